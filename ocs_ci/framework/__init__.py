@@ -144,8 +144,8 @@ class MultiClusterConfig:
         self.clusters = list()
         # This member always points to current cluster's Config() object
         self.nclusters = 1
-        # Index for current cluster in context
-        self.cur_index = 0
+        # Index for current cluster in context, see cur_index property
+        self._cur_index = 0
         self.multicluster = False
         # A list of lists which holds CLI args clusterwise
         self.multicluster_args = list()
@@ -156,6 +156,22 @@ class MultiClusterConfig:
         self.single_cluster_default = True
         self._single_cluster_init_cluster_configs()
 
+    @property
+    def cur_index(self):
+        """
+        Index of the current cluster context. Threads with config index bound
+        by ConfigSafeThread or config_safe_thread_pool_task read and switch
+        their own index, so they never change the context of other threads.
+        """
+        return getattr(self.thread_local_data, "config_index", self._cur_index)
+
+    @cur_index.setter
+    def cur_index(self, index):
+        if hasattr(self.thread_local_data, "config_index"):
+            self.thread_local_data.config_index = index
+        else:
+            self._cur_index = index
+
     def __getattr__(self, attr):
         with config_lock:
             config_index = getattr(
@@ -48,6 +48,7 @@ from ocs_ci.utility.utils import (
     load_config_file,
     create_stats_dir,
     create_kubeconfig,
+    get_oc_plugins_stats,
 )
 
 from ocs_ci.utility.memory import (
@@ -68,6 +69,8 @@ log = logging.getLogger(__name__)
 
 # Global variable to store test start time
 test_start_time = None
+# Global variable to store 'oc plugin list' probe statistics at test start
+oc_plugins_stats_start_test = None
 
 
 def _pytest_addoption_cluster_specific(parser):
@@ -1115,7 +1118,8 @@ def pytest_runtest_setup(item):
 
         start_monitor_memory()
 
-        global consumed_ram_start_test, test_start_time
+        global consumed_ram_start_test, test_start_time, oc_plugins_stats_start_test
+        oc_plugins_stats_start_test = get_oc_plugins_stats()
         consumed_ram_start_test = get_consumed_ram()
 
         # Capture test start time in UTC for must-gather --since-time option
@@ -1131,6 +1135,14 @@ def pytest_runtest_setup(item):
 
 @pytest.hookimpl(trylast=True)
 def pytest_runtest_teardown(item):
+    if oc_plugins_stats_start_test:
+        oc_plugins_stats = get_oc_plugins_stats()
+        log.info(
+            f"oc plugin list probes during {item.nodeid}: executed "
+            f"{oc_plugins_stats['probes'] - oc_plugins_stats_start_test['probes']}, "
+            f"forks saved by cache "
+            f"{oc_plugins_stats['forks_saved'] - oc_plugins_stats_start_test['forks_saved']}"
+        )
     try:
         _, peak_rss_table, peak_vms_table = stop_monitor_memory(save_csv=False)
         log.info(
@@ -10,6 +10,10 @@ from ocs_ci.utility.utils import (
 )
 from ocs_ci.framework import config as ocsci_config
 from ocs_ci.framework import GlobalVariables as GV
+from ocs_ci.ocs.must_gather.delta import mg_delta
+from ocs_ci.ocs.node_agent import teardown_node_agents
+from ocs_ci.ocs.resource_cache import list_cache
+from ocs_ci.utility.prometheus import close_prometheus_sessions
 
 
 log = logging.getLogger(__name__)
@@ -117,6 +121,34 @@ def pytest_sessionfinish(session, exitstatus):
             f"Failed to save Test Time report to logs directory with exception. {e}"
         )
 
+    if list_cache.stats:
+        list_cache.stop_watchers()
+        cache_stats = list_cache.format_stats()
+        log.info(f"List cache statistics:\n{cache_stats}")
+        try:
+            cache_report_file = os.path.join(
+                ocsci_log_path(), "session_list_cache_stats.txt"
+            )
+            with open(cache_report_file, "w") as fil:
+                fil.write(cache_stats + "\n")
+        except Exception as e:
+            log.warning(f"Failed to save list cache statistics. {e}")
+
+    teardown_node_agents()
+    close_prometheus_sessions()
+
+    if mg_delta.stats["gathers"]:
+        mg_stats = mg_delta.format_stats()
+        log.info(f"Delta must-gather statistics:\n{mg_stats}")
+        try:
+            mg_report_file = os.path.join(
+                ocsci_log_path(), "session_mg_delta_stats.txt"
+            )
+            with open(mg_report_file, "w") as fil:
+                fil.write(mg_stats + "\n")
+        except Exception as e:
+            log.warning(f"Failed to save delta must-gather statistics. {e}")
+
     for i in range(ocsci_config.nclusters):
         ocsci_config.switch_ctx(i)
         if not (
@@ -6,13 +6,17 @@ import time
 from datetime import datetime
 
 import re
+import tempfile
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from ocs_ci.ocs.resources import pod
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import TimeoutSampler
-from ocs_ci.ocs.exceptions import TimeoutExpiredError
+from ocs_ci.ocs.exceptions import CommandFailed, TimeoutExpiredError
 from ocs_ci.utility import version
 
 logger = logging.getLogger(__name__)
@@ -29,6 +33,21 @@ interface_data = {
     },
 }
 
+# Events of the provisioner and CSI driver logs indexed by CsiLogIndex
+PROVISION_STARTED_RE = re.compile(r'Started.*PVC="[^"]*/([^"]+)"')
+PROVISION_SUCCEEDED_RE = re.compile(r"succeeded(.*)", re.IGNORECASE)
+NAMESPACED_VALUE_RE = re.compile(r'"[^"/\s]*/([^"\s]+)"')
+LEGACY_PROVISION_RE = re.compile(
+    r'provision "[^"]*/([^"]+)" class "[^"]*": (started|succeeded)'
+)
+DELETE_STARTED_RE = re.compile(r'"shouldDelete is true".*PV="([^"]+)"')
+DELETE_SUCCEEDED_RE = re.compile(r'deleted succeeded.*PV="([^"]+)"')
+LEGACY_DELETE_RE = re.compile(r'delete "([^"]+)": (started|succeeded)')
+CSI_GRPC_RE = re.compile(r"Req-ID: (\S+) GRPC (call|response):")
+GENERATED_VOLUME_ID_RE = re.compile(r"generated volume id \(([^)]+)\)", re.IGNORECASE)
+REQ_ID_RE = re.compile(r"Req-ID: (\S+)")
+PV_NAME_RE = re.compile(r"pvc-[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}")
+
 
 def write_fio_on_pod(pod_obj, file_size):
     """
@@ -211,17 +230,477 @@ def read_csi_logs(log_names, container_name, start_time):
 
     """
     ns_name = config.ENV_DATA["cluster_namespace"]
-    logs = []
-    for l in log_names:
-        logs.append(
-            run_oc_command(
-                f"logs {l} -c {container_name} --since-time={start_time}",
-                ns_name,
+    with ThreadPoolExecutor(max_workers=max(len(log_names), 1)) as executor:
+        logs = list(
+            executor.map(
+                lambda log_name: run_oc_command(
+                    f"logs {log_name} -c {container_name} --since-time={start_time}",
+                    ns_name,
+                ),
+                log_names,
             )
         )
     return logs
 
 
+class CsiLogIndex(object):
+    """
+    Index of the PVC / PV events found in the provisioner and CSI driver logs.
+
+    The logs are tokenised once and every event is stored under its key (PVC
+    name for the provisioning, PV name for the deletion and Req-ID for the CSI
+    GRPC calls) with the list of the log timestamps in the order they appear
+    in the logs, so times of any number of PVCs are answered by dictionary
+    lookups instead of searching the logs again for every PVC.
+
+    Example::
+
+        index = CsiLogIndex.from_cluster(constants.CEPHBLOCKPOOL, start_time)
+        start = index.first(CsiLogIndex.CREATE_START, pvc_obj.name)
+        end = index.last(CsiLogIndex.CREATE_END, pvc_obj.name)
+
+    """
+
+    CREATE_START = "create_start"
+    CREATE_END = "create_end"
+    DELETE_START = "delete_start"
+    DELETE_END = "delete_end"
+    CSI_START = "csi_start"
+    CSI_END = "csi_end"
+
+    def __init__(self, ocs_version=None):
+        """
+        Args:
+            ocs_version (str): OCS version the logs come from, it decides
+                whether the log messages of the older provisioner are indexed,
+                taken from config if not provided
+
+        """
+        if ocs_version is None:
+            ocs_version = version.get_semantic_ocs_version_from_config()
+        else:
+            ocs_version = version.get_semantic_version(ocs_version, True)
+        self.legacy_provision = ocs_version <= version.VERSION_4_16
+        self.legacy_delete_end = ocs_version <= version.VERSION_4_13
+        self.events = defaultdict(list)
+        self.volume_ids = {}
+
+    @classmethod
+    def from_cluster(cls, interface, start_time, provisioner=True, csi=True):
+        """
+        Read the logs of the provisioner pods from the cluster and index them,
+        the logs already read from the same start time are not read again
+
+        Args:
+            interface (str): an interface (RBD or CephFS) to read the logs of
+            start_time (str): Formatted time from which and on to read the logs
+            provisioner (bool): True to index the csi-provisioner container logs
+            csi (bool): True to index the CSI driver container logs
+
+        Returns:
+            CsiLogIndex: index of the logs
+
+        """
+        index = get_csi_log_tail(interface, start_time).update(
+            provisioner=provisioner, csi=csi
+        )
+        logger.info(
+            f"Indexed {sum(len(times) for times in index.events.values())} "
+            f"events of {len(index.events)} PVCs / requests"
+        )
+        return index
+
+    def merge(self, other):
+        """
+        Add the events of other index after the events of this index
+
+        Args:
+            other (CsiLogIndex): index to take the events from
+
+        """
+        for key, times in other.events.items():
+            self.events[key].extend(times)
+        self.volume_ids.update(other.volume_ids)
+
+    def _add(self, event, key, line):
+        self.events[(event, key)].append(" ".join(line.split(" ")[0:2]))
+
+    def add_provisioner_log(self, lines):
+        """
+        Index the PVC creation and deletion events of csi-provisioner log
+
+        Args:
+            lines (list): lines of the log
+
+        """
+        for line in lines:
+            if "delete" in line or "shouldDelete" in line:
+                match = DELETE_STARTED_RE.search(line)
+                if match:
+                    self._add(self.DELETE_START, match.group(1), line)
+                    continue
+                match = DELETE_SUCCEEDED_RE.search(line)
+                if match:
+                    self._add(self.DELETE_END, match.group(1), line)
+                    continue
+                match = LEGACY_DELETE_RE.search(line)
+                if match:
+                    if match.group(2) == "started" and self.legacy_provision:
+                        self._add(self.DELETE_START, match.group(1), line)
+                    elif match.group(2) == "succeeded" and self.legacy_delete_end:
+                        self._add(self.DELETE_END, match.group(1), line)
+                    continue
+            if self.legacy_provision and "provision" in line:
+                match = LEGACY_PROVISION_RE.search(line)
+                if match:
+                    event = (
+                        self.CREATE_START
+                        if match.group(2) == "started"
+                        else self.CREATE_END
+                    )
+                    self._add(event, match.group(1), line)
+                    continue
+            if "Started" in line:
+                match = PROVISION_STARTED_RE.search(line)
+                if match:
+                    self._add(self.CREATE_START, match.group(1), line)
+                    continue
+            match = PROVISION_SUCCEEDED_RE.search(line)
+            if match:
+                for name in set(NAMESPACED_VALUE_RE.findall(match.group(1))):
+                    self._add(self.CREATE_END, name, line)
+
+    def add_csi_log(self, lines):
+        """
+        Index the GRPC calls and the generated volume ids of CSI driver log
+
+        Args:
+            lines (list): lines of the log
+
+        """
+        for line in lines:
+            if "Req-ID:" not in line:
+                continue
+            match = CSI_GRPC_RE.search(line)
+            if match:
+                event = self.CSI_START if match.group(2) == "call" else self.CSI_END
+                self._add(event, match.group(1), line)
+                continue
+            match = GENERATED_VOLUME_ID_RE.search(line)
+            if match:
+                names = set(REQ_ID_RE.findall(line)) | set(PV_NAME_RE.findall(line))
+                for name in names:
+                    self.volume_ids[name] = match.group(1)
+
+    def get_times(self, event, key):
+        """
+        Get timestamps of the event in the order they appear in the logs
+
+        Args:
+            event (str): one of the event constants of the class
+            key (str): PVC name, PV name or Req-ID of the event
+
+        Returns:
+            list: timestamps of the event in format of extruct_timestamp_from_log
+                without the year
+
+        """
+        return self.events.get((event, key), [])
+
+    def first(self, event, key):
+        """
+        Get the first timestamp of the event
+
+        Args:
+            event (str): one of the event constants of the class
+            key (str): PVC name, PV name or Req-ID of the event
+
+        Returns:
+            str: the timestamp as returned by extruct_timestamp_from_log, None
+                if the event is not in the logs
+
+        """
+        times = self.get_times(event, key)
+        return extruct_timestamp_from_log(times[0]) if times else None
+
+    def last(self, event, key):
+        """
+        Get the last timestamp of the event
+
+        Args:
+            event (str): one of the event constants of the class
+            key (str): PVC name, PV name or Req-ID of the event
+
+        Returns:
+            str: the timestamp as returned by extruct_timestamp_from_log, None
+                if the event is not in the logs
+
+        """
+        times = self.get_times(event, key)
+        return extruct_timestamp_from_log(times[-1]) if times else None
+
+    def csi_request_id(self, pv_name, operation):
+        """
+        Get the Req-ID of the CSI GRPC calls of the PV operation
+
+        Args:
+            pv_name (str): name of the PV
+            operation (str): 'create' / 'delete'
+
+        Returns:
+            str: Req-ID of the calls, the volume id generated for the PV in
+                case of delete if it is in the logs, PV name otherwise
+
+        """
+        if operation == "delete":
+            return self.volume_ids.get(pv_name, pv_name)
+        return pv_name
+
+
+def log_time_to_time(timestamp):
+    """
+    Convert timestamp returned by CsiLogIndex to a time object
+
+    Args:
+        timestamp (str): the timestamp with year, day and time
+
+    Returns:
+        datetime : a time object of the time of the day
+
+    """
+    return string_to_time(timestamp.split(" ")[2])
+
+
+def normalize_log_timestamp(timestamp):
+    """
+    Normalize RFC3339 timestamp of the log line to nanoseconds precision, so
+    the timestamps can be compared as strings
+
+    Args:
+        timestamp (str): RFC3339 timestamp in UTC, e.g. 2024-03-12T10:00:01.1Z
+
+    Returns:
+        str: the timestamp with 9 digits of the fraction of the second
+
+    """
+    seconds, _, fraction = timestamp.rstrip("Z").partition(".")
+    return f"{seconds}.{fraction[:9].ljust(9, '0')}Z"
+
+
+class CsiLogTail(object):
+    """
+    Incremental reader of the provisioner pods logs.
+
+    The logs of all the containers are read concurrently with
+    ``oc logs --timestamps`` and the lines are streamed into the CsiLogIndex
+    as they arrive, without keeping the logs in memory. The timestamp of the
+    last line read is remembered for every container, so the next update only
+    reads the lines which were logged since then.
+    """
+
+    def __init__(self, interface, start_time, max_workers=None):
+        """
+        Args:
+            interface (str): an interface (RBD or CephFS) to read the logs of
+            start_time (str): Formatted time from which and on to read the logs
+            max_workers (int): maximal number of logs read at once, all the
+                logs are read at once if not provided
+
+        """
+        self.interface = interface
+        self.start_time = start_time
+        self.max_workers = max_workers
+        self.namespace = config.ENV_DATA["cluster_namespace"]
+        self.kubeconfig = config.RUN.get("kubeconfig")
+        self.ocs_version = config.ENV_DATA["ocs_version"]
+        self.index = CsiLogIndex(ocs_version=self.ocs_version)
+        # (pod, container): (normalized timestamp, lines read with it)
+        self.cursors = {}
+        self.lock = threading.Lock()
+
+    def update(self, provisioner=True, csi=True, timeout=600):
+        """
+        Read the new lines of the logs into the index
+
+        Args:
+            provisioner (bool): True to read the csi-provisioner container logs
+            csi (bool): True to read the CSI driver container logs
+            timeout (int): timeout for reading one log in seconds
+
+        Returns:
+            CsiLogIndex: index of all the lines read so far
+
+        Raises:
+            Exception: if reading some of the logs failed, the lines of the
+                logs read successfully are indexed anyway
+
+        """
+        containers = []
+        if provisioner:
+            containers.append("csi-provisioner")
+        if csi:
+            containers.append(interface_data[self.interface]["csi_cnt"])
+        with self.lock:
+            log_names = get_logfile_names(self.interface)
+            logs = [
+                (pod_name, container)
+                for container in containers
+                for pod_name in log_names
+            ]
+            if not logs:
+                return self.index
+            max_workers = self.max_workers or len(logs)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._read_log, pod_name, container, timeout)
+                    for pod_name, container in logs
+                ]
+            error = None
+            # merging in the order of the logs keeps the order of events
+            # the same as when the logs are read one after another
+            for (pod_name, container), future in zip(logs, futures):
+                try:
+                    partial_index, cursor = future.result()
+                except Exception as ex:
+                    logger.error(f"Failed to read log of {pod_name} {container}: {ex}")
+                    error = error or ex
+                    continue
+                self.index.merge(partial_index)
+                self.cursors[(pod_name, container)] = cursor
+            if error:
+                raise error
+        return self.index
+
+    def _log_cmd(self, pod_name, container, since_time):
+        """
+        Get the command streaming the container log with timestamps
+
+        Args:
+            pod_name (str): name of the pod
+            container (str): name of the container
+            since_time (str): time from which and on to read the log
+
+        Returns:
+            list: the command
+
+        """
+        cmd = ["oc"]
+        if self.kubeconfig:
+            cmd += ["--kubeconfig", self.kubeconfig]
+        return cmd + [
+            "-n",
+            self.namespace,
+            "logs",
+            pod_name,
+            "-c",
+            container,
+            "--timestamps",
+            f"--since-time={since_time}",
+        ]
+
+    def _read_log(self, pod_name, container, timeout):
+        """
+        Stream the new lines of the container log into a new index
+
+        Args:
+            pod_name (str): name of the pod
+            container (str): name of the container
+            timeout (int): timeout for reading the log in seconds
+
+        Returns:
+            tuple: CsiLogIndex with the events of the new lines and the cursor
+                of the last line read
+
+        Raises:
+            CommandFailed: if reading the log failed
+
+        """
+        cursor, skip = self.cursors.get((pod_name, container), (None, 0))
+        since_time = cursor or self.start_time
+        cmd = self._log_cmd(pod_name, container, since_time)
+        logger.debug(f"Streaming log of {pod_name} {container} since {since_time}")
+        partial_index = CsiLogIndex(ocs_version=self.ocs_version)
+        new_cursor = [cursor, skip]
+
+        def lines(stream):
+            # the API server reads the logs since the whole second, the lines
+            # which were already read are skipped here
+            skipped = 0
+            for raw_line in stream:
+                timestamp, _, line = raw_line.rstrip("\n").partition(" ")
+                timestamp = normalize_log_timestamp(timestamp)
+                if cursor:
+                    if timestamp < cursor:
+                        continue
+                    if timestamp == cursor and skipped < skip:
+                        skipped += 1
+                        continue
+                if timestamp == new_cursor[0]:
+                    new_cursor[1] += 1
+                else:
+                    new_cursor[0], new_cursor[1] = timestamp, 1
+                yield line
+
+        # stderr goes to a file, so it can't block the process while the
+        # stdout is streamed
+        with tempfile.TemporaryFile(mode="w+") as err_file:
+            with subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=err_file,
+                universal_newlines=True,
+            ) as proc:
+                timer = threading.Timer(timeout, proc.kill)
+                timer.start()
+                try:
+                    if container == "csi-provisioner":
+                        partial_index.add_provisioner_log(lines(proc.stdout))
+                    else:
+                        partial_index.add_csi_log(lines(proc.stdout))
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+                if returncode:
+                    err_file.seek(0)
+                    raise CommandFailed(
+                        f"Error in command {' '.join(cmd)} ({returncode}): "
+                        f"{err_file.read()}"
+                    )
+        return partial_index, tuple(new_cursor)
+
+
+# Number of the log tails kept, the least recently used tail is dropped
+MAX_CSI_LOG_TAILS = 8
+
+_csi_log_tails = OrderedDict()
+_csi_log_tails_lock = threading.Lock()
+
+
+def get_csi_log_tail(interface, start_time):
+    """
+    Get the log tail of the interface provisioner pods reading the logs from
+    the start time, the same tail is returned for the same cluster, interface
+    and start time while it is one of the MAX_CSI_LOG_TAILS recently used
+
+    Args:
+        interface (str): an interface (RBD or CephFS) to read the logs of
+        start_time (str): Formatted time from which and on to read the logs
+
+    Returns:
+        CsiLogTail: the log tail
+
+    """
+    key = (config.RUN.get("kubeconfig"), interface, start_time)
+    with _csi_log_tails_lock:
+        if key in _csi_log_tails:
+            _csi_log_tails.move_to_end(key)
+        else:
+            _csi_log_tails[key] = CsiLogTail(interface, start_time)
+            while len(_csi_log_tails) > MAX_CSI_LOG_TAILS:
+                _csi_log_tails.popitem(last=False)
+        return _csi_log_tails[key]
+
+
 # Sometimes, the logs are not available due to the connection issues, retry added
 @retry(Exception, tries=6, delay=5, backoff=2)
 def measure_pvc_creation_time(interface, pvc_name, start_time):
@@ -238,21 +717,13 @@ def measure_pvc_creation_time(interface, pvc_name, start_time):
         (float) creation time for PVC in seconds
 
     """
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, "csi-provisioner", start_time)
+    index = CsiLogIndex.from_cluster(interface, start_time, csi=False)
 
-    st = None
-    et = None
     # look for start time and end time of pvc creation. The start/end line may appear in log several times
     # in order to be on the safe side and measure the longest time difference (which is the actual pvc creation
     # time), the earliest start time and the latest end time are taken
-    for sublog in logs:
-        for line in sublog:
-            if st is None and "Started" in line and pvc_name in line:
-                st = string_to_time(line.split(" ")[1])
-            elif pvc_name in line and "Succeeded" in line:
-                et = string_to_time(line.split(" ")[1])
-    del logs
+    st = index.first(CsiLogIndex.CREATE_START, pvc_name)
+    et = index.last(CsiLogIndex.CREATE_END, pvc_name)
     if st is None:
         logger.error(f"Cannot find start time of {pvc_name}")
         raise Exception(f"Cannot find start time of {pvc_name}")
@@ -261,7 +732,7 @@ def measure_pvc_creation_time(interface, pvc_name, start_time):
         logger.error(f"Cannot find end time of {pvc_name}")
         raise Exception(f"Cannot find end time of {pvc_name}")
 
-    total_time = (et - st).total_seconds()
+    total_time = (log_time_to_time(et) - log_time_to_time(st)).total_seconds()
     if total_time < 0:
         # for start-time > end-time (before / after midnigth) adding 24H to the time.
         total_time += 24 * 60 * 60
@@ -288,27 +759,11 @@ def csi_pvc_time_measure(interface, pvc_obj, operation, start_time):
 
     """
 
-    pv_name = pvc_obj.backed_pv
-
     # Reading the CSI provisioner logs
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, interface_data[interface]["csi_cnt"], start_time)
-
-    st = None
-    et = None
-    for sublog in logs:
-        for line in sublog:
-            if (
-                operation == "delete"
-                and "generated volume id" in line.lower()
-                and pv_name in line
-            ):
-                pv_name = line.split("(")[1].split(")")[0]
-            if f"Req-ID: {pv_name} GRPC call:" in line:
-                st = string_to_time(line.split(" ")[1])
-            if f"Req-ID: {pv_name} GRPC response:" in line:
-                et = string_to_time(line.split(" ")[1])
-    del logs
+    index = CsiLogIndex.from_cluster(interface, start_time, provisioner=False)
+    req_id = index.csi_request_id(pvc_obj.backed_pv, operation)
+    st = index.last(CsiLogIndex.CSI_START, req_id)
+    et = index.last(CsiLogIndex.CSI_END, req_id)
     if st is None:
         err_msg = f"Cannot find CSI start time of {pvc_obj.name}"
         logger.error(err_msg)
@@ -319,7 +774,7 @@ def csi_pvc_time_measure(interface, pvc_obj, operation, start_time):
         logger.error(err_msg)
         raise Exception(err_msg)
 
-    total_time = (et - st).total_seconds()
+    total_time = (log_time_to_time(et) - log_time_to_time(st)).total_seconds()
     if total_time < 0:
         # for start-time > end-time (before / after midnigth) adding 24H to the time.
         total_time += 24 * 60 * 60
@@ -347,32 +802,13 @@ def csi_bulk_pvc_time_measure(interface, pvc_objs, operation, start_time):
     st = []
     et = []
 
-    cnt_names = {
-        constants.CEPHFILESYSTEM: "csi-cephfsplugin",
-        constants.CEPHBLOCKPOOL: "csi-rbdplugin",
-    }
-
     # Reading the CSI provisioner logs
-    log_names = get_logfile_names(interface)
-    logs = read_csi_logs(log_names, cnt_names[interface], start_time)
+    index = CsiLogIndex.from_cluster(interface, start_time, provisioner=False)
 
     for pvc in pvc_objs:
-        pv_name = pvc.backed_pv
-        single_st = None
-        single_et = None
-
-        for sublog in logs:
-            for line in sublog:
-                if (
-                    operation == "delete"
-                    and "generated volume id" in line.lower()
-                    and pv_name in line
-                ):
-                    pv_name = line.split("(")[1].split(")")[0]
-                if f"Req-ID: {pv_name} GRPC call:" in line:
-                    single_st = string_to_time(line.split(" ")[1])
-                if f"Req-ID: {pv_name} GRPC response:" in line:
-                    single_et = string_to_time(line.split(" ")[1])
+        req_id = index.csi_request_id(pvc.backed_pv, operation)
+        single_st = index.last(CsiLogIndex.CSI_START, req_id)
+        single_et = index.last(CsiLogIndex.CSI_END, req_id)
 
         if single_st is None:
             err_msg = f"Cannot find CSI start time of {pvc.name}"
@@ -384,8 +820,8 @@ def csi_bulk_pvc_time_measure(interface, pvc_objs, operation, start_time):
             logger.error(err_msg)
             raise Exception(err_msg)
 
-        st.append(single_st)
-        et.append(single_et)
+        st.append(log_time_to_time(single_st))
+        et.append(log_time_to_time(single_et))
 
     st.sort()
     et.sort()
@@ -629,143 +1065,59 @@ def get_pvc_provision_times(interface, pvc_name, start_time, time_type="all", op
 
     """
 
-    log_names = get_logfile_names(interface)
+    read_prov = time_type.lower() in ["all", "total"]
+    read_csi = time_type.lower() in ["all", "csi"]
+    index = CsiLogIndex.from_cluster(
+        interface, start_time, provisioner=read_prov, csi=read_csi
+    )
 
-    if time_type.lower() in ["all", "total"]:
-        logger.info("Reading the Provisioner logs")
-        prov_logs = read_csi_logs(log_names, "csi-provisioner", start_time)
-    if time_type.lower() in ["all", "csi"]:
-        logger.info("Reading the CSI only logs")
-        csi_logs = read_csi_logs(
-            log_names, interface_data[interface]["csi_cnt"], start_time
-        )
+    # the time is calculated once the end of the operation is found in the log
+    operations = []
+    if op in ["all", "create"]:
+        if read_prov:
+            operations.append(
+                ("create", CsiLogIndex.CREATE_START, CsiLogIndex.CREATE_END)
+            )
+        if read_csi:
+            operations.append(
+                ("csi_create", CsiLogIndex.CSI_START, CsiLogIndex.CSI_END)
+            )
+    if op in ["all", "delete"]:
+        if read_prov:
+            operations.append(
+                ("delete", CsiLogIndex.DELETE_START, CsiLogIndex.DELETE_END)
+            )
+        if read_csi:
+            operations.append(
+                ("csi_delete", CsiLogIndex.CSI_START, CsiLogIndex.CSI_END)
+            )
 
-    # Initializing the results dictionary
     results = {}
-    for i in range(0, len(pvc_name)):
-        results[pvc_name[i].name] = {
+    for pvc in pvc_name:
+        name = pvc.name
+        pv_name = pvc.backed_pv
+        keys = {
+            "create": name,
+            "delete": pv_name,
+            "csi_create": pv_name,
+            # CSI deletion calls use the volume id generated for the PV
+            "csi_delete": index.volume_ids.get(pv_name),
+        }
+        results[name] = {
             "create": {"start": None, "end": None, "time": None},
             "delete": {"start": None, "end": None, "time": None},
             "csi_create": {"start": None, "end": None, "time": None},
             "csi_delete": {"start": None, "end": None, "time": None},
         }
-    # Getting times from Provisioner log - if needed
-    if prov_logs:
-        for sublog in prov_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-                    if op in ["all", "create"]:
-                        if (
-                            re.search(f"provision.*{name}.*started", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(f'Started.*PVC="[^"]*/{re.escape(name)}"', line):
-                            if results[name]["create"]["start"] is None:
-                                results[name]["create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f"provision.*{name}.*succeeded", line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f"Succeeded.*{re.escape(name)}", line, re.IGNORECASE
-                        ):
-                            if results[name]["create"]["end"] is None:
-                                results[name]["create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if (
-                            re.search(f'delete "{pv_name}": started', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_16
-                            )
-                        ) or re.search(
-                            f'"shouldDelete is true".*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["start"] is None:
-                                results[name]["delete"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if (
-                            re.search(f'delete "{pv_name}": succeeded', line)
-                            and (
-                                version.get_semantic_ocs_version_from_config()
-                                <= version.VERSION_4_13
-                            )
-                        ) or re.search(
-                            f'deleted succeeded.*PV="{re.escape(pv_name)}"', line
-                        ):
-                            if results[name]["delete"]["end"] is None:
-                                results[name]["delete"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["delete"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["delete"]
-                                    )
-                                )
-
-    # Getting times from CSI log - if needed
-    del_pv_names = []
-    for i in range(0, len(pvc_name)):
-        del_pv_names.append("")
-
-    if csi_logs:
-        for sublog in csi_logs:
-            for line in sublog:
-                for i in range(0, len(pvc_name)):
-                    name = pvc_name[i].name
-                    pv_name = pvc_name[i].backed_pv
-
-                    if "generated volume id" in line.lower() and pv_name in line:
-                        del_pv_names[i] = line.split("(")[1].split(")")[0]
-                    if op in ["all", "create"]:
-                        if f"Req-ID: {pv_name} GRPC call:" in line:
-                            if results[name]["csi_create"]["start"] is None:
-                                results[name]["csi_create"]["start"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                        if f"Req-ID: {pv_name} GRPC response:" in line:
-                            if results[name]["csi_create"]["end"] is None:
-                                results[name]["csi_create"]["end"] = (
-                                    extruct_timestamp_from_log(line)
-                                )
-                                results[name]["csi_create"]["time"] = (
-                                    calculate_operation_time(
-                                        name, results[name]["csi_create"]
-                                    )
-                                )
-                    if op in ["all", "delete"]:
-                        if del_pv_names[i]:
-                            if f"Req-ID: {del_pv_names[i]} GRPC call:" in line:
-                                if results[name]["csi_delete"]["start"] is None:
-                                    results[name]["csi_delete"]["start"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                            if f"Req-ID: {del_pv_names[i]} GRPC response:" in line:
-                                if results[name]["csi_delete"]["end"] is None:
-                                    results[name]["csi_delete"]["end"] = (
-                                        extruct_timestamp_from_log(line)
-                                    )
-                                    results[name]["csi_delete"]["time"] = (
-                                        calculate_operation_time(
-                                            name, results[name]["csi_delete"]
-                                        )
-                                    )
+        for operation, start_event, end_event in operations:
+            key = keys[operation]
+            if key is None:
+                continue
+            times = results[name][operation]
+            times["start"] = index.first(start_event, key)
+            times["end"] = index.first(end_event, key)
+            if times["end"] is not None:
+                times["time"] = calculate_operation_time(name, times)
 
     logger.debug(f"All results are : {json.dumps(results, indent=3)}")
     return results
@@ -18,6 +18,8 @@ Success Criteria:
 - Healthy Ceph status throughout
 """
 
+import bisect
+import heapq
 import logging
 import threading
 import time
@@ -41,6 +43,29 @@ from ocs_ci.helpers import helpers
 
 log = logging.getLogger(__name__)
 
+# Operations of the same category compete for the same cluster resources
+# (e.g. Ceph daemons), each category has its own concurrency limit
+OPERATION_CATEGORIES = {
+    "snapshot_lifecycle": "pvc",
+    "clone_lifecycle": "pvc",
+    "reclaim_space": "csi_addons",
+    "volume_replication": "csi_addons",
+    "node_taint_churn": "node",
+    "osd_operations": "ceph_daemon",
+    "mds_failover": "ceph_daemon",
+    "rgw_restart": "ceph_daemon",
+    "longevity_operations": "longevity",
+}
+DEFAULT_CATEGORY_LIMITS = {
+    "pvc": 3,
+    "csi_addons": 2,
+    "node": 1,
+    "ceph_daemon": 1,
+    "longevity": 1,
+}
+# Upper bounds in seconds of the operation latency histogram buckets
+LATENCY_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
 
 class BackgroundClusterMetrics:
     """Track metrics for background cluster operations."""
@@ -49,26 +74,77 @@ class BackgroundClusterMetrics:
         self.operations = defaultdict(int)
         self.successes = defaultdict(int)
         self.failures = defaultdict(int)
+        self.latencies = defaultdict(list)
         self.errors = []
         self.start_time = time.time()
+        self._lock = threading.Lock()
 
     def record_operation(
-        self, operation_type: str, success: bool, error: Optional[str] = None
+        self,
+        operation_type: str,
+        success: bool,
+        error: Optional[str] = None,
+        duration: Optional[float] = None,
     ):
-        """Record an operation result."""
-        self.operations[operation_type] += 1
-        if success:
-            self.successes[operation_type] += 1
-        else:
-            self.failures[operation_type] += 1
-            if error:
-                self.errors.append(
-                    {
-                        "operation": operation_type,
-                        "error": error,
-                        "timestamp": time.time(),
-                    }
-                )
+        """
+        Record an operation result.
+
+        Args:
+            operation_type: Name of the operation
+            success: Whether the operation succeeded
+            error: Error message of the failed operation
+            duration: Latency of the operation in seconds
+        """
+        with self._lock:
+            self.operations[operation_type] += 1
+            if duration is not None:
+                self.latencies[operation_type].append(duration)
+            if success:
+                self.successes[operation_type] += 1
+            else:
+                self.failures[operation_type] += 1
+                if error:
+                    self.errors.append(
+                        {
+                            "operation": operation_type,
+                            "error": error,
+                            "timestamp": time.time(),
+                        }
+                    )
+
+    def get_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency histogram of every operation type.
+
+        Returns:
+            dict: Operation type: histogram with keys:
+                - buckets (dict): Bucket upper bound ("+Inf" for the last):
+                  number of operations with latency in the bucket
+                - count (int): Number of operations
+                - sum (float): Sum of the latencies in seconds
+                - p50, p95, max (float): Latency percentiles in seconds
+        """
+        with self._lock:
+            latencies = {op: list(values) for op, values in self.latencies.items()}
+        histograms = {}
+        for operation_type, values in latencies.items():
+            if not values:
+                continue
+            counts = [0] * (len(LATENCY_BUCKETS) + 1)
+            for value in values:
+                counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+            values.sort()
+            histograms[operation_type] = {
+                "buckets": dict(
+                    zip([str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"], counts)
+                ),
+                "count": len(values),
+                "sum": sum(values),
+                "p50": values[int(0.5 * (len(values) - 1))],
+                "p95": values[int(0.95 * (len(values) - 1))],
+                "max": values[-1],
+            }
+        return histograms
 
     def get_summary(self) -> Dict[str, Any]:
         """Get operation summary."""
@@ -87,6 +163,10 @@ class BackgroundClusterMetrics:
                 if sum(self.operations.values()) > 0
                 else 0
             ),
+            "operations_per_minute": (
+                sum(self.operations.values()) / duration * 60 if duration else 0
+            ),
+            "latency_by_type": self.get_latency_histograms(),
         }
 
 
@@ -104,6 +184,9 @@ class BackgroundClusterOperations:
         enabled_operations: Optional[List[str]] = None,
         operation_interval: int = 60,
         max_concurrent_operations: int = 3,
+        operations_per_minute: Optional[float] = None,
+        category_limits: Optional[Dict[str, int]] = None,
+        operation_priorities: Optional[Dict[str, int]] = None,
     ):
         """
         Initialize BackgroundClusterOperations.
@@ -113,18 +196,33 @@ class BackgroundClusterOperations:
             enabled_operations: List of enabled operation types (None = all)
             operation_interval: Seconds between operations (default: 60)
             max_concurrent_operations: Max concurrent background operations
+            operations_per_minute: Target rate of starting operations, derived
+                from operation_interval if not provided
+            category_limits: Max concurrent operations per category (see
+                OPERATION_CATEGORIES), merged with DEFAULT_CATEGORY_LIMITS
+            operation_priorities: Priority per operation type, operations
+                with lower value are started first (default: 0)
         """
         self.workload_ops = workload_ops
         self.namespace = workload_ops.namespace
         self.workloads = workload_ops.workloads
         self.operation_interval = operation_interval
         self.max_concurrent_operations = max_concurrent_operations
+        self.operations_per_minute = operations_per_minute or 60 / operation_interval
+        self.category_limits = {**DEFAULT_CATEGORY_LIMITS, **(category_limits or {})}
+        self.operation_priorities = operation_priorities or {}
 
         # Operation control
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._operation_threads: List[threading.Thread] = []
 
+        # Scheduler state, guarded by the condition
+        self._scheduler = threading.Condition()
+        self._queue: List[tuple] = []
+        self._queue_seq = 0
+        self._running_by_category: Dict[str, int] = defaultdict(int)
+
         # Metrics and tracking
         self.metrics = BackgroundClusterMetrics()
         self._resources_to_cleanup: List[Any] = []
@@ -187,6 +285,8 @@ class BackgroundClusterOperations:
 
         log.info("Stopping background cluster operations")
         self._running = False
+        with self._scheduler:
+            self._scheduler.notify_all()
 
         # Wait for main thread
         if self._thread and self._thread.is_alive():
@@ -204,34 +304,44 @@ class BackgroundClusterOperations:
         self._log_final_summary()
 
     def _operation_loop(self):
-        """Main operation loop - continuously performs background operations."""
-        log.info("Background cluster operation loop started")
+        """
+        Scheduler loop - starts queued operations at the target rate while
+        the global and per-category concurrency limits allow it.
+
+        Operations wait in a priority queue ordered by priority and by the
+        time of queueing, so operations of the same priority take turns. A
+        started operation is queued again right away, so more instances of
+        it can run at once within the limit of its category.
+        """
+        log.info(
+            f"Background cluster operation loop started "
+            f"(target {self.operations_per_minute:.1f} operations/min, "
+            f"category limits: {self.category_limits})"
+        )
+        dispatch_interval = 60 / self.operations_per_minute
+        operation_names = list(self.enabled_operations)
+        random.shuffle(operation_names)
+        with self._scheduler:
+            self._queue = []
+            for operation_name in operation_names:
+                self._enqueue(operation_name)
+        next_dispatch = time.time()
 
         while self._running:
             try:
-                # Clean up completed threads
-                self._operation_threads = [
-                    t for t in self._operation_threads if t.is_alive()
-                ]
-
-                # Check if we can start new operations
-                if len(self._operation_threads) < self.max_concurrent_operations:
-                    # Select random operation
-                    operation_name = random.choice(list(self.enabled_operations.keys()))
-                    operation_func = self.enabled_operations[operation_name]
-
-                    # Start operation in separate thread
-                    op_thread = threading.Thread(
-                        target=self._run_operation_safe,
-                        args=(operation_name, operation_func),
-                        name=f"BgOp-{operation_name}",
-                        daemon=True,
-                    )
-                    op_thread.start()
-                    self._operation_threads.append(op_thread)
-
-                # Sleep before next operation
-                time.sleep(self.operation_interval)
+                delay = next_dispatch - time.time()
+                with self._scheduler:
+                    if delay > 0:
+                        self._scheduler.wait(delay)
+                        continue
+                    operation_name = self._pop_runnable()
+                    if operation_name is None:
+                        # All limits are exhausted, wait for an operation to end
+                        self._scheduler.wait(dispatch_interval)
+                        continue
+                    self._start_operation(operation_name)
+                # Keep the target rate without a burst after waiting for limits
+                next_dispatch = max(next_dispatch, time.time()) + dispatch_interval
 
             except Exception as e:
                 log.error(f"Error in background operation loop: {e}")
@@ -239,6 +349,76 @@ class BackgroundClusterOperations:
 
         log.info("Background cluster operation loop stopped")
 
+    def _enqueue(self, operation_name: str):
+        """Queue the operation, must be called with the scheduler lock held."""
+        self._queue_seq += 1
+        heapq.heappush(
+            self._queue,
+            (
+                self.operation_priorities.get(operation_name, 0),
+                self._queue_seq,
+                operation_name,
+            ),
+        )
+
+    def _category_limit(self, category: str) -> int:
+        return self.category_limits.get(category, self.max_concurrent_operations)
+
+    def _pop_runnable(self) -> Optional[str]:
+        """
+        Pop the first queued operation within the concurrency limits and queue
+        it again, must be called with the scheduler lock held.
+
+        Returns:
+            str: Name of the operation, None if no operation can start now
+        """
+        if sum(self._running_by_category.values()) >= self.max_concurrent_operations:
+            return None
+        deferred = []
+        operation_name = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            category = OPERATION_CATEGORIES.get(entry[2], entry[2])
+            if self._running_by_category[category] < self._category_limit(category):
+                operation_name = entry[2]
+                break
+            deferred.append(entry)
+        # Deferred operations keep their place in the queue
+        for entry in deferred:
+            heapq.heappush(self._queue, entry)
+        if operation_name:
+            self._enqueue(operation_name)
+        return operation_name
+
+    def _start_operation(self, operation_name: str):
+        """Start the operation thread, must be called with the scheduler lock held."""
+        category = OPERATION_CATEGORIES.get(operation_name, operation_name)
+        self._running_by_category[category] += 1
+        self._operation_threads = [t for t in self._operation_threads if t.is_alive()]
+        op_thread = threading.Thread(
+            target=self._run_scheduled_operation,
+            args=(operation_name, category),
+            name=f"BgOp-{operation_name}",
+            daemon=True,
+        )
+        op_thread.start()
+        self._operation_threads.append(op_thread)
+        log.debug(
+            f"Started {operation_name}, running per category: "
+            f"{dict(self._running_by_category)}"
+        )
+
+    def _run_scheduled_operation(self, operation_name: str, category: str):
+        """Run the operation and release its concurrency slot."""
+        try:
+            self._run_operation_safe(
+                operation_name, self.enabled_operations[operation_name]
+            )
+        finally:
+            with self._scheduler:
+                self._running_by_category[category] -= 1
+                self._scheduler.notify_all()
+
     def _namespace_exists(self) -> bool:
         """
         Check if the namespace still exists using the existing OCP utility.
@@ -272,6 +452,7 @@ class BackgroundClusterOperations:
             operation_name: Name of the operation
             operation_func: Function to execute
         """
+        start_time = time.time()
         try:
             # Check if namespace still exists before running operation
             if not self._namespace_exists():
@@ -279,14 +460,20 @@ class BackgroundClusterOperations:
                 return
 
             log.info(f"Starting background operation: {operation_name}")
+            start_time = time.time()
             operation_func()
-            self.metrics.record_operation(operation_name, success=True)
+            self.metrics.record_operation(
+                operation_name, success=True, duration=time.time() - start_time
+            )
             log.info(f"Completed background operation: {operation_name}")
         except Exception as e:
             error_msg = f"{operation_name} failed: {str(e)}"
             log.error(error_msg)
             self.metrics.record_operation(
-                operation_name, success=False, error=error_msg
+                operation_name,
+                success=False,
+                error=error_msg,
+                duration=time.time() - start_time,
             )
 
     # ==========================================================================
@@ -1203,6 +1390,13 @@ class BackgroundClusterOperations:
             successes = summary["successes_by_type"].get(op_type, 0)
             failures = summary["failures_by_type"].get(op_type, 0)
             log.info(f"  {op_type}: {count} ({successes} success, {failures} failed)")
+            latency = summary["latency_by_type"].get(op_type)
+            if latency:
+                log.info(
+                    f"    latency p50: {latency['p50']:.1f}s, "
+                    f"p95: {latency['p95']:.1f}s, max: {latency['max']:.1f}s"
+                )
+        log.info(f"Operations per minute: {summary['operations_per_minute']:.2f}")
 
         if summary["error_count"] > 0:
             log.warning(f"\n{summary['error_count']} errors occurred during operations")
@@ -7,18 +7,366 @@ It ensures success criteria are met:
 - Clean PVC events (no errors)
 - Consistent data checksums
 - Healthy Ceph status throughout operations
+
+Orphans are detected incrementally: the PV, PVC, RBD image and CephFS
+subvolume inventories are captured as sorted snapshots (the Ceph ones in one
+batched toolbox session call), and only the entries added or removed since
+the previous snapshot are evaluated.
 """
 
+import json
 import logging
 import time
-from typing import List, Dict, Any, Tuple
+from collections import defaultdict
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 
 from ocs_ci.framework import config
 from ocs_ci.ocs import constants, ocp
+from ocs_ci.ocs.exceptions import CommandFailed
 from ocs_ci.ocs.resources import pod as pod_helpers
+from ocs_ci.ocs.resources import toolbox_session
 
 log = logging.getLogger(__name__)
 
+INVENTORY_KINDS = ("pvs", "pvcs", "rbd_images", "cephfs_subvolumes")
+
+
+def diff_sorted(old: tuple, new: tuple) -> Tuple[list, list]:
+    """
+    Compute entries added and removed between two sorted sequences by one
+    merge walk over them.
+
+    Args:
+        old: Sorted entries of the previous snapshot
+        new: Sorted entries of the current snapshot
+
+    Returns:
+        Tuple of (added, removed) entries
+    """
+    added, removed = [], []
+    i = j = 0
+    while i < len(old) and j < len(new):
+        if old[i] == new[j]:
+            i += 1
+            j += 1
+        elif old[i] < new[j]:
+            removed.append(old[i])
+            i += 1
+        else:
+            added.append(new[j])
+            j += 1
+    removed.extend(old[i:])
+    added.extend(new[j:])
+    return added, removed
+
+
+class PVRecord(NamedTuple):
+    """
+    Fields of a PV relevant for orphan detection, a change of any of them
+    shows up in the snapshot diff as removal of the old record and addition
+    of the new one.
+    """
+
+    name: str
+    phase: str
+    # "<namespace>/<name>" of the claim, empty if the PV has no claimRef
+    claim: str
+    rbd_image: str
+    subvolume: str
+
+    @classmethod
+    def from_pv(cls, pv: Dict[str, Any]) -> "PVRecord":
+        """
+        Args:
+            pv: PV resource dictionary
+
+        Returns:
+            PVRecord: Record of the PV
+        """
+        claim_ref = pv["spec"].get("claimRef")
+        claim = f"{claim_ref['namespace']}/{claim_ref['name']}" if claim_ref else ""
+        csi = pv["spec"].get("csi", {})
+        driver = csi.get("driver", "")
+        rbd_image = subvolume = ""
+        if "rbd.csi.ceph.com" in driver:
+            # Volume handle format: <cluster-id>-<pool-id>-<image-name>-<image-id>
+            parts = csi.get("volumeHandle", "").split("-")
+            if len(parts) >= 4:
+                rbd_image = "-".join(parts[2:-1])
+        elif "cephfs.csi.ceph.com" in driver:
+            subvolume = csi.get("volumeAttributes", {}).get("subvolumeName", "")
+        return cls(
+            pv["metadata"]["name"],
+            pv.get("status", {}).get("phase", ""),
+            claim,
+            rbd_image,
+            subvolume,
+        )
+
+
+class ClusterInventory:
+    """
+    Snapshot of the PV, PVC, RBD image and CephFS subvolume inventories,
+    each stored as a sorted tuple so two snapshots are diffed in one pass.
+    """
+
+    def __init__(
+        self,
+        pvs=(),
+        pvcs=(),
+        rbd_images=(),
+        cephfs_subvolumes=(),
+        filesystems=(),
+        timestamp: Optional[float] = None,
+    ):
+        """
+        Initialize ClusterInventory.
+
+        Args:
+            pvs: PVRecord of every PV
+            pvcs: "<namespace>/<name>" of every PVC
+            rbd_images: Names of the RBD images in the block pool
+            cephfs_subvolumes: Names of the subvolumes in the csi group
+            filesystems: Names of the CephFS filesystems
+            timestamp: Time of the capture, now if not provided
+        """
+        self.pvs = tuple(sorted(set(pvs)))
+        self.pvcs = tuple(sorted(set(pvcs)))
+        self.rbd_images = tuple(sorted(set(rbd_images)))
+        self.cephfs_subvolumes = tuple(sorted(set(cephfs_subvolumes)))
+        self.filesystems = tuple(sorted(set(filesystems)))
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def diff(self, previous: Optional["ClusterInventory"]) -> Dict[str, Tuple]:
+        """
+        Compute changes of the inventories since the previous snapshot.
+
+        Args:
+            previous: Previous snapshot, everything is added if None
+
+        Returns:
+            dict: Inventory kind: (added, removed) entries
+        """
+        previous = previous or ClusterInventory(timestamp=0)
+        return {
+            kind: diff_sorted(getattr(previous, kind), getattr(self, kind))
+            for kind in INVENTORY_KINDS
+        }
+
+    @classmethod
+    def capture(
+        cls, previous: Optional["ClusterInventory"] = None, timeout: int = 300
+    ) -> "ClusterInventory":
+        """
+        Capture the inventories of the cluster: PVs and PVCs by one list call
+        each, RBD images and subvolumes of the known filesystems by one batch
+        of commands over the toolbox session. Filesystems are taken from the
+        previous snapshot, subvolumes of new filesystems are listed by a
+        second batch only when the filesystems changed.
+
+        Args:
+            previous: Previous snapshot, its Ceph inventories are kept if
+                listing of them fails
+            timeout: Timeout for the batch of toolbox commands in seconds
+
+        Returns:
+            ClusterInventory: The snapshot
+
+        Raises:
+            CommandFailed: If the PVs, PVCs can't be listed or the toolbox
+                session can't be established
+        """
+        pvs = [PVRecord.from_pv(pv) for pv in ocp.OCP(kind=constants.PV).get()["items"]]
+        pvcs = [
+            _pvc_key(pvc)
+            for pvc in ocp.OCP(kind=constants.PVC).get(all_namespaces=True)["items"]
+        ]
+        pool = config.ENV_DATA.get("rbd_pool", constants.DEFAULT_BLOCKPOOL)
+        filesystems = list(previous.filesystems) if previous else []
+        session = toolbox_session.get_toolbox_session()
+        results = session.run_cmds(
+            [f"rbd ls -p {pool} --format json", "ceph fs ls --format json"]
+            + [_subvolume_ls_cmd(fs_name) for fs_name in filesystems],
+            timeout=timeout,
+        )
+        (rbd_out, rbd_rc, rbd_err), (fs_out, fs_rc, fs_err) = results[:2]
+        subvolume_results = dict(zip(filesystems, results[2:]))
+
+        if rbd_rc:
+            log.warning(f"Failed to list RBD images: {rbd_err}")
+            rbd_images = previous.rbd_images if previous else ()
+        else:
+            rbd_images = json.loads(rbd_out) if rbd_out.strip() else []
+
+        if fs_rc:
+            log.warning(f"Failed to list CephFS filesystems: {fs_err}")
+            subvolumes = previous.cephfs_subvolumes if previous else ()
+            return cls(pvs, pvcs, rbd_images, subvolumes, filesystems)
+
+        current_filesystems = [
+            fs["name"] for fs in json.loads(fs_out or "[]") if fs.get("name")
+        ]
+        new_filesystems = [fs for fs in current_filesystems if fs not in filesystems]
+        if new_filesystems:
+            subvolume_results.update(
+                zip(
+                    new_filesystems,
+                    session.run_cmds(
+                        [_subvolume_ls_cmd(fs_name) for fs_name in new_filesystems],
+                        timeout=timeout,
+                    ),
+                )
+            )
+        subvolumes = []
+        for fs_name in current_filesystems:
+            stdout, returncode, _ = subvolume_results[fs_name]
+            # the subvolume group doesn't exist if there is no CephFS PV yet
+            if not returncode and stdout.strip():
+                subvolumes.extend(
+                    subvol["name"] for subvol in json.loads(stdout) if "name" in subvol
+                )
+        return cls(pvs, pvcs, rbd_images, subvolumes, current_filesystems)
+
+
+def _subvolume_ls_cmd(fs_name: str) -> str:
+    return f"ceph fs subvolume ls {fs_name} csi --format json"
+
+
+def _pvc_key(pvc: Dict[str, Any]) -> str:
+    return f"{pvc['metadata']['namespace']}/{pvc['metadata']['name']}"
+
+
+class OrphanTracker:
+    """
+    Orphan PVs, RBD images and CephFS subvolumes maintained incrementally
+    from snapshot diffs: only the entries touched by a diff are evaluated
+    again, so an update costs O(changes) instead of O(inventory).
+
+    A PV is orphan if it's Released without claim or its PVC doesn't exist.
+    An RBD image or subvolume is orphan if no PV refers to it and it wasn't
+    present in the baseline snapshot.
+    """
+
+    def __init__(self, baseline: Optional[ClusterInventory] = None):
+        """
+        Initialize OrphanTracker.
+
+        Args:
+            baseline: Snapshot taken before the operations, its images and
+                subvolumes are never reported as orphans
+        """
+        self.baseline_rbd_images = set(baseline.rbd_images) if baseline else set()
+        self.baseline_subvolumes = (
+            set(baseline.cephfs_subvolumes) if baseline else set()
+        )
+        self.pvs: Dict[str, PVRecord] = {}
+        self.pvcs: set = set()
+        self.rbd_images: set = set()
+        self.cephfs_subvolumes: set = set()
+        self.pvs_by_claim: Dict[str, set] = defaultdict(set)
+        self.pv_rbd_images: Dict[str, set] = defaultdict(set)
+        self.pv_subvolumes: Dict[str, set] = defaultdict(set)
+        self.orphan_pvs: set = set()
+        self.orphan_rbd_images: set = set()
+        self.orphan_subvolumes: set = set()
+        self.last_snapshot: Optional[ClusterInventory] = None
+        if baseline:
+            self.update(baseline)
+
+    def update(self, snapshot: ClusterInventory) -> Dict[str, Tuple]:
+        """
+        Apply changes since the last snapshot and evaluate the touched
+        entries again.
+
+        Args:
+            snapshot: The current snapshot
+
+        Returns:
+            dict: Inventory kind: (added, removed) entries
+        """
+        changes = snapshot.diff(self.last_snapshot)
+        self.last_snapshot = snapshot
+        touched_pvs, touched_images, touched_subvolumes = set(), set(), set()
+
+        pvs_added, pvs_removed = changes["pvs"]
+        for record in pvs_removed:
+            if self.pvs.get(record.name) == record:
+                del self.pvs[record.name]
+            self._index_pv(record, discard=True)
+        for record in pvs_added:
+            self.pvs[record.name] = record
+            self._index_pv(record)
+        for record in pvs_removed + pvs_added:
+            touched_pvs.add(record.name)
+            touched_images.add(record.rbd_image)
+            touched_subvolumes.add(record.subvolume)
+
+        pvcs_added, pvcs_removed = changes["pvcs"]
+        self.pvcs.difference_update(pvcs_removed)
+        self.pvcs.update(pvcs_added)
+        for claim in pvcs_removed + pvcs_added:
+            touched_pvs.update(self.pvs_by_claim.get(claim, ()))
+
+        for kind, inventory, touched in (
+            ("rbd_images", self.rbd_images, touched_images),
+            ("cephfs_subvolumes", self.cephfs_subvolumes, touched_subvolumes),
+        ):
+            added, removed = changes[kind]
+            inventory.difference_update(removed)
+            inventory.update(added)
+            touched.update(added)
+            touched.update(removed)
+
+        for name in touched_pvs:
+            record = self.pvs.get(name)
+            if record and (
+                (record.claim and record.claim not in self.pvcs)
+                or (not record.claim and record.phase == "Released")
+            ):
+                self.orphan_pvs.add(name)
+            else:
+                self.orphan_pvs.discard(name)
+        self._evaluate(
+            touched_images - {""},
+            self.rbd_images,
+            self.pv_rbd_images,
+            self.baseline_rbd_images,
+            self.orphan_rbd_images,
+        )
+        self._evaluate(
+            touched_subvolumes - {""},
+            self.cephfs_subvolumes,
+            self.pv_subvolumes,
+            self.baseline_subvolumes,
+            self.orphan_subvolumes,
+        )
+        return changes
+
+    def _index_pv(self, record: PVRecord, discard: bool = False):
+        """Add or remove the PV in the claim, image and subvolume indexes."""
+        for index, key in (
+            (self.pvs_by_claim, record.claim),
+            (self.pv_rbd_images, record.rbd_image),
+            (self.pv_subvolumes, record.subvolume),
+        ):
+            if not key:
+                continue
+            if discard:
+                index[key].discard(record.name)
+                if not index[key]:
+                    del index[key]
+            else:
+                index[key].add(record.name)
+
+    @staticmethod
+    def _evaluate(touched, inventory, referenced, baseline, orphans):
+        """Evaluate the touched images or subvolumes again."""
+        for name in touched:
+            if name in inventory and name not in referenced and name not in baseline:
+                orphans.add(name)
+            else:
+                orphans.discard(name)
+
 
 class BackgroundClusterValidator:
     """
@@ -40,6 +388,7 @@ class BackgroundClusterValidator:
         self.initial_rbd_images: set = set()
         self.initial_cephfs_subvolumes: set = set()
         self.validation_errors: List[Dict[str, Any]] = []
+        self.orphan_tracker = OrphanTracker()
 
     def pre_operation_validation(self):
         """
@@ -50,16 +399,14 @@ class BackgroundClusterValidator:
         log.info("Performing pre-operation validation")
 
         try:
-            # Capture initial PV count
-            self.initial_pv_count = self._get_pv_count()
+            # Capture baseline snapshot of PVs, RBD images and CephFS subvolumes
+            baseline = ClusterInventory.capture()
+            self.orphan_tracker = OrphanTracker(baseline)
+            self.initial_pv_count = len(baseline.pvs)
+            self.initial_rbd_images = set(baseline.rbd_images)
+            self.initial_cephfs_subvolumes = set(baseline.cephfs_subvolumes)
             log.info(f"Initial PV count: {self.initial_pv_count}")
-
-            # Capture initial Ceph RBD images
-            self.initial_rbd_images = self._get_rbd_images()
             log.info(f"Initial RBD images count: {len(self.initial_rbd_images)}")
-
-            # Capture initial CephFS subvolumes
-            self.initial_cephfs_subvolumes = self._get_cephfs_subvolumes()
             log.info(
                 f"Initial CephFS subvolumes count: {len(self.initial_cephfs_subvolumes)}"
             )
@@ -115,6 +462,9 @@ class BackgroundClusterValidator:
                     }
                 )
 
+            # Evaluate only inventory changes since the last snapshot
+            self._update_inventory()
+
             return True
 
         except Exception as e:
@@ -136,6 +486,8 @@ class BackgroundClusterValidator:
         }
 
         try:
+            self._update_inventory()
+
             # Check 1: No orphan PVs
             orphan_pvs = self._check_orphan_pvs()
             validation_report["checks"]["orphan_pvs"] = {
@@ -211,66 +563,29 @@ class BackgroundClusterValidator:
     # Helper Methods
     # ==========================================================================
 
-    def _get_pv_count(self) -> int:
-        """Get current PV count."""
-        pv_obj = ocp.OCP(kind=constants.PV)
-        pvs = pv_obj.get()["items"]
-        return len(pvs)
-
-    def _get_rbd_images(self) -> set:
-        """Get list of RBD images in Ceph."""
-        try:
-            ct_pod = pod_helpers.get_ceph_tools_pod()
-            pool = config.ENV_DATA.get("rbd_pool", constants.DEFAULT_BLOCKPOOL)
-
-            # List RBD images
-            cmd = f"rbd ls -p {pool}"
-            result = ct_pod.exec_cmd_on_pod(cmd, out_yaml_format=False)
-
-            images = set()
-            if result:
-                for line in result.strip().split("\n"):
-                    if line.strip():
-                        images.add(line.strip())
-
-            return images
-        except Exception as e:
-            log.warning(f"Failed to get RBD images: {e}")
-            return set()
+    def _update_inventory(self) -> Optional[Dict[str, Tuple]]:
+        """
+        Capture snapshot of the inventories and update the orphans by the
+        changes since the previous snapshot.
 
-    def _get_cephfs_subvolumes(self) -> set:
-        """Get list of CephFS subvolumes."""
+        Returns:
+            dict: Inventory kind: (added, removed) entries, None if the
+                snapshot couldn't be captured
+        """
         try:
-            ct_pod = pod_helpers.get_ceph_tools_pod()
-
-            # Get filesystem name
-            cmd = "ceph fs ls --format=json"
-            result = ct_pod.exec_cmd_on_pod(cmd)
-
-            if not result or not isinstance(result, list):
-                return set()
-
-            subvolumes = set()
-            for fs in result:
-                fs_name = fs.get("name")
-                if not fs_name:
-                    continue
-
-                # List subvolumes
-                cmd = f"ceph fs subvolume ls {fs_name} csi"
-                try:
-                    subvol_result = ct_pod.exec_cmd_on_pod(cmd)
-                    if subvol_result and isinstance(subvol_result, list):
-                        for subvol in subvol_result:
-                            if "name" in subvol:
-                                subvolumes.add(subvol["name"])
-                except Exception:
-                    pass  # Subvolume group might not exist
-
-            return subvolumes
-        except Exception as e:
-            log.warning(f"Failed to get CephFS subvolumes: {e}")
-            return set()
+            snapshot = ClusterInventory.capture(self.orphan_tracker.last_snapshot)
+        except CommandFailed as e:
+            log.warning(f"Failed to capture cluster inventory: {e}")
+            return None
+        changes = self.orphan_tracker.update(snapshot)
+        log.debug(
+            "Inventory changes: "
+            + ", ".join(
+                f"{kind} +{len(added)}/-{len(removed)}"
+                for kind, (added, removed) in changes.items()
+            )
+        )
+        return changes
 
     def _check_ceph_health(self) -> str:
         """
@@ -294,38 +609,7 @@ class BackgroundClusterValidator:
         Returns:
             List of orphan PV names
         """
-        orphan_pvs = []
-
-        try:
-            pv_obj = ocp.OCP(kind=constants.PV)
-            pvs = pv_obj.get()["items"]
-
-            for pv in pvs:
-                pv_name = pv["metadata"]["name"]
-                claim_ref = pv["spec"].get("claimRef")
-
-                if not claim_ref:
-                    # PV has no claim reference (available or released)
-                    phase = pv["status"]["phase"]
-                    if phase == "Released":
-                        orphan_pvs.append(pv_name)
-                else:
-                    # Check if PVC still exists
-                    pvc_name = claim_ref["name"]
-                    pvc_namespace = claim_ref["namespace"]
-
-                    pvc_obj = ocp.OCP(
-                        kind=constants.PVC,
-                        namespace=pvc_namespace,
-                        resource_name=pvc_name,
-                    )
-                    if not pvc_obj.is_exist():
-                        orphan_pvs.append(pv_name)
-
-        except Exception as e:
-            log.error(f"Failed to check orphan PVs: {e}")
-
-        return orphan_pvs
+        return sorted(self.orphan_tracker.orphan_pvs)
 
     def _check_orphan_rbd_images(self) -> set:
         """
@@ -334,45 +618,7 @@ class BackgroundClusterValidator:
         Returns:
             Set of orphan RBD image names
         """
-        try:
-            current_images = self._get_rbd_images()
-
-            # Get all PV-backed RBD images
-            pv_images = self._get_pv_rbd_images()
-
-            # Orphans are images not backed by PVs and not in initial set
-            orphans = current_images - pv_images - self.initial_rbd_images
-
-            return orphans
-        except Exception as e:
-            log.error(f"Failed to check orphan RBD images: {e}")
-            return set()
-
-    def _get_pv_rbd_images(self) -> set:
-        """Get RBD image names from all RBD PVs."""
-        images = set()
-
-        try:
-            pv_obj = ocp.OCP(kind=constants.PV)
-            pvs = pv_obj.get()["items"]
-
-            for pv in pvs:
-                # Check if it's an RBD PV
-                csi = pv["spec"].get("csi", {})
-                if "rbd.csi.ceph.com" in csi.get("driver", ""):
-                    # Extract image name from volume handle
-                    volume_handle = csi.get("volumeHandle", "")
-                    if volume_handle:
-                        # Volume handle format: <cluster-id>-<pool-id>-<image-name>-<image-id>
-                        parts = volume_handle.split("-")
-                        if len(parts) >= 4:
-                            image_name = "-".join(parts[2:-1])
-                            images.add(image_name)
-
-        except Exception as e:
-            log.error(f"Failed to get PV RBD images: {e}")
-
-        return images
+        return set(self.orphan_tracker.orphan_rbd_images)
 
     def _check_orphan_cephfs_subvolumes(self) -> set:
         """
@@ -381,44 +627,7 @@ class BackgroundClusterValidator:
         Returns:
             Set of orphan subvolume names
         """
-        try:
-            current_subvolumes = self._get_cephfs_subvolumes()
-
-            # Get all PV-backed subvolumes
-            pv_subvolumes = self._get_pv_cephfs_subvolumes()
-
-            # Orphans are subvolumes not backed by PVs and not in initial set
-            orphans = (
-                current_subvolumes - pv_subvolumes - self.initial_cephfs_subvolumes
-            )
-
-            return orphans
-        except Exception as e:
-            log.error(f"Failed to check orphan CephFS subvolumes: {e}")
-            return set()
-
-    def _get_pv_cephfs_subvolumes(self) -> set:
-        """Get CephFS subvolume names from all CephFS PVs."""
-        subvolumes = set()
-
-        try:
-            pv_obj = ocp.OCP(kind=constants.PV)
-            pvs = pv_obj.get()["items"]
-
-            for pv in pvs:
-                # Check if it's a CephFS PV
-                csi = pv["spec"].get("csi", {})
-                if "cephfs.csi.ceph.com" in csi.get("driver", ""):
-                    # Extract subvolume name from volume attributes
-                    volume_attributes = csi.get("volumeAttributes", {})
-                    subvol_name = volume_attributes.get("subvolumeName")
-                    if subvol_name:
-                        subvolumes.add(subvol_name)
-
-        except Exception as e:
-            log.error(f"Failed to get PV CephFS subvolumes: {e}")
-
-        return subvolumes
+        return set(self.orphan_tracker.orphan_subvolumes)
 
     def _check_pvc_events(self) -> List[Dict[str, Any]]:
         """
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from ocs_ci.framework import config
 
@@ -139,6 +139,36 @@ class KrknWorkloadConfig:
         bg_ops_config = self.get_background_cluster_operations_config()
         return bg_ops_config.get("max_concurrent_operations", 3)
 
+    def get_background_operations_per_minute(self) -> Optional[float]:
+        """
+        Get target rate of starting background operations.
+
+        Returns:
+            float: Operations per minute, None to derive it from the interval
+        """
+        bg_ops_config = self.get_background_cluster_operations_config()
+        return bg_ops_config.get("operations_per_minute")
+
+    def get_background_operations_category_limits(self) -> Dict[str, int]:
+        """
+        Get maximum concurrent background operations per category.
+
+        Returns:
+            dict: Category name: limit, default limits are used for missing ones
+        """
+        bg_ops_config = self.get_background_cluster_operations_config()
+        return bg_ops_config.get("category_limits", {})
+
+    def get_background_operations_priorities(self) -> Dict[str, int]:
+        """
+        Get priorities of background operation types, lower value starts first.
+
+        Returns:
+            dict: Operation type: priority
+        """
+        bg_ops_config = self.get_background_cluster_operations_config()
+        return bg_ops_config.get("operation_priorities", {})
+
     def get_enabled_background_operations(self) -> List[str]:
         """
         Get list of enabled background operation types.
@@ -113,6 +113,9 @@ class WorkloadOps:
                 enabled_operations=enabled_operations if enabled_operations else None,
                 operation_interval=operation_interval,
                 max_concurrent_operations=max_concurrent,
+                operations_per_minute=config.get_background_operations_per_minute(),
+                category_limits=config.get_background_operations_category_limits(),
+                operation_priorities=config.get_background_operations_priorities(),
             )
             self.background_cluster_ops.start()
 
@@ -2043,48 +2043,323 @@ def get_bucket_available_size(mcg_obj, bucket_name):
     return bucket_size
 
 
+class BucketDiff(object):
+    """
+    Summary of differences between objects of two buckets
+    """
+
+    MISSING_IN_FIRST = "missing_in_first"
+    MISSING_IN_SECOND = "missing_in_second"
+    SIZE_MISMATCH = "size_mismatch"
+    ETAG_MISMATCH = "etag_mismatch"
+
+    def __init__(self):
+        self.compared = 0
+        # object key: reason of the difference
+        self.differences = {}
+
+    @property
+    def identical(self):
+        return not self.differences
+
+    def update(self, compared, differences):
+        """
+        Add result of comparison of part of the objects
+
+        Args:
+            compared (int): number of compared object keys
+            differences (iterable): tuples of object key and reason of the
+                difference
+
+        """
+        self.compared += compared
+        self.differences.update(differences)
+
+    def summary(self, max_keys=10):
+        """
+        Compact description of the differences
+
+        Args:
+            max_keys (int): maximal number of object keys listed per reason
+
+        Returns:
+            str: numbers of different objects per reason with examples of keys
+
+        """
+        if self.identical:
+            return f"{self.compared} objects are identical"
+        reasons = {}
+        for key, reason in self.differences.items():
+            reasons.setdefault(reason, []).append(key)
+        lines = [f"{len(self.differences)} of {self.compared} objects differ"]
+        for reason, keys in sorted(reasons.items()):
+            lines.append(f"{reason}: {len(keys)}, e.g. {sorted(keys)[:max_keys]}")
+        return "\n".join(lines)
+
+
+def compare_object_metadata(first_obj, second_obj, compare_etag=False):
+    """
+    Compare metadata of the object in two buckets
+
+    Args:
+        first_obj (dict): object with Key, Size and ETag keys, None if missing
+        second_obj (dict): object with Key, Size and ETag keys, None if missing
+        compare_etag (bool): True to compare also ETags of the objects
+
+    Returns:
+        str: reason of the difference (BucketDiff constant), None if the
+            objects are the same
+
+    """
+    if first_obj is None and second_obj is None:
+        return None
+    if first_obj is None:
+        return BucketDiff.MISSING_IN_FIRST
+    if second_obj is None:
+        return BucketDiff.MISSING_IN_SECOND
+    if first_obj["Size"] != second_obj["Size"]:
+        return BucketDiff.SIZE_MISMATCH
+    if compare_etag and first_obj["ETag"] != second_obj["ETag"]:
+        return BucketDiff.ETAG_MISMATCH
+    return None
+
+
+def diff_sorted_objects(first_objects, second_objects, compare_etag=False):
+    """
+    Merge two object listings sorted by key and find the differences, the
+    listings are consumed as streams
+
+    Args:
+        first_objects (iterable): objects with Key, Size and ETag keys
+        second_objects (iterable): objects with Key, Size and ETag keys
+        compare_etag (bool): True to compare also ETags of the objects
+
+    Returns:
+        tuple: number of compared object keys and list of tuples of object
+            key and reason of the difference
+
+    """
+    first_objects = iter(first_objects)
+    second_objects = iter(second_objects)
+    first_obj = next(first_objects, None)
+    second_obj = next(second_objects, None)
+    compared = 0
+    differences = []
+    while first_obj is not None or second_obj is not None:
+        compared += 1
+        if second_obj is None or (
+            first_obj is not None and first_obj["Key"] < second_obj["Key"]
+        ):
+            differences.append((first_obj["Key"], BucketDiff.MISSING_IN_SECOND))
+            first_obj = next(first_objects, None)
+        elif first_obj is None or second_obj["Key"] < first_obj["Key"]:
+            differences.append((second_obj["Key"], BucketDiff.MISSING_IN_FIRST))
+            second_obj = next(second_objects, None)
+        else:
+            reason = compare_object_metadata(first_obj, second_obj, compare_etag)
+            if reason:
+                differences.append((first_obj["Key"], reason))
+            first_obj = next(first_objects, None)
+            second_obj = next(second_objects, None)
+    return compared, differences
+
+
+def get_bucket_prefixes(mcg_obj, bucket_name, delimiter="/"):
+    """
+    Get the top level prefixes (directories) of the bucket
+
+    Args:
+        mcg_obj (MCG): MCG object
+        bucket_name (str): Name of the bucket
+        delimiter (str): Character used to group keys
+
+    Returns:
+        list: the common prefixes of the keys
+
+    """
+    prefixes = []
+    con_token = ""
+    while True:
+        response = s3_list_objects_v2(
+            mcg_obj, bucket_name, delimiter=delimiter, con_token=con_token
+        )
+        prefixes.extend(
+            prefix["Prefix"] for prefix in response.get("CommonPrefixes", [])
+        )
+        if not response.get("IsTruncated", False):
+            return prefixes
+        con_token = response["NextContinuationToken"]
+
+
+def diff_buckets(
+    mcg_obj,
+    first_bucket_name,
+    second_bucket_name,
+    compare_etag=False,
+    max_workers=8,
+    batch_size=1000,
+    delimiter="/",
+):
+    """
+    Compare all objects of two buckets by streaming merge of their sorted
+    listings. The buckets are partitioned by the top level prefixes which
+    are listed and compared in parallel.
+
+    Args:
+        mcg_obj (MCG): An initialized MCG object
+        first_bucket_name (str): The name of the first bucket to compare
+        second_bucket_name (str): The name of the second bucket to compare
+        compare_etag (bool): True to compare also ETags of the objects
+        max_workers (int): Maximal number of partitions compared at once
+        batch_size (int): Number of objects to list at a time
+        delimiter (str): Character separating the prefixes of the partitions
+
+    Returns:
+        BucketDiff: differences of the buckets
+
+    """
+    prefixes = set(get_bucket_prefixes(mcg_obj, first_bucket_name, delimiter))
+    prefixes |= set(get_bucket_prefixes(mcg_obj, second_bucket_name, delimiter))
+    # objects without the delimiter and objects under every prefix
+    partitions = [("", delimiter)] + [(prefix, "") for prefix in sorted(prefixes)]
+
+    def _diff_partition(partition):
+        prefix, partition_delimiter = partition
+        first_objects, second_objects = (
+            list_objects_in_batches(
+                mcg_obj,
+                bucket_name,
+                batch_size=batch_size,
+                prefix=prefix,
+                delimiter=partition_delimiter,
+                with_metadata=True,
+            )
+            for bucket_name in (first_bucket_name, second_bucket_name)
+        )
+        return diff_sorted_objects(first_objects, second_objects, compare_etag)
+
+    diff = BucketDiff()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for compared, differences in executor.map(_diff_partition, partitions):
+            diff.update(compared, differences)
+    return diff
+
+
+def recheck_bucket_objects(
+    mcg_obj,
+    first_bucket_name,
+    second_bucket_name,
+    object_keys,
+    compare_etag=False,
+    max_workers=8,
+):
+    """
+    Compare only the given objects of two buckets by head_object requests
+
+    Args:
+        mcg_obj (MCG): An initialized MCG object
+        first_bucket_name (str): The name of the first bucket to compare
+        second_bucket_name (str): The name of the second bucket to compare
+        object_keys (iterable): keys of the objects to compare
+        compare_etag (bool): True to compare also ETags of the objects
+        max_workers (int): Maximal number of objects compared at once
+
+    Returns:
+        BucketDiff: differences of the objects
+
+    """
+
+    def _get_metadata(bucket_name, object_key):
+        try:
+            response = s3_head_object(mcg_obj, bucket_name, object_key)
+        except boto3exception.ClientError as err:
+            if err.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return {
+            "Key": object_key,
+            "Size": response["ContentLength"],
+            "ETag": response["ETag"],
+        }
+
+    def _recheck(object_key):
+        return compare_object_metadata(
+            _get_metadata(first_bucket_name, object_key),
+            _get_metadata(second_bucket_name, object_key),
+            compare_etag,
+        )
+
+    object_keys = list(object_keys)
+    diff = BucketDiff()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        reasons = executor.map(_recheck, object_keys)
+        diff.update(
+            len(object_keys),
+            [(key, reason) for key, reason in zip(object_keys, reasons) if reason],
+        )
+    return diff
+
+
 def compare_bucket_object_list(
-    mcg_obj, first_bucket_name, second_bucket_name, timeout=600
+    mcg_obj,
+    first_bucket_name,
+    second_bucket_name,
+    timeout=600,
+    compare_etag=False,
+    max_workers=8,
 ):
     """
     Compares the object lists of two given buckets
 
+    The buckets are compared by key and size (and ETag if requested) of all
+    objects, then only the objects which differed are checked again until
+    they are the same, and the buckets are compared once more as a whole.
+
     Args:
         mcg_obj (MCG): An initialized MCG object
         first_bucket_name (str): The name of the first bucket to compare
         second_bucket_name (str): The name of the second bucket to compare
         timeout (int): The maximum time in seconds to wait for the buckets to be identical
+        compare_etag (bool): True to compare also ETags of the objects, it
+            shouldn't be used for buckets on different types of backing stores
+        max_workers (int): Maximal number of parallel list or head requests
 
     Returns:
         bool: True if both buckets contain the same object names in all objects,
         False otherwise
     """
+    last_diff = [None]
 
     def _comparison_logic():
-        first_bucket_object_set = {
-            obj.key for obj in mcg_obj.s3_list_all_objects_in_bucket(first_bucket_name)
-        }
-        second_bucket_object_set = {
-            obj.key for obj in mcg_obj.s3_list_all_objects_in_bucket(second_bucket_name)
-        }
-        if first_bucket_object_set == second_bucket_object_set:
+        diff = last_diff[0]
+        if diff is not None and not diff.identical:
+            diff = recheck_bucket_objects(
+                mcg_obj,
+                first_bucket_name,
+                second_bucket_name,
+                diff.differences,
+                compare_etag=compare_etag,
+                max_workers=max_workers,
+            )
+        if diff is None or diff.identical:
+            diff = diff_buckets(
+                mcg_obj,
+                first_bucket_name,
+                second_bucket_name,
+                compare_etag=compare_etag,
+                max_workers=max_workers,
+            )
+        last_diff[0] = diff
+        if diff.identical:
             logger.info(
-                f"""Objects in both buckets are identical
-                {first_bucket_name} objects:
-                {first_bucket_object_set}
-                {second_bucket_name} objects:
-                {second_bucket_object_set}
-                """
+                f"Objects in buckets {first_bucket_name} and {second_bucket_name} "
+                f"are identical: {diff.summary()}"
             )
             return True
         else:
             logger.warning(
-                f"""Buckets {first_bucket_name} and {second_bucket_name} do not contain the same objects.
-                    {first_bucket_name} objects:
-                    {first_bucket_object_set}
-                    {second_bucket_name} objects:
-                    {second_bucket_object_set}
-                    """
+                f"Buckets {first_bucket_name} and {second_bucket_name} do not "
+                f"contain the same objects.\n{diff.summary()}"
             )
             return False
 
@@ -3046,7 +3321,13 @@ def delete_objects_from_source_and_wait_for_deletion_sync(
 
 
 def list_objects_in_batches(
-    mcg_obj, bucket_name, batch_size=1000, yield_individual=True
+    mcg_obj,
+    bucket_name,
+    batch_size=1000,
+    yield_individual=True,
+    prefix="",
+    delimiter="",
+    with_metadata=False,
 ):
     """
     This method lists objects in a bucket either in batch of mentioned batch_size
@@ -3059,6 +3340,11 @@ def list_objects_in_batches(
         batch_size (int): Number of objects to list at a time, by default 1000
         yield_individual (bool): If True, it will yield indviudal objects until all the
         objects are listed. If False, batch of objects are yielded.
+        prefix (str): List only objects with keys beginning with the prefix
+        delimiter (str): List only objects without the delimiter in the key
+            after the prefix
+        with_metadata (bool): If True, objects are yielded as dicts with Key,
+            Size and ETag keys, instead of keys only
 
     Returns:
         yield: indvidual object key or list containing batch of objects
@@ -3066,21 +3352,41 @@ def list_objects_in_batches(
     """
 
     marker = ""
+    con_token = ""
 
     while True:
         response = s3_list_objects_v2(
-            mcg_obj, bucket_name, max_keys=batch_size, start_after=marker
+            mcg_obj,
+            bucket_name,
+            prefix=prefix,
+            delimiter=delimiter,
+            max_keys=batch_size,
+            start_after=marker,
+            con_token=con_token,
         )
+        contents = response.get("Contents", [])
+        if with_metadata:
+            objects = [
+                {"Key": obj["Key"], "Size": obj.get("Size"), "ETag": obj.get("ETag")}
+                for obj in contents
+            ]
+        else:
+            objects = [{"Key": obj["Key"]} for obj in contents]
         if yield_individual:
-            for obj in response.get("Contents", []):
-                yield obj["Key"]
+            for obj in objects:
+                yield obj if with_metadata else obj["Key"]
         else:
-            yield [{"Key": obj["Key"]} for obj in response.get("Contents", [])]
+            yield objects
 
         if not response.get("IsTruncated", False):
             break
 
-        marker = response.get("Contents", [])[-1]["Key"]
+        if contents:
+            marker = contents[-1]["Key"]
+            con_token = ""
+        else:
+            # page with common prefixes only
+            con_token = response.get("NextContinuationToken", "")
         del response
 
 
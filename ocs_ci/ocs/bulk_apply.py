@@ -0,0 +1,448 @@
+"""
+Bulk creation of resources for scale tests
+
+BulkApply submits many objects (PVCs, pods, deployment configs, ...) by
+server side apply with bounded concurrency and retries, using the pooled
+Kubernetes API client of kube_api_backend instead of 'oc create' of kube-job
+YAML files. The progress of the objects is followed by one watch stream per
+kind (see ResourceWatch) instead of repeated 'oc get' of all the objects, and
+every object gets a timeline of the times it was applied, created, bound and
+running.
+
+Example::
+
+    bulk = BulkApply(namespace)
+    bulk.apply(pvc_dicts)
+    bulk.wait(timeout=600)
+    bulk.apply(pod_dicts)
+    timelines = bulk.wait(timeout=900)
+    logger.info(bulk.summary())
+
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from uuid import uuid4
+
+from ocs_ci.ocs import constants, kube_api_backend
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    ResourceWrongStatusException,
+    TimeoutExpiredError,
+)
+from ocs_ci.ocs.resource_watch import ResourceWatch
+from ocs_ci.utility.retry import retry
+
+log = logging.getLogger(__name__)
+
+BULK_APPLY_LABEL = "ocs-ci/bulk-apply"
+FIELD_MANAGER = "ocs-ci"
+APPLY_PATCH_CONTENT_TYPE = "application/apply-patch+yaml"
+
+STAGE_APPLIED = "applied"
+STAGE_CREATED = "created"
+STAGE_BOUND = "bound"
+STAGE_RUNNING = "running"
+STAGE_FAILED = "failed"
+# stage each kind has to reach to be ready, other kinds are ready once created
+READY_STAGES = {
+    constants.PVC: STAGE_BOUND,
+    constants.POD: STAGE_RUNNING,
+    "DeploymentConfig": STAGE_RUNNING,
+    constants.DEPLOYMENT: STAGE_RUNNING,
+}
+
+
+def get_object_stage(obj):
+    """
+    Get the stage of the object from its status
+
+    Args:
+        obj (dict): the object as returned by the API
+
+    Returns:
+        str: one of the STAGE_* constants
+
+    """
+    kind = obj.get("kind")
+    status = obj.get("status") or {}
+    if kind == constants.PVC:
+        phase = status.get("phase")
+        if phase == constants.STATUS_BOUND:
+            return STAGE_BOUND
+        if phase == "Lost":
+            return STAGE_FAILED
+    elif kind == constants.POD:
+        phase = status.get("phase")
+        if phase == constants.STATUS_RUNNING:
+            return STAGE_RUNNING
+        if phase in (constants.STATUS_FAILED, "Succeeded"):
+            return STAGE_FAILED
+    elif kind in ("DeploymentConfig", constants.DEPLOYMENT):
+        if status.get("availableReplicas"):
+            return STAGE_RUNNING
+    return STAGE_CREATED
+
+
+class ObjectTimeline(object):
+    """
+    Times (epoch seconds) the object reached the stages
+    """
+
+    def __init__(self, kind, name, namespace):
+        self.kind = kind
+        self.name = name
+        self.namespace = namespace
+        self.stages = {}
+        self.error = None
+
+    def add(self, stage, timestamp=None):
+        """
+        Record the time the stage was reached, only the first time counts
+
+        Args:
+            stage (str): one of the STAGE_* constants
+            timestamp (float): epoch time, now if not provided
+
+        """
+        self.stages.setdefault(stage, timestamp or time.time())
+
+    @property
+    def ready(self):
+        return READY_STAGES.get(self.kind, STAGE_CREATED) in self.stages
+
+    @property
+    def failed(self):
+        return self.error is not None or STAGE_FAILED in self.stages
+
+    def duration(self, from_stage, to_stage):
+        """
+        Args:
+            from_stage (str): the first stage
+            to_stage (str): the second stage
+
+        Returns:
+            float: seconds between the stages, None if any of them wasn't
+                reached
+
+        """
+        if from_stage in self.stages and to_stage in self.stages:
+            return self.stages[to_stage] - self.stages[from_stage]
+        return None
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "namespace": self.namespace,
+            "stages": dict(self.stages),
+            "error": self.error,
+        }
+
+
+class BulkApply(object):
+    """
+    Server side apply of many objects with timelines of their readiness
+    """
+
+    def __init__(
+        self,
+        namespace,
+        max_workers=20,
+        retries=3,
+        field_manager=FIELD_MANAGER,
+        kubeconfig=None,
+    ):
+        """
+        Args:
+            namespace (str): namespace of the objects without namespace
+            max_workers (int): number of objects applied at once
+            retries (int): number of attempts to apply the object
+            field_manager (str): field manager of the server side apply
+            kubeconfig (str): kubeconfig of the cluster
+
+        """
+        self.namespace = namespace
+        self.max_workers = max_workers
+        self.retries = retries
+        self.field_manager = field_manager
+        self.kubeconfig = kubeconfig
+        self.backend = kube_api_backend.get_api_backend(kubeconfig=kubeconfig)
+        # every object applied by this instance gets the label, so the watch
+        # streams see only them
+        self.label_value = uuid4().hex[:12]
+        self.selector = f"{BULK_APPLY_LABEL}={self.label_value}"
+        # (kind, name): ObjectTimeline
+        self.timelines = {}
+        self.lock = threading.Lock()
+        self._resources = {}
+
+    def _get_resource(self, api_version, kind):
+        key = (api_version, kind)
+        if key not in self._resources:
+            self._resources[key] = self.backend.dyn_client.resources.get(
+                api_version=api_version, kind=kind
+            )
+        return self._resources[key]
+
+    def _apply_one(self, body):
+        """
+        Apply single object, retried on failure
+
+        Args:
+            body (dict): the object
+
+        Returns:
+            dict: the applied object returned by the API server
+
+        """
+        resource = self._get_resource(body["apiVersion"], body["kind"])
+        namespace = None
+        if resource.namespaced:
+            namespace = body["metadata"].get("namespace") or self.namespace
+        path = resource.path(name=body["metadata"]["name"], namespace=namespace)
+        return retry(CommandFailed, tries=self.retries, delay=2, backoff=2)(
+            self.backend.request
+        )(
+            "patch",
+            path,
+            60,
+            body=body,
+            content_type=APPLY_PATCH_CONTENT_TYPE,
+            field_manager=self.field_manager,
+            force_conflicts=True,
+        )
+
+    def apply(self, objects, raise_on_failure=True):
+        """
+        Apply the objects with at most max_workers requests at once
+
+        Args:
+            objects (list): dicts of the objects
+            raise_on_failure (bool): True to raise if any object failed to
+                be applied after the retries
+
+        Returns:
+            list: timelines of the objects
+
+        Raises:
+            CommandFailed: if any object failed to be applied
+
+        """
+        timelines = []
+        futures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for obj in objects:
+                metadata = obj.setdefault("metadata", {})
+                metadata.setdefault("labels", {})[BULK_APPLY_LABEL] = self.label_value
+                timeline = ObjectTimeline(
+                    obj["kind"],
+                    metadata["name"],
+                    metadata.get("namespace") or self.namespace,
+                )
+                with self.lock:
+                    self.timelines[(timeline.kind, timeline.name)] = timeline
+                timelines.append(timeline)
+                futures[executor.submit(self._apply_one, obj)] = timeline
+            for future in as_completed(futures):
+                timeline = futures[future]
+                try:
+                    future.result()
+                except Exception as ex:
+                    log.error(f"Failed to apply {timeline.kind} {timeline.name}: {ex}")
+                    timeline.error = str(ex)
+                else:
+                    timeline.add(STAGE_APPLIED)
+        failed = [timeline.name for timeline in timelines if timeline.error]
+        log.info(f"Applied {len(timelines) - len(failed)} of {len(timelines)} objects")
+        if failed and raise_on_failure:
+            raise CommandFailed(f"Failed to apply {len(failed)} objects: {failed[:10]}")
+        return timelines
+
+    def _update_timelines(self, kind, state, pending):
+        """
+        Update the timelines of the objects of the kind from the watched
+        state
+
+        Args:
+            kind (str): kind of the objects
+            state (dict): name: object
+            pending (set): names of the objects which are not ready yet, the
+                ready and failed objects are removed
+
+        Returns:
+            bool: True when no object is pending
+
+        """
+        now = time.time()
+        for name in list(pending):
+            obj = state.get(name)
+            if obj is None:
+                continue
+            timeline = self.timelines[(kind, name)]
+            obj.setdefault("kind", kind)
+            stage = get_object_stage(obj)
+            timeline.add(STAGE_CREATED, now)
+            if stage != STAGE_CREATED:
+                timeline.add(stage, now)
+            if timeline.ready or timeline.failed:
+                pending.discard(name)
+        return not pending
+
+    def _wait_kind(self, kind, names, timeout):
+        """
+        Follow the objects of the kind by watch until they are ready
+
+        Args:
+            kind (str): kind of the objects
+            names (set): names of the objects to wait for
+            timeout (int): time in seconds to wait
+
+        """
+        namespaces = {self.timelines[(kind, name)].namespace for name in names}
+        pending = set(names)
+        watch = ResourceWatch(
+            kind,
+            namespace=namespaces.pop() if len(namespaces) == 1 else None,
+            selector=self.selector,
+            kubeconfig=self.kubeconfig,
+        )
+        try:
+            watch.wait(
+                lambda state: self._update_timelines(kind, state, pending),
+                timeout,
+                description=f"{len(names)} {kind} objects to be ready",
+            )
+        finally:
+            log.info(f"{len(names) - len(pending)} of {len(names)} {kind} ready")
+
+    def wait(self, timeout=600, raise_on_failure=True):
+        """
+        Wait until all the applied objects are ready: PVCs bound, pods and
+        deployments running, other objects created. Every kind is followed
+        by one watch stream.
+
+        Args:
+            timeout (int): time in seconds to wait
+            raise_on_failure (bool): True to raise if any object failed
+
+        Returns:
+            dict: (kind, name): ObjectTimeline of all the objects
+
+        Raises:
+            TimeoutExpiredError: if the objects weren't ready in time
+            ResourceWrongStatusException: if any object failed
+
+        """
+        names_by_kind = {}
+        with self.lock:
+            for (kind, name), timeline in self.timelines.items():
+                if not (timeline.ready or timeline.failed):
+                    names_by_kind.setdefault(kind, set()).add(name)
+        if names_by_kind:
+            with ThreadPoolExecutor(max_workers=len(names_by_kind)) as executor:
+                futures = [
+                    executor.submit(self._wait_kind, kind, names, timeout)
+                    for kind, names in names_by_kind.items()
+                ]
+                errors = []
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except TimeoutExpiredError as ex:
+                        errors.append(ex)
+                if errors:
+                    log.info(self.summary())
+                    raise errors[0]
+        failed = [
+            f"{timeline.kind}/{timeline.name}"
+            for timeline in self.timelines.values()
+            if timeline.failed
+        ]
+        log.info(self.summary())
+        if failed and raise_on_failure:
+            raise ResourceWrongStatusException(
+                f"{len(failed)} objects failed: {failed[:10]}"
+            )
+        return dict(self.timelines)
+
+    def summary(self):
+        """
+        Summary of the stages of all the objects
+
+        Returns:
+            str: number of objects per kind and stage with the median and
+                maximal time from apply to the stage
+
+        """
+        lines = []
+        kinds = sorted({kind for kind, _ in self.timelines})
+        for kind in kinds:
+            timelines = [t for (k, _), t in self.timelines.items() if k == kind]
+            parts = [f"{kind}: {len(timelines)} objects"]
+            for stage in (STAGE_CREATED, STAGE_BOUND, STAGE_RUNNING, STAGE_FAILED):
+                durations = sorted(
+                    d
+                    for d in (t.duration(STAGE_APPLIED, stage) for t in timelines)
+                    if d is not None
+                )
+                if durations:
+                    parts.append(
+                        f"{stage} {len(durations)} (median "
+                        f"{durations[len(durations) // 2]:.1f}s, max "
+                        f"{durations[-1]:.1f}s)"
+                    )
+            lines.append(", ".join(parts))
+        return "\n".join(lines)
+
+    def get_names(self, kind, ready_only=True):
+        """
+        Args:
+            kind (str): kind of the objects
+            ready_only (bool): True to get only the ready objects
+
+        Returns:
+            list: names of the applied objects of the kind in apply order
+
+        """
+        return [
+            name
+            for (obj_kind, name), timeline in self.timelines.items()
+            if obj_kind == kind and (timeline.ready or not ready_only)
+        ]
+
+    def delete(self, timeout=600):
+        """
+        Delete all the applied objects, in reverse order of kinds they were
+        applied in (pods before PVCs)
+
+        Args:
+            timeout (int): request timeout in seconds
+
+        """
+        kinds = list(dict.fromkeys(kind for kind, _ in self.timelines))
+        for kind in reversed(kinds):
+            resource = self.backend.resolve_resource(kind)
+            timelines = [t for (k, _), t in self.timelines.items() if k == kind]
+
+            def _delete(timeline):
+                namespace = timeline.namespace if resource.namespaced else None
+                try:
+                    self.backend.request(
+                        "delete",
+                        resource.path(name=timeline.name, namespace=namespace),
+                        timeout,
+                        propagation_policy="Background",
+                    )
+                except CommandFailed as ex:
+                    if "(NotFound)" not in str(ex):
+                        raise
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for future in as_completed(
+                    [executor.submit(_delete, t) for t in timelines]
+                ):
+                    future.result()
+            log.info(f"Deleted {len(timelines)} {kind} objects")
@@ -17,6 +17,7 @@ import os
 import pandas as pd
 import re
 import math
+from collections import deque, namedtuple
 
 from datetime import datetime
 from semantic_version import Version
@@ -38,7 +39,7 @@ from ocs_ci.ocs.exceptions import (
     CephHealthException,
     ActiveMdsValueNotMatch,
 )
-from ocs_ci.ocs.resources import ocs, storage_cluster
+from ocs_ci.ocs.resources import ocs, storage_cluster, toolbox_session
 import ocs_ci.ocs.constants as constant
 from ocs_ci.ocs.resources.mcg import MCG
 from ocs_ci.utility import version
@@ -82,7 +83,7 @@ class CephClusterMultiCluster(object):
     """
 
     def __init__(self, cluster_conf=None):
-        pass
+        self.cluster_conf = cluster_conf
 
 
 class CephCluster(object):
@@ -624,6 +625,8 @@ class CephCluster(object):
         if detail:
             ceph_health_cmd = f"{ceph_health_cmd} detail"
 
+        if toolbox_session.is_toolbox_session_enabled():
+            return toolbox_session.get_toolbox_session().exec_cmd(ceph_health_cmd)
         return self.toolbox.exec_cmd_on_pod(
             ceph_health_cmd,
             out_yaml_format=False,
@@ -643,6 +646,8 @@ class CephCluster(object):
         cmd = "ceph status"
         if format:
             cmd += f" -f {format}"
+        if toolbox_session.is_toolbox_session_enabled():
+            return toolbox_session.get_toolbox_session().exec_cmd(cmd)
         return self.toolbox.exec_cmd_on_pod(cmd, out_yaml_format=False)
 
     def get_ceph_default_replica(self):
@@ -1062,52 +1067,212 @@ class CephCluster(object):
         self.RBD.exec_oc_cmd(f"patch {patch}")
 
 
-class MulticlusterCephHealthMonitor(object):
-    # TODO: This will be a placeholder for now
-    def __init__(self, ceph_cluster=None):
-        pass
-
-    def __enter__(self):
-        pass
-
-    def __exit__(self, exception_type, value, traceback):
-        pass
+HealthTransition = namedtuple("HealthTransition", ["timestamp", "status", "summary"])
 
 
 class CephHealthMonitor(threading.Thread):
     """
     Context manager class for monitoring ceph health status of CephCluster.
-    If CephCluster will get to HEALTH_ERROR state it will save the ceph status
-    to health_error_status variable and will stop monitoring.
+
+    The health is read from the status of the CephCluster CR (source "cr")
+    or by 'ceph health detail' on the toolbox (source "toolbox", over the
+    persistent toolbox session if it's enabled). The sampling interval starts
+    at sleep seconds and is doubled up to max_sleep seconds while the cluster
+    stays HEALTH_OK, any change or not HEALTH_OK status resets it. Every
+    change of the health is stored to a ring buffer of the last history_size
+    transitions which is logged at the end of monitoring.
+
+    If CephCluster gets to HEALTH_ERR state, the ceph status is saved to
+    health_error_status variable and CephHealthException is raised at the end
+    of monitoring.
 
     """
 
-    def __init__(self, ceph_cluster, sleep=5):
+    def __new__(cls, ceph_cluster=None, *args, **kwargs):
+        """
+        Monitor of CephClusterMultiCluster is MulticlusterCephHealthMonitor
+        watching every cluster of it by its own thread
+        """
+        if isinstance(ceph_cluster, CephClusterMultiCluster):
+            kwargs.pop("cluster_index", None)
+            return MulticlusterCephHealthMonitor(ceph_cluster, **kwargs)
+        return super(CephHealthMonitor, cls).__new__(cls)
+
+    def __init__(
+        self,
+        ceph_cluster,
+        sleep=5,
+        max_sleep=30,
+        source=None,
+        cluster_index=None,
+        history_size=256,
+    ):
         """
         Constructor for ceph health status thread.
 
         Args:
-            ceph_cluster (CephCluster): Reference to CephCluster object.
-            sleep (int): Number of seconds to sleep between health checks.
+            ceph_cluster (CephCluster): Reference to CephCluster object, can
+                be None when cluster_index is provided
+            sleep (int): Minimal number of seconds to sleep between health
+                checks.
+            max_sleep (int): Maximal number of seconds to sleep between health
+                checks while the cluster is HEALTH_OK.
+            source (str): "cr" or "toolbox", RUN["ceph_health_monitor_source"]
+                of the monitored cluster is used if not provided
+            cluster_index (int): index of the cluster in config.clusters to
+                monitor without switching the config context, the current
+                cluster is monitored via ceph_cluster if not provided
+            history_size (int): Number of health transitions to keep
 
         """
-        if isinstance(ceph_cluster, CephClusterMultiCluster):
-            return MulticlusterCephHealthMonitor()
         self.ceph_cluster = ceph_cluster
         self.sleep = sleep
+        self.max_sleep = max(sleep, max_sleep)
+        self.cluster_index = cluster_index
+        # config index bound to the monitor thread, so switching of the
+        # context (e.g. by toolbox session) never changes the context of
+        # the other threads
+        self.config_index = (
+            cluster_index if cluster_index is not None else config.cur_index
+        )
+        self.cluster_config = (
+            config.clusters[cluster_index] if cluster_index is not None else config
+        )
+        self.source = source or self.cluster_config.RUN.get(
+            "ceph_health_monitor_source", "toolbox"
+        )
         self.health_error_status = None
         self.health_monitor_enabled = False
         self.latest_health_status = None
-        super(CephHealthMonitor, self).__init__()
+        self.health_history = deque(maxlen=history_size)
+        self._stop_event = threading.Event()
+        super(CephHealthMonitor, self).__init__(
+            name=f"ceph-health-monitor-{self.config_index}",
+            daemon=True,
+        )
+
+    @property
+    def cluster_name(self):
+        return self.cluster_config.ENV_DATA.get("cluster_name")
+
+    def _read_health_cr(self):
+        """
+        Read the health from the status of the CephCluster CR
+
+        Returns:
+            tuple: health status (str), summary with the health checks (str)
+
+        """
+        kubeconfig = os.path.join(
+            self.cluster_config.ENV_DATA["cluster_path"],
+            self.cluster_config.RUN.get("kubeconfig_location"),
+        )
+        ceph_cluster_obj = OCP(
+            kind=constants.CEPH_CLUSTER,
+            namespace=self.cluster_config.ENV_DATA["cluster_namespace"],
+            cluster_kubeconfig=kubeconfig,
+        )
+        items = ceph_cluster_obj.get().get("items") or []
+        if not items:
+            raise exceptions.ResourceNotFoundError("CephCluster CR doesn't exist")
+        ceph_status = items[0].get("status", {}).get("ceph", {})
+        health = ceph_status.get("health", "UNKNOWN")
+        checks = [
+            f"{name}: {check.get('message')}"
+            for name, check in sorted((ceph_status.get("details") or {}).items())
+        ]
+        return health, "; ".join([health] + checks)
+
+    def _read_health_toolbox(self):
+        """
+        Read the health by 'ceph health detail' on the toolbox
+
+        Returns:
+            tuple: health status (str), output of the command (str)
+
+        """
+        if self.cluster_index is None:
+            out = self.ceph_cluster.get_ceph_health(detail=True)
+        else:
+            out = toolbox_session.get_toolbox_session(self.cluster_index).exec_cmd(
+                "ceph health detail"
+            )
+        out = out.strip()
+        return (out.split() or ["UNKNOWN"])[0], out
+
+    def _get_ceph_status(self):
+        """
+        Get ceph status for the report of HEALTH_ERR
+
+        Returns:
+            str: output of 'ceph status', the latest health summary if it
+                can't be obtained
+
+        """
+        try:
+            if self.cluster_index is None:
+                return self.ceph_cluster.get_ceph_status()
+            return toolbox_session.get_toolbox_session(self.cluster_index).exec_cmd(
+                "ceph status"
+            )
+        except Exception as ex:
+            logger.warning(f"Failed to get ceph status: {ex}")
+            return self.latest_health_status
+
+    def read_health(self):
+        """
+        Read the current health of the cluster from the configured source
+
+        Returns:
+            tuple: health status (str), summary (str)
+
+        """
+        if self.source == "cr":
+            return self._read_health_cr()
+        return self._read_health_toolbox()
+
+    def _record(self, status, summary):
+        """
+        Record the health sample, transitions are stored to the history
+
+        Returns:
+            bool: True if the health changed
+
+        """
+        changed = summary != self.latest_health_status
+        self.latest_health_status = summary
+        if changed:
+            self.health_history.append(HealthTransition(time.time(), status, summary))
+            logger.info(f"Ceph health of {self.cluster_name} changed: {summary}")
+        return changed
 
     def run(self):
+        config.thread_local_data.config_index = self.config_index
         self.health_monitor_enabled = True
-        while self.health_monitor_enabled and (not self.health_error_status):
-            time.sleep(self.sleep)
-            self.latest_health_status = self.ceph_cluster.get_ceph_health(detail=True)
-            if "HEALTH_ERROR" in self.latest_health_status:
-                self.health_error_status = self.ceph_cluster.get_ceph_status()
+        interval = self.sleep
+        while self.health_monitor_enabled and not self._stop_event.wait(interval):
+            try:
+                status, summary = self.read_health()
+            except Exception as ex:
+                logger.warning(f"Failed to read ceph health: {ex}")
+                status, summary = "UNKNOWN", f"UNKNOWN; {ex}"
+            changed = self._record(status, summary)
+            if constants.CEPH_HEALTH_ERROR in status and not self.health_error_status:
+                self.health_error_status = self._get_ceph_status()
                 self.log_error_status()
+            if changed or status != constants.CEPH_HEALTH_OK:
+                interval = self.sleep
+            else:
+                interval = min(interval * 2, self.max_sleep)
+
+    def stop(self):
+        """
+        Stop the monitoring and log the health history
+        """
+        self.health_monitor_enabled = False
+        self._stop_event.set()
+        self.join(timeout=self.max_sleep)
+        self.log_health_history()
 
     def __enter__(self):
         self.start()
@@ -1118,31 +1283,117 @@ class CephHealthMonitor(threading.Thread):
 
         Raises:
             CephHealthException: If no other exception occurred during
-                execution of context manager and HEALTH_ERROR is detected
+                execution of context manager and HEALTH_ERR is detected
                 during the monitoring.
             exception_type: In case of exception raised during processing of
                 the context manager.
 
         """
-        self.health_monitor_enabled = False
+        self.stop()
         if self.health_error_status:
             self.log_error_status()
         if exception_type:
             raise exception_type.with_traceback(value, traceback)
         if self.health_error_status:
             raise exceptions.CephHealthException(
-                f"During monitoring of Ceph health status hit HEALTH_ERROR: "
+                f"During monitoring of Ceph health status hit HEALTH_ERR: "
                 f"{self.health_error_status}"
             )
 
         return True
 
+    def get_health_history(self):
+        """
+        Get the recorded health transitions
+
+        Returns:
+            list: of HealthTransition tuples, the oldest first
+
+        """
+        return list(self.health_history)
+
+    def log_health_history(self):
+        lines = [
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(item.timestamp))} "
+            f"{item.summary}"
+            for item in self.health_history
+        ]
+        logger.info(
+            f"Ceph health transitions of {self.cluster_name}:\n" + "\n".join(lines)
+        )
+
     def log_error_status(self):
         logger.error(
             f"ERROR HEALTH STATUS DETECTED! " f"Status: {self.health_error_status}"
         )
 
 
+class MulticlusterCephHealthMonitor(object):
+    """
+    Context manager monitoring ceph health of several clusters concurrently,
+    one CephHealthMonitor thread per cluster. Every monitor thread binds the
+    config index of its cluster, so switching the config context in the
+    monitors doesn't affect the other threads.
+
+    """
+
+    def __init__(self, ceph_cluster=None, cluster_indexes=None, **monitor_kwargs):
+        """
+        Args:
+            ceph_cluster (CephClusterMultiCluster): cluster to monitor, all
+                non ACM clusters are monitored if neither ceph_cluster nor
+                cluster_indexes are provided
+            cluster_indexes (list): indexes of the clusters to monitor
+            monitor_kwargs (dict): arguments of CephHealthMonitor
+
+        """
+        # Importing here to avoid circular dependency
+        from ocs_ci.ocs.utils import get_non_acm_cluster_indexes
+
+        cluster_conf = getattr(ceph_cluster, "cluster_conf", None)
+        if cluster_indexes is None and cluster_conf is not None:
+            cluster_indexes = [cluster_conf.MULTICLUSTER["multicluster_index"]]
+        if cluster_indexes is None:
+            cluster_indexes = get_non_acm_cluster_indexes()
+        self.monitors = [
+            CephHealthMonitor(None, cluster_index=index, **monitor_kwargs)
+            for index in cluster_indexes
+        ]
+
+    def __enter__(self):
+        for monitor in self.monitors:
+            monitor.start()
+
+    def __exit__(self, exception_type, value, traceback):
+        """
+        Exit method for context manager
+
+        Raises:
+            CephHealthException: If no other exception occurred during
+                execution of context manager and HEALTH_ERR is detected
+                on any of the clusters during the monitoring.
+
+        """
+        for monitor in self.monitors:
+            monitor.health_monitor_enabled = False
+            monitor._stop_event.set()
+        for monitor in self.monitors:
+            monitor.stop()
+        if exception_type:
+            raise exception_type.with_traceback(value, traceback)
+        errors = [
+            f"{monitor.cluster_name}: {monitor.health_error_status}"
+            for monitor in self.monitors
+            if monitor.health_error_status
+        ]
+        if errors:
+            raise exceptions.CephHealthException(
+                "During monitoring of Ceph health status hit HEALTH_ERR: "
+                + "\n".join(errors)
+            )
+        return True
+
+
 class DummyCephHealthMonitor(object):
     """
     Dummy ceph health monitor usable for OCP upgrade without installed ODF
@@ -1425,8 +1676,7 @@ def get_osd_utilization():
     """
     osd_filled = {}
     ceph_cmd = "ceph osd df"
-    ct_pod = pod.get_ceph_tools_pod()
-    output = ct_pod.exec_ceph_cmd(ceph_cmd=ceph_cmd)
+    output = toolbox_session.exec_ceph_cmd(ceph_cmd=ceph_cmd)
     for osd in output.get("nodes"):
         osd_filled[osd["name"]] = osd["utilization"]
 
@@ -1442,8 +1692,7 @@ def get_ceph_df_detail(format="json-pretty", out_yaml_format=True):
 
     """
     ceph_cmd = "ceph df detail"
-    ct_pod = pod.get_ceph_tools_pod()
-    return ct_pod.exec_ceph_cmd(
+    return toolbox_session.exec_ceph_cmd(
         ceph_cmd=ceph_cmd, format=format, out_yaml_format=out_yaml_format
     )
 
@@ -1768,8 +2017,7 @@ def get_pgs_per_osd():
     """
     osd_dict = {}
     ceph_cmd = "ceph osd df"
-    ct_pod = pod.get_ceph_tools_pod()
-    output = ct_pod.exec_ceph_cmd(ceph_cmd=ceph_cmd)
+    output = toolbox_session.exec_ceph_cmd(ceph_cmd=ceph_cmd)
     for osd in output.get("nodes"):
         osd_dict[osd["name"]] = osd["pgs"]
 
@@ -1058,6 +1058,12 @@ AWSCLI_POD_YAML = os.path.join(TEMPLATE_APP_POD_DIR, "awscli.yaml")
 
 AWSCLI_MULTIARCH_POD_YAML = os.path.join(TEMPLATE_APP_POD_DIR, "awscli_multiarch.yaml")
 
+NODE_AGENT_DAEMONSET_YAML = os.path.join(
+    TEMPLATE_APP_POD_DIR, "node-agent-daemonset.yaml"
+)
+NODE_AGENT_NAMESPACE = "ocs-ci-node-agent"
+NODE_AGENT_LABEL = "app=ocs-ci-node-agent"
+
 S3CLI_MULTIARCH_STS_YAML = os.path.join(TEMPLATE_MCG_DIR, "s3cli-sts.yaml")
 
 S3CLI_STS_NAME = "s3cli"
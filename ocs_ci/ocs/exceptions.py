@@ -820,3 +820,21 @@ class PodStabilityError(Exception):
     """Raised when pods show signs of instability (Restarts or OOMKills)"""
 
     pass
+
+
+class WatchUnavailableError(Exception):
+    """Raised when the resources can't be watched via the Kubernetes API"""
+
+    pass
+
+
+class S3BulkIOError(Exception):
+    """Raised when some objects of a bulk S3 operation failed"""
+
+    pass
+
+
+class NodeAgentUnavailable(Exception):
+    """Raised when there is no running node agent pod on the node"""
+
+    pass
@@ -0,0 +1,674 @@
+"""
+In-process Kubernetes API backend for OCP.exec_oc_cmd
+
+Every 'oc' invocation forks a new binary which re-reads the kubeconfig and
+re-does the TLS handshake with the API server. When the backend is enabled
+with ``RUN["api_backend"] = "kubernetes"``, the most common 'oc' verbs (get,
+create, patch and delete) are served from a pooled, keep-alive Kubernetes API
+client instead. One client is kept per kubeconfig/context, so multicluster
+runs keep a warm connection to each cluster.
+
+The results keep the same shape as the yaml loaded output of the 'oc'
+command, so callers of OCP.exec_oc_cmd don't see any difference. Commands or
+flags the backend does not understand (e.g. rsh, debug, adm, exec, custom
+columns output) are reported as not served and the caller falls back to the
+'oc' subprocess path.
+"""
+
+import json
+import logging
+import os
+import shlex
+import threading
+import time
+
+import yaml
+from kubernetes import client as kube_client
+from kubernetes import config as kube_config
+from kubernetes.watch.watch import iter_resp_lines
+from openshift.dynamic import DynamicClient, ResourceList
+from openshift.dynamic.exceptions import (
+    DynamicApiError,
+    NotFoundError,
+    ResourceNotFoundError,
+)
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility.utils import mask_secrets
+
+log = logging.getLogger(__name__)
+
+# Sentinel returned by serve_oc_command when the command has to be executed
+# with the 'oc' binary
+NOT_SERVED = object()
+
+API_BACKEND_OC = "oc"
+API_BACKEND_KUBERNETES = "kubernetes"
+
+SUPPORTED_VERBS = ("get", "create", "patch", "delete")
+PATCH_CONTENT_TYPES = {
+    "json": "application/json-patch+json",
+    "merge": "application/merge-patch+json",
+    "strategic": "application/strategic-merge-patch+json",
+}
+DEFAULT_POOL_MAXSIZE = 8
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def is_api_backend_enabled(cluster_config=None):
+    """
+    Check whether 'oc' verbs should be served by the Kubernetes API backend
+
+    Args:
+        cluster_config (MultiClusterConfig): cluster config to read the RUN
+            section from, current cluster config is used if not provided
+
+    Returns:
+        bool: True if the kubernetes API backend is selected in RUN section
+
+    """
+    cluster_config = cluster_config or config
+    return cluster_config.RUN.get("api_backend", API_BACKEND_OC) == (
+        API_BACKEND_KUBERNETES
+    )
+
+
+def get_api_backend(kubeconfig=None, context=None, skip_tls_verify=False):
+    """
+    Get pooled KubeAPIBackend instance for the kubeconfig and context
+
+    The pool is keyed by the real path and modification time of the
+    kubeconfig, so a re-login which rewrites the kubeconfig creates a new
+    client.
+
+    Args:
+        kubeconfig (str): path to the kubeconfig, the default kubeconfig
+            loading rules are used if not provided
+        context (str): context from the kubeconfig to use
+        skip_tls_verify (bool): True to skip verification of the API server
+            certificate
+
+    Returns:
+        KubeAPIBackend: backend bound to the kubeconfig and context
+
+    """
+    mtime = None
+    if kubeconfig:
+        kubeconfig = os.path.realpath(os.path.expanduser(kubeconfig))
+        mtime = os.path.getmtime(kubeconfig)
+    key = (kubeconfig, context, skip_tls_verify)
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None or backend.kubeconfig_mtime != mtime:
+            if backend is not None:
+                log.info(f"Kubeconfig {kubeconfig} changed, recreating API client")
+                backend.close()
+            backend = KubeAPIBackend(
+                kubeconfig=kubeconfig,
+                context=context,
+                skip_tls_verify=skip_tls_verify,
+                kubeconfig_mtime=mtime,
+            )
+            _backends[key] = backend
+        return backend
+
+
+def reset_api_backends():
+    """
+    Close and drop all pooled API clients
+    """
+    with _backends_lock:
+        for backend in _backends.values():
+            backend.close()
+        _backends.clear()
+
+
+def parse_oc_command(command, namespace=None):
+    """
+    Translate 'oc' command (without the initial 'oc') to the request which
+    can be served by the API backend.
+
+    Only a conservative subset of flags is recognized, anything else means
+    the command can't be served in-process.
+
+    Args:
+        command (str): oc command, e.g. 'get pod -n openshift-storage -o yaml'
+        namespace (str): namespace of the OCP object, used when the command
+            doesn't contain its own namespace
+
+    Returns:
+        dict: parsed request or None if the command is not supported
+
+    """
+    try:
+        args = shlex.split(command)
+    except ValueError:
+        return None
+    if not args or args[0] not in SUPPORTED_VERBS:
+        return None
+    request = {
+        "verb": args[0],
+        "namespace": namespace,
+        "all_namespaces": False,
+        "output": None,
+        "selector": None,
+        "field_selector": None,
+        "patch": None,
+        "patch_type": "strategic",
+        "filename": None,
+        "grace_period": None,
+        "force": False,
+        "wait": True,
+        "ignore_not_found": False,
+        "skip_tls_verify": False,
+    }
+    value_flags = {
+        "-n": "namespace",
+        "--namespace": "namespace",
+        "-o": "output",
+        "--output": "output",
+        "-l": "selector",
+        "--selector": "selector",
+        "--field-selector": "field_selector",
+        "-p": "patch",
+        "--patch": "patch",
+        "--type": "patch_type",
+        "-f": "filename",
+        "--filename": "filename",
+        "--grace-period": "grace_period",
+    }
+    bool_flags = {
+        "-A": "all_namespaces",
+        "--all-namespaces": "all_namespaces",
+        "--force": "force",
+        "--wait": "wait",
+        "--ignore-not-found": "ignore_not_found",
+        "--insecure-skip-tls-verify": "skip_tls_verify",
+    }
+    positionals = []
+    args_iter = iter(args[1:])
+    for arg in args_iter:
+        if not arg.startswith("-"):
+            positionals.append(arg)
+            continue
+        flag, has_value, value = arg.partition("=")
+        if flag.startswith("-o") and len(flag) > 2 and not flag.startswith("--"):
+            # -oyaml / -ojson
+            flag, has_value, value = "-o", "=", flag[2:]
+        if flag in value_flags:
+            if not has_value:
+                value = next(args_iter, None)
+                if value is None:
+                    return None
+            request[value_flags[flag]] = value
+        elif flag in bool_flags:
+            if has_value and value.lower() not in ("true", "false"):
+                return None
+            request[bool_flags[flag]] = not has_value or value.lower() == "true"
+        else:
+            return None
+
+    if request["output"] not in (None, "yaml", "json"):
+        return None
+    if request["patch_type"] not in PATCH_CONTENT_TYPES:
+        return None
+
+    verb = request["verb"]
+    if verb == "create":
+        if positionals or not request["filename"]:
+            return None
+        return request
+    if request["filename"]:
+        return None
+
+    if len(positionals) == 1 and "/" in positionals[0]:
+        positionals = positionals[0].split("/", 1)
+    if not positionals or len(positionals) > 2 or "," in positionals[0]:
+        return None
+    request["kind"] = positionals[0]
+    request["name"] = positionals[1] if len(positionals) > 1 else None
+
+    if verb == "get":
+        # table output is produced by the client side printers of oc
+        if not request["output"]:
+            return None
+        if request["name"] and (request["selector"] or request["field_selector"]):
+            return None
+    elif verb == "patch":
+        if not request["name"] or request["patch"] is None:
+            return None
+    elif verb == "delete":
+        if not request["name"]:
+            return None
+    return request
+
+
+def serve_oc_command(
+    command,
+    namespace=None,
+    kubeconfig=None,
+    timeout=600,
+    ignore_error=False,
+    secrets=None,
+    silent=False,
+):
+    """
+    Serve 'oc' command via the pooled Kubernetes API backend
+
+    Args:
+        command (str): oc command without the initial 'oc'
+        namespace (str): namespace of the OCP object
+        kubeconfig (str): kubeconfig of the cluster the command is for
+        timeout (int): request timeout in seconds
+        ignore_error (bool): True to return None instead of raising
+            CommandFailed, same as yaml loaded empty stdout of failed 'oc'
+        secrets (list): A list of secrets to be masked with asterisks
+        silent (bool): If True will silent errors from the server
+
+    Returns:
+        dict: Dictionary represents a returned yaml file, str for the verbs
+            which don't produce yaml output, or NOT_SERVED in case the
+            command has to be executed by the 'oc' binary
+
+    Raises:
+        CommandFailed: In case the API server returned an error
+
+    """
+    request = parse_oc_command(command, namespace=namespace)
+    if request is None:
+        return NOT_SERVED
+    try:
+        backend = get_api_backend(
+            kubeconfig=kubeconfig, skip_tls_verify=request["skip_tls_verify"]
+        )
+    except Exception as ex:
+        log.warning(f"Kubernetes API backend is not available: {ex}")
+        return NOT_SERVED
+    masked_cmd = mask_secrets(f"oc {command}", secrets)
+    log.info(f"Executing command via Kubernetes API: {masked_cmd}")
+    try:
+        return backend.execute(request, timeout=timeout)
+    except UnsupportedResourceError as ex:
+        log.debug(f"Falling back to oc binary: {ex}")
+        return NOT_SERVED
+    except CommandFailed as ex:
+        if not silent:
+            log.warning(f"Command stderr: {ex}")
+        if ignore_error:
+            return None
+        raise CommandFailed(
+            f"Error during execution of command: {masked_cmd}." f"\nError is {ex}"
+        )
+
+
+class UnsupportedResourceError(Exception):
+    """
+    Raised when the kind can't be resolved by the API discovery and the
+    command has to be executed by the 'oc' binary
+    """
+
+    pass
+
+
+class KubeAPIBackend(object):
+    """
+    Keep-alive Kubernetes API client bound to single kubeconfig/context
+    """
+
+    def __init__(
+        self,
+        kubeconfig=None,
+        context=None,
+        skip_tls_verify=False,
+        kubeconfig_mtime=None,
+    ):
+        """
+        Args:
+            kubeconfig (str): path to the kubeconfig
+            context (str): context from the kubeconfig to use
+            skip_tls_verify (bool): True to skip verification of API server
+                certificate
+            kubeconfig_mtime (float): modification time of the kubeconfig the
+                client was created from
+
+        """
+        self.kubeconfig = kubeconfig
+        self.context = context
+        self.kubeconfig_mtime = kubeconfig_mtime
+        configuration = kube_client.Configuration()
+        kube_config.load_kube_config(
+            config_file=kubeconfig,
+            context=context,
+            client_configuration=configuration,
+        )
+        if skip_tls_verify:
+            configuration.verify_ssl = False
+        self.namespace = self.context_namespace(kubeconfig, context)
+        configuration.connection_pool_maxsize = config.RUN.get(
+            "api_backend_pool_maxsize", DEFAULT_POOL_MAXSIZE
+        )
+        self.api_client = kube_client.ApiClient(configuration=configuration)
+        self.dyn_client = DynamicClient(self.api_client)
+        self._resources = {}
+        self._resources_lock = threading.Lock()
+
+    @staticmethod
+    def context_namespace(kubeconfig=None, context=None):
+        """
+        Namespace 'oc' uses for namespaced kinds when the command doesn't
+        specify one: namespace of the kubeconfig context or 'default'
+
+        Args:
+            kubeconfig (str): path to the kubeconfig
+            context (str): context from the kubeconfig, the current context
+                is used if not provided
+
+        Returns:
+            str: namespace of the context
+
+        """
+        contexts, current_context = kube_config.list_kube_config_contexts(
+            config_file=kubeconfig
+        )
+        if context:
+            current_context = next(
+                (ctx for ctx in contexts if ctx["name"] == context), current_context
+            )
+        context_data = (current_context or {}).get("context") or {}
+        return context_data.get("namespace") or "default"
+
+    def close(self):
+        """
+        Close the connection pool of the client
+        """
+        try:
+            self.api_client.close()
+        except Exception as ex:
+            log.debug(f"Failed to close API client: {ex}")
+
+    def resolve_resource(self, kind):
+        """
+        Resolve kind the same way as 'oc' does: by kind, plural name, singular
+        name or short name, optionally suffixed with the API group
+        (e.g. storagecluster.ocs.openshift.io).
+
+        Args:
+            kind (str): kind as used in the 'oc' command
+
+        Returns:
+            Resource: discovered API resource
+
+        Raises:
+            UnsupportedResourceError: in case the kind can't be resolved
+
+        """
+        with self._resources_lock:
+            if kind in self._resources:
+                return self._resources[kind]
+        if kind == constants.NETWORK_ATTACHMENT_DEFINITION:
+            kind = "network-attachment-definitions"
+        name, _, group = kind.partition(".")
+        name_lower = name.lower()
+        matches = []
+        for resource in self._iter_resources():
+            if group and resource.group != group:
+                continue
+            if name_lower in (
+                resource.kind.lower(),
+                resource.name,
+                resource.singular_name,
+            ) or name_lower in (resource.short_names or []):
+                matches.append(resource)
+        if not matches:
+            raise UnsupportedResourceError(f"Unable to resolve kind {kind}")
+        # prefer the core group and preferred versions like 'oc' does
+        matches.sort(key=lambda res: (bool(res.group), not res.preferred))
+        resource = matches[0]
+        with self._resources_lock:
+            self._resources[kind] = resource
+        return resource
+
+    def _iter_resources(self):
+        """
+        Iterate over all discovered API resources, skipping the <Kind>List
+        pseudo resources
+        """
+        for entry in self.dyn_client.resources:
+            for resource in entry if isinstance(entry, list) else [entry]:
+                if isinstance(resource, ResourceList):
+                    continue
+                yield resource
+
+    @staticmethod
+    def resource_ref(resource, name):
+        """
+        Reference to the resource as printed by 'oc', e.g. pod/my-pod or
+        storagecluster.ocs.openshift.io/ocs-storagecluster
+
+        """
+        kind = resource.kind.lower()
+        if resource.group:
+            kind = f"{kind}.{resource.group}"
+        return f"{kind}/{name}"
+
+    def request(self, method, path, timeout, **params):
+        """
+        Perform raw request on the API server
+
+        Args:
+            method (str): HTTP method
+            path (str): API path of the resource
+            timeout (int): request timeout in seconds
+
+        Returns:
+            dict: decoded JSON body of the response
+
+        Raises:
+            CommandFailed: In case the API server returned an error
+
+        """
+        try:
+            response = self.dyn_client.request(
+                method, path, serialize=False, _request_timeout=timeout, **params
+            )
+        except DynamicApiError as ex:
+            raise CommandFailed(self.format_api_error(ex))
+        return json.loads(response.data)
+
+    def watch(self, path, resource_version, timeout, **params):
+        """
+        Stream watch events of the resources under the API path
+
+        Args:
+            path (str): API path of the resource collection
+            resource_version (str): resource version to start watching from
+            timeout (int): how long the API server should keep the watch open
+                in seconds
+
+        Yields:
+            dict: decoded watch event with 'type' and 'object' keys
+
+        Raises:
+            CommandFailed: In case the API server refused the watch request
+
+        """
+        try:
+            response = self.dyn_client.request(
+                "get",
+                path,
+                serialize=False,
+                watch=True,
+                resource_version=resource_version,
+                allow_watch_bookmarks=True,
+                timeout_seconds=max(int(timeout), 1),
+                # the server closes the watch after timeout_seconds, the read
+                # timeout only protects against a stuck connection
+                _request_timeout=(30, max(int(timeout), 1) + 30),
+                **params,
+            )
+        except DynamicApiError as ex:
+            raise CommandFailed(self.format_api_error(ex))
+        try:
+            for line in iter_resp_lines(response):
+                yield json.loads(line)
+        finally:
+            response.close()
+            response.release_conn()
+
+    @staticmethod
+    def format_api_error(ex):
+        """
+        Format API error the same way as 'oc' prints it
+
+        """
+        message = ex.summary()
+        try:
+            message = json.loads(ex.body).get("message", message)
+        except (TypeError, ValueError, AttributeError):
+            pass
+        return f"Error from server ({ex.reason.replace(' ', '')}): {message}"
+
+    def execute(self, request, timeout=600):
+        """
+        Execute parsed 'oc' request
+
+        Args:
+            request (dict): request as returned by parse_oc_command
+            timeout (int): timeout in seconds
+
+        Returns:
+            dict or str: the same output as yaml loaded output of 'oc'
+
+        """
+        verb = request["verb"]
+        if verb == "create":
+            return self.create(request, timeout)
+        resource = self.resolve_resource(request["kind"])
+        namespace = None
+        if resource.namespaced:
+            namespace = request["namespace"] or self.namespace
+        if verb == "get":
+            return self.get(resource, request, namespace, timeout)
+        if verb == "patch":
+            path = resource.path(name=request["name"], namespace=namespace)
+            body = yaml.safe_load(request["patch"])
+            self.request(
+                "patch",
+                path,
+                timeout,
+                body=body,
+                content_type=PATCH_CONTENT_TYPES[request["patch_type"]],
+            )
+            return f"{self.resource_ref(resource, request['name'])} patched"
+        return self.delete(resource, request, namespace, timeout)
+
+    def get(self, resource, request, namespace, timeout):
+        """
+        Serve 'oc get <kind> [name] -o yaml'
+
+        """
+        if request["all_namespaces"]:
+            namespace = None
+        if request["name"]:
+            path = resource.path(name=request["name"], namespace=namespace)
+            try:
+                return self.request("get", path, timeout)
+            except CommandFailed as ex:
+                # 'oc get --ignore-not-found' prints nothing, which is loaded
+                # as None from yaml
+                if request["ignore_not_found"] and "(NotFound)" in str(ex):
+                    return None
+                raise
+        path = resource.path(namespace=namespace)
+        data = self.request(
+            "get",
+            path,
+            timeout,
+            label_selector=request["selector"],
+            field_selector=request["field_selector"],
+        )
+        # 'oc get -o yaml' converts <Kind>List to generic List and fills
+        # apiVersion and kind of every item
+        items = []
+        for item in data.get("items") or []:
+            item.setdefault("apiVersion", resource.group_version)
+            item.setdefault("kind", resource.kind)
+            items.append(item)
+        return {
+            "apiVersion": "v1",
+            "items": items,
+            "kind": "List",
+            "metadata": {"resourceVersion": ""},
+        }
+
+    def create(self, request, timeout):
+        """
+        Serve 'oc create -f <file>'
+
+        """
+        with open(os.path.expanduser(request["filename"])) as file_stream:
+            docs = [doc for doc in yaml.safe_load_all(file_stream) if doc]
+        if len(docs) != 1 or docs[0].get("kind", "").endswith("List"):
+            raise UnsupportedResourceError("Only single object files are supported")
+        body = docs[0]
+        try:
+            resource = self.dyn_client.resources.get(
+                api_version=body["apiVersion"], kind=body["kind"]
+            )
+        except ResourceNotFoundError:
+            raise UnsupportedResourceError(f"Unable to resolve kind {body['kind']}")
+        namespace = None
+        if resource.namespaced:
+            namespace = (
+                body["metadata"].get("namespace")
+                or request["namespace"]
+                or self.namespace
+            )
+        created = self.request(
+            "post", resource.path(namespace=namespace), timeout, body=body
+        )
+        if request["output"]:
+            return created
+        return f"{self.resource_ref(resource, created['metadata']['name'])} created"
+
+    def delete(self, resource, request, namespace, timeout):
+        """
+        Serve 'oc delete <kind> <name>' including waiting for the resource to
+        be gone unless --wait=false is used
+
+        """
+        name = request["name"]
+        path = resource.path(name=name, namespace=namespace)
+        params = {}
+        grace_period = request["grace_period"]
+        if request["force"] and grace_period is None:
+            grace_period = "0"
+        if grace_period is not None:
+            params["grace_period_seconds"] = grace_period
+        try:
+            self.request(
+                "delete", path, timeout, propagation_policy="Background", **params
+            )
+        except CommandFailed as ex:
+            if request["ignore_not_found"] and "(NotFound)" in str(ex):
+                return ""
+            raise
+        if request["wait"]:
+            end_time = time.time() + timeout
+            while time.time() < end_time:
+                try:
+                    self.dyn_client.request("get", path, serialize=False)
+                except NotFoundError:
+                    break
+                except DynamicApiError as ex:
+                    raise CommandFailed(self.format_api_error(ex))
+                time.sleep(1)
+            else:
+                raise CommandFailed(
+                    f"timed out waiting for the condition on {resource.name}/{name}"
+                )
+        return f'{resource.singular_name or resource.kind.lower()} "{name}" deleted'
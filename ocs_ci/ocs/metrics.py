@@ -5,14 +5,20 @@ OCS Metrics module.
 Code in this module Supports monitoring test cases dealing with OCS metrics.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
+import re
 
+from ocs_ci.framework import config, config_safe_thread_pool_task
 from ocs_ci.ocs import constants
 
 
 logger = logging.getLogger(__name__)
 
+# plain metric name which can be combined to regex of batched query
+METRIC_NAME_RE = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
 
 # See: https://ceph.com/rbd/new-in-nautilus-rbd-performance-monitoring/
 # This is not a full list, but it is enough to check whether we have
@@ -306,8 +312,54 @@ ceph_rgw_metrics = tuple(
 ceph_metrics_all = tuple(ceph_metrics + ceph_rbd_metrics)
 
 
+def is_rgw_metric_exempted(metric, current_platform):
+    """
+    Check whether missing metric is expected on the platform.
+
+    Ceph Object Gateway https://docs.ceph.com/docs/master/radosgw/ is
+    deployed on on-prem platforms only, so we are going to ignore missing
+    metrics from these components on such platforms. See BZ 1763150
+
+    Args:
+        metric (str): name of the metric
+        current_platform (str): name of current platform
+
+    Returns:
+        bool: True if the metric is not expected on the platform
+
+    """
+    is_rgw_metric = metric.startswith("ceph_rgw") or metric.startswith("ceph_objecter")
+    return current_platform in constants.CLOUD_PLATFORMS and is_rgw_metric
+
+
+def query_available_metrics(prometheus, metrics, timestamp=None):
+    """
+    Find out which of the metrics have any value using one instant query
+    ``count by (__name__) ({__name__=~"a|b|c"})`` for all of them.
+
+    Args:
+        prometheus (ocs_ci.utility.prometheus.PrometheusAPI): prometheus instance
+        metrics (list): names of the metrics
+        timestamp (float): evaluation timestamp, current time if not provided
+
+    Returns:
+        set: names of the metrics with some value
+
+    """
+    regex = "|".join(metrics)
+    query = f'count by (__name__) ({{__name__=~"{regex}"}})'
+    result = prometheus.query(query, timestamp=timestamp, log_debug=True)
+    return {item["metric"].get("__name__") for item in result}
+
+
 def get_missing_metrics(
-    prometheus, metrics, current_platform=None, start=None, stop=None
+    prometheus,
+    metrics,
+    current_platform=None,
+    start=None,
+    stop=None,
+    batch_size=50,
+    max_workers=4,
 ):
     """
     Using given prometheus instance, check that all given metrics which are
@@ -317,46 +369,92 @@ def get_missing_metrics(
     metric data from a middle of this time range (instead of fetching the
     current value). Expected to be used with workload fixtures.
 
+    Metric names are checked in batches of batch_size names per Prometheus
+    query, the batches are queried concurrently. Metrics which are not plain
+    metric names (e.g. expressions with labels) are queried one by one.
+
     Args:
         prometheus (ocs_ci.utility.prometheus.PrometheusAPI): prometheus instance
         metrics (list): list or tuple with metrics to be checked
         current_platform (str): name of current platform (optional)
         start (float): start timestamp (unix time number)
         stop (float): stop timestamp (unix time number)
+        batch_size (int): number of metric names checked by one query, 1
+            to query every metric separately
+        max_workers (int): number of queries executed concurrently
 
     Returns:
         list: metrics which were not available but should be
 
     """
-    metrics_without_results = []
-    for metric in metrics:
-        if start is None or stop is None:
+    timestamp = None
+    if start is not None and stop is not None:
+        # to simplify the test case, we are going to query values for a
+        # moment in the middle between start and stop events
+        start_ts = datetime.fromtimestamp(start)
+        stop_ts = datetime.fromtimestamp(stop)
+        middle_ts = start_ts + (stop_ts - start_ts) / 2
+        timestamp = middle_ts.timestamp()
+
+    batches = []
+    if batch_size and batch_size > 1:
+        names = sorted(
+            {metric for metric in metrics if METRIC_NAME_RE.fullmatch(metric)}
+        )
+        batches = [names[i : i + batch_size] for i in range(0, len(names), batch_size)]
+    batched_names = {name for batch in batches for name in batch}
+    single_metrics = [metric for metric in metrics if metric not in batched_names]
+    logger.info(
+        f"Checking {len(metrics)} metrics using {len(batches)} batched and "
+        f"{len(single_metrics)} single queries"
+    )
+
+    def _query_single(metric):
+        if timestamp is None:
             result = prometheus.query(metric)
         else:
-            # to simplify the test case, we are going to query values for a
-            # moment in the middle between start and stop events
-            start_ts = datetime.fromtimestamp(start)
-            stop_ts = datetime.fromtimestamp(stop)
-            middle_ts = start_ts + (stop_ts - start_ts) / 2
-            result = prometheus.query(metric, timestamp=middle_ts.timestamp())
+            result = prometheus.query(metric, timestamp=timestamp)
         # check that we actually received some values
-        if len(result) == 0:
-            # Ceph Object Gateway https://docs.ceph.com/docs/master/radosgw/ is
-            # deployed on on-prem platforms only, so we are going to ignore
-            # missing metrics from these components on such platforms.
-            # See BZ 1763150
-            is_rgw_metric = metric.startswith("ceph_rgw") or metric.startswith(
-                "ceph_objecter"
+        return {metric} if len(result) else set()
+
+    available = set()
+    # the queries switch to the provider context, the workers have to use
+    # their own config index to not change the context of the other threads
+    config_index = config.cur_index
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = [
+            executor.submit(
+                config_safe_thread_pool_task,
+                config_index,
+                query_available_metrics,
+                prometheus,
+                batch,
+                timestamp,
+            )
+            for batch in batches
+        ]
+        futures += [
+            executor.submit(
+                config_safe_thread_pool_task, config_index, _query_single, metric
+            )
+            for metric in single_metrics
+        ]
+        for future in futures:
+            available |= future.result()
+
+    metrics_without_results = []
+    for metric in metrics:
+        if metric in available:
+            continue
+        if is_rgw_metric_exempted(metric, current_platform):
+            msg = (
+                f"failed to get results for {metric}, "
+                f"but it is expected on {current_platform}"
             )
-            if current_platform in constants.CLOUD_PLATFORMS and is_rgw_metric:
-                msg = (
-                    f"failed to get results for {metric}, "
-                    f"but it is expected on {current_platform}"
-                )
-                logger.info(msg)
-            else:
-                logger.error(f"failed to get results for {metric}")
-                metrics_without_results.append(metric)
+            logger.info(msg)
+        else:
+            logger.error(f"failed to get results for {metric}")
+            metrics_without_results.append(metric)
     return metrics_without_results
 
 
@@ -0,0 +1,231 @@
+"""
+Delta must-gather collection.
+
+After the first full must-gather of the cluster in the session, the next
+must-gathers of the same image collect only logs since the previous one
+(--since-time). Files of the gathered directories are deduplicated across
+gathers: resources with the same resourceVersion as in the previous gather
+and files with the same content are replaced by hardlinks to a
+content-addressed store, so the disk space is used only once.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_VERSION_RE = re.compile(
+    rb"""^\s*resourceVersion:\s*["']?([\w-]+)""", re.MULTILINE
+)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+GatherRecord = namedtuple("GatherRecord", ["path", "since_time", "resource_versions"])
+
+
+def get_resource_versions(content):
+    """
+    Get all resourceVersions of the resources in YAML file content
+
+    Args:
+        content (bytes): content of the YAML file
+
+    Returns:
+        tuple: the resource versions in the order they are in the file
+
+    """
+    return tuple(version.decode() for version in RESOURCE_VERSION_RE.findall(content))
+
+
+def get_file_digest(path):
+    """
+    Get sha256 digest of the file content
+
+    Args:
+        path (str): path to the file
+
+    Returns:
+        str: hex digest of the content
+
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def replace_with_link(source, path):
+    """
+    Replace the file by hardlink to the source file
+
+    Args:
+        source (str): path to the file to link to
+        path (str): path to the file to replace
+
+    Returns:
+        bool: True if the file was replaced, False if it is already the same
+            file or hardlink can't be created (e.g. other filesystem)
+
+    """
+    try:
+        if os.path.samefile(source, path):
+            return False
+        tmp_path = f"{path}.mg-delta"
+        os.link(source, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as ex:
+        logger.debug(f"Cannot link {path} to {source}: {ex}")
+        return False
+    return True
+
+
+class MustGatherDelta(object):
+    """
+    Tracker of the must-gathers collected in the session
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.gathers = {}
+        self.stats = {
+            "gathers": 0,
+            "delta_gathers": 0,
+            "files": 0,
+            "unchanged_resources": 0,
+            "deduplicated_files": 0,
+            "bytes_saved": 0,
+        }
+
+    @staticmethod
+    def get_key(cluster_config, image, command=None, mg_options=None):
+        """
+        Get key of the must-gather, the delta is collected for the same key
+
+        Args:
+            cluster_config (MultiClusterConfig): config of the gathered cluster
+            image (str): must-gather image
+            command (str): command executed within the must-gather image
+            mg_options (str): options of must gather command
+
+        Returns:
+            tuple: the key
+
+        """
+        return (
+            cluster_config.ENV_DATA["cluster_name"],
+            image,
+            command or "",
+            mg_options or "",
+        )
+
+    def get_since_time(self, key):
+        """
+        Get the time of the start of the previous must-gather with the key
+
+        Args:
+            key (tuple): key of the must-gather
+
+        Returns:
+            str: RFC3339 time, None if there was no previous must-gather
+
+        """
+        with self.lock:
+            previous = self.gathers.get(key)
+        return previous.since_time if previous else None
+
+    def record(self, key, log_dir_path, start_time, store_dir=None):
+        """
+        Record collected must-gather, deduplicate its files against the
+        previous gathers if the store directory is provided
+
+        Args:
+            key (tuple): key of the must-gather
+            log_dir_path (str): directory with the collected must-gather
+            start_time (datetime.datetime): UTC time the must-gather started
+            store_dir (str): directory of the content-addressed store, it has
+                to be on the same filesystem as log_dir_path
+
+        Returns:
+            int: number of bytes saved by deduplication of this must-gather
+
+        """
+        with self.lock:
+            previous = self.gathers.get(key)
+        resource_versions = {}
+        unchanged = deduplicated = bytes_saved = files = 0
+        for root, _, file_names in os.walk(log_dir_path):
+            for name in file_names:
+                path = os.path.join(root, name)
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                files += 1
+                relative_path = os.path.relpath(path, log_dir_path)
+                size = os.path.getsize(path)
+                if name.endswith((".yaml", ".yml")):
+                    with open(path, "rb") as f:
+                        versions = get_resource_versions(f.read())
+                    if versions:
+                        resource_versions[relative_path] = versions
+                    if (
+                        store_dir
+                        and previous
+                        and versions
+                        and previous.resource_versions.get(relative_path) == versions
+                    ):
+                        previous_path = os.path.join(previous.path, relative_path)
+                        if os.path.isfile(previous_path) and replace_with_link(
+                            previous_path, path
+                        ):
+                            unchanged += 1
+                            bytes_saved += size
+                            continue
+                if not store_dir:
+                    continue
+                digest = get_file_digest(path)
+                store_path = os.path.join(store_dir, digest[:2], digest)
+                if os.path.exists(store_path):
+                    if replace_with_link(store_path, path):
+                        deduplicated += 1
+                        bytes_saved += size
+                    continue
+                os.makedirs(os.path.dirname(store_path), exist_ok=True)
+                try:
+                    os.link(path, store_path)
+                except OSError as ex:
+                    logger.debug(f"Cannot add {path} to the store: {ex}")
+
+        since_time = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        with self.lock:
+            self.gathers[key] = GatherRecord(
+                log_dir_path, since_time, resource_versions
+            )
+            self.stats["gathers"] += 1
+            self.stats["delta_gathers"] += 1 if previous else 0
+            self.stats["files"] += files
+            self.stats["unchanged_resources"] += unchanged
+            self.stats["deduplicated_files"] += deduplicated
+            self.stats["bytes_saved"] += bytes_saved
+        logger.info(
+            f"Must-gather {log_dir_path}: {files} files, {unchanged} unchanged "
+            f"resources and {deduplicated} identical files linked, "
+            f"{bytes_saved} bytes saved"
+        )
+        return bytes_saved
+
+    def format_stats(self):
+        """
+        Format statistics of the must-gathers collected in the session
+
+        Returns:
+            str: the statistics, one per line
+
+        """
+        with self.lock:
+            return "\n".join(f"{name}: {value}" for name, value in self.stats.items())
+
+
+mg_delta = MustGatherDelta()
@@ -14,6 +14,7 @@ from ocs_ci.ocs.must_gather.const_must_gather import (
     GATHER_COMMANDS_VERSION,
     GATHER_COMMANDS_LOG,
 )
+from ocs_ci.ocs.must_gather.path_index import PathIndex
 from ocs_ci.utility import version
 from ocs_ci.ocs.constants import MANAGED_SERVICE_PLATFORMS
 
@@ -36,6 +37,7 @@ class MustGather(object):
         self.files_content_issue = list()
         self.ocs_version = version.get_semantic_ocs_version_from_config()
         self.full_paths = list()
+        self.path_index = None
 
     @property
     def log_type(self):
@@ -89,13 +91,13 @@ class MustGather(object):
             files = GATHER_COMMANDS_VERSION[ocs_version]["OTHERS_EXTERNAL"]
         else:
             files = GATHER_COMMANDS_VERSION[ocs_version][self.type_log]
+        dir_index = PathIndex()
+        dir_index.add_dir(self.root, tarballs=False)
         for file in files:
-            self.files_not_exist.append(file)
-            for dir_name, subdir_list, files_list in os.walk(self.root):
-                if file in files_list:
-                    self.files_path[file] = os.path.join(dir_name, file)
-                    self.files_not_exist.remove(file)
-                    break
+            if file in dir_index.file_names:
+                self.files_path[file] = dir_index.file_names[file]
+            else:
+                self.files_not_exist.append(file)
 
     def validate_file_size(self):
         """
@@ -275,22 +277,11 @@ class MustGather(object):
             list: paths of all members (files and dirs) in the archive
 
         """
-        paths = []
-        try:
-            with tarfile.open(tarball_path, "r:*") as tar:
-                for member in tar.getmembers():
-                    # Add the member path (files and dirs)
-                    paths.append(member.name)
-                    # Ensure parent directory paths are included for substring
-                    # matching in verify_paths_in_dir / verify_paths_not_in_dir
-                    parts = member.name.replace("\\", "/").split("/")
-                    for i in range(1, len(parts)):
-                        parent = "/".join(parts[:i])
-                        if parent and parent not in paths:
-                            paths.append(parent)
-        except (tarfile.TarError, OSError) as e:
-            logger.warning(f"Could not read tarball {tarball_path}: {e}")
-        return paths
+        tarball_index = PathIndex()
+        # Parent directory paths are included for substring matching
+        # in verify_paths_in_dir / verify_paths_not_in_dir
+        tarball_index.add_tarball(tarball_path)
+        return tarball_index.ordered_paths
 
     def get_all_paths(self):
         """
@@ -298,20 +289,54 @@ class MustGather(object):
 
         When REPORTING["tarball_mg_logs"] is used, must-gather may be packed
         into a .tar.gz; this method collects paths from both directory trees
-        and from inside such tarballs.
+        and from inside such tarballs, which are read as a stream.
+
+        """
+        self.path_index = PathIndex()
+        self.path_index.add_dir(self.root)
+        self.full_paths = self.path_index.ordered_paths
 
+    def _get_path_index(self):
         """
-        self.full_paths = []
+        Get index of the paths, it is built from full_paths if they were
+        not collected by get_all_paths
+
+        Returns:
+            PathIndex: the index of all paths
 
-        for root_dir, dirs, files in os.walk(self.root):
-            for name in files + dirs:
-                full_path = os.path.join(root_dir, name)
-                self.full_paths.append(full_path)
-            # Collect paths from must-gather tarballs found under root
-            for name in files:
-                if name.endswith(".tar.gz"):
-                    tarball_path = os.path.join(root_dir, name)
-                    self.full_paths.extend(self._get_paths_from_tarball(tarball_path))
+        """
+        index_outdated = (
+            self.path_index is None
+            or self.path_index.ordered_paths is not self.full_paths
+        )
+        if index_outdated:
+            self.path_index = PathIndex()
+            for full_path in self.full_paths:
+                self.path_index.add(full_path)
+            self.full_paths = self.path_index.ordered_paths
+        return self.path_index
+
+    def verify_paths(self, paths_exist, paths_not_exist):
+        """
+        Verify paths exist and paths do not exist in must gather directory,
+        all the paths are searched in one pass over the must gather paths
+
+        Args:
+            paths_exist (list): list of paths which should exist in mg directory
+            paths_not_exist (list): list of paths which should not exist in mg directory
+                for example ``/ceph_logs/journal_`` exist in ``/mg_dir/a/b/ceph/ceph_logs/journal_compute-1/log.log``
+
+        Returns:
+            tuple: list of the paths which should exist and do not exist in mg dir,
+                list of the paths which should not exist and exist in mg dir
+
+        """
+        found = self._get_path_index().find_substrings(
+            list(paths_exist) + list(paths_not_exist)
+        )
+        missing = [path for path in paths_exist if path not in found]
+        unexpected = [path for path in paths_not_exist if path in found]
+        return missing, unexpected
 
     def verify_paths_in_dir(self, paths):
         """
@@ -325,15 +350,7 @@ class MustGather(object):
             list: the paths do not exist in mg dir
 
         """
-        paths_exist = []
-        for path in paths:
-            status = False
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = True
-            if not status:
-                paths_exist.append(path)
-        return paths_exist
+        return self.verify_paths(paths, [])[0]
 
     def verify_paths_not_in_dir(self, paths):
         """
@@ -347,15 +364,7 @@ class MustGather(object):
             list: the paths exist in mg dir
 
         """
-        paths_not_exist = []
-        for path in paths:
-            status = True
-            for full_path in self.full_paths:
-                if path in full_path:
-                    status = False
-            if not status:
-                paths_not_exist.append(path)
-        return paths_not_exist
+        return self.verify_paths([], paths)[1]
 
     def validate_must_gather(self):
         """
@@ -0,0 +1,178 @@
+"""
+Index of the paths in must-gather directory and its tarballs
+"""
+
+import logging
+import os
+import tarfile
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class SubstringMatcher(object):
+    """
+    Aho-Corasick automaton finding which of many patterns are substrings of
+    the text in one pass over the text.
+
+    Example::
+
+        matcher = SubstringMatcher(["/ceph_logs/journal_", "/namespaces/"])
+        matcher.search("/mg/ceph/ceph_logs/journal_compute-1/log.log")
+        # {"/ceph_logs/journal_"}
+
+    """
+
+    def __init__(self, patterns):
+        """
+        Args:
+            patterns (iterable): patterns to search for
+
+        """
+        self.patterns = list(dict.fromkeys(patterns))
+        # trie of the patterns, the state is index of the node
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(set())
+                state = next_state
+            self.output[state].add(pattern)
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        """
+        Link every node to the node of its longest proper suffix in the trie
+        """
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail = self.fail[state]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_state] = self.goto[fail].get(char, 0)
+                self.output[next_state] |= self.output[self.fail[next_state]]
+
+    def search(self, text):
+        """
+        Find the patterns which are substrings of the text
+
+        Args:
+            text (str): text to search in
+
+        Returns:
+            set: the patterns found in the text
+
+        """
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if self.output[state]:
+                found |= self.output[state]
+        if "" in self.output[0]:
+            found.add("")
+        return found
+
+
+class PathIndex(object):
+    """
+    Set of all the paths (including parent directories) in must-gather
+    directory and inside its tarballs, with the file paths indexed by file
+    name.
+    """
+
+    def __init__(self):
+        self.paths = set()
+        self.ordered_paths = []
+        # file name: first path of the file found on the disk
+        self.file_names = {}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self.paths
+
+    def add(self, path, with_parents=False):
+        """
+        Add path to the index
+
+        Args:
+            path (str): the path
+            with_parents (bool): True to add also all the parent directories
+                of the relative path
+
+        """
+        if with_parents:
+            parts = path.replace("\\", "/").split("/")
+            for i in range(1, len(parts)):
+                self.add("/".join(parts[:i]))
+        if path and path not in self.paths:
+            self.paths.add(path)
+            self.ordered_paths.append(path)
+
+    def add_dir(self, root, tarballs=True):
+        """
+        Add all the paths under the directory to the index
+
+        Args:
+            root (str): the directory
+            tarballs (bool): True to add also the paths inside the .tar.gz
+                files found in the directory
+
+        """
+        for root_dir, dirs, files in os.walk(root):
+            for name in files + dirs:
+                self.add(os.path.join(root_dir, name))
+            for name in files:
+                self.file_names.setdefault(name, os.path.join(root_dir, name))
+                if tarballs and name.endswith(".tar.gz"):
+                    self.add_tarball(os.path.join(root_dir, name))
+
+    def add_tarball(self, tarball_path):
+        """
+        Add member paths of the archive and their parent directories to the
+        index, the archive is read as a stream without extracting it
+
+        Args:
+            tarball_path (str): path to the .tar.gz file
+
+        """
+        try:
+            with tarfile.open(tarball_path, "r|*") as tar:
+                for member in tar:
+                    self.add(member.name, with_parents=True)
+        except (tarfile.TarError, OSError) as e:
+            logger.warning(f"Could not read tarball {tarball_path}: {e}")
+
+    def find_substrings(self, patterns):
+        """
+        Find which patterns are substrings of some path in the index
+
+        Args:
+            patterns (iterable): the patterns, e.g. ``/ceph_logs/journal_``
+
+        Returns:
+            set: the patterns found in the paths
+
+        """
+        matcher = SubstringMatcher(patterns)
+        found = set()
+        for path in self.ordered_paths:
+            found |= matcher.search(path)
+            if len(found) == len(matcher.patterns):
+                break
+        return found
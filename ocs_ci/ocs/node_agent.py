@@ -0,0 +1,321 @@
+"""
+Persistent privileged agent on every node
+
+'oc debug node' creates a new debug pod for every command, which takes tens of
+seconds. When ``RUN["node_agent"]`` is enabled, a DaemonSet of privileged
+pods with the host filesystem mounted to /host (the same access the debug pod
+has) is deployed once per session on first use, and OCP.exec_oc_debug_cmd runs
+the commands by 'oc exec' in the agent pod of the node instead. Nodes without
+running agent pod (e.g. just added or not ready) fall back to 'oc debug'.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ocs_ci.framework import config, config_safe_thread_pool_task
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    NodeAgentUnavailable,
+    TimeoutExpiredError,
+)
+from ocs_ci.ocs.ocp import NODE_CMD_ERROR_MARKER, OCP, build_node_cmd
+from ocs_ci.ocs.resources.ocs import OCS
+from ocs_ci.utility import templating
+from ocs_ci.utility.utils import TimeoutSampler
+
+log = logging.getLogger(__name__)
+
+AGENT_NAME = "ocs-ci-node-agent"
+# errors of 'oc exec' meaning the agent pod is gone, not failure of the command
+AGENT_GONE_ERRORS = (
+    "NotFound",
+    "container not found",
+    "unable to upgrade connection",
+    "does not have a host assigned",
+    "is not running",
+)
+
+_agents = {}
+_agents_lock = threading.Lock()
+
+
+def is_node_agent_enabled():
+    """
+    Check whether node commands should be run in the node agent pods
+
+    Returns:
+        bool: True if node agent is enabled in RUN section
+
+    """
+    return bool(config.RUN.get("node_agent"))
+
+
+class NodeAgent(object):
+    """
+    DaemonSet of the agent pods of one cluster and client running commands
+    in them
+    """
+
+    def __init__(self, namespace=constants.NODE_AGENT_NAMESPACE):
+        """
+        Args:
+            namespace (str): namespace of the DaemonSet
+
+        """
+        self.namespace = namespace
+        self.pods = {}
+        self.pods_lock = threading.Lock()
+
+    def _get_image(self):
+        """
+        Get image of the agent, the same tools image 'oc debug node' uses
+        unless configured
+
+        Returns:
+            str: the image
+
+        """
+        image = config.RUN.get("node_agent_image")
+        if image:
+            return image
+        try:
+            tools = OCP(kind="imagestreamtag", namespace="openshift").get(
+                resource_name="tools:latest"
+            )
+            return tools["image"]["dockerImageReference"]
+        except (CommandFailed, KeyError, TypeError) as ex:
+            log.info(f"Tools image stream not available, using default image: {ex}")
+            return None
+
+    def deploy(self, timeout=300):
+        """
+        Deploy the DaemonSet and wait for the agent pods
+
+        Args:
+            timeout (int): time in seconds to wait for the agent pods
+
+        Raises:
+            TimeoutExpiredError: if no agent pod is running in timeout
+
+        """
+        log.info(f"Deploying node agent DaemonSet to namespace {self.namespace}")
+        ocp_obj = OCP(namespace=self.namespace)
+        if not OCP(kind=constants.NAMESPACE).is_exist(resource_name=self.namespace):
+            ocp_obj.exec_oc_cmd(
+                f"create namespace {self.namespace}", out_yaml_format=False
+            )
+        ocp_obj.exec_oc_cmd(
+            f"label namespace {self.namespace} --overwrite "
+            "pod-security.kubernetes.io/enforce=privileged "
+            "security.openshift.io/scc.podSecurityLabelSync=false",
+            out_yaml_format=False,
+        )
+        sa_obj = OCP(kind=constants.SERVICE_ACCOUNT, namespace=self.namespace)
+        if not sa_obj.is_exist(resource_name=AGENT_NAME):
+            ocp_obj.exec_oc_cmd(
+                f"create serviceaccount {AGENT_NAME}", out_yaml_format=False
+            )
+        ocp_obj.exec_oc_cmd(
+            f"adm policy add-scc-to-user {constants.PRIVILEGED} "
+            f"-z {AGENT_NAME} -n {self.namespace}",
+            out_yaml_format=False,
+        )
+        daemonset = templating.load_yaml(constants.NODE_AGENT_DAEMONSET_YAML)
+        daemonset["metadata"]["namespace"] = self.namespace
+        image = self._get_image()
+        if image:
+            daemonset["spec"]["template"]["spec"]["containers"][0]["image"] = image
+        ds_obj = OCP(kind=constants.DAEMONSET, namespace=self.namespace)
+        if not ds_obj.is_exist(resource_name=AGENT_NAME):
+            OCS(**daemonset).create()
+        for pods in TimeoutSampler(timeout, 5, self.refresh_pods):
+            if pods:
+                break
+        log.info(f"Node agent is running on {len(self.pods)} nodes")
+
+    def refresh_pods(self):
+        """
+        Get running and ready agent pods
+
+        Returns:
+            dict: node name: agent pod name
+
+        """
+        pod_list = OCP(kind=constants.POD, namespace=self.namespace).get(
+            selector=constants.NODE_AGENT_LABEL, dont_raise=True
+        )
+        pods = {}
+        for item in (pod_list or {}).get("items", []):
+            status = item.get("status", {})
+            ready = all(
+                container.get("ready")
+                for container in status.get("containerStatuses", [{}])
+            )
+            if (
+                status.get("phase") == constants.STATUS_RUNNING
+                and ready
+                and not item["metadata"].get("deletionTimestamp")
+            ):
+                pods[item["spec"]["nodeName"]] = item["metadata"]["name"]
+        with self.pods_lock:
+            self.pods = pods
+        return pods
+
+    def get_pod(self, node):
+        """
+        Args:
+            node (str): node name
+
+        Returns:
+            str: name of the agent pod on the node
+
+        Raises:
+            NodeAgentUnavailable: if there is no running agent pod on the node
+
+        """
+        with self.pods_lock:
+            pod_name = self.pods.get(node)
+        if pod_name is None:
+            pod_name = self.refresh_pods().get(node)
+        if pod_name is None:
+            raise NodeAgentUnavailable(f"No node agent pod on node {node}")
+        return pod_name
+
+    def exec_cmd(self, node, cmd_list, timeout=300, use_root=True):
+        """
+        Execute the commands on the node in the agent pod
+
+        Args:
+            node (str): Node name where the command to be executed
+            cmd_list (list): List of commands eg: ['cmd1', 'cmd2']
+            timeout (int): timeout of the command
+            use_root (bool): True to run the commands in chroot of the host
+
+        Returns:
+            str: output of the executed command/commands
+
+        Raises:
+            CommandFailed: When failure in command execution
+            NodeAgentUnavailable: if the agent pod isn't available on the node
+
+        """
+        pod_name = self.get_pod(node)
+        exec_cmd = f"exec {pod_name} -- {build_node_cmd(cmd_list, use_root)}"
+        try:
+            out = str(
+                OCP(namespace=self.namespace).exec_oc_cmd(
+                    command=exec_cmd, out_yaml_format=False, timeout=timeout
+                )
+            )
+        except CommandFailed as ex:
+            if any(error in str(ex) for error in AGENT_GONE_ERRORS):
+                with self.pods_lock:
+                    self.pods.pop(node, None)
+                raise NodeAgentUnavailable(
+                    f"Node agent pod {pod_name} on node {node} failed: {ex}"
+                )
+            raise
+        if NODE_CMD_ERROR_MARKER in out:
+            raise CommandFailed
+        return out
+
+    def teardown(self):
+        """
+        Delete the namespace of the agent
+        """
+        log.info(f"Deleting node agent namespace {self.namespace}")
+        OCP(kind=constants.NAMESPACE).delete(resource_name=self.namespace, wait=False)
+        with self.pods_lock:
+            self.pods = {}
+
+
+def get_node_agent(cluster_index=None):
+    """
+    Get node agent of the cluster, it's deployed on first use. If the
+    deployment fails, None is returned for the rest of the session.
+
+    Args:
+        cluster_index (int): index of the cluster in config.clusters, the
+            current cluster is used if not provided
+
+    Returns:
+        NodeAgent: the agent, None if it's not available
+
+    """
+    cluster_index = config.cur_index if cluster_index is None else cluster_index
+    with _agents_lock:
+        if cluster_index not in _agents:
+            agent = NodeAgent()
+            try:
+                with config.RunWithConfigContext(cluster_index):
+                    agent.deploy()
+            except (CommandFailed, TimeoutExpiredError) as ex:
+                log.warning(f"Node agent is not available, using oc debug: {ex}")
+                agent = None
+            _agents[cluster_index] = agent
+        return _agents[cluster_index]
+
+
+def teardown_node_agents():
+    """
+    Delete the node agents deployed in the session
+    """
+    with _agents_lock:
+        agents = [(index, agent) for index, agent in _agents.items() if agent]
+        _agents.clear()
+    for index, agent in agents:
+        with config.RunWithConfigContext(index):
+            try:
+                agent.teardown()
+            except CommandFailed as ex:
+                log.warning(f"Failed to delete node agent: {ex}")
+
+
+def exec_cmd_on_nodes(nodes, cmd_list, timeout=300, use_root=True, max_workers=None):
+    """
+    Execute the commands on many nodes in parallel, by the node agent if
+    enabled, by 'oc debug' otherwise
+
+    Args:
+        nodes (list): node names
+        cmd_list (list): List of commands eg: ['cmd1', 'cmd2']
+        timeout (int): timeout of the command on one node
+        use_root (bool): True to run the commands in chroot of the host
+        max_workers (int): number of nodes the commands run on at once
+
+    Returns:
+        dict: node name: output of the commands
+
+    Raises:
+        CommandFailed: if the commands failed on any node
+
+    """
+    if not nodes:
+        return {}
+    ocp_obj = OCP()
+    results = {}
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(nodes)) as executor:
+        futures = {
+            executor.submit(
+                config_safe_thread_pool_task,
+                config.cur_index,
+                ocp_obj.exec_oc_debug_cmd,
+                node=node,
+                cmd_list=cmd_list,
+                timeout=timeout,
+                use_root=use_root,
+            ): node
+            for node in nodes
+        }
+        for future in as_completed(futures):
+            node = futures[future]
+            try:
+                results[node] = future.result()
+            except CommandFailed as ex:
+                failures[node] = ex
+    if failures:
+        raise CommandFailed(f"Commands {cmd_list} failed on nodes: {failures}")
+    return results
@@ -11,15 +11,16 @@ import tempfile
 import time
 import yaml
 import json
-import copy
 
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
+    NodeAgentUnavailable,
     NotSupportedFunctionError,
     NonUpgradedImagesFoundError,
     ResourceWrongStatusException,
     ResourceNameNotSpecifiedException,
     TimeoutExpiredError,
+    WatchUnavailableError,
 )
 from ocs_ci.utility.proxy import update_kubeconfig_with_proxy_url_for_client
 from ocs_ci.utility.retry import retry, catch_exceptions
@@ -27,12 +28,35 @@ from ocs_ci.utility.utils import TimeoutSampler
 from ocs_ci.utility.utils import exec_cmd, run_cmd, update_container_with_mirrored_image
 from ocs_ci.utility.templating import dump_data_to_temp_yaml, load_yaml
 from ocs_ci.utility import version
-from ocs_ci.ocs import constants
+from ocs_ci.ocs import constants, kube_api_backend, resource_cache, resource_watch
 from ocs_ci.framework import config
 
 
 log = logging.getLogger(__name__)
 
+# printed by the node command when one of its commands failed
+NODE_CMD_ERROR_MARKER = "CMD FAILED"
+
+
+def build_node_cmd(cmd_list, use_root=True):
+    """
+    Build the shell command running the commands on the node by 'oc debug'
+    or 'oc exec' in the node agent pod, with marker printed on failure
+
+    Args:
+        cmd_list (list): List of commands eg: ['cmd1', 'cmd2']
+        use_root (bool): True to run the commands in chroot of the host
+
+    Returns:
+        str: the command to pass after '--' of 'oc debug' or 'oc exec'
+
+    """
+    # Appending one empty value in list for string manipulation
+    create_cmd_list = list(cmd_list) + [" "]
+    cmd = f" || echo '{NODE_CMD_ERROR_MARKER}';".join(create_cmd_list)
+    root_option = " chroot /host /bin/bash -c " if use_root else " /bin/bash -c "
+    return f'{root_option} "{cmd}"'
+
 
 class OCP(object):
     """
@@ -136,6 +160,31 @@ class OCP(object):
         self._data = self.get(silent=silent)
         return self._data
 
+    def get_kubeconfig_path(self):
+        """
+        Get kubeconfig of the cluster the resource belongs to, the same one
+        which is used by exec_oc_cmd
+
+        Returns:
+            str: path to the kubeconfig or None if the default kubeconfig
+                loading rules should be used
+
+        """
+        if self.cluster_kubeconfig and os.path.exists(self.cluster_kubeconfig):
+            return self.cluster_kubeconfig
+        cluster_config = config
+        if self.cluster_context is not None and self.cluster_context < len(
+            config.clusters
+        ):
+            cluster_config = config.clusters[self.cluster_context]
+        cluster_dir_kubeconfig = os.path.join(
+            cluster_config.ENV_DATA["cluster_path"],
+            cluster_config.RUN.get("kubeconfig_location"),
+        )
+        if os.path.exists(cluster_dir_kubeconfig):
+            return cluster_dir_kubeconfig
+        return cluster_config.RUN.get("kubeconfig") or os.getenv("KUBECONFIG")
+
     def reload_data(self):
         """
         Reloading data of OCP object
@@ -198,6 +247,12 @@ class OCP(object):
         kubeconfig_path = (
             self.cluster_kubeconfig if os.path.exists(self.cluster_kubeconfig) else None
         )
+        # kubeconfig the command is executed with, used by the API backend
+        cmd_kubeconfig = (
+            cluster_config.RUN.get("kubeconfig")
+            or config.RUN.get("kubeconfig")
+            or env_kubeconfig
+        )
 
         if kubeconfig_path or not env_kubeconfig or not os.path.exists(env_kubeconfig):
             cluster_dir_kubeconfig = kubeconfig_path or os.path.join(
@@ -206,11 +261,35 @@ class OCP(object):
             )
             if os.path.exists(cluster_dir_kubeconfig):
                 oc_cmd += f"--kubeconfig {cluster_dir_kubeconfig} "
+                cmd_kubeconfig = cluster_dir_kubeconfig
 
         if self.namespace:
             oc_cmd += f"-n {self.namespace} "
         if skip_tls_verify or self.skip_tls_verify:
             command += " --insecure-skip-tls-verify"
+        # Drop cached listings which can be outdated by the command
+        resource_cache.list_cache.invalidate_for_command(command)
+
+        if (
+            out_yaml_format
+            and not kwargs
+            and not output_file
+            and kube_api_backend.is_api_backend_enabled(cluster_config)
+        ):
+            out = kube_api_backend.serve_oc_command(
+                command,
+                namespace=self.namespace,
+                kubeconfig=cmd_kubeconfig,
+                timeout=timeout,
+                ignore_error=ignore_error,
+                secrets=secrets,
+                silent=silent,
+            )
+            if out is not kube_api_backend.NOT_SERVED:
+                resource_cache.list_cache.invalidate_for_command(command)
+                if original_context is not None:
+                    config.switch_ctx(original_context)
+                return out
 
         oc_cmd += command
         out = run_cmd(
@@ -224,6 +303,7 @@ class OCP(object):
             output_file=output_file,
             **kwargs,
         )
+        resource_cache.list_cache.invalidate_for_command(command)
 
         try:
             if out.startswith("hints = "):
@@ -243,7 +323,8 @@ class OCP(object):
         self, node, cmd_list, timeout=300, namespace="default", use_root=True
     ):
         """
-        Function to execute "oc debug" command on OCP node
+        Function to execute "oc debug" command on OCP node, or "oc exec" in the
+        node agent pod on the node if RUN["node_agent"] is enabled
 
         Args:
             node (str): Node name where the command to be executed
@@ -259,23 +340,24 @@ class OCP(object):
         Raises:
             CommandFailed: When failure in command execution
         """
-        # Appending one empty value in list for string manipulation
-        create_cmd_list = copy.deepcopy(cmd_list)
-        create_cmd_list.append(" ")
-        err_msg = "CMD FAILED"
-        if use_root:
-            root_option = " chroot /host /bin/bash -c "
-        else:
-            root_option = " /bin/bash -c "
-        cmd = f" || echo '{err_msg}';".join(create_cmd_list)
+        if config.RUN.get("node_agent"):
+            # Internal import in order to avoid circular import
+            from ocs_ci.ocs.node_agent import get_node_agent
+
+            agent = get_node_agent()
+            if agent:
+                try:
+                    return agent.exec_cmd(node, cmd_list, timeout, use_root)
+                except NodeAgentUnavailable as ex:
+                    log.info(f"{ex}, using oc debug")
         debug_cmd = (
             f"debug nodes/{node} --to-namespace={namespace} "
-            f' -- {root_option} "{cmd}"'
+            f" -- {build_node_cmd(cmd_list, use_root)}"
         )
         out = str(
             self.exec_oc_cmd(command=debug_cmd, out_yaml_format=False, timeout=timeout)
         )
-        if err_msg in out:
+        if NODE_CMD_ERROR_MARKER in out:
             raise CommandFailed
         else:
             return out
@@ -1067,9 +1149,12 @@ class OCP(object):
                 " which describes unexpected error state."
             )
 
+        use_watch = resource_watch.is_watch_wait_enabled()
         # if dont_allow_other_resources or resource_count or error_condition are used, don't try build command with
         # oc wait, but use the old way with oc get and TimeoutSampler
-        if not (dont_allow_other_resources or resource_count or error_condition):
+        if not (
+            use_watch or dont_allow_other_resources or resource_count or error_condition
+        ):
             if not self._process_oc_wait_cmd(column, condition):
                 # continue with legacy approach
                 pass
@@ -1100,6 +1185,22 @@ class OCP(object):
         actual_status = None
 
         try:
+            if use_watch:
+                start_time = time.time()
+                try:
+                    return self._wait_for_resource_watch(
+                        condition=condition,
+                        resource_name=resource_name,
+                        column=column,
+                        selector=selector,
+                        resource_count=resource_count,
+                        timeout=timeout,
+                        dont_allow_other_resources=dont_allow_other_resources,
+                        error_condition=error_condition,
+                    )
+                except WatchUnavailableError as ex:
+                    log.warning(f"{ex}, falling back to polling")
+                    timeout = max(timeout - (time.time() - start_time), sleep)
             for sample in TimeoutSampler(
                 timeout, sleep, self.get, resource_name, True, selector
             ):
@@ -1231,6 +1332,77 @@ class OCP(object):
 
         return False
 
+    def _wait_for_resource_watch(
+        self,
+        condition,
+        resource_name,
+        column,
+        selector,
+        resource_count,
+        timeout,
+        dont_allow_other_resources,
+        error_condition,
+    ):
+        """
+        Watch based implementation of wait_for_resource, see wait_for_resource
+        for description of the arguments. The column values are taken from
+        the server side printed table, the same one 'oc get' prints.
+
+        Returns:
+            bool: True in case all resources reached desired condition
+
+        Raises:
+            TimeoutExpiredError: In case the condition wasn't met in timeout
+            ResourceWrongStatusException: In case a resource is in the error
+                condition
+            WatchUnavailableError: In case the resources can't be watched
+
+        """
+        watcher = resource_watch.ResourceWatch(
+            self.kind,
+            namespace=self.namespace,
+            resource_name=resource_name,
+            selector=None if resource_name else selector,
+            table=True,
+            kubeconfig=self.get_kubeconfig_path(),
+        )
+
+        def _condition(state):
+            if watcher.columns and column not in [c.upper() for c in watcher.columns]:
+                raise WatchUnavailableError(
+                    f"Column {column} is not printed by API for {self.kind}"
+                )
+            statuses = {
+                name: item["columns"].get(column) for name, item in state.items()
+            }
+            for name, status in statuses.items():
+                if error_condition is not None and status == error_condition:
+                    raise ResourceWrongStatusException(
+                        name, column=column, expected=condition, got=status
+                    )
+            in_condition = [
+                name for name, status in statuses.items() if status == condition
+            ]
+            log.debug(f"Status of {self.kind} at column {column}: {statuses}")
+            if resource_name:
+                return resource_name in in_condition
+            if resource_count:
+                if dont_allow_other_resources:
+                    return len(in_condition) == resource_count == len(statuses)
+                return len(in_condition) >= resource_count
+            return bool(statuses) and len(in_condition) == len(statuses)
+
+        watcher.wait(
+            _condition,
+            timeout,
+            description=(
+                f"{self._kind} '{resource_name}' selector {selector} to reach "
+                f"condition {condition} at column {column}"
+            ),
+        )
+        log.info(f"{self._kind} '{resource_name}' reached condition {condition}!")
+        return True
+
     def wait_for_delete(
         self,
         resource_name="",
@@ -1261,6 +1433,31 @@ class OCP(object):
         if config.ENV_DATA["platform"].lower() == constants.IBM_POWER_PLATFORM:
             timeout = 720
         start_time = time.time()
+        resource_name = resource_name or self.resource_name
+        if resource_name and resource_watch.is_watch_wait_enabled():
+            try:
+                watcher = resource_watch.ResourceWatch(
+                    self.kind,
+                    namespace=self.namespace,
+                    resource_name=resource_name,
+                    table=True,
+                    kubeconfig=self.get_kubeconfig_path(),
+                )
+                watcher.wait(
+                    lambda state: resource_name not in state,
+                    timeout,
+                    description=f"{self.kind} {resource_name} to be deleted",
+                )
+                log.info(f"{self.kind} {resource_name} got deleted successfully")
+                return True
+            except WatchUnavailableError as ex:
+                log.warning(f"{ex}, falling back to polling")
+            except TimeoutExpiredError:
+                describe_out = self.describe(resource_name=resource_name)
+                raise TimeoutError(
+                    f"Timeout when waiting for {resource_name} to delete. "
+                    f"Describe output: {describe_out}"
+                )
         while True:
             try:
                 self.get(resource_name=resource_name)
@@ -1432,10 +1629,7 @@ class OCP(object):
             log.info(f"Cannot find resource object {self.resource_name}")
             return False
         try:
-            if self.kind == constants.APPLICATION_ARGOCD:
-                current_phase = data["status"]["operationState"]["phase"]
-            else:
-                current_phase = data["status"]["phase"]
+            current_phase = self._phase_of(data, raise_error=True)
             log.info(f"Resource {self.resource_name} is in phase: {current_phase}!")
             return current_phase == phase
         except KeyError:
@@ -1445,6 +1639,28 @@ class OCP(object):
             )
         return False
 
+    def _phase_of(self, data, raise_error=False):
+        """
+        Get phase from the resource data
+
+        Args:
+            data (dict): resource data
+            raise_error (bool): True to raise KeyError when the phase is
+                missing, None is returned otherwise
+
+        Returns:
+            str: phase of the resource
+
+        """
+        try:
+            if self.kind == constants.APPLICATION_ARGOCD:
+                return data["status"]["operationState"]["phase"]
+            return data["status"]["phase"]
+        except (KeyError, TypeError):
+            if raise_error:
+                raise KeyError("phase")
+            return None
+
     @retry(ResourceWrongStatusException, tries=4, delay=5, backoff=1)
     def wait_for_phase(self, phase, timeout=300, sleep=5):
         """
@@ -1466,6 +1682,31 @@ class OCP(object):
         """
         self.check_function_supported(self._has_phase)
         self.check_name_is_specified()
+        if resource_watch.is_watch_wait_enabled():
+            start_time = time.time()
+            try:
+                watcher = resource_watch.ResourceWatch(
+                    self.kind,
+                    namespace=self.namespace,
+                    resource_name=self.resource_name,
+                    kubeconfig=self.get_kubeconfig_path(),
+                )
+                watcher.wait(
+                    lambda state: self._phase_of(state.get(self.resource_name))
+                    == phase,
+                    timeout,
+                    description=f"{self.kind} {self.resource_name} to reach phase {phase}",
+                )
+                log.info(f"Resource {self.resource_name} is in phase: {phase}!")
+                return
+            except WatchUnavailableError as ex:
+                log.warning(f"{ex}, falling back to polling")
+                timeout = max(timeout - (time.time() - start_time), sleep)
+            except TimeoutExpiredError:
+                raise ResourceWrongStatusException(
+                    f"Resource: {self.resource_name} is not in expected phase: "
+                    f"{phase}"
+                )
         sampler = TimeoutSampler(timeout, sleep, func=self.check_phase, phase=phase)
         if not sampler.wait_for_func_status(True):
             raise ResourceWrongStatusException(
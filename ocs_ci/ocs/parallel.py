@@ -1,8 +1,8 @@
 import logging
+import queue
 import sys
-
-import gevent.pool
-import gevent.queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 log = logging.getLogger(__name__)
 
@@ -44,7 +44,8 @@ class parallel(object):
             for foo in bar:
                 p.spawn(quux, foo, baz=True)
 
-    You can iterate over the results (which are in arbitrary order)::
+    You can iterate over the results, they are streamed in the order the
+    functions complete::
 
         with parallel() as p:
             for foo in bar:
@@ -52,38 +53,74 @@ class parallel(object):
             for result in p:
                 print result
 
+    The functions run in a bounded pool of threads, which suits blocking I/O
+    like subprocess or HTTP calls. CPU bound work (e.g. parsing) can use pool
+    of processes with ``parallel(use_processes=True)``, the functions and
+    their arguments have to be picklable then.
+
     If one of the spawned functions throws an exception, it will be thrown
     when iterating over the results, or when the with block ends.
 
     At the end of the with block, the main thread waits until all
     spawned functions have completed, or, if one exited with an exception,
-    kills the rest and raises the exception.
+    cancels the functions which didn't start yet, waits for the running ones
+    and raises the exception.
     """
 
-    def __init__(self):
-        self.group = gevent.pool.Group()
-        self.results = gevent.queue.Queue()
+    def __init__(self, max_workers=None, use_processes=False):
+        """
+        Args:
+            max_workers (int): maximal number of functions running at once,
+                default of the concurrent.futures executor if not provided
+            use_processes (bool): True to run the functions in pool of
+                processes instead of threads
+
+        """
+        self.use_processes = use_processes
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=max_workers)
+        self.futures = []
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
         self.count = 0
         self.any_spawned = False
+        self.spawning_done = False
+        self.failed = False
         self.iteration_stopped = False
 
     def spawn(self, func, *args, **kwargs):
-        self.count += 1
+        if self.failed:
+            log.debug("Not spawning %s, previous function failed", func)
+            return
+        with self.lock:
+            self.count += 1
         self.any_spawned = True
-        greenlet = self.group.spawn(capture_traceback, func, *args, **kwargs)
-        greenlet.link(self._finish)
+        if self.use_processes:
+            # tracebacks can't be pickled, the exception is taken from future
+            future = self.executor.submit(func, *args, **kwargs)
+        else:
+            future = self.executor.submit(capture_traceback, func, *args, **kwargs)
+        self.futures.append(future)
+        future.add_done_callback(self._finish)
+
+    def cancel(self):
+        """
+        Cancel the spawned functions which didn't start yet
+        """
+        for future in self.futures:
+            future.cancel()
 
     def __enter__(self):
         return self
 
     def __exit__(self, type_, value, traceback):
-        self.group.join()
-
         if value is not None:
+            self.cancel()
+            self.executor.shutdown(wait=True)
             return False
 
         try:
-            # raises if any greenlets exited with an exception
+            # raises if any function exited with an exception
             for result in self:
                 log.debug("result is %s", repr(result))
                 pass
@@ -91,6 +128,8 @@ class parallel(object):
             # Emit message here because traceback gets stomped when we re-raise
             log.exception("Exception in parallel execution")
             raise
+        finally:
+            self.executor.shutdown(wait=True)
         return True
 
     def __iter__(self):
@@ -99,6 +138,13 @@ class parallel(object):
     def __next__(self):
         if not self.any_spawned or self.iteration_stopped:
             raise StopIteration()
+        with self.lock:
+            # functions finished before the iteration started don't know
+            # that no more functions will be spawned
+            if not self.spawning_done:
+                self.spawning_done = True
+                if self.count <= 0:
+                    self.results.put(StopIteration())
         result = self.results.get()
 
         try:
@@ -106,15 +152,23 @@ class parallel(object):
         except StopIteration:
             self.iteration_stopped = True
             raise
+        except Exception:
+            self.cancel()
+            raise
 
         return result
 
-    def _finish(self, greenlet):
-        if greenlet.successful():
-            self.results.put(greenlet.value)
-        else:
-            self.results.put(greenlet.exception)
-
-        self.count -= 1
-        if self.count <= 0:
-            self.results.put(StopIteration())
+    def _finish(self, future):
+        if not future.cancelled():
+            exception = future.exception()
+            result = future.result() if exception is None else exception
+            if exception is not None or isinstance(result, ExceptionHolder):
+                # cancel the rest as soon as the first function fails
+                self.failed = True
+                self.cancel()
+            self.results.put(result)
+
+        with self.lock:
+            self.count -= 1
+            if self.count <= 0 and self.spawning_done:
+                self.results.put(StopIteration())
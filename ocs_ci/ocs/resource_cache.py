@@ -0,0 +1,333 @@
+"""
+Process wide cache of resource listings
+
+Helpers like get_all_pods, get_pods_having_label, get_osd_pods or
+CephCluster.scan_cluster list the same namespace many times within a second.
+When ``RUN["list_cache_mode"]`` is set, the list results are cached per
+cluster (kubeconfig), kind, namespace, label selector and field selector:
+
+* "ttl" - an entry is valid for ``RUN["list_cache_ttl"]`` seconds
+* "watch" - an entry is valid until the watch of the kind and namespace
+  reports a change, the TTL is used only when the watch is not running
+
+Listings with a simple equality label selector (e.g. app=rook-ceph-osd) are
+served from the cached listing of the whole namespace if there is one.
+Any mutating 'oc' command executed via OCP.exec_oc_cmd drops all entries.
+Callers which need strong freshness pass fresh=True.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import WatchUnavailableError
+
+log = logging.getLogger(__name__)
+
+LIST_CACHE_MODE_TTL = "ttl"
+LIST_CACHE_MODE_WATCH = "watch"
+DEFAULT_LIST_CACHE_TTL = 5
+
+# 'oc' verbs which don't modify any resource
+READ_ONLY_VERBS = {
+    "get",
+    "describe",
+    "logs",
+    "wait",
+    "rsh",
+    "exec",
+    "cp",
+    "rsync",
+    "whoami",
+    "version",
+    "api-resources",
+    "api-versions",
+    "explain",
+    "status",
+}
+
+
+def get_list_cache_mode():
+    """
+    Get the configured mode of the list cache
+
+    Returns:
+        str: "ttl", "watch" or None if the cache is disabled
+
+    """
+    return config.RUN.get("list_cache_mode")
+
+
+def match_label_selector(labels, selector):
+    """
+    Match labels against simple equality based label selector
+
+    Args:
+        labels (dict): labels of the resource
+        selector (str): label selector like 'app=rook-ceph-osd,osd=1'
+
+    Returns:
+        bool: True if all requirements of the selector are met, None if the
+            selector is not a simple equality selector and can't be evaluated
+            locally
+
+    """
+    labels = labels or {}
+    for requirement in selector.split(","):
+        requirement = requirement.strip()
+        if not requirement or any(char in requirement for char in "()! "):
+            return None
+        key, sep, value = requirement.partition("==")
+        if not sep:
+            key, sep, value = requirement.partition("=")
+        if not sep or "=" in value or not key:
+            return None
+        if labels.get(key) != value:
+            return False
+    return True
+
+
+class ResourceListCache(object):
+    """
+    Cache of resource listings with hit/miss statistics
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._watchers = {}
+        self._stop_event = threading.Event()
+        self.stats = defaultdict(lambda: {"hits": 0, "misses": 0, "bypassed": 0})
+
+    @staticmethod
+    def _stats_key(kind, namespace, selector, field_selector):
+        return f"{kind}/{namespace or '*'}/{selector or ''}/{field_selector or ''}"
+
+    def _is_valid(self, entry, context, kind, namespace):
+        """
+        Check whether the cache entry can be used
+        """
+        stored_at, _ = entry
+        if get_list_cache_mode() == LIST_CACHE_MODE_WATCH:
+            watcher = self._watchers.get((context, kind.lower(), namespace))
+            if watcher and watcher.is_alive():
+                return True
+        ttl = config.RUN.get("list_cache_ttl", DEFAULT_LIST_CACHE_TTL)
+        return time.time() - stored_at < ttl
+
+    def _lookup(self, context, kind, namespace, selector, field_selector):
+        """
+        Find cached items for the listing, the whole namespace listing is
+        filtered locally for simple equality label selectors
+
+        Returns:
+            list: cached items or None
+
+        """
+        key = (context, kind.lower(), namespace, selector, field_selector)
+        entry = self._entries.get(key)
+        if entry and self._is_valid(entry, context, kind, namespace):
+            return entry[1]
+        if selector and not field_selector:
+            entry = self._entries.get((context, kind.lower(), namespace, None, None))
+            if entry and self._is_valid(entry, context, kind, namespace):
+                items = []
+                for item in entry[1]:
+                    matched = match_label_selector(
+                        item.get("metadata", {}).get("labels"), selector
+                    )
+                    if matched is None:
+                        return None
+                    if matched:
+                        items.append(item)
+                return items
+        return None
+
+    def get_list(
+        self,
+        ocp_obj,
+        selector=None,
+        field_selector=None,
+        fresh=False,
+        **get_kwargs,
+    ):
+        """
+        Get listing of resources of the OCP object, the same one which is
+        returned by ocp_obj.get(selector=selector) for list requests
+
+        Args:
+            ocp_obj (OCP): OCP object of the kind and namespace to list
+            selector (str): label selector
+            field_selector (str): field selector
+            fresh (bool): True to bypass the cache and list the resources
+                from the cluster, the result is stored to the cache
+            get_kwargs (dict): additional arguments of OCP.get
+
+        Returns:
+            dict: List with the 'items' of the listed resources
+
+        """
+        mode = get_list_cache_mode()
+        selector = selector or ocp_obj.selector
+        field_selector = field_selector or ocp_obj.field_selector
+        kind, namespace = ocp_obj.kind, ocp_obj.namespace
+        stats_key = self._stats_key(kind, namespace, selector, field_selector)
+        if not mode:
+            return ocp_obj.get(
+                selector=selector, field_selector=field_selector, **get_kwargs
+            )
+        context = ocp_obj.get_kubeconfig_path()
+        with self._lock:
+            if fresh:
+                self.stats[stats_key]["bypassed"] += 1
+            else:
+                items = self._lookup(context, kind, namespace, selector, field_selector)
+                if items is not None:
+                    self.stats[stats_key]["hits"] += 1
+                    return {
+                        "apiVersion": "v1",
+                        "kind": "List",
+                        "items": copy.deepcopy(items),
+                    }
+                self.stats[stats_key]["misses"] += 1
+        data = ocp_obj.get(
+            selector=selector, field_selector=field_selector, **get_kwargs
+        )
+        with self._lock:
+            self._entries[
+                (context, kind.lower(), namespace, selector, field_selector)
+            ] = (time.time(), copy.deepcopy(data.get("items") or []))
+        if mode == LIST_CACHE_MODE_WATCH:
+            self._ensure_watcher(context, kind, namespace)
+        return data
+
+    def invalidate(self, context=None, kind=None, namespace=None):
+        """
+        Drop cached entries matching the arguments, all entries are dropped
+        when called without arguments
+
+        Args:
+            context (str): kubeconfig of the cluster
+            kind (str): kind of the resources
+            namespace (str): namespace of the resources, entries of all
+                namespaces listing of the kind are dropped as well
+
+        """
+        with self._lock:
+            for key in list(self._entries):
+                entry_context, entry_kind, entry_namespace = key[:3]
+                if context is not None and entry_context != context:
+                    continue
+                if kind is not None and entry_kind != kind.lower():
+                    continue
+                if namespace is not None and entry_namespace not in (
+                    namespace,
+                    None,
+                ):
+                    continue
+                del self._entries[key]
+
+    def invalidate_for_command(self, command):
+        """
+        Drop all entries if the 'oc' command can modify resources, called
+        before and after the command is executed
+
+        Args:
+            command (str): oc command without the initial 'oc'
+
+        """
+        if not self._entries:
+            return
+        verb = command.split(maxsplit=1)[0] if command.strip() else ""
+        if verb not in READ_ONLY_VERBS:
+            self.invalidate()
+
+    def _ensure_watcher(self, context, kind, namespace):
+        """
+        Start background watch which invalidates entries of the kind and
+        namespace on every change
+        """
+        key = (context, kind.lower(), namespace)
+        with self._lock:
+            watcher = self._watchers.get(key)
+            if watcher and watcher.is_alive():
+                return
+            watcher = threading.Thread(
+                target=self._watch_loop,
+                args=(context, kind, namespace),
+                name=f"list-cache-watch-{kind.lower()}-{namespace}",
+                daemon=True,
+            )
+            self._watchers[key] = watcher
+            watcher.start()
+
+    def _watch_loop(self, context, kind, namespace):
+        """
+        Invalidate entries of the kind and namespace on every watch event,
+        when the watch is not available the entries expire by TTL
+        """
+        # imported here to avoid circular import via ocs_ci.ocs.ocp
+        from ocs_ci.ocs.resource_watch import ResourceWatch
+
+        try:
+            watch = ResourceWatch(
+                kind, namespace=namespace, table=True, kubeconfig=context
+            )
+            watch.relist(60)
+            self.invalidate(context, kind, namespace)
+            while not self._stop_event.is_set():
+                for event in watch.backend.watch(
+                    watch.path, watch.resource_version, 300, **watch.request_params
+                ):
+                    if not watch.apply_event(event):
+                        watch.relist(60)
+                        self.invalidate(context, kind, namespace)
+                    elif event.get("type") != "BOOKMARK":
+                        self.invalidate(context, kind, namespace)
+                    if self._stop_event.is_set():
+                        break
+        except WatchUnavailableError as ex:
+            log.warning(f"List cache falls back to TTL for {kind}: {ex}")
+        except Exception as ex:
+            log.warning(f"List cache watch of {kind} stopped: {ex}")
+        finally:
+            self.invalidate(context, kind, namespace)
+
+    def stop_watchers(self):
+        """
+        Stop the background watches
+        """
+        self._stop_event.set()
+        with self._lock:
+            self._watchers.clear()
+
+    def format_stats(self):
+        """
+        Format hit/miss statistics of the cache
+
+        Returns:
+            str: table with statistics per kind/namespace/selector
+
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        lines = [f"{'listing':<80} {'hits':>8} {'misses':>8} {'bypassed':>8}"]
+        total = {"hits": 0, "misses": 0, "bypassed": 0}
+        for key, values in sorted(stats.items()):
+            lines.append(
+                f"{key:<80} {values['hits']:>8} {values['misses']:>8} "
+                f"{values['bypassed']:>8}"
+            )
+            for name in total:
+                total[name] += values[name]
+        lines.append(
+            f"{'total':<80} {total['hits']:>8} {total['misses']:>8} "
+            f"{total['bypassed']:>8}"
+        )
+        return "\n".join(lines)
+
+
+list_cache = ResourceListCache()
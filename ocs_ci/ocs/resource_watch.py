@@ -0,0 +1,269 @@
+"""
+Watch based wait engine
+
+Waiting helpers like OCP.wait_for_resource poll full 'oc get -o yaml' listings
+in a sleep loop. With ``RUN["wait_mode"] = "watch"`` they use ResourceWatch
+instead: the resources of the kind, namespace and selector are listed once and
+then kept up to date from the stream of watch events of the Kubernetes API,
+so the wait condition is evaluated incrementally on every change without
+re-listing the resources.
+
+ResourceWatch raises WatchUnavailableError when the resources can't be
+watched (API client can't be created, kind can't be resolved, watch is
+forbidden, ...) so the caller can fall back to polling.
+"""
+
+import logging
+import time
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import kube_api_backend
+from ocs_ci.ocs.exceptions import (
+    CommandFailed,
+    TimeoutExpiredError,
+    WatchUnavailableError,
+)
+
+log = logging.getLogger(__name__)
+
+WAIT_MODE_POLL = "poll"
+WAIT_MODE_WATCH = "watch"
+
+# Request server side printed table, the same one 'oc get' prints, with
+# metadata of the objects. Plain JSON is the fallback for APIs which don't
+# support table output.
+TABLE_ACCEPT_HEADER = (
+    "application/json;as=Table;v=v1;g=meta.k8s.io,"
+    "application/json;as=Table;v=v1beta1;g=meta.k8s.io,"
+    "application/json"
+)
+# Number of consecutive failures of the watch stream before giving up
+MAX_WATCH_FAILURES = 3
+
+
+def is_watch_wait_enabled(cluster_config=None):
+    """
+    Check whether waits should use the watch based engine
+
+    Args:
+        cluster_config (MultiClusterConfig): cluster config to read the RUN
+            section from, current cluster config is used if not provided
+
+    Returns:
+        bool: True if watch wait mode is selected in RUN section
+
+    """
+    cluster_config = cluster_config or config
+    return cluster_config.RUN.get("wait_mode", WAIT_MODE_POLL) == WAIT_MODE_WATCH
+
+
+class ResourceWatch(object):
+    """
+    Local view of resources of a kind kept up to date by watch events
+
+    The state passed to the condition function is a dict of resource name to
+    resource. With table=False the resource is the full object as returned by
+    'oc get -o yaml'. With table=True it is a dict with 'metadata' of the
+    object and 'columns' - dict of upper case column name (as printed by
+    'oc get') to the string value of the cell.
+    """
+
+    def __init__(
+        self,
+        kind,
+        namespace=None,
+        resource_name=None,
+        selector=None,
+        field_selector=None,
+        table=False,
+        kubeconfig=None,
+    ):
+        """
+        Args:
+            kind (str): kind of the resources, as used in 'oc' commands
+            namespace (str): namespace of the resources, None for cluster
+                scoped resources or all namespaces
+            resource_name (str): watch only the resource with this name
+            selector (str): label selector of the resources
+            field_selector (str): field selector of the resources
+            table (bool): True to watch server side printed table rows
+                instead of full objects
+            kubeconfig (str): kubeconfig of the cluster
+
+        Raises:
+            WatchUnavailableError: In case the API client can't be created or
+                the kind can't be resolved
+
+        """
+        if resource_name:
+            name_selector = f"metadata.name={resource_name}"
+            field_selector = (
+                f"{field_selector},{name_selector}" if field_selector else name_selector
+            )
+        self.kind = kind
+        self.selector = selector
+        self.field_selector = field_selector
+        self.table = table
+        self.state = {}
+        self.columns = []
+        self.resource_version = None
+        try:
+            self.backend = kube_api_backend.get_api_backend(kubeconfig=kubeconfig)
+            self.resource = self.backend.resolve_resource(kind)
+        except Exception as ex:
+            raise WatchUnavailableError(f"Unable to watch {kind}: {ex}")
+        namespace = namespace if self.resource.namespaced else None
+        self.path = self.resource.path(namespace=namespace)
+        self.request_params = {
+            "label_selector": selector,
+            "field_selector": field_selector,
+        }
+        if table:
+            self.request_params["header_params"] = {"Accept": TABLE_ACCEPT_HEADER}
+
+    def _row_to_item(self, row):
+        """
+        Convert row of the server side printed table to the state item
+        """
+        return {
+            "metadata": row.get("object", {}).get("metadata", {}),
+            "columns": {
+                column.upper(): str(cell)
+                for column, cell in zip(self.columns, row.get("cells", []))
+            },
+        }
+
+    def _items_of(self, obj):
+        """
+        Get (name, item) pairs from the listed or watched object
+        """
+        if not self.table:
+            if obj.get("kind", "").endswith("List"):
+                return [
+                    (item["metadata"]["name"], item) for item in obj.get("items", [])
+                ]
+            return [(obj["metadata"]["name"], obj)]
+        if obj.get("kind") != "Table":
+            raise WatchUnavailableError(
+                f"API of {self.kind} doesn't support table output"
+            )
+        if obj.get("columnDefinitions"):
+            self.columns = [column["name"] for column in obj["columnDefinitions"]]
+        pairs = []
+        for row in obj.get("rows") or []:
+            item = self._row_to_item(row)
+            pairs.append((item["metadata"].get("name"), item))
+        return pairs
+
+    def relist(self, timeout):
+        """
+        List the resources and reset the local state
+
+        Args:
+            timeout (int): request timeout in seconds
+
+        Raises:
+            WatchUnavailableError: In case the resources can't be listed
+
+        """
+        try:
+            data = self.backend.request(
+                "get", self.path, max(int(timeout), 1), **self.request_params
+            )
+        except CommandFailed as ex:
+            raise WatchUnavailableError(f"Unable to list {self.kind}: {ex}")
+        self.state = dict(self._items_of(data))
+        self.resource_version = data.get("metadata", {}).get("resourceVersion")
+
+    def apply_event(self, event):
+        """
+        Apply single watch event to the local state
+
+        Args:
+            event (dict): decoded watch event
+
+        Returns:
+            bool: False if the local state has to be re-listed (the resource
+                version expired), True otherwise
+
+        """
+        event_type = event.get("type")
+        obj = event.get("object") or {}
+        if event_type == "ERROR":
+            log.debug(f"Watch of {self.kind} returned error: {obj.get('message')}")
+            return False
+        resource_version = obj.get("metadata", {}).get("resourceVersion")
+        if event_type == "BOOKMARK":
+            self.resource_version = resource_version or self.resource_version
+            return True
+        for name, item in self._items_of(obj):
+            if event_type == "DELETED":
+                self.state.pop(name, None)
+            else:
+                self.state[name] = item
+            resource_version = (
+                item.get("metadata", {}).get("resourceVersion") or resource_version
+            )
+        self.resource_version = resource_version or self.resource_version
+        return True
+
+    def wait(self, condition_func, timeout, description=""):
+        """
+        Wait until the condition function returns truthy value for the local
+        state of the watched resources
+
+        Args:
+            condition_func (function): function accepting the state dict, it
+                can raise an exception to abort the wait
+            timeout (int): time in seconds to wait
+            description (str): description of the wait for the log messages
+
+        Returns:
+            The truthy value returned by the condition function
+
+        Raises:
+            TimeoutExpiredError: In case the condition wasn't met in timeout
+            WatchUnavailableError: In case the resources can't be watched
+
+        """
+        description = description or f"{self.kind} condition"
+        log.info(
+            f"Waiting up to {timeout}s for {description} using watch of {self.kind}"
+            f" selector: {self.selector}, field selector: {self.field_selector}"
+        )
+        end_time = time.time() + timeout
+        self.relist(timeout)
+        failures = 0
+        while True:
+            result = condition_func(self.state)
+            if result:
+                return result
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                break
+            try:
+                for event in self.backend.watch(
+                    self.path, self.resource_version, remaining, **self.request_params
+                ):
+                    if not self.apply_event(event):
+                        self.relist(end_time - time.time())
+                    result = condition_func(self.state)
+                    if result:
+                        return result
+                    if time.time() >= end_time:
+                        break
+                failures = 0
+            except WatchUnavailableError:
+                raise
+            except Exception as ex:
+                failures += 1
+                log.warning(f"Watch of {self.kind} was interrupted: {ex}")
+                if failures >= MAX_WATCH_FAILURES:
+                    raise WatchUnavailableError(
+                        f"Watch of {self.kind} failed {failures} times: {ex}"
+                    )
+                if time.time() < end_time:
+                    self.relist(end_time - time.time())
+        raise TimeoutExpiredError(
+            timeout, f"Timed out after {timeout}s waiting for {description}"
+        )
@@ -34,11 +34,14 @@ from ocs_ci.ocs.exceptions import (
     TimeoutException,
     NoRunningCephToolBoxException,
     TolerationNotFoundException,
+    WatchUnavailableError,
 )
 
 from ocs_ci.ocs.utils import setup_ceph_toolbox, get_pod_name_by_pattern
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.ocs.resources.job import get_job_obj, get_jobs_with_prefix
+from ocs_ci.ocs.resource_cache import list_cache
+from ocs_ci.ocs.resource_watch import ResourceWatch, is_watch_wait_enabled
 from ocs_ci.utility import templating
 from ocs_ci.utility.utils import (
     get_primary_nb_db_pod,
@@ -376,6 +379,18 @@ class Pod(OCS):
         """
         if "rook-ceph-tools" not in self.labels.values():
             raise CommandFailed("Ceph commands can be executed only on toolbox pod")
+        # imported here to avoid circular dependency
+        from ocs_ci.ocs.resources import toolbox_session
+
+        if toolbox_session.is_toolbox_session_enabled():
+            session = toolbox_session.get_toolbox_session()
+            if session.toolbox and session.toolbox.name == self.name:
+                return session.exec_ceph_cmd(
+                    ceph_cmd,
+                    format=format,
+                    out_yaml_format=out_yaml_format,
+                    timeout=timeout,
+                )
         ceph_cmd = ceph_cmd
         if format:
             ceph_cmd += f" --format {format}"
@@ -783,6 +798,7 @@ def get_all_pods(
     wait=False,
     field_selector=None,
     cluster_kubeconfig="",
+    fresh=False,
 ):
     """
     Get all pods in a namespace.
@@ -798,6 +814,8 @@ def get_all_pods(
             '=', '==', and '!='. (e.g. status.phase=Running)
         wait (bool): True if you want to wait for the pods to be Running
         cluster_kubeconfig (str): Path to the kubeconfig file for the cluster
+        fresh (bool): True to bypass the list cache and get the pods from
+            the cluster
 
     Returns:
         list: List of Pod objects
@@ -817,7 +835,7 @@ def get_all_pods(
         wait_time = 180
         logger.info(f"Waiting for {wait_time}s for the pods to stabilize")
         time.sleep(wait_time)
-    pods = ocp_pod_obj.get()["items"]
+    pods = list_cache.get_list(ocp_pod_obj, fresh=fresh)["items"]
     if selector:
         if exclude_selector:
             pods_new = [
@@ -1667,6 +1685,7 @@ def get_pods_having_label(
     retry=0,
     cluster_config=None,
     statuses=None,
+    fresh=False,
 ):
     """
     Fetches pod resources with given label in given namespace
@@ -1678,15 +1697,22 @@ def get_pods_having_label(
             specif cluster config
         statuses (list): List of pod statuses. Fetch only pods in any of the status mentioned
             in the statuses list
+        fresh (bool): True to bypass the list cache and get the pods from
+            the cluster
     Return:
         list: of pods info
 
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
     ocp_pod = OCP(kind=constants.POD, namespace=namespace)
-    pods = ocp_pod.get(selector=label, retry=retry, cluster_config=cluster_config).get(
-        "items"
-    )
+    if cluster_config:
+        pods = ocp_pod.get(
+            selector=label, retry=retry, cluster_config=cluster_config
+        ).get("items")
+    else:
+        pods = list_cache.get_list(
+            ocp_pod, selector=label, fresh=fresh, retry=retry
+        ).get("items")
     if statuses:
         for pod in pods:
             if pod["status"]["phase"] not in statuses:
@@ -1729,7 +1755,7 @@ def get_mds_pods(mds_label=constants.MDS_APP_LABEL, namespace=None):
     return mds_pods
 
 
-def get_mon_pods(mon_label=constants.MON_APP_LABEL, namespace=None):
+def get_mon_pods(mon_label=constants.MON_APP_LABEL, namespace=None, fresh=False):
     """
     Fetches info about mon pods in the cluster
 
@@ -1738,12 +1764,14 @@ def get_mon_pods(mon_label=constants.MON_APP_LABEL, namespace=None):
             (default: defaults.MON_APP_LABEL)
         namespace (str): Namespace in which ceph cluster lives
             (default: config.ENV_DATA["cluster_namespace"])
+        fresh (bool): True to bypass the list cache and get the pods from
+            the cluster
 
     Returns:
         list : of mon pod objects
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
-    mons = get_pods_having_label(mon_label, namespace)
+    mons = get_pods_having_label(mon_label, namespace, fresh=fresh)
     mon_pods = [Pod(**mon) for mon in mons]
     return mon_pods
 
@@ -1767,7 +1795,7 @@ def get_mgr_pods(mgr_label=constants.MGR_APP_LABEL, namespace=None):
     return mgr_pods
 
 
-def get_osd_pods(osd_label=constants.OSD_APP_LABEL, namespace=None):
+def get_osd_pods(osd_label=constants.OSD_APP_LABEL, namespace=None, fresh=False):
     """
     Fetches info about osd pods in the cluster
 
@@ -1776,12 +1804,14 @@ def get_osd_pods(osd_label=constants.OSD_APP_LABEL, namespace=None):
             (default: defaults.OSD_APP_LABEL)
         namespace (str): Namespace in which ceph cluster lives
             (default: config.ENV_DATA["cluster_namespace"])
+        fresh (bool): True to bypass the list cache and get the pods from
+            the cluster
 
     Returns:
         list : of osd pod objects
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
-    osds = get_pods_having_label(osd_label, namespace)
+    osds = get_pods_having_label(osd_label, namespace, fresh=fresh)
     osd_pods = [Pod(**osd) for osd in osds]
     return osd_pods
 
@@ -2628,6 +2658,72 @@ def get_pod_restarts_count(namespace=None, label=None, list_of_pods=None):
     return restart_dict
 
 
+def _skip_pod_in_running_check(pod_name, labels):
+    """
+    Check whether the pod should be skipped when checking that all the pods
+    are in Running state
+
+    Args:
+        pod_name (str): name of the pod
+        labels (dict): labels of the pod
+
+    Returns:
+        bool: True if the pod should be skipped
+
+    """
+    # we don't want to compare osd-prepare and canary pods as they get created freshly when an osd need to be added.
+    # Also skip CatalogSource pods (managed by OLM) — they may be Pending
+    # when nodes are tainted with custom taints that lack matching tolerations
+    # on the CatalogSource resource.
+    return (
+        ("rook-ceph-osd-prepare" in pod_name)
+        or ("rook-ceph-drain-canary" in pod_name)
+        or ("debug" in pod_name)
+        or (constants.REPORT_STATUS_TO_PROVIDER_POD in pod_name)
+        or ("status-reporter" in pod_name)
+        or bool((labels or {}).get("olm.catalogSource"))
+    )
+
+
+def _wait_for_pods_watch(
+    namespace, condition, timeout, selector=None, cluster_kubeconfig="", description=""
+):
+    """
+    Wait for the pods condition using watch of the pods instead of polling
+
+    Args:
+        namespace (str): namespace of the pods
+        condition (function): function accepting dict of pod name to the
+            pod table row with 'metadata' and 'columns' keys
+        timeout (int): time in seconds to wait
+        selector (str): label selector of the pods
+        cluster_kubeconfig (str): The kubeconfig file to use
+        description (str): description of the wait for log messages
+
+    Returns:
+        bool: True if the condition was met, False in case of timeout
+
+    Raises:
+        WatchUnavailableError: In case the pods can't be watched
+
+    """
+    kubeconfig = OCP(
+        kind=constants.POD, namespace=namespace, cluster_kubeconfig=cluster_kubeconfig
+    ).get_kubeconfig_path()
+    watcher = ResourceWatch(
+        constants.POD,
+        namespace=namespace,
+        selector=selector,
+        table=True,
+        kubeconfig=kubeconfig,
+    )
+    try:
+        watcher.wait(condition, timeout, description=description)
+        return True
+    except TimeoutExpiredError:
+        return False
+
+
 def check_pods_in_running_state(
     namespace=None,
     pod_names=None,
@@ -2669,18 +2765,7 @@ def check_pods_in_running_state(
         kind=constants.POD, namespace=namespace, cluster_kubeconfig=cluster_kubeconfig
     )
     for p in list_of_pods:
-        # we don't want to compare osd-prepare and canary pods as they get created freshly when an osd need to be added.
-        # Also skip CatalogSource pods (managed by OLM) — they may be Pending
-        # when nodes are tainted with custom taints that lack matching tolerations
-        # on the CatalogSource resource.
-        if (
-            ("rook-ceph-osd-prepare" not in p.name)
-            and ("rook-ceph-drain-canary" not in p.name)
-            and ("debug" not in p.name)
-            and (constants.REPORT_STATUS_TO_PROVIDER_POD not in p.name)
-            and ("status-reporter" not in p.name)
-            and not p.get_labels().get("olm.catalogSource")
-        ):
+        if not _skip_pod_in_running_check(p.name, p.get_labels()):
             status = ocp_pod_obj.get_resource(p.name, "STATUS")
             if skip_for_status:
                 if status in skip_for_status:
@@ -2800,6 +2885,49 @@ def wait_for_pods_to_be_running(
 
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    if is_watch_wait_enabled():
+        start_time = time.time()
+
+        def _all_running(state):
+            if pod_names:
+                missing = set(pod_names) - set(state)
+                if missing and raise_pod_not_found_error:
+                    logger.info(f"Pods {missing} were not found")
+                    return False
+                state = {name: state[name] for name in pod_names if name in state}
+            for name, item in state.items():
+                if _skip_pod_in_running_check(name, item["metadata"].get("labels")):
+                    continue
+                status = item["columns"].get("STATUS")
+                if skip_for_status and status in skip_for_status:
+                    continue
+                if (
+                    status == constants.STATUS_COMPLETED
+                    and not pod_names
+                    and namespace == config.ENV_DATA["cluster_namespace"]
+                ):
+                    continue
+                if status != constants.STATUS_RUNNING:
+                    return False
+            return True
+
+        try:
+            if _wait_for_pods_watch(
+                namespace,
+                _all_running,
+                timeout,
+                cluster_kubeconfig=cluster_kubeconfig,
+                description="pods to be running",
+            ):
+                logger.info("All the pods reached status running!")
+                return True
+            logger.warning(
+                f"Not all the pods reached status running after {timeout} seconds"
+            )
+            return False
+        except WatchUnavailableError as ex:
+            logger.warning(f"{ex}, falling back to polling")
+            timeout = max(timeout - (time.time() - start_time), sleep)
     try:
         for pods_running in TimeoutSampler(
             timeout=timeout,
@@ -2843,6 +2971,25 @@ def wait_for_pods_by_label_count(
 
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    if is_watch_wait_enabled():
+        start_time = time.time()
+        try:
+            if _wait_for_pods_watch(
+                namespace,
+                lambda state: len(state) == expected_count,
+                timeout,
+                selector=label,
+                description=f"{expected_count} pods with selector {label}",
+            ):
+                logger.info(f"Found {expected_count} pods with selector {label}")
+                return True
+            logger.warning(
+                f"The expected number of pods was not met after {timeout} seconds"
+            )
+            return False
+        except WatchUnavailableError as ex:
+            logger.warning(f"{ex}, falling back to polling")
+            timeout = max(timeout - (time.time() - start_time), sleep)
     try:
         for pods_count in TimeoutSampler(
             timeout=timeout,
@@ -4085,6 +4232,23 @@ def wait_for_pods_deletion(label, timeout=120, sleep=5, namespace=None):
 
     """
     namespace = namespace or config.ENV_DATA["cluster_namespace"]
+    if is_watch_wait_enabled():
+        start_time = time.time()
+        try:
+            if not _wait_for_pods_watch(
+                namespace,
+                lambda state: not state,
+                timeout,
+                selector=label,
+                description=f"pods with label {label} to be deleted",
+            ):
+                logger.error(
+                    f"Pods with label {label} were not deleted after {timeout} seconds"
+                )
+            return
+        except WatchUnavailableError as ex:
+            logger.warning(f"{ex}, falling back to polling")
+            timeout = max(timeout - (time.time() - start_time), sleep)
 
     def _check_if_pod_deleted(label, namespace):
         return len(get_pods_having_label(label, namespace)) == 0
@@ -1,6 +1,9 @@
 import logging
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 logger = logging.getLogger(__name__)
 
@@ -9,6 +12,25 @@ logger = logging.getLogger(__name__)
 # 1GB memory usage
 MAX_OBJS_TO_KEEP_IN_MEMORY = 150000
 
+# Error codes of S3 responses meaning the request should be sent again later
+THROTTLING_ERROR_CODES = (
+    "SlowDown",
+    "503",
+    "ServiceUnavailable",
+    "RequestLimitExceeded",
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequests",
+)
+# Seconds to wait before the first retry of throttled batch, doubled for
+# every next attempt up to THROTTLING_MAX_BACKOFF
+THROTTLING_BACKOFF = 1
+THROTTLING_MAX_BACKOFF = 30
+# Attempts to delete throttled batch before its objects are reported as failed
+THROTTLING_MAX_ATTEMPTS = 8
+# Number of partitions of the bucket listed concurrently
+LIST_WORKERS = 8
+
 
 class S3BatchDeleter:
     """
@@ -52,10 +74,17 @@ class S3BatchDeleter:
         if not all_errors:
             return
         logger.warning(f"{len(all_errors)} objects failed to delete, retrying once...")
-        failed_keys = [e["Key"] for e in all_errors]
+        failed_objects = [
+            (
+                {"Key": e["Key"], "VersionId": e["VersionId"]}
+                if e.get("VersionId")
+                else {"Key": e["Key"]}
+            )
+            for e in all_errors
+        ]
         retry_batches = [
-            [{"Key": k} for k in failed_keys[i : i + self.MAX_BATCH_SIZE]]
-            for i in range(0, len(failed_keys), self.MAX_BATCH_SIZE)
+            failed_objects[i : i + self.MAX_BATCH_SIZE]
+            for i in range(0, len(failed_objects), self.MAX_BATCH_SIZE)
         ]
 
         final_errors = []
@@ -96,7 +125,113 @@ class S3BatchDeleter:
         logger.info(f"Deleted {total_deleted} objects from bucket '{self.bucket_name}'")
         self._retry_failed(all_errors)
 
-    def delete_in_parallel(self):
+    def _is_versioned(self):
+        """
+        Check whether the bucket has (or had) versioning enabled
+
+        Returns:
+            bool: True if versions of the objects have to be deleted
+
+        """
+        response = self.s3_client.get_bucket_versioning(Bucket=self.bucket_name)
+        return response.get("Status") in ("Enabled", "Suspended")
+
+    def _list_partitions(self, versioned):
+        """
+        Get the partitions of the bucket listed in parallel: the top level
+        prefixes and the objects without the delimiter
+
+        Args:
+            versioned (bool): True to list object versions
+
+        Returns:
+            list: tuples of prefix and delimiter of the partitions
+
+        """
+        operation = "list_object_versions" if versioned else "list_objects_v2"
+        paginator = self.s3_client.get_paginator(operation)
+        prefixes = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Delimiter="/"):
+            prefixes.extend(
+                prefix["Prefix"] for prefix in page.get("CommonPrefixes", [])
+            )
+        return [("", "/")] + [(prefix, "") for prefix in prefixes]
+
+    def _list_partition(self, prefix, delimiter, versioned, batch_queue, progress):
+        """
+        List the partition and put batches of objects to delete to the queue,
+        the listing is blocked while the queue is full
+
+        Args:
+            prefix (str): prefix of the partition
+            delimiter (str): delimiter of the partition
+            versioned (bool): True to list object versions and delete markers
+            batch_queue (queue.Queue): queue of the batches to delete
+            progress (DeletionProgress): progress to update
+
+        """
+        kwargs = {"Bucket": self.bucket_name, "Prefix": prefix}
+        if delimiter:
+            kwargs["Delimiter"] = delimiter
+        if versioned:
+            pages = self.s3_client.get_paginator("list_object_versions").paginate(
+                **kwargs
+            )
+        else:
+            pages = self.s3_client.get_paginator("list_objects_v2").paginate(**kwargs)
+        for page in pages:
+            if versioned:
+                batch = [
+                    {"Key": obj["Key"], "VersionId": obj["VersionId"]}
+                    for obj in page.get("Versions", []) + page.get("DeleteMarkers", [])
+                ]
+            else:
+                batch = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+            # versions and delete markers may exceed the batch size together
+            for i in range(0, len(batch), self.MAX_BATCH_SIZE):
+                batch_queue.put(batch[i : i + self.MAX_BATCH_SIZE])
+                progress.add(listed=len(batch[i : i + self.MAX_BATCH_SIZE]))
+
+    def _delete_batch_limited(self, objects_batch, limiter):
+        """
+        Delete a batch of objects within the concurrency limit
+
+        Args:
+            objects_batch (list): List of dictionaries with object keys to delete.
+            limiter (AIMDLimiter): limiter of concurrent requests
+
+        Returns:
+            tuple: Number of deleted objects, list of errors and list of
+                throttled objects to delete again
+
+        """
+        limiter.acquire()
+        throttled = False
+        try:
+            response = self.bucket.delete_objects(Delete={"Objects": objects_batch})
+        except Exception as e:
+            throttled = is_throttling_error(e)
+            if throttled:
+                return 0, [], objects_batch
+            logger.error(f"Exception during batch deletion: {e}")
+            return 0, [{**obj, "Error": str(e)} for obj in objects_batch], []
+        finally:
+            limiter.release(throttled)
+        errors = []
+        throttled_objects = []
+        for error in response.get("Errors", []):
+            if error.get("Code") in THROTTLING_ERROR_CODES:
+                obj = {"Key": error["Key"]}
+                if error.get("VersionId"):
+                    obj["VersionId"] = error["VersionId"]
+                throttled_objects.append(obj)
+            else:
+                errors.append(error)
+        if throttled_objects:
+            limiter.throttled()
+        return len(response.get("Deleted", [])), errors, throttled_objects
+
+    def delete_in_parallel(self, max_workers=64, versioned=None, progress_interval=30):
         """
         Delete all objects from the S3 bucket in parallel using multiple threads.
 
@@ -104,65 +239,230 @@ class S3BatchDeleter:
         hundreds of thousands of objects and should only be used for scale
         and cleanup purposes.
 
-        This method uses a ThreadPoolExecutor to process batches of objects concurrently.
-        It is designed to optimize deletion performance by leveraging multiple threads,
-        while also managing memory usage to avoid excessive resource consumption.
+        The top level prefixes of the bucket are listed in parallel and the
+        listed batches are deleted while the listing continues. The queue of
+        the batches is bounded, so the listing waits for the deletion and
+        the memory usage is limited. The number of concurrent delete requests
+        is adapted to the responses: increased by one while the requests
+        succeed and halved when S3 responds with SlowDown or 503, the
+        throttled objects are deleted again with exponential backoff, up to
+        THROTTLING_MAX_ATTEMPTS times, then they are reported as failed.
+
+        Args:
+            max_workers (int): Maximal number of concurrent delete requests
+            versioned (bool): True to delete all versions and delete markers
+                of the objects, checked on the bucket if None
+            progress_interval (int): Seconds between progress reports
+
+        Returns:
+            dict: statistics of the deletion
 
         Raises:
             Exception: If any objects fail to delete after a retry attempt.
         """
-
-        queued_obj_count = 0
-        total_deleted = 0
+        if versioned is None:
+            versioned = self._is_versioned()
+        # Start with 2 threads per CPU core like for I/O-bound work, the
+        # limiter finds the concurrency the S3 endpoint can handle
+        limiter = AIMDLimiter(
+            initial=min(multiprocessing.cpu_count() * 2, 16, max_workers),
+            maximum=max_workers,
+        )
+        progress = DeletionProgress()
+        batch_queue = queue.Queue(
+            maxsize=max(MAX_OBJS_TO_KEEP_IN_MEMORY // self.MAX_BATCH_SIZE, max_workers)
+        )
         failed_deletions = []
-        futures = []
-
-        # Use 2 threads per CPU core to boost performance in I/O-bound S3 deletions,
-        # but cap at 16 to prevent resource exhaustion on high-core systems.
-        max_workers = min(multiprocessing.cpu_count() * 2, 16)
+        errors_lock = threading.Lock()
+        partitions = self._list_partitions(versioned)
         logger.info(
-            f"Starting threaded deletion in bucket '{self.bucket_name}' using a max of {max_workers} threads"
+            f"Starting pipelined deletion in bucket '{self.bucket_name}' "
+            f"(versioned: {versioned}) of {len(partitions)} partitions "
+            f"using up to {max_workers} concurrent requests"
         )
 
-        paginator = self.s3_client.get_paginator("list_objects_v2")
-        pages = paginator.paginate(Bucket=self.bucket_name)
+        def _delete_worker():
+            while True:
+                batch = batch_queue.get()
+                try:
+                    if batch is None:
+                        return
+                    attempt = 0
+                    while batch:
+                        attempt += 1
+                        deleted, errors, batch = self._delete_batch_limited(
+                            batch, limiter
+                        )
+                        if batch and attempt >= THROTTLING_MAX_ATTEMPTS:
+                            logger.error(
+                                f"{len(batch)} objects still throttled after "
+                                f"{attempt} attempts"
+                            )
+                            errors = errors + [
+                                {**obj, "Error": "Throttled"} for obj in batch
+                            ]
+                            batch = []
+                        progress.add(
+                            deleted=deleted,
+                            failed=len(errors),
+                            throttled=len(batch),
+                        )
+                        if errors:
+                            with errors_lock:
+                                failed_deletions.extend(errors)
+                        if batch:
+                            time.sleep(
+                                min(
+                                    THROTTLING_BACKOFF * 2 ** (attempt - 1),
+                                    THROTTLING_MAX_BACKOFF,
+                                )
+                            )
+                finally:
+                    batch_queue.task_done()
+
+        list_workers = min(len(partitions), LIST_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers + list_workers) as executor:
+            workers = [executor.submit(_delete_worker) for _ in range(max_workers)]
+            listings = [
+                executor.submit(
+                    self._list_partition,
+                    prefix,
+                    delimiter,
+                    versioned,
+                    batch_queue,
+                    progress,
+                )
+                for prefix, delimiter in partitions
+            ]
+            pending = set(listings)
+            while pending:
+                _, pending = wait(pending, timeout=progress_interval)
+                logger.info(progress.format(self.bucket_name, limiter.limit))
+            for _ in workers:
+                batch_queue.put(None)
+            for future in as_completed(listings + workers):
+                # raise listing errors
+                future.result()
+
+        logger.info(progress.format(self.bucket_name, limiter.limit))
+        self._retry_failed(failed_deletions)
+        return progress.stats()
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for page in pages:
 
-                # Skip in case of no objects - rare but possible edge case
-                page_contents = page.get("Contents", [])
-                if not page_contents:
-                    continue
+def is_throttling_error(error):
+    """
+    Check whether the exception is S3 throttling response
 
-                current_batch = [{"Key": obj["Key"]} for obj in page_contents]
-                queued_obj_count += len(current_batch)
-                futures.append(executor.submit(self._delete_batch, current_batch))
+    Args:
+        error (Exception): the exception
 
-                if queued_obj_count >= MAX_OBJS_TO_KEEP_IN_MEMORY:
-                    logger.info(
-                        (
-                            f"Queued {queued_obj_count} objects for deletion. "
-                            "waiting for threads to finish..."
-                        )
-                    )
-
-                    for future in as_completed(futures):
-                        num_deleted, errors = future.result()
-                        total_deleted += num_deleted
-                        failed_deletions.extend(errors)
-                        logger.info(
-                            f"So far deleted {total_deleted} objects from bucket '{self.bucket_name}'"
-                        )
+    Returns:
+        bool: True if the request should be retried with lower concurrency
 
-                    queued_obj_count = 0
-                    futures = []
+    """
+    response = getattr(error, "response", None) or {}
+    code = str(response.get("Error", {}).get("Code", ""))
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return code in THROTTLING_ERROR_CODES or status == 503
 
-            # Wait for any remaining threads to finish
-            for future in as_completed(futures):
-                num_deleted, errors = future.result()
-                total_deleted += num_deleted
-                failed_deletions.extend(errors)
 
-        logger.info(f"Deleted {total_deleted} objects from bucket '{self.bucket_name}'")
-        self._retry_failed(failed_deletions)
+class AIMDLimiter:
+    """
+    Limit of concurrent requests with additive increase and multiplicative
+    decrease: the limit grows by one per limit of successful requests and
+    is halved on throttling, at most once per cooldown.
+    """
+
+    def __init__(self, initial, minimum=1, maximum=64, cooldown=1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self.in_use = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait until a request can be sent within the limit
+        """
+        with self.condition:
+            while self.in_use >= int(self.limit):
+                self.condition.wait()
+            self.in_use += 1
+
+    def release(self, throttled=False):
+        """
+        Finish the request and adapt the limit
+
+        Args:
+            throttled (bool): True if the request was throttled
+
+        """
+        with self.condition:
+            self.in_use -= 1
+            if throttled:
+                self._decrease()
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def throttled(self):
+        """
+        Decrease the limit after the request which was partially throttled
+        """
+        with self.condition:
+            self._decrease()
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit / 2)
+            self.last_decrease = now
+            logger.info(f"S3 throttling, concurrency decreased to {int(self.limit)}")
+
+
+class DeletionProgress:
+    """
+    Thread safe counters of the deletion progress
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.monotonic()
+        self.listed = 0
+        self.deleted = 0
+        self.failed = 0
+        self.throttled = 0
+
+    def add(self, listed=0, deleted=0, failed=0, throttled=0):
+        with self.lock:
+            self.listed += listed
+            self.deleted += deleted
+            self.failed += failed
+            self.throttled += throttled
+
+    def stats(self):
+        """
+        Returns:
+            dict: the counters, duration and deletion rate per second
+
+        """
+        with self.lock:
+            duration = time.monotonic() - self.start_time
+            return {
+                "listed": self.listed,
+                "deleted": self.deleted,
+                "failed": self.failed,
+                "throttled": self.throttled,
+                "duration": duration,
+                "rate": self.deleted / duration if duration else 0.0,
+            }
+
+    def format(self, bucket_name, limit):
+        stats = self.stats()
+        return (
+            f"Bucket '{bucket_name}': listed {stats['listed']}, deleted "
+            f"{stats['deleted']} ({stats['rate']:.0f}/s), failed {stats['failed']}, "
+            f"throttled {stats['throttled']}, concurrency {int(limit)}"
+        )
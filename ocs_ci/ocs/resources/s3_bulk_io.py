@@ -0,0 +1,470 @@
+"""
+Bulk object I/O on S3 buckets done in the test process by boto3, instead of
+executing one AWS CLI command in the awscli pod per object.
+
+Example::
+
+    bulk_io = S3BulkIO.from_mcg(mcg_obj, max_workers=32)
+    result = bulk_io.put_objects(bucket_name, {"obj-1": b"data", "obj-2": path})
+    logger.info(result)  # put: 2 objects, 12.3 MiB in 1.2 s (10.2 MiB/s)
+    bulk_io.get_objects(bucket_name, result.checksums, target_dir=tmp_dir)
+
+"""
+
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import boto3
+import botocore.config
+
+from ocs_ci.ocs.exceptions import S3BulkIOError
+
+logger = logging.getLogger(__name__)
+
+MiB = 1024 * 1024
+# objects bigger than this are uploaded by multipart upload in parts of the
+# same size (S3 requires the parts to be at least 5 MiB)
+DEFAULT_PART_SIZE = 8 * MiB
+READ_CHUNK_SIZE = MiB
+
+
+class BulkIOResult(object):
+    """
+    Result and throughput of one bulk operation
+    """
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.objects = 0
+        self.bytes = 0
+        # object key: checksum of the object content
+        self.checksums = {}
+        # object key: exception
+        self.failed = {}
+        self.start_time = time.monotonic()
+        self.duration = 0.0
+
+    def add(self, key, size=0, checksum=None):
+        """
+        Record successfully processed object
+
+        Args:
+            key (str): object key
+            size (int): number of bytes transferred
+            checksum (str): checksum of the object content
+
+        """
+        self.objects += 1
+        self.bytes += size
+        if checksum is not None:
+            self.checksums[key] = checksum
+
+    def finish(self):
+        self.duration = time.monotonic() - self.start_time
+
+    @property
+    def throughput(self):
+        """
+        float: bytes per second
+        """
+        return self.bytes / self.duration if self.duration else 0.0
+
+    @property
+    def objects_per_second(self):
+        return self.objects / self.duration if self.duration else 0.0
+
+    def __str__(self):
+        message = (
+            f"{self.operation}: {self.objects} objects, {self.bytes / MiB:.1f} MiB "
+            f"in {self.duration:.1f} s ({self.throughput / MiB:.1f} MiB/s, "
+            f"{self.objects_per_second:.1f} objects/s)"
+        )
+        if self.failed:
+            message += f", {len(self.failed)} failed"
+        return message
+
+
+class S3BulkIO(object):
+    """
+    Concurrent put, get, copy and tag operations on many objects with one
+    pooled boto3 client. Checksums of the content are computed while the
+    data are transferred.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        max_workers=16,
+        part_size=DEFAULT_PART_SIZE,
+        checksum_algorithm="sha256",
+    ):
+        """
+        Args:
+            s3_client (botocore.client.S3): S3 client, it should have at least
+                2 * max_workers pooled connections
+            max_workers (int): number of objects (and parts of multipart
+                uploads) transferred at once
+            part_size (int): size of the multipart upload parts, objects
+                bigger than this are uploaded by multipart upload
+            checksum_algorithm (str): hashlib algorithm of the checksums
+
+        """
+        self.s3_client = s3_client
+        self.max_workers = max_workers
+        self.part_size = part_size
+        self.checksum_algorithm = checksum_algorithm
+        self._part_executor = None
+        self._part_executor_lock = threading.Lock()
+        # parts of all the multipart uploads read in memory and not uploaded
+        # yet, shared by the uploads so the limit holds for all of them
+        self._parts_in_flight = threading.BoundedSemaphore(max_workers)
+
+    @classmethod
+    def from_mcg(cls, mcg_obj, max_workers=16, **kwargs):
+        """
+        Create the engine with a new client using the MCG credentials and
+        a connection pool sized for the workers
+
+        Args:
+            mcg_obj (MCG): MCG object
+            max_workers (int): number of objects transferred at once
+            **kwargs: other arguments of S3BulkIO
+
+        Returns:
+            S3BulkIO: the engine
+
+        """
+        # Internal import in order to avoid circular import
+        from ocs_ci.ocs.bucket_utils import retrieve_verification_mode
+
+        client_config = botocore.config.Config(
+            max_pool_connections=2 * max_workers,
+            retries={"max_attempts": 8, "mode": "standard"},
+        )
+        s3_client = boto3.session.Session().client(
+            "s3",
+            verify=retrieve_verification_mode(),
+            endpoint_url=mcg_obj.s3_endpoint,
+            aws_access_key_id=mcg_obj.access_key_id,
+            aws_secret_access_key=mcg_obj.access_key,
+            config=client_config,
+        )
+        return cls(s3_client, max_workers=max_workers, **kwargs)
+
+    def _get_part_executor(self):
+        with self._part_executor_lock:
+            if self._part_executor is None:
+                self._part_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="s3-part"
+                )
+            return self._part_executor
+
+    def close(self):
+        """
+        Stop the threads uploading parts of multipart uploads
+        """
+        with self._part_executor_lock:
+            if self._part_executor is not None:
+                self._part_executor.shutdown()
+                self._part_executor = None
+
+    def _run(self, operation, func, items, raise_on_failure=True):
+        """
+        Run the function on all the items with at most max_workers running
+        at once, the items are consumed lazily
+
+        Args:
+            operation (str): name of the operation for the result
+            func (function): function called with the item, returning size
+                and checksum of the object
+            items (iterable): tuples of object key and arguments of func
+            raise_on_failure (bool): True to raise S3BulkIOError if some of
+                the objects failed
+
+        Returns:
+            BulkIOResult: result of the operation
+
+        Raises:
+            S3BulkIOError: if some of the objects failed
+
+        """
+        result = BulkIOResult(operation)
+        pending = {}
+
+        def _collect(done):
+            for future in done:
+                key = pending.pop(future)
+                try:
+                    size, checksum = future.result()
+                except Exception as ex:
+                    logger.debug(f"{operation} of {key} failed: {ex}")
+                    result.failed[key] = ex
+                else:
+                    result.add(key, size, checksum)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for key, args in items:
+                if len(pending) >= 2 * self.max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                pending[executor.submit(func, *args)] = key
+            _collect(wait(pending).done)
+        result.finish()
+        logger.info(result)
+        if result.failed and raise_on_failure:
+            raise S3BulkIOError(
+                f"{operation} failed for {len(result.failed)} objects: "
+                f"{dict(list(result.failed.items())[:10])}"
+            )
+        return result
+
+    def _upload(self, bucket_name, key, source):
+        """
+        Upload the object, by multipart upload if it is bigger than part size
+
+        Args:
+            bucket_name (str): name of the bucket
+            key (str): object key
+            source (bytes or str): content of the object or path to the file
+
+        Returns:
+            tuple: size and checksum of the object
+
+        """
+        if isinstance(source, (bytes, bytearray)):
+            stream = io.BytesIO(source)
+        else:
+            stream = open(source, "rb")
+        with stream:
+            data = stream.read(self.part_size + 1)
+            if len(data) <= self.part_size:
+                self.s3_client.put_object(Bucket=bucket_name, Key=key, Body=data)
+                digest = hashlib.new(self.checksum_algorithm, data)
+                return len(data), digest.hexdigest()
+            stream.seek(0)
+            return self._upload_multipart(bucket_name, key, stream)
+
+    def _upload_multipart(self, bucket_name, key, stream):
+        """
+        Upload the parts of the object concurrently, at most max_workers
+        parts of all the multipart uploads are read in memory at once
+
+        Args:
+            bucket_name (str): name of the bucket
+            key (str): object key
+            stream (file): stream with the object content
+
+        Returns:
+            tuple: size and checksum of the object
+
+        """
+        upload_id = self.s3_client.create_multipart_upload(Bucket=bucket_name, Key=key)[
+            "UploadId"
+        ]
+        digest = hashlib.new(self.checksum_algorithm)
+        size = 0
+        futures = []
+        in_flight = self._parts_in_flight
+        executor = self._get_part_executor()
+
+        def _upload_part(part_number, body):
+            try:
+                response = self.s3_client.upload_part(
+                    Bucket=bucket_name,
+                    Key=key,
+                    PartNumber=part_number,
+                    UploadId=upload_id,
+                    Body=body,
+                )
+            finally:
+                in_flight.release()
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            part_number = 0
+            while True:
+                # the part is read only when it can be uploaded
+                in_flight.acquire()
+                try:
+                    chunk = stream.read(self.part_size)
+                    if chunk:
+                        part_number += 1
+                        future = executor.submit(_upload_part, part_number, chunk)
+                except BaseException:
+                    in_flight.release()
+                    raise
+                if not chunk:
+                    in_flight.release()
+                    break
+                futures.append(future)
+                digest.update(chunk)
+                size += len(chunk)
+            parts = [future.result() for future in futures]
+            self.s3_client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            for future in futures:
+                # the parts which won't be uploaded free their slot
+                if future.cancel():
+                    in_flight.release()
+            # the parts being uploaded free their slots when they end, the
+            # upload is aborted after them
+            wait(futures)
+            self.s3_client.abort_multipart_upload(
+                Bucket=bucket_name, Key=key, UploadId=upload_id
+            )
+            raise
+        return size, digest.hexdigest()
+
+    def _download(self, bucket_name, key, target_dir):
+        """
+        Download the object, stream its content to the file if target
+        directory is set
+
+        Args:
+            bucket_name (str): name of the bucket
+            key (str): object key
+            target_dir (str): directory to write the object to, the object key
+                is the relative path of the file
+
+        Returns:
+            tuple: size and checksum of the object
+
+        """
+        body = self.s3_client.get_object(Bucket=bucket_name, Key=key)["Body"]
+        digest = hashlib.new(self.checksum_algorithm)
+        size = 0
+        target = None
+        if target_dir:
+            path = os.path.join(target_dir, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            target = open(path, "wb")
+        try:
+            for chunk in body.iter_chunks(READ_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                if target:
+                    target.write(chunk)
+        finally:
+            body.close()
+            if target:
+                target.close()
+        return size, digest.hexdigest()
+
+    def put_objects(self, bucket_name, objects, raise_on_failure=True):
+        """
+        Upload the objects
+
+        Args:
+            bucket_name (str): name of the bucket
+            objects (dict or iterable): object key: content (bytes) or path
+                to the local file, or tuples of them
+            raise_on_failure (bool): True to raise S3BulkIOError if some of
+                the objects failed
+
+        Returns:
+            BulkIOResult: result with checksums of the uploaded objects
+
+        """
+        if isinstance(objects, dict):
+            objects = objects.items()
+        return self._run(
+            "put",
+            self._upload,
+            ((key, (bucket_name, key, source)) for key, source in objects),
+            raise_on_failure,
+        )
+
+    def get_objects(self, bucket_name, keys, target_dir=None, raise_on_failure=True):
+        """
+        Download the objects
+
+        Args:
+            bucket_name (str): name of the bucket
+            keys (iterable): object keys
+            target_dir (str): directory to write the objects to, the content
+                is only checksummed if not set
+            raise_on_failure (bool): True to raise S3BulkIOError if some of
+                the objects failed
+
+        Returns:
+            BulkIOResult: result with checksums of the downloaded objects
+
+        """
+        return self._run(
+            "get",
+            self._download,
+            ((key, (bucket_name, key, target_dir)) for key in keys),
+            raise_on_failure,
+        )
+
+    def copy_objects(
+        self,
+        source_bucket_name,
+        target_bucket_name,
+        keys,
+        target_prefix="",
+        raise_on_failure=True,
+    ):
+        """
+        Copy the objects on the server side, objects bigger than 5 GiB can't
+        be copied this way
+
+        Args:
+            source_bucket_name (str): name of the bucket to copy from
+            target_bucket_name (str): name of the bucket to copy to
+            keys (iterable): object keys
+            target_prefix (str): prefix added to the keys of the copies
+            raise_on_failure (bool): True to raise S3BulkIOError if some of
+                the objects failed
+
+        Returns:
+            BulkIOResult: result of the copy, without sizes and checksums
+
+        """
+
+        def _copy(key):
+            self.s3_client.copy_object(
+                Bucket=target_bucket_name,
+                Key=f"{target_prefix}{key}",
+                CopySource={"Bucket": source_bucket_name, "Key": key},
+            )
+            return 0, None
+
+        return self._run(
+            "copy", _copy, ((key, (key,)) for key in keys), raise_on_failure
+        )
+
+    def tag_objects(self, bucket_name, keys, tags, raise_on_failure=True):
+        """
+        Set the same tags to all the objects
+
+        Args:
+            bucket_name (str): name of the bucket
+            keys (iterable): object keys
+            tags (dict): tag key: tag value
+            raise_on_failure (bool): True to raise S3BulkIOError if some of
+                the objects failed
+
+        Returns:
+            BulkIOResult: result of the tagging
+
+        """
+        tag_set = [{"Key": key, "Value": value} for key, value in tags.items()]
+
+        def _tag(key):
+            self.s3_client.put_object_tagging(
+                Bucket=bucket_name, Key=key, Tagging={"TagSet": tag_set}
+            )
+            return 0, None
+
+        return self._run("tag", _tag, ((key, (key,)) for key in keys), raise_on_failure)
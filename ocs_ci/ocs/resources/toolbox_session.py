@@ -0,0 +1,488 @@
+"""
+Persistent command channel to the Ceph toolbox pod
+
+Every ceph helper resolves the toolbox with get_ceph_tools_pod() (several
+'oc get' calls) and then runs a new 'oc rsh' for each command. ToolboxSession
+resolves the running toolbox pod once and keeps a single 'oc exec -i' shell
+open in it. Commands are written to the stdin of the shell and the output of
+each command is delimited by a unique marker line followed by its return
+code and stderr, so many commands (or a whole batch of them) share one exec
+stream. The toolbox pod is resolved again and the shell restarted only when
+the stream breaks (e.g. the toolbox pod was deleted).
+Each command runs in its own subshell, so like with 'oc rsh' no shell state
+is kept between the commands.
+
+The session is used by the ceph helpers when ``RUN["toolbox_session"]`` is
+enabled.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+
+import yaml
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.resources import pod
+from ocs_ci.utility.utils import mask_secrets
+
+log = logging.getLogger(__name__)
+
+# Shell started in the toolbox pod, fd 3 is the original stdout so stdout of
+# the command goes there while its stderr is captured to a variable
+TOOLBOX_SHELL = "exec 3>&1"
+STDERR_TAIL_LINES = 50
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class ToolboxStreamError(Exception):
+    """
+    The exec stream to the toolbox pod is broken
+    """
+
+    pass
+
+
+def is_toolbox_session_enabled():
+    """
+    Check whether ceph commands should use the persistent toolbox session
+
+    Returns:
+        bool: True if toolbox session is enabled in RUN section
+
+    """
+    return bool(config.RUN.get("toolbox_session"))
+
+
+class ToolboxSession(object):
+    """
+    Long-lived shell in the Ceph toolbox pod of one cluster
+    """
+
+    def __init__(self, cluster_index=None):
+        """
+        Args:
+            cluster_index (int): index of the cluster in config.clusters,
+                the current cluster is used if not provided
+
+        """
+        self.cluster_index = (
+            config.cur_index if cluster_index is None else cluster_index
+        )
+        self.toolbox = None
+        self._process = None
+        self._lines = None
+        self._stderr = deque(maxlen=STDERR_TAIL_LINES)
+        self._lock = threading.RLock()
+
+    def _resolve_toolbox(self):
+        """
+        Resolve the running toolbox pod of the cluster
+        """
+        with config.RunWithConfigContext(self.cluster_index):
+            self.toolbox = pod.get_ceph_tools_pod(wait=True)
+        log.info(f"Toolbox session uses pod {self.toolbox.name}")
+
+    @staticmethod
+    def _read_stream(stream, sink):
+        """
+        Read lines of the stream to the sink until the stream is closed
+        """
+        for line in iter(stream.readline, ""):
+            if isinstance(sink, queue.Queue):
+                sink.put(line)
+            else:
+                sink.append(line.rstrip("\n"))
+        if isinstance(sink, queue.Queue):
+            sink.put(None)
+
+    def _shell_cmd(self):
+        """
+        Get command and environment which start the shell in the toolbox pod
+
+        Returns:
+            tuple: command (list), environment (dict)
+
+        """
+        env = os.environ.copy()
+        kubeconfig = self.toolbox.ocp.get_kubeconfig_path()
+        if kubeconfig:
+            env["KUBECONFIG"] = kubeconfig
+        cmd = [
+            "oc",
+            "-n",
+            self.toolbox.namespace,
+            "exec",
+            "-i",
+            self.toolbox.name,
+            "--",
+            "sh",
+        ]
+        return cmd, env
+
+    def _start(self):
+        """
+        Start the shell in the toolbox pod
+        """
+        if self.toolbox is None:
+            self._resolve_toolbox()
+        cmd, env = self._shell_cmd()
+        log.info(f"Starting toolbox session: {shlex.join(cmd)}")
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            text=True,
+            bufsize=1,
+        )
+        self._lines = queue.Queue()
+        self._stderr.clear()
+        for stream, sink in (
+            (self._process.stdout, self._lines),
+            (self._process.stderr, self._stderr),
+        ):
+            threading.Thread(
+                target=self._read_stream, args=(stream, sink), daemon=True
+            ).start()
+        self._write(f"{TOOLBOX_SHELL}\n")
+
+    def _write(self, data):
+        """
+        Write data to the stdin of the shell
+        """
+        try:
+            self._process.stdin.write(data)
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as ex:
+            raise ToolboxStreamError(f"Unable to write to toolbox session: {ex}")
+
+    def close(self):
+        """
+        Close the shell in the toolbox pod
+        """
+        with self._lock:
+            process, self._process = self._process, None
+            if process is None:
+                return
+            try:
+                process.stdin.close()
+                process.wait(timeout=10)
+            except Exception:
+                process.kill()
+
+    def _reset(self):
+        """
+        Close the shell and forget the toolbox pod, so the toolbox is resolved
+        again on the next command
+        """
+        self.close()
+        self.toolbox = None
+
+    @staticmethod
+    def _wrap(command, marker):
+        """
+        Wrap the command to print its output, return code and stderr
+        delimited by the marker
+        """
+        return (
+            f"err=$({{ {command} ; }} 2>&1 1>&3 </dev/null); rc=$?; "
+            f"echo '{marker}' $rc; "
+            f"printf '%s\\n' \"$err\"; echo '{marker}'\n"
+        )
+
+    def _read_line(self, end_time, command):
+        """
+        Read single line of the shell output
+        """
+        remaining = end_time - time.time()
+        if remaining <= 0:
+            raise subprocess.TimeoutExpired(command, 0)
+        try:
+            line = self._lines.get(timeout=remaining)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(command, remaining)
+        if line is None:
+            stderr = "\n".join(self._stderr)
+            raise ToolboxStreamError(f"Toolbox session was closed: {stderr}")
+        return line.rstrip("\n")
+
+    def _read_result(self, marker, end_time, command):
+        """
+        Read output of one command
+
+        Returns:
+            tuple: stdout (str), return code (int), stderr (str)
+
+        """
+        stdout = []
+        while True:
+            line = self._read_line(end_time, command)
+            if f"{marker} " in line:
+                # output without trailing new line is followed by the marker
+                last_line, _, returncode = line.partition(f"{marker} ")
+                if last_line:
+                    stdout.append(last_line)
+                returncode = int(returncode)
+                break
+            stdout.append(line)
+        stderr = []
+        while True:
+            line = self._read_line(end_time, command)
+            if line == marker:
+                break
+            stderr.append(line)
+        return "\n".join(stdout), returncode, "\n".join(stderr).strip()
+
+    def _run(self, commands, timeout):
+        """
+        Write all commands to the shell and read their results
+
+        Returns:
+            list: of (stdout, return code, stderr) tuples in order of commands
+
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+        markers = [f"ocs-ci-{uuid.uuid4().hex}" for _ in commands]
+        self._write(
+            "".join(
+                self._wrap(command, marker)
+                for command, marker in zip(commands, markers)
+            )
+        )
+        end_time = time.time() + timeout
+        results = []
+        try:
+            for command, marker in zip(commands, markers):
+                results.append(self._read_result(marker, end_time, command))
+        except subprocess.TimeoutExpired:
+            # the output of the remaining commands would desynchronize the
+            # stream, start a new shell for the next command
+            self.close()
+            raise
+        return results
+
+    def run_cmds(self, commands, timeout=600, secrets=None):
+        """
+        Execute the commands in the toolbox pod over the session, the toolbox
+        pod is resolved again and the commands retried once if the session
+        stream is broken
+
+        Args:
+            commands (list): commands to execute
+            timeout (int): timeout for all the commands in seconds
+            secrets (list): secrets to be masked with asterisks in the log
+
+        Returns:
+            list: of (stdout, return code, stderr) tuples in order of commands
+
+        Raises:
+            CommandFailed: In case the session can't be established
+            subprocess.TimeoutExpired: In case the commands didn't finish in
+                the timeout
+
+        """
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self.toolbox is None:
+                        self._resolve_toolbox()
+                    for command in commands:
+                        log.info(
+                            f"Executing command on toolbox {self.toolbox.name}: "
+                            f"{mask_secrets(command, secrets)}"
+                        )
+                    return self._run(commands, timeout)
+                except ToolboxStreamError as ex:
+                    log.warning(f"Toolbox session failed: {ex}")
+                    self._reset()
+                    if attempt:
+                        raise CommandFailed(f"Toolbox session failed: {ex}")
+
+    def exec_cmd(self, command, timeout=600, secrets=None, ignore_error=False):
+        """
+        Execute single command in the toolbox pod
+
+        Args:
+            command (str): command to execute
+            timeout (int): timeout for the command in seconds
+            secrets (list): secrets to be masked with asterisks in the log
+            ignore_error (bool): True to not raise exception on non zero
+                return code
+
+        Returns:
+            str: stdout of the command
+
+        Raises:
+            CommandFailed: In case the command returned non zero return code
+
+        """
+        stdout, returncode, stderr = self.run_cmds(
+            [command], timeout=timeout, secrets=secrets
+        )[0]
+        log.debug(f"Command stdout: {stdout}")
+        if returncode and not ignore_error:
+            raise CommandFailed(
+                f"Error during execution of command: "
+                f"{mask_secrets(command, secrets)}."
+                f"\nError is {mask_secrets(stderr, secrets)}"
+            )
+        return stdout
+
+    def exec_ceph_cmd(
+        self, ceph_cmd, format="json-pretty", out_yaml_format=True, timeout=600
+    ):
+        """
+        Execute a Ceph command in the toolbox pod, the same way as
+        Pod.exec_ceph_cmd does
+
+        Args:
+            ceph_cmd (str): The Ceph command to execute
+            format (str): The returning output format of the Ceph command
+            out_yaml_format (bool): whether to return yaml loaded python
+                object OR to return raw output
+            timeout (int): timeout for the command in seconds
+
+        Returns:
+            dict: Ceph command output
+
+        """
+        if format:
+            ceph_cmd += f" --format {format}"
+        out = self.exec_cmd(ceph_cmd, timeout=timeout)
+        if not out_yaml_format:
+            return out
+        out = yaml.load(out, Loader=yaml.CSafeLoader)
+        if isinstance(out, list):
+            return [item for item in out if item]
+        return out
+
+    def exec_ceph_cmds(self, ceph_cmds, timeout=600, ignore_error=False):
+        """
+        Execute batch of Ceph commands over one write to the session and
+        return their parsed JSON outputs
+
+        Args:
+            ceph_cmds (list): Ceph commands to execute, e.g.
+                ['ceph health', 'ceph osd df']
+            timeout (int): timeout for all the commands in seconds
+            ignore_error (bool): True to return None for the failed commands
+                instead of raising an exception
+
+        Returns:
+            list: parsed JSON outputs in order of the commands
+
+        Raises:
+            CommandFailed: In case any of the commands failed
+
+        """
+        results = self.run_cmds(
+            [f"{ceph_cmd} --format json" for ceph_cmd in ceph_cmds],
+            timeout=timeout,
+        )
+        outputs = []
+        for ceph_cmd, (stdout, returncode, stderr) in zip(ceph_cmds, results):
+            if returncode:
+                if not ignore_error:
+                    raise CommandFailed(
+                        f"Error during execution of command: {ceph_cmd}."
+                        f"\nError is {stderr}"
+                    )
+                outputs.append(None)
+                continue
+            outputs.append(json.loads(stdout) if stdout.strip() else None)
+        return outputs
+
+
+def get_toolbox_session(cluster_index=None):
+    """
+    Get toolbox session of the cluster, the session is created on first use
+
+    Args:
+        cluster_index (int): index of the cluster in config.clusters, the
+            current cluster is used if not provided
+
+    Returns:
+        ToolboxSession: session of the cluster
+
+    """
+    cluster_index = config.cur_index if cluster_index is None else cluster_index
+    with _sessions_lock:
+        session = _sessions.get(cluster_index)
+        if session is None:
+            session = ToolboxSession(cluster_index)
+            _sessions[cluster_index] = session
+    return session
+
+
+def close_toolbox_sessions():
+    """
+    Close the toolbox sessions of all clusters
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def exec_ceph_cmd(ceph_cmd, format="json-pretty", out_yaml_format=True, timeout=600):
+    """
+    Execute a Ceph command on the toolbox of the current cluster, over the
+    persistent session if it's enabled, otherwise on the pod returned by
+    get_ceph_tools_pod()
+
+    Args:
+        ceph_cmd (str): The Ceph command to execute
+        format (str): The returning output format of the Ceph command
+        out_yaml_format (bool): whether to return yaml loaded python
+            object OR to return raw output
+        timeout (int): timeout for the command in seconds
+
+    Returns:
+        dict: Ceph command output
+
+    """
+    if is_toolbox_session_enabled():
+        return get_toolbox_session().exec_ceph_cmd(
+            ceph_cmd, format=format, out_yaml_format=out_yaml_format, timeout=timeout
+        )
+    return pod.get_ceph_tools_pod().exec_ceph_cmd(
+        ceph_cmd, format=format, out_yaml_format=out_yaml_format, timeout=timeout
+    )
+
+
+def exec_ceph_cmds(ceph_cmds, timeout=600, ignore_error=False):
+    """
+    Execute batch of Ceph commands on the toolbox of the current cluster and
+    return their parsed JSON outputs, see ToolboxSession.exec_ceph_cmds
+
+    Args:
+        ceph_cmds (list): Ceph commands to execute
+        timeout (int): timeout for all the commands in seconds
+        ignore_error (bool): True to return None for the failed commands
+            instead of raising an exception
+
+    Returns:
+        list: parsed JSON outputs in order of the commands
+
+    """
+    return get_toolbox_session().exec_ceph_cmds(
+        ceph_cmds, timeout=timeout, ignore_error=ignore_error
+    )
+
+
+atexit.register(close_toolbox_sessions)
@@ -8,6 +8,7 @@ import os
 import pathlib
 
 from ocs_ci.helpers import helpers
+from ocs_ci.ocs.bulk_apply import BulkApply
 from ocs_ci.ocs.ocp import OCP
 from ocs_ci.framework import config
 from ocs_ci.utility.retry import retry
@@ -57,6 +58,7 @@ class FioPodScale(object):
         self._set_dc_deployment()
         self.namespace_list = list()
         self.kube_job_pvc_list, self.kube_job_pod_list = ([], [])
+        self.bulk_apply_list = []
         self.is_cleanup = False
 
     @property
@@ -96,6 +98,7 @@ class FioPodScale(object):
         io_runtime=None,
         pvc_size=None,
         max_pvc_size=105,
+        bulk_apply=False,
     ):
         """
         Function to create PVC of different type and attach them to PODs and start IO.
@@ -109,6 +112,8 @@ class FioPodScale(object):
             io_runtime (seconds): Runtime in Seconds to continue IO
             pvc_size (int): Size of PVC to be created
             max_pvc_size (int): The max size of the pvc
+            bulk_apply (bool): True to create the PVCs and PODs by server side
+                apply and follow them by watch (see BulkApply) instead of kube_job
 
         Returns:
             rbd_pvc_name (list): List all the rbd PVCs names created
@@ -120,7 +125,7 @@ class FioPodScale(object):
         # Condition to check kube_job batch count, value more than 750 per job
         # will lead to failure in kube_job completion, below value is 1200
         # since it will be divided by 2 i.e. 600 per job max as per below condition
-        if pvc_count > 1200:
+        if pvc_count > 1200 and not bulk_apply:
             raise UnexpectedBehaviour("Kube_job batch count should be lesser than 1200")
 
         logger.info(f"Start creating {pvc_count} PVC of 2 types RBD-RWO & FS-RWX")
@@ -154,6 +159,15 @@ class FioPodScale(object):
             )
         )
 
+        if bulk_apply:
+            return self._create_multi_pvc_pod_bulk(
+                rbd_pvc_dict_list,
+                cephfs_pvc_dict_list,
+                pvcs_per_pod=pvcs_per_pod,
+                start_io=start_io,
+                io_runtime=io_runtime,
+            )
+
         # kube_job for cephfs and rbd PVC creations
         lcl = locals()
         tmp_path = pathlib.Path(ocsci_log_path())
@@ -238,6 +252,53 @@ class FioPodScale(object):
 
         return rbd_pvc_name, fs_pvc_name, pod_running_list
 
+    def _create_multi_pvc_pod_bulk(
+        self,
+        rbd_pvc_dict_list,
+        cephfs_pvc_dict_list,
+        pvcs_per_pod,
+        start_io,
+        io_runtime,
+    ):
+        """
+        Create the PVCs and the PODs attaching them by BulkApply and wait for
+        them to be Bound and Running
+
+        Args:
+            rbd_pvc_dict_list (list): RBD PVC dicts
+            cephfs_pvc_dict_list (list): CephFS PVC dicts
+            pvcs_per_pod (int): No of PVCs to be attached to single pod
+            start_io (bool): Binary value to start IO
+            io_runtime (seconds): Runtime in Seconds to continue IO
+
+        Returns:
+            tuple: rbd PVCs names, fs PVCs names and PODs names
+
+        """
+        bulk = BulkApply(namespace=self.namespace)
+        self.bulk_apply_list.append(bulk)
+        pvc_timeout = 60 * 10
+        rbd_pvc_name = [timeline.name for timeline in bulk.apply(rbd_pvc_dict_list)]
+        fs_pvc_name = [timeline.name for timeline in bulk.apply(cephfs_pvc_dict_list)]
+        bulk.wait(timeout=pvc_timeout)
+
+        pod_data_list = list()
+        for pvc_list in (rbd_pvc_name, fs_pvc_name):
+            pod_data_list.extend(
+                attach_multiple_pvc_to_pod_dict(
+                    pvc_list=pvc_list,
+                    namespace=self.namespace,
+                    pvcs_per_pod=pvcs_per_pod,
+                    deployment_config=self.dc_deployment,
+                    node_selector=self.node_selector,
+                    start_io=start_io,
+                    io_runtime=io_runtime,
+                )
+            )
+        pod_running_list = [timeline.name for timeline in bulk.apply(pod_data_list)]
+        bulk.wait(timeout=90 * 13)
+        return rbd_pvc_name, fs_pvc_name, pod_running_list
+
     def create_scale_pods(
         self,
         scale_count=1500,
@@ -413,6 +474,9 @@ class FioPodScale(object):
         Function to tear down
         """
         # Delete all pods, pvcs and namespaces
+        for bulk in self.bulk_apply_list:
+            bulk.delete()
+
         for job in self.kube_job_pod_list:
             job.delete(namespace=self.namespace)
 
@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+from ocs_ci.krkn_chaos.background_cluster_operations import (
+    OPERATION_CATEGORIES,
+    BackgroundClusterMetrics,
+    BackgroundClusterOperations,
+)
+
+
+def test_scheduler_concurrency_limits(monkeypatch):
+    """
+    Check that operations run concurrently within the global and per category
+    limits and their latencies are recorded.
+    """
+    lock = threading.Lock()
+    running = defaultdict(int)
+    peaks = defaultdict(int)
+
+    def fake_operation(name):
+        def operation():
+            category = OPERATION_CATEGORIES[name]
+            with lock:
+                running[category] += 1
+                running["total"] += 1
+                peaks[category] = max(peaks[category], running[category])
+                peaks["total"] = max(peaks["total"], running["total"])
+            time.sleep(0.3)
+            with lock:
+                running[category] -= 1
+                running["total"] -= 1
+
+        return operation
+
+    names = ["snapshot_lifecycle", "osd_operations", "mds_failover"]
+    ops = BackgroundClusterOperations(
+        SimpleNamespace(namespace="ns", workloads=[]),
+        enabled_operations=names,
+        max_concurrent_operations=4,
+        operations_per_minute=1200,
+        category_limits={"pvc": 2},
+        operation_priorities={"snapshot_lifecycle": -1},
+    )
+    ops.enabled_operations = {name: fake_operation(name) for name in names}
+    monkeypatch.setattr(ops, "_namespace_exists", lambda: True)
+    ops.start()
+    time.sleep(2)
+    ops.stop(cleanup=False)
+
+    assert peaks["pvc"] == 2
+    assert peaks["ceph_daemon"] == 1
+    assert peaks["total"] <= 3
+    latency = ops.metrics.get_summary()["latency_by_type"]
+    assert latency["snapshot_lifecycle"]["count"] >= 4
+    assert latency["snapshot_lifecycle"]["buckets"]["1"] >= 4
+
+
+def test_latency_histogram():
+    metrics = BackgroundClusterMetrics()
+    for duration in (0.5, 3, 3, 45, 4000):
+        metrics.record_operation("op", success=True, duration=duration)
+    histogram = metrics.get_latency_histograms()["op"]
+    assert histogram["buckets"]["1"] == 1
+    assert histogram["buckets"]["5"] == 2
+    assert histogram["buckets"]["60"] == 1
+    assert histogram["buckets"]["+Inf"] == 1
+    assert histogram["p50"] == 3
+    assert histogram["max"] == 4000
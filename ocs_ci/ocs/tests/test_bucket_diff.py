@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import botocore.exceptions
+
+from ocs_ci.ocs import bucket_utils
+
+
+class FakeS3Client(object):
+    """
+    Client serving list_objects_v2 and head_object from dicts of buckets
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.head_calls = 0
+
+    def list_objects_v2(
+        self,
+        Bucket,
+        Prefix="",
+        Delimiter="",
+        MaxKeys=1000,
+        ContinuationToken="",
+        FetchOwner=False,
+        StartAfter="",
+    ):
+        start_after = ContinuationToken or StartAfter
+        entries = []
+        for key in sorted(self.buckets[Bucket]):
+            if not key.startswith(Prefix) or key <= start_after:
+                continue
+            rest = key[len(Prefix) :]
+            if Delimiter and Delimiter in rest:
+                prefix = Prefix + rest[: rest.index(Delimiter) + 1]
+                if not entries or entries[-1] != ("prefix", prefix):
+                    entries.append(("prefix", prefix))
+            else:
+                entries.append(("key", key))
+        page, rest = entries[:MaxKeys], entries[MaxKeys:]
+        response = {
+            "IsTruncated": bool(rest),
+            "Contents": [
+                {"Key": key, "Size": len(self.buckets[Bucket][key]), "ETag": "etag"}
+                for kind, key in page
+                if kind == "key"
+            ],
+            "CommonPrefixes": [
+                {"Prefix": prefix} for kind, prefix in page if kind == "prefix"
+            ],
+        }
+        if rest:
+            # last key of the page (or of the last prefix) as the token
+            kind, last = page[-1]
+            response["NextContinuationToken"] = (
+                last if kind == "key" else last + "\U0010ffff"
+            )
+        return response
+
+    def head_object(self, Bucket, Key, IfMatch=""):
+        self.head_calls += 1
+        if Key not in self.buckets[Bucket]:
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+            )
+        return {"ContentLength": len(self.buckets[Bucket][Key]), "ETag": "etag"}
+
+
+def make_buckets():
+    first = {f"dir{d}/obj{i:03}": "data" for d in range(3) for i in range(50)}
+    first.update({f"root{i}": "data" for i in range(5)})
+    second = dict(first)
+    del second["dir1/obj007"]
+    second["dir2/extra"] = "data"
+    second["root3"] = "longer data"
+    return first, second
+
+
+def test_diff_buckets_by_partitions():
+    """
+    Check that differences are found in root keys and in every prefix with
+    the listing paginated.
+    """
+    first, second = make_buckets()
+    mcg_obj = SimpleNamespace(s3_client=FakeS3Client({"b1": first, "b2": second}))
+    diff = bucket_utils.diff_buckets(mcg_obj, "b1", "b2", batch_size=7)
+    assert diff.differences == {
+        "dir1/obj007": bucket_utils.BucketDiff.MISSING_IN_SECOND,
+        "dir2/extra": bucket_utils.BucketDiff.MISSING_IN_FIRST,
+        "root3": bucket_utils.BucketDiff.SIZE_MISMATCH,
+    }
+    assert diff.compared == len(first) + 1
+    assert "3 of 156 objects differ" in diff.summary()
+
+
+def test_compare_bucket_object_list_rechecks_differences(monkeypatch):
+    """
+    Check that only the different objects are rechecked until the buckets
+    are the same and the comparison is confirmed by full listing.
+    """
+    first, second = make_buckets()
+    client = FakeS3Client({"b1": first, "b2": second})
+    mcg_obj = SimpleNamespace(s3_client=client)
+    results = []
+
+    def _sampler(timeout, sleep, func):
+        for _ in range(3):
+            result = func()
+            results.append(result)
+            yield result
+            # replication catches up after the first recheck
+            client.buckets["b2"] = dict(first)
+
+    monkeypatch.setattr(bucket_utils, "TimeoutSampler", _sampler)
+    assert bucket_utils.compare_bucket_object_list(mcg_obj, "b1", "b2")
+    assert results == [False, True]
+    assert client.head_calls == 6
@@ -0,0 +1,91 @@
+from ocs_ci.ocs import bulk_apply, kube_api_backend
+from ocs_ci.ocs.bulk_apply import BulkApply
+
+
+class FakeResource(object):
+    namespaced = True
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def path(self, name=None, namespace=None):
+        path = f"/api/v1/namespaces/{namespace}/{self.kind.lower()}s"
+        return f"{path}/{name}" if name else path
+
+
+class FakeBackend(object):
+    """
+    API backend storing applied objects and streaming status changes of
+    them as watch events
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+        self.failures = 1
+        self.dyn_client = self
+        self.resources = self
+
+    def get(self, api_version, kind):
+        return FakeResource(kind)
+
+    def resolve_resource(self, kind):
+        return FakeResource(kind)
+
+    def request(self, method, path, timeout, body=None, **params):
+        self.requests.append((method, path, params.get("content_type")))
+        if method == "patch":
+            if self.failures:
+                self.failures -= 1
+                raise kube_api_backend.CommandFailed("Error from server (Timeout)")
+            self.objects[path] = body
+            return body
+        if method == "delete":
+            self.objects.pop(path)
+            return {}
+        items = [obj for p, obj in self.objects.items() if p.startswith(path)]
+        return {"kind": "List", "items": items, "metadata": {"resourceVersion": "1"}}
+
+    def watch(self, path, resource_version, timeout, **params):
+        for obj_path, obj in list(self.objects.items()):
+            if not obj_path.startswith(path):
+                continue
+            if obj["kind"] == "PersistentVolumeClaim":
+                status = {"phase": "Bound"}
+            else:
+                status = {"phase": "Running"}
+            yield {"type": "MODIFIED", "object": dict(obj, status=status)}
+
+
+def test_bulk_apply_timelines(monkeypatch):
+    """
+    Check that the objects are applied by server side apply with retry and
+    the timelines follow the PVCs to Bound and pods to Running.
+    """
+    backend = FakeBackend()
+    monkeypatch.setattr(kube_api_backend, "get_api_backend", lambda **kw: backend)
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    pvcs = [
+        {"apiVersion": "v1", "kind": "PersistentVolumeClaim", "metadata": {"name": n}}
+        for n in ("pvc-1", "pvc-2", "pvc-3")
+    ]
+    pods = [{"apiVersion": "v1", "kind": "Pod", "metadata": {"name": "pod-1"}}]
+
+    bulk = BulkApply("ns", max_workers=2)
+    bulk.apply(pvcs)
+    assert backend.requests[0][2] == "application/apply-patch+yaml"
+    timelines = bulk.wait(timeout=10)
+    assert all(
+        timeline.duration("applied", "bound") is not None
+        for timeline in timelines.values()
+    )
+    bulk.apply(pods)
+    bulk.wait(timeout=10)
+    assert bulk.get_names("Pod") == ["pod-1"]
+    assert bulk.get_names("PersistentVolumeClaim") == ["pvc-1", "pvc-2", "pvc-3"]
+    for obj in backend.objects.values():
+        assert obj["metadata"]["labels"][bulk_apply.BULK_APPLY_LABEL]
+    assert "Pod: 1 objects" in bulk.summary()
+
+    bulk.delete()
+    assert not backend.objects
@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import exceptions
+from ocs_ci.ocs.cluster import (
+    CephClusterMultiCluster,
+    CephHealthMonitor,
+    MulticlusterCephHealthMonitor,
+)
+
+
+class SampledHealthMonitor(CephHealthMonitor):
+    """
+    Monitor reading the health from the list of samples
+    """
+
+    def __init__(self, samples, **kwargs):
+        super().__init__(None, **kwargs)
+        self.samples = list(samples)
+        self.intervals = []
+
+    def read_health(self):
+        if len(self.samples) == 1:
+            self.health_monitor_enabled = False
+        status = self.samples.pop(0)
+        return status, status
+
+    def _get_ceph_status(self):
+        return "ceph status"
+
+    def start(self):
+        # run the monitor thread synchronously without sleeping
+        self._stop_event.wait = lambda interval: self.intervals.append(interval)
+        thread = threading.Thread(target=self.run)
+        thread.start()
+        thread.join()
+
+    def join(self, timeout=None):
+        pass
+
+
+def test_health_monitor_adaptive_interval_and_history():
+    """
+    Check that the interval grows while HEALTH_OK and only transitions are
+    stored to the history.
+    """
+    samples = ["HEALTH_OK"] * 4 + ["HEALTH_WARN", "HEALTH_WARN", "HEALTH_OK"]
+    monitor = SampledHealthMonitor(samples, sleep=5, max_sleep=30)
+    with monitor:
+        pass
+    assert monitor.intervals == [5, 5, 10, 20, 30, 5, 5]
+    assert [item.status for item in monitor.get_health_history()] == [
+        "HEALTH_OK",
+        "HEALTH_WARN",
+        "HEALTH_OK",
+    ]
+
+
+def test_health_monitor_keeps_monitoring_after_error():
+    """
+    Check that HEALTH_ERR is reported at the exit and monitoring continues.
+    """
+    monitor = SampledHealthMonitor(
+        ["HEALTH_OK", "HEALTH_ERR", "HEALTH_OK"], history_size=2
+    )
+    with pytest.raises(exceptions.CephHealthException, match="ceph status"):
+        with monitor:
+            pass
+    assert [item.status for item in monitor.get_health_history()] == [
+        "HEALTH_ERR",
+        "HEALTH_OK",
+    ]
+
+
+def test_health_monitor_context_switch_is_thread_local():
+    """
+    Check that switching of the config context in the monitor thread doesn't
+    change the context of the other threads.
+    """
+
+    class SwitchingHealthMonitor(SampledHealthMonitor):
+        def read_health(self):
+            config.cur_index = self.config_index + 1
+            self.global_index = config._cur_index
+            config.cur_index = self.config_index
+            return super().read_health()
+
+    original_index = config._cur_index
+    monitor = SwitchingHealthMonitor(["HEALTH_OK"], cluster_index=0)
+    assert monitor.name == "ceph-health-monitor-0"
+    with monitor:
+        pass
+    assert monitor.global_index == original_index == config._cur_index
+
+
+def test_health_monitor_of_multicluster(monkeypatch):
+    """
+    Check that monitor of CephClusterMultiCluster monitors its clusters and
+    every monitor reads the source from the config of its cluster.
+    """
+    monkeypatch.setitem(config.clusters[0].RUN, "ceph_health_monitor_source", "cr")
+    ceph_cluster = CephClusterMultiCluster.__new__(CephClusterMultiCluster)
+    ceph_cluster.cluster_conf = config.clusters[0]
+    monitor = CephHealthMonitor(ceph_cluster, sleep=1)
+    assert isinstance(monitor, MulticlusterCephHealthMonitor)
+    assert [item.cluster_index for item in monitor.monitors] == [
+        config.clusters[0].MULTICLUSTER["multicluster_index"]
+    ]
+    assert [item.source for item in monitor.monitors] == ["cr"]
+    assert monitor.monitors[0].sleep == 1
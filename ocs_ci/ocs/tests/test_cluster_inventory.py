@@ -0,0 +1,96 @@
+import json
+
+from ocs_ci.krkn_chaos import background_cluster_validator as validator
+from ocs_ci.krkn_chaos.background_cluster_validator import (
+    ClusterInventory,
+    OrphanTracker,
+    PVRecord,
+    diff_sorted,
+)
+
+
+def rbd_pv(name, claim, image, phase="Bound"):
+    return PVRecord(name, phase, claim, image, "")
+
+
+def test_diff_sorted():
+    assert diff_sorted(("a", "b", "d"), ("b", "c", "d", "e")) == (["c", "e"], ["a"])
+
+
+def test_orphan_tracker_incremental():
+    """
+    Check that orphans updated from the snapshot diffs are the same as
+    computed from the whole inventories.
+    """
+    baseline = ClusterInventory(
+        pvs=[rbd_pv("pv-1", "ns/pvc-1", "img-1")],
+        pvcs=["ns/pvc-1"],
+        rbd_images=["img-1", "img-old"],
+    )
+    tracker = OrphanTracker(baseline)
+    assert not (tracker.orphan_pvs or tracker.orphan_rbd_images)
+
+    # PVC deleted, PV released and its image left behind, new image
+    # provisioned before its PV appears
+    changes = tracker.update(
+        ClusterInventory(
+            pvs=[rbd_pv("pv-1", "ns/pvc-1", "img-1", phase="Released")],
+            rbd_images=["img-1", "img-2", "img-old"],
+            cephfs_subvolumes=["subvol-1"],
+        )
+    )
+    assert changes["pvcs"] == ([], ["ns/pvc-1"])
+    assert tracker.orphan_pvs == {"pv-1"}
+    assert tracker.orphan_rbd_images == {"img-2"}
+    assert tracker.orphan_subvolumes == {"subvol-1"}
+
+    # PV of the new image bound, released PV and its image deleted
+    tracker.update(
+        ClusterInventory(
+            pvs=[rbd_pv("pv-2", "ns/pvc-2", "img-2")],
+            pvcs=["ns/pvc-2"],
+            rbd_images=["img-2", "img-old"],
+            cephfs_subvolumes=["subvol-1"],
+        )
+    )
+    assert not tracker.orphan_pvs
+    assert not tracker.orphan_rbd_images
+    assert tracker.orphan_subvolumes == {"subvol-1"}
+
+
+class FakeSession(object):
+    def __init__(self):
+        self.batches = []
+        self.filesystems = ["fs-a"]
+
+    def run_cmds(self, commands, timeout):
+        self.batches.append(commands)
+        results = []
+        for command in commands:
+            if command.startswith("rbd ls"):
+                out = ["img-1"]
+            elif command.startswith("ceph fs ls"):
+                out = [{"name": fs} for fs in self.filesystems]
+            else:
+                out = [{"name": f"subvol-{command.split()[4]}"}]
+            results.append((json.dumps(out), 0, ""))
+        return results
+
+
+def test_capture_batches_toolbox_commands(monkeypatch):
+    """
+    Check that the Ceph inventories are listed by one batch of commands once
+    the filesystems are known.
+    """
+    session = FakeSession()
+    monkeypatch.setattr(
+        validator.toolbox_session, "get_toolbox_session", lambda: session
+    )
+    monkeypatch.setattr(validator.ocp.OCP, "get", lambda self, **kwargs: {"items": []})
+    first = ClusterInventory.capture()
+    assert first.cephfs_subvolumes == ("subvol-fs-a",)
+    assert len(session.batches) == 2
+    second = ClusterInventory.capture(first)
+    assert len(session.batches) == 3
+    assert second.rbd_images == ("img-1",)
+    assert second.diff(first) == {kind: ([], []) for kind in validator.INVENTORY_KINDS}
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.helpers import performance_lib
+from ocs_ci.helpers.performance_lib import CsiLogIndex, CsiLogTail
+from ocs_ci.ocs.exceptions import CommandFailed
+
+PV = "pvc-0b1c2d3e-0000-1111-2222-333344445555"
+VOLUME_ID = "0001-0011-openshift-storage-0000000000000001-abcdef"
+
+PROVISIONER_LOG = [
+    'I0312 10:00:01.000000       1 controller.go:1] "Started" PVC="ns/pvc-1"',
+    'I0312 10:00:01.500000       1 controller.go:1] "Started" PVC="ns/pvc-10"',
+    'I0312 10:00:03.250000       1 controller.go:1] "Succeeded" PVC="ns/pvc-1"',
+    'I0312 10:00:04.000000       1 controller.go:1] "Succeeded" PVC="ns/pvc-10"',
+    f'I0312 10:05:00.000000       1 controller.go:1] "shouldDelete is true" PV="{PV}"',
+    f'I0312 10:05:02.000000       1 controller.go:1] "deleted succeeded" PV="{PV}"',
+]
+
+CSI_LOG = [
+    f"I0312 10:00:01.100000       1 utils.go:1] ID: 1 Req-ID: {PV} GRPC call: "
+    "/csi.v1.Controller/CreateVolume",
+    f"I0312 10:00:02.000000       1 utils.go:1] ID: 1 Req-ID: {PV} generated "
+    f"volume id ({VOLUME_ID}) and image name (csi-vol-1) for request name {PV}",
+    f"I0312 10:00:02.100000       1 utils.go:1] ID: 1 Req-ID: {PV} GRPC response: "
+    "{}",
+    f"I0312 10:05:00.500000       1 utils.go:1] ID: 2 Req-ID: {VOLUME_ID} GRPC call: "
+    "/csi.v1.Controller/DeleteVolume",
+    f"I0312 10:05:01.500000       1 utils.go:1] ID: 2 Req-ID: {VOLUME_ID} GRPC "
+    "response: {}",
+]
+
+
+def test_csi_log_index_events():
+    """
+    Check that events are indexed by exact PVC / PV names and Req-IDs.
+    """
+    index = CsiLogIndex(ocs_version="4.18")
+    index.add_provisioner_log(PROVISIONER_LOG)
+    index.add_csi_log(CSI_LOG)
+    assert index.get_times(CsiLogIndex.CREATE_START, "pvc-1") == [
+        "I0312 10:00:01.000000"
+    ]
+    assert index.get_times(CsiLogIndex.CREATE_END, "pvc-10") == [
+        "I0312 10:00:04.000000"
+    ]
+    assert index.get_times(CsiLogIndex.DELETE_END, PV) == ["I0312 10:05:02.000000"]
+    assert index.csi_request_id(PV, "create") == PV
+    assert index.csi_request_id(PV, "delete") == VOLUME_ID
+    assert index.last(CsiLogIndex.CSI_END, VOLUME_ID).endswith("I0312 10:05:01.500000")
+    assert index.first(CsiLogIndex.CREATE_START, "pvc-2") is None
+
+
+def test_get_pvc_provision_times_from_index(monkeypatch):
+    """
+    Check that all the operation times are answered from one index.
+    """
+
+    def from_cluster(interface, start_time, provisioner=True, csi=True):
+        index = CsiLogIndex(ocs_version="4.18")
+        index.add_provisioner_log(PROVISIONER_LOG)
+        index.add_csi_log(CSI_LOG)
+        return index
+
+    monkeypatch.setattr(CsiLogIndex, "from_cluster", staticmethod(from_cluster))
+    pvcs = [
+        SimpleNamespace(name="pvc-1", backed_pv=PV),
+        SimpleNamespace(name="pvc-10", backed_pv="pvc-not-in-log"),
+    ]
+    results = performance_lib.get_pvc_provision_times("rbd", pvcs, "start")
+    assert results["pvc-1"]["create"]["time"] == 2.25
+    assert results["pvc-1"]["delete"]["time"] == 2.0
+    assert results["pvc-1"]["csi_create"]["time"] == 1.0
+    assert results["pvc-1"]["csi_delete"]["time"] == 1.0
+    assert results["pvc-10"]["create"]["time"] == 2.5
+    assert results["pvc-10"]["csi_delete"]["start"] is None
+
+
+class FileLogTail(CsiLogTail):
+    """
+    Log tail reading the logs from local files instead of the pods
+    """
+
+    def __init__(self, log_dir):
+        super().__init__("rbd", "2024-03-12T10:00:00Z")
+        self.log_dir = log_dir
+        self.since_times = []
+
+    def _log_cmd(self, pod_name, container, since_time):
+        self.since_times.append(since_time)
+        return ["cat", str(self.log_dir / f"{pod_name}-{container}")]
+
+
+def test_csi_log_tail_reads_only_new_lines(monkeypatch, tmp_path):
+    """
+    Check that the logs of all pods are indexed and the lines already read
+    are skipped on the next update, even with the same timestamp.
+    """
+    monkeypatch.setattr(
+        performance_lib, "get_logfile_names", lambda interface: ["prov-a", "prov-b"]
+    )
+    log_a = tmp_path / "prov-a-csi-provisioner"
+    log_b = tmp_path / "prov-b-csi-provisioner"
+    log_a.write_text(
+        f"2024-03-12T10:00:01.1Z {PROVISIONER_LOG[0]}\n"
+        f"2024-03-12T10:00:03.25Z {PROVISIONER_LOG[2]}\n"
+    )
+    log_b.write_text(f"2024-03-12T10:00:01.5Z {PROVISIONER_LOG[1]}\n")
+    tail = FileLogTail(tmp_path)
+    index = tail.update(csi=False)
+    assert index.get_times(CsiLogIndex.CREATE_START, "pvc-10") == [
+        "I0312 10:00:01.500000"
+    ]
+    assert tail.cursors[("prov-a", "csi-provisioner")] == (
+        "2024-03-12T10:00:03.250000000Z",
+        1,
+    )
+
+    # the log is read again since the last timestamp with the new lines
+    log_a.write_text(
+        f"2024-03-12T10:00:01.1Z {PROVISIONER_LOG[0]}\n"
+        f"2024-03-12T10:00:03.25Z {PROVISIONER_LOG[2]}\n"
+        f"2024-03-12T10:00:03.25Z {PROVISIONER_LOG[2]}\n"
+    )
+    index = tail.update(csi=False)
+    assert tail.since_times[-2:] == [
+        "2024-03-12T10:00:03.250000000Z",
+        "2024-03-12T10:00:01.500000000Z",
+    ]
+    assert index.get_times(CsiLogIndex.CREATE_START, "pvc-1") == [
+        "I0312 10:00:01.000000"
+    ]
+    assert len(index.get_times(CsiLogIndex.CREATE_END, "pvc-1")) == 2
+    assert len(index.get_times(CsiLogIndex.CREATE_START, "pvc-10")) == 1
+
+
+def test_csi_log_tail_command_failure(monkeypatch, tmp_path):
+    """
+    Check that the log command writing lot of stderr doesn't block and its
+    failure is reported with the stderr.
+    """
+    monkeypatch.delitem(performance_lib.config.RUN, "kubeconfig", raising=False)
+    tail = CsiLogTail("rbd", "2024-03-12T10:00:00Z")
+    assert "--kubeconfig" not in tail._log_cmd("prov-a", "csi-provisioner", "now")
+    script = "head -c 1000000 /dev/zero | tr '\\0' e >&2; echo failed >&2; exit 3"
+    monkeypatch.setattr(tail, "_log_cmd", lambda *args: ["/bin/bash", "-c", script])
+    with pytest.raises(CommandFailed, match="failed"):
+        tail._read_log("prov-a", "csi-provisioner", 30)
+
+
+def test_csi_log_tails_bounded(monkeypatch):
+    """
+    Check that only the recently used log tails are kept.
+    """
+    monkeypatch.setattr(performance_lib, "_csi_log_tails", OrderedDict())
+    first = performance_lib.get_csi_log_tail("rbd", "start-0")
+    for i in range(1, performance_lib.MAX_CSI_LOG_TAILS + 1):
+        assert performance_lib.get_csi_log_tail("rbd", "start-0") is first
+        performance_lib.get_csi_log_tail("rbd", f"start-{i}")
+    assert len(performance_lib._csi_log_tails) == performance_lib.MAX_CSI_LOG_TAILS
+    assert performance_lib.get_csi_log_tail("rbd", "start-0") is first
+    start_times = [key[2] for key in performance_lib._csi_log_tails]
+    assert "start-1" not in start_times
@@ -0,0 +1,224 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from openshift.dynamic.exceptions import DynamicApiError
+
+from ocs_ci.ocs import kube_api_backend
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.kube_api_backend import KubeAPIBackend, parse_oc_command
+
+KUBECONFIG = """
+apiVersion: v1
+kind: Config
+clusters:
+- name: cluster
+  cluster:
+    server: https://127.0.0.1:6443
+users:
+- name: admin
+  user:
+    token: token
+contexts:
+- name: ctx-a
+  context:
+    cluster: cluster
+    user: admin
+    namespace: ns-a
+- name: ctx-b
+  context:
+    cluster: cluster
+    user: admin
+current-context: ctx-a
+"""
+
+
+def test_parse_get_with_selector():
+    """
+    Check that 'oc get' with yaml output and selector is translated.
+    """
+    request = parse_oc_command(
+        "get Pod  -n openshift-storage --selector=app=rook-ceph-osd -o yaml",
+        namespace="default",
+    )
+    assert request["verb"] == "get"
+    assert request["kind"] == "Pod"
+    assert request["name"] is None
+    assert request["namespace"] == "openshift-storage"
+    assert request["selector"] == "app=rook-ceph-osd"
+    assert request["output"] == "yaml"
+
+
+def test_parse_kind_slash_name():
+    """
+    Check that kind/name reference is split to kind and name.
+    """
+    request = parse_oc_command("get pvc/my-pvc -ojson", namespace="ns")
+    assert request["kind"] == "pvc"
+    assert request["name"] == "my-pvc"
+    assert request["namespace"] == "ns"
+    assert request["output"] == "json"
+
+
+def test_parse_patch():
+    """
+    Check that patch with merge type keeps the patch body intact.
+    """
+    request = parse_oc_command(
+        "patch storagecluster ocs-storagecluster -n openshift-storage "
+        """-p '{"spec": {"a": 1}}' --type merge"""
+    )
+    assert request["name"] == "ocs-storagecluster"
+    assert request["patch"] == '{"spec": {"a": 1}}'
+    assert request["patch_type"] == "merge"
+
+
+def test_parse_delete_flags():
+    """
+    Check delete related boolean flags.
+    """
+    request = parse_oc_command(
+        "delete pod my-pod --grace-period=0 --force --wait=false"
+    )
+    assert request["grace_period"] == "0"
+    assert request["force"]
+    assert not request["wait"]
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "rsh my-pod ceph status",
+        "debug nodes/worker-0 -- chroot /host ls",
+        "adm must-gather",
+        "get pods",
+        "get pods -o wide",
+        "get pods,pvc -o yaml",
+        "get pod my-pod --show-labels -o yaml",
+        "patch pod my-pod --type=unknown -p '{}'",
+        "delete -f file.yaml",
+        "create namespace my-namespace",
+        "get pod 'unbalanced -o yaml",
+    ],
+)
+def test_parse_not_served(command):
+    """
+    Check that commands which need the oc binary are not served by the API
+    backend.
+    """
+    assert parse_oc_command(command) is None
+
+
+class FakeResource(object):
+    namespaced = True
+    kind = "Pod"
+    group = ""
+    group_version = "v1"
+    name = "pods"
+    singular_name = "pod"
+
+    def path(self, name=None, namespace=None):
+        path = f"/api/v1/namespaces/{namespace}/pods" if namespace else "/api/v1/pods"
+        return f"{path}/{name}" if name else path
+
+
+class FakeDynamicClient(object):
+    """
+    Dynamic client answering the requests from the responses of the paths,
+    the paths without response are not found
+    """
+
+    def __init__(self, api_client):
+        self.responses = {}
+        self.requests = []
+
+    def request(self, method, path, serialize=False, **params):
+        self.requests.append((method, path))
+        if method in ("patch", "delete"):
+            return SimpleNamespace(data="{}")
+        if path not in self.responses:
+            raise DynamicApiError(
+                SimpleNamespace(
+                    status=404,
+                    reason="Not Found",
+                    body=json.dumps({"message": f'pods "{path}" not found'}),
+                    headers={},
+                )
+            )
+        return SimpleNamespace(data=json.dumps(self.responses[path]))
+
+
+@pytest.fixture
+def backend(monkeypatch, tmp_path):
+    kubeconfig = tmp_path / "kubeconfig"
+    kubeconfig.write_text(KUBECONFIG)
+    monkeypatch.setattr(kube_api_backend, "DynamicClient", FakeDynamicClient)
+    backend = KubeAPIBackend(kubeconfig=str(kubeconfig))
+    backend._resources = {"pod": FakeResource()}
+    backend._resources_lock = threading.Lock()
+    return backend
+
+
+def test_context_namespace(backend):
+    """
+    Check that the namespace of the kubeconfig context is used for the
+    namespaced kinds when the command doesn't specify one.
+    """
+    assert backend.namespace == "ns-a"
+    assert (
+        KubeAPIBackend.context_namespace(backend.kubeconfig, context="ctx-b")
+        == "default"
+    )
+    responses = backend.dyn_client.responses
+    responses["/api/v1/namespaces/ns-a/pods/pod-a"] = {"kind": "Pod"}
+    responses["/api/v1/namespaces/ns-a/pods"] = {"kind": "PodList", "items": []}
+    assert backend.execute(parse_oc_command("get pod pod-a -o yaml"))["kind"] == "Pod"
+    backend.execute(parse_oc_command("get pod -o yaml"))
+    backend.execute(parse_oc_command("delete pod pod-a --wait=false"))
+    assert [path for _, path in backend.dyn_client.requests] == [
+        "/api/v1/namespaces/ns-a/pods/pod-a",
+        "/api/v1/namespaces/ns-a/pods",
+        "/api/v1/namespaces/ns-a/pods/pod-a",
+    ]
+
+
+def test_execute_output(backend):
+    """
+    Check that the output of the served commands has the same shape as the
+    yaml loaded output of 'oc'.
+    """
+    backend.dyn_client.responses["/api/v1/pods"] = {
+        "kind": "PodList",
+        "metadata": {"resourceVersion": "10"},
+        "items": [{"metadata": {"name": "pod-a"}}],
+    }
+    assert backend.execute(parse_oc_command("get pod -A -o yaml")) == {
+        "apiVersion": "v1",
+        "items": [{"apiVersion": "v1", "kind": "Pod", "metadata": {"name": "pod-a"}}],
+        "kind": "List",
+        "metadata": {"resourceVersion": ""},
+    }
+    patch = parse_oc_command("patch pod pod-a -n ns -p '{}' --type merge")
+    assert backend.execute(patch) == "pod/pod-a patched"
+    delete = parse_oc_command("delete pod pod-a -n ns --wait=false")
+    assert backend.execute(delete) == 'pod "pod-a" deleted'
+
+
+def test_execute_not_found(backend):
+    """
+    Check that NotFound error is formatted the same way as 'oc' prints it.
+    """
+    path = "/api/v1/namespaces/ns/pods/pod-b"
+    with pytest.raises(CommandFailed) as ex:
+        backend.execute(parse_oc_command("get pod pod-b -n ns -o yaml"))
+    assert str(ex.value) == f'Error from server (NotFound): pods "{path}" not found'
+
+
+def test_execute_get_ignore_not_found(backend):
+    """
+    Check that get of missing object with --ignore-not-found returns the
+    same empty output as 'oc'.
+    """
+    request = parse_oc_command("get pod pod-b -n ns --ignore-not-found -o yaml")
+    assert backend.execute(request) is None
@@ -0,0 +1,55 @@
+import re
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import constants
+from ocs_ci.ocs.metrics import get_missing_metrics
+
+
+class MetricStore(object):
+    """
+    Object with query method of PrometheusAPI answering from a set of
+    available metric names
+    """
+
+    def __init__(self, available):
+        self.available = available
+        self.queries = []
+        self.config_indexes = set()
+
+    def query(self, query, timestamp=None, **kwargs):
+        self.queries.append(query)
+        # index bound to the worker thread by config_safe_thread_pool_task
+        self.config_indexes.add(getattr(config.thread_local_data, "config_index", None))
+        match = re.fullmatch(r'count by \(__name__\) \(\{__name__=~"(.*)"\}\)', query)
+        if match:
+            names = match.group(1).split("|")
+        else:
+            names = [query]
+        return [
+            {"metric": {"__name__": name}} for name in names if name in self.available
+        ]
+
+
+def test_get_missing_metrics_batched():
+    """
+    Check that batched queries find the same missing metrics as single ones,
+    including RGW exemptions on cloud platforms.
+    """
+    metrics = [f"ceph_metric_{i}" for i in range(7)] + ["ceph_rgw_req"]
+    prometheus = MetricStore({"ceph_metric_0", "ceph_metric_3", "ceph_metric_6"})
+    missing = get_missing_metrics(
+        prometheus, metrics, current_platform=constants.AWS_PLATFORM, batch_size=3
+    )
+    assert len(prometheus.queries) == 3
+    assert prometheus.config_indexes == {config.cur_index}
+    assert missing == [
+        "ceph_metric_1",
+        "ceph_metric_2",
+        "ceph_metric_4",
+        "ceph_metric_5",
+    ]
+    single = MetricStore(prometheus.available)
+    assert get_missing_metrics(single, metrics, batch_size=1) == missing + [
+        "ceph_rgw_req"
+    ]
+    assert len(single.queries) == len(metrics)
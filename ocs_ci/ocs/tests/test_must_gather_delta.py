@@ -0,0 +1,48 @@
+import datetime
+import os
+from types import SimpleNamespace
+
+from ocs_ci.ocs.must_gather.delta import MustGatherDelta
+
+
+def write_gather(path, pod_version, log_content):
+    """
+    Write must-gather directory with one resource and one log
+    """
+    os.makedirs(path / "namespaces" / "pods")
+    (path / "namespaces" / "pods" / "pod.yaml").write_text(
+        f'kind: Pod\nmetadata:\n  name: pod\n  resourceVersion: "{pod_version}"\n'
+    )
+    (path / "namespaces" / "pods" / "pod.log").write_text(log_content)
+
+
+def test_delta_gathers_are_deduplicated(tmp_path):
+    """
+    Check that since time of next gather is the start of the previous one and
+    unchanged resources and identical files are hardlinked.
+    """
+    delta = MustGatherDelta()
+    cluster_config = SimpleNamespace(ENV_DATA={"cluster_name": "cl"})
+    key = delta.get_key(cluster_config, "quay.io/ocs-must-gather:latest")
+    store = str(tmp_path / "store")
+    assert delta.get_since_time(key) is None
+
+    first, second, third = (tmp_path / f"gather_{i}" for i in range(3))
+    write_gather(first, 10, "log line\n")
+    start = datetime.datetime(2024, 1, 15, 10, 30)
+    assert delta.record(key, str(first), start, store) == 0
+    assert delta.get_since_time(key) == "2024-01-15T10:30:00Z"
+
+    write_gather(second, 10, "log line\n")
+    saved = delta.record(key, str(second), start, store)
+    assert saved == os.path.getsize(first / "namespaces" / "pods" / "pod.yaml") + 9
+    for name in ["pod.yaml", "pod.log"]:
+        assert os.path.samefile(
+            first / "namespaces" / "pods" / name, second / "namespaces" / "pods" / name
+        )
+
+    write_gather(third, 11, "other line\n")
+    assert delta.record(key, str(third), start, store) == 0
+    assert delta.stats["delta_gathers"] == 2
+    assert delta.stats["unchanged_resources"] == 1
+    assert delta.stats["deduplicated_files"] == 1
@@ -0,0 +1,49 @@
+import random
+import tarfile
+
+from ocs_ci.ocs.must_gather.must_gather import MustGather
+from ocs_ci.ocs.must_gather.path_index import SubstringMatcher
+
+
+def test_substring_matcher_matches_in_operator():
+    """
+    Check that the matcher finds the same patterns as ``in`` operator,
+    including overlapping patterns and patterns being suffixes of others.
+    """
+    rng = random.Random(42)
+    patterns = ["ab", "b", "bab", "abab", "ca", "aaa", "/c/", "cc"]
+    patterns += ["".join(rng.choice("abc/") for _ in range(4)) for _ in range(30)]
+    matcher = SubstringMatcher(patterns)
+    for _ in range(200):
+        text = "".join(rng.choice("abc/") for _ in range(rng.randint(0, 20)))
+        assert matcher.search(text) == {p for p in patterns if p in text}
+
+
+def test_verify_paths_with_tarball(tmp_path):
+    """
+    Check that paths in the directory and inside the tarball including its
+    parent directories are verified.
+    """
+    root = tmp_path / "mg_ocs_logs"
+    (root / "ceph" / "ceph_logs").mkdir(parents=True)
+    (root / "ceph" / "ceph_logs" / "journal_compute-1").write_text("log")
+    member = tmp_path / "log.log"
+    member.write_text("log")
+    with tarfile.open(root / "must-gather.tar.gz", "w:gz") as tar:
+        tar.add(member, arcname="mg/namespaces/openshift-storage/noobaa/log.log")
+
+    mustgather = MustGather()
+    mustgather.root = str(root)
+    mustgather.get_all_paths()
+    assert "mg/namespaces/openshift-storage" in mustgather.full_paths
+    missing, unexpected = mustgather.verify_paths(
+        ["/ceph_logs/journal_", "/openshift-storage/noobaa", "/rgw/"],
+        ["/namespaces/openshift-storage", "/rbd_vol_and_snap_info"],
+    )
+    assert missing == ["/rgw/"]
+    assert unexpected == ["/namespaces/openshift-storage"]
+    assert mustgather.verify_paths_in_dir(["/rgw/", "ceph_logs"]) == ["/rgw/"]
+
+    # paths set directly are indexed as well
+    mustgather.full_paths = ["/a/b/rgw/c"]
+    assert mustgather.verify_paths_not_in_dir(["/rgw/", "/ceph/"]) == ["/rgw/"]
@@ -0,0 +1,108 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.resiliency import network_faults
+from ocs_ci.resiliency.network_faults import (
+    INTERFACE_MARKER,
+    TIMESTAMP_MARKER,
+    NetworkFaults,
+)
+
+
+class FakeNodes(object):
+    """
+    exec_oc_debug_cmd of the nodes recording the commands, commands
+    containing any of the failing strings fail on the node
+    """
+
+    def __init__(self, outputs=None, failing=None):
+        self.lock = threading.Lock()
+        self.commands = {}
+        self.outputs = outputs or {}
+        self.failing = failing or {}
+
+    def exec_oc_debug_cmd(self, node, cmd_list, **kwargs):
+        with self.lock:
+            self.commands.setdefault(node, []).append(cmd_list)
+        if any(fail in cmd for cmd in cmd_list for fail in self.failing.get(node, [])):
+            raise CommandFailed(f"command failed on {node}")
+        lines = []
+        for cmd in cmd_list:
+            if cmd.startswith("echo "):
+                lines.append(
+                    cmd[len("echo ") :].replace("$(date +%s.%N)", "1700000000.25")
+                )
+            lines.append(self.outputs.get((node, cmd), ""))
+        return "\n".join(line for line in lines if line)
+
+
+@pytest.fixture
+def faults(monkeypatch):
+    monkeypatch.setattr(network_faults.time, "sleep", lambda seconds: None)
+    obj = NetworkFaults.__new__(NetworkFaults)
+    obj.nodes = [SimpleNamespace(name="node-a"), SimpleNamespace(name="node-b")]
+    obj.node_interfaces = {"node-a": ["eth0"], "node-b": ["eth0", "eth1"]}
+    obj.duration = obj.pause = 0
+    obj.iterations = 1
+    obj.fault_timeline = []
+    return obj
+
+
+def test_exec_timed_on_nodes(faults):
+    """
+    Check that the time is parsed from the output of every node and the node
+    the commands failed on is missing.
+    """
+    faults.ocp_obj = FakeNodes(failing={"node-b": ["uptime"]})
+    timestamps = faults._exec_timed_on_nodes(
+        {"node-a": ["uptime"], "node-b": ["uptime"]}, "testing"
+    )
+    assert timestamps == {"node-a": 1700000000.25}
+    assert faults.ocp_obj.commands["node-a"][0][-1].startswith(
+        f"echo {TIMESTAMP_MARKER}"
+    )
+
+
+def test_remove_faults_verification(faults):
+    """
+    Check that the qdisc outputs are split by interface and interfaces with
+    netem left are reported.
+    """
+    faults.ocp_obj = FakeNodes(
+        outputs={
+            ("node-b", "tc qdisc show dev eth1"): "qdisc netem 8001: root",
+            ("node-b", "tc qdisc show dev eth0"): "qdisc fq_codel 0: root",
+        }
+    )
+    assert faults._remove_faults_all_nodes() == {"node-b": ["eth1"]}
+    assert NetworkFaults._parse_interface_outputs(
+        f"{INTERFACE_MARKER}eth0\nqdisc fq_codel\n{INTERFACE_MARKER}eth1\n"
+    ) == {"eth0": "qdisc fq_codel", "eth1": ""}
+
+
+def test_apply_fault_partial_failure(faults, monkeypatch):
+    """
+    Check that the fault is removed from the node where applying failed on
+    one of its interfaces.
+    """
+    monkeypatch.setattr(network_faults.random, "randint", lambda low, high: high)
+    faults.ocp_obj = FakeNodes(failing={"node-b": ["replace dev eth1"]})
+    faults._apply_fault("loss", "loss 10%")
+
+    removal = [
+        cmds
+        for cmds in faults.ocp_obj.commands["node-b"]
+        if cmds[0].startswith("tc qdisc del") and INTERFACE_MARKER not in cmds[1]
+    ]
+    assert removal == [
+        [
+            "tc qdisc del dev eth0 root || true",
+            "tc qdisc del dev eth1 root || true",
+            f"echo {TIMESTAMP_MARKER}$(date +%s.%N)",
+        ]
+    ]
+    assert [entry["node"] for entry in faults.fault_timeline] == ["node-a"]
+    assert faults.fault_timeline[0]["duration"] == 0
@@ -0,0 +1,50 @@
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs import node_agent
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.ocp import OCP
+
+
+@pytest.fixture
+def oc_commands(monkeypatch):
+    """
+    Record 'oc' commands instead of executing them
+    """
+    commands = []
+
+    def _exec_oc_cmd(self, command, out_yaml_format=True, timeout=600, **kwargs):
+        commands.append(command)
+        if "fail" in command:
+            return f"error\n{node_agent.NODE_CMD_ERROR_MARKER}"
+        return "output"
+
+    monkeypatch.setattr(OCP, "exec_oc_cmd", _exec_oc_cmd)
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    return commands
+
+
+def test_debug_cmd_uses_agent_with_fallback(monkeypatch, oc_commands):
+    """
+    Check that commands run in the agent pod of the node and nodes without
+    agent pod fall back to oc debug.
+    """
+    agent = node_agent.NodeAgent()
+    monkeypatch.setattr(agent, "refresh_pods", lambda: {"worker-0": "agent-abc"})
+    monkeypatch.setitem(config.RUN, "node_agent", True)
+    monkeypatch.setattr(node_agent, "_agents", {config.cur_index: agent})
+
+    outputs = node_agent.exec_cmd_on_nodes(["worker-0", "worker-1"], ["uptime"])
+    assert outputs == {"worker-0": "output", "worker-1": "output"}
+    exec_cmds = [cmd for cmd in oc_commands if cmd.startswith("exec agent-abc")]
+    debug_cmds = [cmd for cmd in oc_commands if cmd.startswith("debug nodes/")]
+    assert exec_cmds == [
+        "exec agent-abc --  chroot /host /bin/bash -c  \"uptime || echo 'CMD FAILED'; \""
+    ]
+    assert debug_cmds == [
+        "debug nodes/worker-1 --to-namespace=default  --  chroot /host /bin/bash"
+        " -c  \"uptime || echo 'CMD FAILED'; \""
+    ]
+
+    with pytest.raises(CommandFailed):
+        OCP().exec_oc_debug_cmd("worker-0", ["fail"])
@@ -0,0 +1,69 @@
+import gzip
+import time
+
+from ocs_ci.resiliency import node_stats
+from ocs_ci.resiliency.node_stats import (
+    NodeTelemetrySampler,
+    compute_telemetry_metrics,
+    parse_telemetry_sample,
+)
+
+
+def sample_lines(ts, busy, idle, sectors, io_ms, rx):
+    return [
+        f"@@SAMPLE {ts}",
+        "@@CPU",
+        f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0",
+        "@@MEM",
+        "MemTotal:       1000 kB",
+        "MemAvailable:    250 kB",
+        "@@DISK",
+        f"   8       0 sda 10 0 {sectors} 0 10 0 {sectors} 0 0 {io_ms} 0",
+        f"   8       1 sda1 10 0 {sectors} 0 10 0 {sectors} 0 0 {io_ms} 0",
+        "@@NET",
+        f"  ens3: {rx} 0 0 0 0 0 0 0 {rx} 0 0 0 0 0 0 0",
+        f"    lo: {rx} 0 0 0 0 0 0 0 {rx} 0 0 0 0 0 0 0",
+        "@@END",
+    ]
+
+
+def test_compute_telemetry_metrics():
+    """
+    Check the metrics computed from the counters of two samples, partitions
+    and loopback are not counted.
+    """
+    previous = parse_telemetry_sample(sample_lines(100.0, 100, 100, 0, 0, 0))
+    current = parse_telemetry_sample(sample_lines(102.0, 250, 150, 4096, 500, 2000))
+    metrics = compute_telemetry_metrics(previous, current)
+    assert metrics["cpu_percent"] == 75.0
+    assert metrics["memory_percent"] == 75.0
+    assert metrics["disk_read_bps"] == metrics["disk_write_bps"] == 4096 * 512 / 2
+    assert metrics["disk_busy_percent"] == 25.0
+    assert metrics["net_rx_bps"] == metrics["net_tx_bps"] == 1000.0
+    # counters reset by reboot of the node
+    assert compute_telemetry_metrics(current, previous) is None
+
+
+def test_sampler_streams_local_counters(monkeypatch, tmp_path):
+    """
+    Check that the sampler streams the samples of the script run on the
+    local host to the buffers and exports them.
+    """
+    monkeypatch.setattr(node_stats, "ocsci_log_path", lambda: str(tmp_path))
+    sampler = NodeTelemetrySampler(["node-a", "node-b"], interval=0.1)
+    monkeypatch.setattr(
+        sampler, "_build_cmd", lambda node: ["/bin/bash", "-c", sampler.script]
+    )
+    with sampler:
+        deadline = time.time() + 30
+        while time.time() < deadline and min(map(len, sampler.buffers.values())) < 3:
+            time.sleep(0.1)
+    assert not sampler._threads
+    timestamps, values = sampler.series("node-a", "memory_percent")
+    assert len(timestamps) >= 3 and (timestamps[1:] > timestamps[:-1]).all()
+    assert ((values > 0) & (values < 100)).all()
+    assert set(sampler.percentiles()) == {"node-a", "node-b"}
+    assert "cpu_percent" in sampler.summary()
+    path = sampler.save_report("test")
+    with gzip.open(path, "rt") as csv_file:
+        assert csv_file.readline().startswith("node,timestamp,cpu_percent")
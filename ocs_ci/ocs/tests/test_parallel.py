@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from ocs_ci.ocs.parallel import parallel
+
+
+def test_parallel_runs_concurrently():
+    """
+    Check that blocking functions run at the same time and all results are
+    streamed.
+    """
+    barrier = threading.Barrier(4, timeout=10)
+
+    def _wait(number):
+        barrier.wait()
+        return number
+
+    with parallel() as p:
+        for number in range(4):
+            p.spawn(_wait, number)
+        assert sorted(p) == [0, 1, 2, 3]
+
+
+def test_parallel_streams_in_completion_order():
+    """
+    Check that results come in the order the functions complete.
+    """
+    with parallel(max_workers=2) as p:
+        p.spawn(time.sleep, 0.5)
+        p.spawn(str, "fast")
+        assert next(p) == "fast"
+
+
+def test_parallel_cancels_rest_on_failure():
+    """
+    Check that exception is raised at the end of the block and functions
+    which didn't start yet are cancelled.
+    """
+    started = []
+
+    def _fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError, match="failed"):
+        with parallel(max_workers=1) as p:
+            p.spawn(_fail)
+            for number in range(10):
+                p.spawn(started.append, number)
+    assert len(started) < 10
@@ -0,0 +1,83 @@
+import pytest
+
+from ocs_ci.framework import config
+from ocs_ci.ocs.resource_cache import ResourceListCache, match_label_selector
+
+
+class PodLister(object):
+    """
+    Minimal object with the interface of OCP used by the list cache
+    """
+
+    kind = "Pod"
+    namespace = "openshift-storage"
+    selector = None
+    field_selector = None
+
+    def __init__(self, pods):
+        self.pods = pods
+        self.calls = 0
+
+    def get_kubeconfig_path(self):
+        return "/tmp/kubeconfig"
+
+    def get(self, selector=None, field_selector=None, **kwargs):
+        self.calls += 1
+        items = [
+            pod
+            for pod in self.pods
+            if not selector or match_label_selector(pod["metadata"]["labels"], selector)
+        ]
+        return {"kind": "List", "items": items}
+
+
+@pytest.fixture
+def pod_lister(monkeypatch):
+    monkeypatch.setitem(config.RUN, "list_cache_mode", "ttl")
+    monkeypatch.setitem(config.RUN, "list_cache_ttl", 60)
+    return PodLister(
+        [
+            {"metadata": {"name": "osd-0", "labels": {"app": "rook-ceph-osd"}}},
+            {"metadata": {"name": "mon-a", "labels": {"app": "rook-ceph-mon"}}},
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        ("app=rook-ceph-osd", True),
+        ("app==rook-ceph-osd,osd=0", True),
+        ("app=rook-ceph-mon", False),
+        ("app!=rook-ceph-osd", None),
+        ("app in (rook-ceph-osd)", None),
+    ],
+)
+def test_match_label_selector(selector, expected):
+    """
+    Check that simple equality selectors are evaluated and other ones are not.
+    """
+    labels = {"app": "rook-ceph-osd", "osd": "0"}
+    assert match_label_selector(labels, selector) is expected
+
+
+def test_list_cache_serves_selector_from_namespace_listing(pod_lister):
+    """
+    Check that the label listing is filtered from the cached namespace listing
+    and that mutating command and fresh argument bypass the cache.
+    """
+    cache = ResourceListCache()
+    assert len(cache.get_list(pod_lister)["items"]) == 2
+    osds = cache.get_list(pod_lister, selector="app=rook-ceph-osd")["items"]
+    assert [pod["metadata"]["name"] for pod in osds] == ["osd-0"]
+    assert pod_lister.calls == 1
+    cache.invalidate_for_command("get pods -o yaml")
+    cache.get_list(pod_lister)
+    assert pod_lister.calls == 1
+    cache.invalidate_for_command("delete pod osd-0")
+    cache.get_list(pod_lister)
+    assert pod_lister.calls == 2
+    cache.get_list(pod_lister, fresh=True)
+    assert pod_lister.calls == 3
+    stats = cache.stats["Pod/openshift-storage//"]
+    assert stats == {"hits": 1, "misses": 2, "bypassed": 1}
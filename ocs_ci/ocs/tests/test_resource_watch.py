@@ -0,0 +1,152 @@
+import time
+
+import pytest
+
+from ocs_ci.ocs import kube_api_backend
+from ocs_ci.ocs.exceptions import TimeoutExpiredError, WatchUnavailableError
+from ocs_ci.ocs.resource_watch import MAX_WATCH_FAILURES, ResourceWatch
+from ocs_ci.ocs.resources import pod
+
+
+class FakeResource(object):
+    namespaced = True
+
+    def path(self, name=None, namespace=None):
+        return f"/api/v1/namespaces/{namespace}/pods"
+
+
+class FakeBackend(object):
+    """
+    API backend listing the stored pods and streaming the prepared watch
+    streams, an exception in the streams is raised by the watch
+    """
+
+    def __init__(self, pods, streams=None):
+        self.pods = pods
+        self.streams = list(streams or [])
+        self.lists = 0
+        self.watches = []
+
+    def resolve_resource(self, kind):
+        return FakeResource()
+
+    def request(self, method, path, timeout, **params):
+        self.lists += 1
+        return {
+            "kind": "PodList",
+            "items": list(self.pods.values()),
+            "metadata": {"resourceVersion": str(self.lists)},
+        }
+
+    def watch(self, path, resource_version, timeout, **params):
+        self.watches.append(resource_version)
+        if not self.streams:
+            time.sleep(min(timeout, 0.05))
+            return
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        for event in stream:
+            yield event
+
+
+def pod_obj(name, phase="Pending", resource_version="1"):
+    return {
+        "kind": "Pod",
+        "metadata": {"name": name, "resourceVersion": resource_version},
+        "status": {"phase": phase},
+    }
+
+
+def running(name):
+    return lambda state: state.get(name, {}).get("status", {}).get("phase") == (
+        "Running"
+    )
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = FakeBackend({"pod-a": pod_obj("pod-a")})
+    monkeypatch.setattr(kube_api_backend, "get_api_backend", lambda **kw: backend)
+    return backend
+
+
+def test_apply_event(backend):
+    """
+    Check that the events add, modify and delete the items of the state and
+    the resource version follows the events.
+    """
+    watch = ResourceWatch("pod", namespace="ns")
+    watch.relist(10)
+    assert set(watch.state) == {"pod-a"}
+    assert watch.apply_event({"type": "ADDED", "object": pod_obj("pod-b", "", "2")})
+    assert watch.apply_event(
+        {"type": "MODIFIED", "object": pod_obj("pod-a", "Running", "3")}
+    )
+    assert watch.state["pod-a"]["status"]["phase"] == "Running"
+    assert watch.apply_event({"type": "DELETED", "object": pod_obj("pod-b", "", "4")})
+    assert set(watch.state) == {"pod-a"}
+    assert watch.resource_version == "4"
+    assert watch.apply_event(
+        {"type": "BOOKMARK", "object": {"metadata": {"resourceVersion": "5"}}}
+    )
+    assert watch.resource_version == "5"
+
+
+def test_wait_relists_on_expired_version(backend):
+    """
+    Check that the ERROR event of expired resource version re-lists the
+    resources and the wait continues from the new version.
+    """
+    backend.streams = [
+        [{"type": "ERROR", "object": {"code": 410, "message": "too old"}}],
+        [{"type": "MODIFIED", "object": pod_obj("pod-a", "Running", "9")}],
+    ]
+    watch = ResourceWatch("pod", namespace="ns")
+    assert watch.wait(running("pod-a"), 10)
+    assert backend.lists == 2
+    assert backend.watches == ["1", "2"]
+
+
+def test_wait_timeout(backend):
+    watch = ResourceWatch("pod", namespace="ns")
+    start = time.time()
+    with pytest.raises(TimeoutExpiredError):
+        watch.wait(running("pod-a"), 0.3)
+    assert time.time() - start < 5
+
+
+def test_wait_watch_unavailable(backend):
+    """
+    Check that the wait gives up after MAX_WATCH_FAILURES consecutive
+    failures of the watch stream.
+    """
+    backend.streams = [Exception("connection reset")] * MAX_WATCH_FAILURES
+    watch = ResourceWatch("pod", namespace="ns")
+    with pytest.raises(WatchUnavailableError):
+        watch.wait(running("pod-a"), 10)
+    assert len(backend.watches) == MAX_WATCH_FAILURES
+
+
+def test_polling_fallback_remaining_timeout(monkeypatch):
+    """
+    Check that polling after the watch failed mid-wait uses only the
+    remaining time of the timeout.
+    """
+    now = [1000.0]
+    sampler_timeouts = []
+
+    def failing_watch(*args, **kwargs):
+        now[0] += 150
+        raise WatchUnavailableError("watch failed")
+
+    def sampler(timeout, sleep, func, **kwargs):
+        sampler_timeouts.append(timeout)
+        return iter([2])
+
+    monkeypatch.setattr(pod.time, "time", lambda: now[0])
+    monkeypatch.setattr(pod, "is_watch_wait_enabled", lambda: True)
+    monkeypatch.setattr(pod, "_wait_for_pods_watch", failing_watch)
+    monkeypatch.setattr(pod, "TimeoutSampler", sampler)
+    assert pod.wait_for_pods_by_label_count("app=a", 2, namespace="ns", timeout=200)
+    assert sampler_timeouts == [50]
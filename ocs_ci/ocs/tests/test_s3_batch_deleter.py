@@ -0,0 +1,138 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from ocs_ci.ocs.resources import s3_batch_deleter
+from ocs_ci.ocs.resources.s3_batch_deleter import AIMDLimiter, S3BatchDeleter
+
+
+class FakePaginator(object):
+    def __init__(self, bucket, operation, page_size=250):
+        self.bucket = bucket
+        self.operation = operation
+        self.page_size = page_size
+
+    def paginate(self, Bucket, Prefix="", Delimiter=""):
+        with self.bucket.lock:
+            items = sorted(self.bucket.objects.items())
+        prefixes = []
+        entries = []
+        for (key, version), is_marker in items:
+            rest = key[len(Prefix) :]
+            if not key.startswith(Prefix):
+                continue
+            if Delimiter and Delimiter in rest:
+                prefix = Prefix + rest[: rest.index(Delimiter) + 1]
+                if prefix not in prefixes:
+                    prefixes.append(prefix)
+            else:
+                entries.append((key, version, is_marker))
+        for i in range(0, max(len(entries), 1), self.page_size):
+            page = {
+                "CommonPrefixes": [{"Prefix": p} for p in prefixes] if not i else []
+            }
+            chunk = entries[i : i + self.page_size]
+            if self.operation == "list_objects_v2":
+                page["Contents"] = [{"Key": key} for key, _, _ in chunk]
+            else:
+                page["Versions"] = [
+                    {"Key": key, "VersionId": version}
+                    for key, version, marker in chunk
+                    if not marker
+                ]
+                page["DeleteMarkers"] = [
+                    {"Key": key, "VersionId": version}
+                    for key, version, marker in chunk
+                    if marker
+                ]
+            yield page
+
+
+class FakeBucket(object):
+    """
+    Bucket throttling the first delete requests
+    """
+
+    def __init__(self, objects, throttle=3):
+        self.lock = threading.Lock()
+        # (key, version id): is delete marker
+        self.objects = objects
+        self.throttle = throttle
+        self.meta = SimpleNamespace(client=self)
+
+    def get_paginator(self, operation):
+        return FakePaginator(self, operation)
+
+    def get_bucket_versioning(self, Bucket):
+        versioned = any(version for _, version in self.objects)
+        return {"Status": "Enabled"} if versioned else {}
+
+    def Bucket(self, name):
+        return self
+
+    def delete_objects(self, Delete):
+        with self.lock:
+            if self.throttle:
+                self.throttle -= 1
+                raise ClientError(
+                    {"Error": {"Code": "SlowDown", "Message": "Slow Down"}},
+                    "DeleteObjects",
+                )
+            for obj in Delete["Objects"]:
+                del self.objects[(obj["Key"], obj.get("VersionId", ""))]
+        return {"Deleted": Delete["Objects"]}
+
+
+def test_delete_in_parallel_with_throttling(monkeypatch):
+    """
+    Check that all objects in root and prefixes are deleted and throttled
+    batches are deleted again.
+    """
+    monkeypatch.setattr(s3_batch_deleter, "THROTTLING_BACKOFF", 0)
+    objects = {(f"dir{d}/obj{i}", ""): False for d in range(4) for i in range(700)}
+    objects.update({(f"root{i}", ""): False for i in range(300)})
+    bucket = FakeBucket(objects)
+    stats = S3BatchDeleter(bucket, "bucket").delete_in_parallel(
+        max_workers=4, progress_interval=0.1
+    )
+    assert not bucket.objects
+    assert stats["deleted"] == stats["listed"] == 3100
+    assert stats["throttled"] > 0
+
+
+def test_delete_in_parallel_unavailable_endpoint(monkeypatch):
+    """
+    Check that deletion from the endpoint throttling all the requests ends
+    and reports the objects as failed.
+    """
+    monkeypatch.setattr(s3_batch_deleter, "THROTTLING_BACKOFF", 0)
+    objects = {(f"dir/obj{i}", ""): False for i in range(1500)}
+    bucket = FakeBucket(objects, throttle=10**9)
+    with pytest.raises(Exception, match="Deletion failed for 1500 objects"):
+        S3BatchDeleter(bucket, "bucket").delete_in_parallel(max_workers=2)
+
+
+def test_delete_in_parallel_versioned():
+    """
+    Check that versions and delete markers are deleted in versioned bucket.
+    """
+    objects = {(f"dir/obj{i}", f"v{v}"): v == 2 for i in range(200) for v in range(3)}
+    bucket = FakeBucket(objects, throttle=0)
+    S3BatchDeleter(bucket, "bucket").delete_in_parallel(max_workers=2)
+    assert not bucket.objects
+
+
+def test_aimd_limiter():
+    """
+    Check additive increase and multiplicative decrease of the limit.
+    """
+    limiter = AIMDLimiter(initial=4, maximum=8, cooldown=0)
+    for _ in range(5):
+        limiter.acquire()
+        limiter.release()
+    assert int(limiter.limit) == 5
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert int(limiter.limit) == 2
@@ -0,0 +1,169 @@
+import hashlib
+import itertools
+import threading
+import time
+
+import pytest
+
+from ocs_ci.ocs.exceptions import S3BulkIOError
+from ocs_ci.ocs.resources.s3_bulk_io import S3BulkIO
+
+
+class FakeBody(object):
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class LocalS3(object):
+    """
+    In-memory stand-in of the S3 client calls used by the bulk I/O engine
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = {"b1": {}, "b2": {}}
+        self.tags = {}
+        self.uploads = {}
+
+    def put_object(self, Bucket, Key, Body):
+        if Key.startswith("fail"):
+            raise ValueError("injected failure")
+        with self.lock:
+            self.buckets[Bucket][Key] = bytes(Body)
+
+    def get_object(self, Bucket, Key):
+        return {"Body": FakeBody(self.buckets[Bucket][Key])}
+
+    def copy_object(self, Bucket, Key, CopySource):
+        data = self.buckets[CopySource["Bucket"]][CopySource["Key"]]
+        with self.lock:
+            self.buckets[Bucket][Key] = data
+
+    def put_object_tagging(self, Bucket, Key, Tagging):
+        with self.lock:
+            self.tags[(Bucket, Key)] = Tagging["TagSet"]
+
+    def create_multipart_upload(self, Bucket, Key):
+        with self.lock:
+            upload_id = str(len(self.uploads))
+            self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        with self.lock:
+            self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f'"{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert numbers == sorted(parts)
+        with self.lock:
+            self.buckets[Bucket][Key] = b"".join(parts[n] for n in numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+
+def test_bulk_put_get_copy_tag(tmp_path):
+    """
+    Check bulk operations including multipart upload of a file and the
+    checksums computed while transferring the data.
+    """
+    s3 = LocalS3()
+    bulk_io = S3BulkIO(s3, max_workers=4, part_size=1000)
+    big_file = tmp_path / "big"
+    big_content = bytes(range(256)) * 20
+    big_file.write_bytes(big_content)
+    objects = {f"dir/obj-{i}": f"content {i}".encode() for i in range(20)}
+    objects["big"] = str(big_file)
+
+    put_result = bulk_io.put_objects("b1", objects)
+    assert put_result.objects == 21
+    assert s3.buckets["b1"]["big"] == big_content
+    assert put_result.checksums["big"] == hashlib.sha256(big_content).hexdigest()
+    assert not s3.uploads
+
+    get_result = bulk_io.get_objects("b1", objects, target_dir=str(tmp_path / "out"))
+    assert get_result.checksums == put_result.checksums
+    assert get_result.bytes == put_result.bytes
+    assert (tmp_path / "out" / "dir" / "obj-3").read_bytes() == b"content 3"
+
+    bulk_io.copy_objects("b1", "b2", objects, target_prefix="copy/")
+    assert s3.buckets["b2"]["copy/big"] == big_content
+    bulk_io.tag_objects("b2", ["copy/big"], {"k": "v"})
+    assert s3.tags[("b2", "copy/big")] == [{"Key": "k", "Value": "v"}]
+    bulk_io.close()
+
+
+def test_bulk_put_failures():
+    """
+    Check that failed objects are reported and other objects are uploaded.
+    """
+    s3 = LocalS3()
+    bulk_io = S3BulkIO(s3, max_workers=2)
+    objects = [("ok", b"1"), ("fail-1", b"2"), ("ok-2", b"3")]
+    result = bulk_io.put_objects("b1", objects, raise_on_failure=False)
+    assert set(result.failed) == {"fail-1"}
+    assert set(s3.buckets["b1"]) == {"ok", "ok-2"}
+    with pytest.raises(S3BulkIOError):
+        bulk_io.put_objects("b1", objects)
+
+
+class SlowPartsS3(LocalS3):
+    """
+    S3 client recording the peak number of the parts being uploaded, parts
+    of the keys starting with 'fail' fail
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.parts = 0
+        self.peak_parts = 0
+        self.upload_ids = itertools.count()
+
+    def create_multipart_upload(self, Bucket, Key):
+        # ids unique among the concurrent uploads
+        with self.lock:
+            upload_id = str(next(self.upload_ids))
+            self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        with self.lock:
+            self.parts += 1
+            self.peak_parts = max(self.peak_parts, self.parts)
+        try:
+            time.sleep(0.01)
+            if Key.startswith("fail"):
+                raise ValueError("injected failure")
+            return super().upload_part(Bucket, Key, PartNumber, UploadId, Body)
+        finally:
+            with self.lock:
+                self.parts -= 1
+
+
+def test_multipart_parts_in_memory_limit():
+    """
+    Check that at most max_workers parts of all the concurrent multipart
+    uploads are in memory and failed uploads free their parts.
+    """
+    s3 = SlowPartsS3()
+    bulk_io = S3BulkIO(s3, max_workers=3, part_size=100)
+    objects = {f"obj-{i}": bytes(1000) for i in range(6)}
+    objects["fail-big"] = bytes(1000)
+    result = bulk_io.put_objects("b1", objects, raise_on_failure=False)
+    assert result.objects == 6
+    assert list(result.failed) == ["fail-big"]
+    assert s3.peak_parts <= 3
+    # all the slots of the parts are free again
+    for _ in range(3):
+        assert bulk_io._parts_in_flight.acquire(blocking=False)
+    bulk_io.close()
@@ -0,0 +1,72 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.ocs.resources.toolbox_session import ToolboxSession
+
+
+class LocalShellSession(ToolboxSession):
+    """
+    Session running the shell locally instead of in the toolbox pod
+    """
+
+    def __init__(self):
+        super().__init__(cluster_index=0)
+        self.toolbox = SimpleNamespace(name="rook-ceph-tools-local")
+        self.path = os.environ["PATH"]
+
+    def _shell_cmd(self):
+        return ["sh"], dict(os.environ, PATH=self.path)
+
+
+@pytest.fixture
+def session():
+    session = LocalShellSession()
+    yield session
+    session.close()
+
+
+def test_session_multiplexes_commands(session):
+    """
+    Check that output, return code and stderr of the commands are delimited
+    on one shell, including output without trailing new line.
+    """
+    results = session.run_cmds(
+        ["echo one; echo two", "printf no-newline", "echo error >&2; false"],
+        timeout=10,
+    )
+    assert results == [
+        ("one\ntwo", 0, ""),
+        ("no-newline", 0, ""),
+        ("", 1, "error"),
+    ]
+    pid = session._process.pid
+    assert session.exec_cmd("echo again", timeout=10) == "again"
+    assert session._process.pid == pid
+
+
+def test_session_exec_cmd_failure(session):
+    """
+    Check that failed command raises CommandFailed with its stderr.
+    """
+    with pytest.raises(CommandFailed, match="no such thing"):
+        session.exec_cmd("echo no such thing >&2; (exit 3)", timeout=10)
+
+
+def test_session_batch_json(session, tmp_path):
+    """
+    Check that batch returns parsed JSON outputs in order of the commands.
+    """
+    ceph = tmp_path / "ceph"
+    ceph.write_text(
+        """#!/bin/sh\ncase "$1" in a) printf '{"a": 1}';; b) echo '[1, 2]';; """
+        """*) exit 1;; esac\n"""
+    )
+    ceph.chmod(0o755)
+    session.path = f"{tmp_path}:{os.environ['PATH']}"
+    outputs = session.exec_ceph_cmds(
+        ["ceph a", "ceph b", "ceph c"], timeout=10, ignore_error=True
+    )
+    assert outputs == [{"a": 1}, [1, 2], None]
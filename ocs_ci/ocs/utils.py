@@ -1,5 +1,4 @@
 import datetime
-import json
 import logging
 import os
 import pickle
@@ -15,7 +14,7 @@ from subprocess import TimeoutExpired
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import yaml
-from gevent import sleep
+from time import sleep
 from pathlib import Path
 from libcloud.common.exceptions import BaseHTTPError
 from libcloud.common.types import LibcloudError
@@ -34,11 +33,12 @@ from ocs_ci.ocs.exceptions import (
     UnexpectedBehaviour,
 )
 from ocs_ci.ocs.ocp import OCP, get_images
+from ocs_ci.ocs.must_gather.delta import mg_delta
 from ocs_ci.ocs.openstack import CephVMNode
 from ocs_ci.ocs.parallel import parallel
 from ocs_ci.ocs.resources.ocs import OCS
 from ocs_ci.utility import templating, version
-from ocs_ci.utility.prometheus import PrometheusAPI
+from ocs_ci.utility.prometheus import dump_range_queries, get_prometheus_api
 from ocs_ci.utility.retry import retry
 from ocs_ci.utility.utils import (
     create_directory_path,
@@ -963,6 +963,8 @@ def run_must_gather(
         timeout (int): Max timeout to wait for MG to complete before aborting the MG execution.
         mg_options (str): Options of must gather command For example "--host_network=True"
         since_time (str): Only return logs after a specific date (RFC3339). For example "2024-01-15T10:30:00Z"
+            With REPORTING["mg_delta_mode"] the start of the previous must-gather with the same image
+            and command is used if not provided.
 
     Returns:
         mg_output (str): must-gather cli output
@@ -987,6 +989,14 @@ def run_must_gather(
     timestamp = time.time()
     log.info(f"Must gather image: {image} will be used.")
     create_directory_path(log_dir_path)
+    delta_mode = cluster_config.REPORTING.get("mg_delta_mode")
+    if delta_mode:
+        delta_key = mg_delta.get_key(cluster_config, image, command, mg_options)
+        if not since_time:
+            since_time = mg_delta.get_since_time(delta_key)
+            if since_time:
+                log.info(f"Collecting delta must-gather since {since_time}")
+        start_time = datetime.datetime.utcnow()
     cmd = f"adm must-gather --image={image} --dest-dir={log_dir_path}"
     if since_time:
         cmd += f" --since-time={since_time}"
@@ -1011,6 +1021,19 @@ def run_must_gather(
         )
         with mg_lock:
             mg_collected_logs += 1
+        if delta_mode:
+            # deduplicated files would be deleted with the packed directory
+            keep_files = not (
+                config.REPORTING.get("tarball_mg_logs")
+                and config.REPORTING.get("delete_packed_mg_logs")
+            )
+            store_dir = None
+            if keep_files:
+                store_dir = os.path.join(
+                    os.path.expanduser(cluster_config.RUN["log_dir"]),
+                    f"mg_content_store_{cluster_config.RUN['run_id']}",
+                )
+            mg_delta.record(delta_key, log_dir_path, start_time, store_dir)
     except (CommandFailed, TimeoutExpired) as ex:
         log.error(f"Failed during must gather logs! Error: {ex}")
         with mg_lock:
@@ -1525,9 +1548,11 @@ def collect_prometheus_metrics(
     stop,
     step=1.0,
     threading_lock=None,
+    max_workers=4,
 ):
     """
-    Collects metrics from Prometheus and saves them in file in json format.
+    Collects metrics from Prometheus and saves them in one gzip compressed
+    file with JSON line per series (see ``prometheus.read_range_dump()``).
     Metrics can be found in OCP Console in Monitoring -> Metrics.
 
     Args:
@@ -1540,8 +1565,13 @@ def collect_prometheus_metrics(
         stop (str): stop timestamp of required datapoints
         step (float): step of required datapoints
         threading_lock: (threading.RLock): Lock to use for thread safety (default: None)
+        max_workers (int): maximal number of Prometheus queries running at once
+
+    Returns:
+        str: path to the file with the metrics
+
     """
-    api = PrometheusAPI(threading_lock=threading_lock)
+    api = get_prometheus_api(threading_lock)
     log_dir_path = os.path.join(
         os.path.expanduser(ocsci_config.RUN["log_dir"]),
         f"failed_testcase_ocs_logs_{ocsci_config.RUN['run_id']}",
@@ -1551,14 +1581,12 @@ def collect_prometheus_metrics(
         log.info(f"Creating directory {log_dir_path}")
         os.makedirs(log_dir_path)
 
-    for metric in metrics:
-        datapoints = api.get(
-            "query_range", {"query": metric, "start": start, "end": stop, "step": step}
-        )
-        file_name = os.path.join(log_dir_path, f"{metric}.json")
-        log.info(f"Saving {metric} data into {file_name}")
-        with open(file_name, "w") as outfile:
-            json.dump(datapoints.json(), outfile)
+    file_name = os.path.join(log_dir_path, "metrics.ndjson.gz")
+    log.info(f"Saving {len(metrics)} metrics into {file_name}")
+    dump_range_queries(
+        api, metrics, start, stop, step, file_name, max_workers=max_workers
+    )
+    return file_name
 
 
 def oc_get_all_obc_names():
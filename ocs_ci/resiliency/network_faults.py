@@ -2,6 +2,9 @@ import time
 import random
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ocs_ci.framework import config, config_safe_thread_pool_task
 from ocs_ci.ocs import ocp
 from ocs_ci.ocs.exceptions import (
     CommandFailed,
@@ -13,12 +16,20 @@ from ocs_ci.ocs.platform_nodes import PlatformNodesFactory
 
 log = logging.getLogger(__name__)
 
+# markers of the lines printed among the outputs of the batched commands
+TIMESTAMP_MARKER = "NETWORK_FAULT_TS="
+INTERFACE_MARKER = "NETWORK_FAULT_IFACE="
+
 
 class NetworkFaults(PlatformNodesFactory):
     """
     A class to inject and remove various network faults on OpenShift cluster nodes
     using the 'tc' Linux command via 'oc debug'. Supports simulation of network issues
     such as packet loss, latency, duplication, and corruption.
+
+    The commands for all the interfaces of a node are run in one invocation and
+    the selected nodes are faulted concurrently, the times the fault was applied
+    and removed on every node are recorded in fault_timeline.
     """
 
     def __init__(
@@ -41,6 +52,8 @@ class NetworkFaults(PlatformNodesFactory):
         self.pause = pause
         self.ocp_obj = ocp.OCP()
         self.platform_node_obj = self.get_nodes_platform()
+        # actual times the faults were applied and removed on the nodes
+        self.fault_timeline = []
         self.node_interfaces = self._get_all_node_network_interfaces(interface_types)
 
         log.info(
@@ -58,38 +71,95 @@ class NetworkFaults(PlatformNodesFactory):
         Returns:
             dict: Mapping of node names to a list of interface names.
         """
+        cmd_list = []
+        for interface_type in interface_types:
+            if interface_type == "default":
+                cmd_list.append("ip route | awk '/^default/ {print $5}'")
+            elif interface_type == "ovn":
+                cmd_list.append("ip -o link show | grep ovn | awk -F: '{print $2}'")
+            else:
+                raise ValueError(f"Unsupported interface type: {interface_type}")
+
+        log.debug(f"Fetching {interface_types} interface(s) from all nodes")
+        results = self._exec_on_nodes(
+            {node.name: cmd_list for node in self.nodes}, "retrieving interfaces"
+        )
         node_interfaces = {}
         for node in self.nodes:
+            output = results.get(node.name)
             interfaces = []
-            for interface_type in interface_types:
-                if interface_type == "default":
-                    cmd = "ip route | awk '/^default/ {print $5}'"
-                elif interface_type == "ovn":
-                    cmd = "ip -o link show | grep ovn | awk -F: '{print $2}'"
-                else:
-                    raise ValueError(f"Unsupported interface type: {interface_type}")
-
-                log.debug(
-                    f"Fetching '{interface_type}' interface(s) from node {node.name}"
+            if output is not None:
+                interfaces = list(
+                    {iface.strip() for iface in output.splitlines() if iface.strip()}
                 )
-                try:
-                    output = self.ocp_obj.exec_oc_debug_cmd(
-                        node=node.name, cmd_list=[cmd]
-                    )
-                    ifaces = [
-                        iface.strip() for iface in output.splitlines() if iface.strip()
-                    ]
-                    interfaces.extend(ifaces)
-                except (CommandFailed, subprocess.TimeoutExpired) as e:
-                    log.error(f"Error retrieving interfaces from node {node.name}: {e}")
-                    continue
-
-            interfaces = list(set(interfaces))
             if not interfaces:
                 log.warning(f"No interfaces found for node {node.name}")
             node_interfaces[node.name] = interfaces
         return node_interfaces
 
+    def _exec_on_nodes(self, node_cmds, action):
+        """
+        Execute the commands on the nodes concurrently, all the commands of
+        the node in one invocation
+
+        Args:
+            node_cmds (dict): node name: list of commands
+            action (str): description of the commands for the log messages
+
+        Returns:
+            dict: node name: output of the commands, the nodes the commands
+                failed on are missing
+
+        """
+        results = {}
+        node_cmds = {node: cmds for node, cmds in node_cmds.items() if cmds}
+        if not node_cmds:
+            return results
+        with ThreadPoolExecutor(max_workers=len(node_cmds)) as executor:
+            futures = {
+                executor.submit(
+                    config_safe_thread_pool_task,
+                    config.cur_index,
+                    self.ocp_obj.exec_oc_debug_cmd,
+                    node=node,
+                    cmd_list=cmds,
+                ): node
+                for node, cmds in node_cmds.items()
+            }
+            for future in as_completed(futures):
+                node = futures[future]
+                try:
+                    results[node] = future.result()
+                except (CommandFailed, subprocess.TimeoutExpired) as e:
+                    log.error(f"Error {action} on node {node}: {e}")
+        return results
+
+    def _exec_timed_on_nodes(self, node_cmds, action):
+        """
+        Execute the commands on the nodes concurrently and get the time on
+        the node when the commands finished
+
+        Args:
+            node_cmds (dict): node name: list of commands
+            action (str): description of the commands for the log messages
+
+        Returns:
+            dict: node name: epoch time the commands finished on the node,
+                the nodes the commands failed on are missing
+
+        """
+        timed_cmds = {
+            node: cmds + [f"echo {TIMESTAMP_MARKER}$(date +%s.%N)"]
+            for node, cmds in node_cmds.items()
+            if cmds
+        }
+        timestamps = {}
+        for node, output in self._exec_on_nodes(timed_cmds, action).items():
+            for line in output.splitlines():
+                if line.startswith(TIMESTAMP_MARKER):
+                    timestamps[node] = float(line[len(TIMESTAMP_MARKER) :])
+        return timestamps
+
     def _apply_fault(self, description, netem_command):
         """
         Applies a specified tc netem fault in looped iterations across all interfaces.
@@ -134,36 +204,42 @@ class NetworkFaults(PlatformNodesFactory):
 
             count = min(len(remaining_nodes), random.randint(1, len(self.nodes)))
             selected_nodes = random.sample(remaining_nodes, count)
-
-            for node in selected_nodes:
-                interfaces = self.node_interfaces.get(node.name, [])
-                for iface in interfaces:
-                    log.info(
-                        f"[Iteration {i+1}] Applying {description} on {node.name}/{iface}"
-                    )
-                    cmd = f"tc qdisc replace dev {iface} root netem {netem_command}"
-                    try:
-                        self.ocp_obj.exec_oc_debug_cmd(node=node.name, cmd_list=[cmd])
-                        covered_nodes.add(node.name)
-                    except (CommandFailed, subprocess.TimeoutExpired) as e:
-                        log.error(f"Failed to apply fault on {node.name}/{iface}: {e}")
+            node_names = [node.name for node in selected_nodes]
+
+            log.info(
+                f"[Iteration {i+1}] Applying {description} on {node_names} "
+                f"interfaces {[self.node_interfaces.get(n) for n in node_names]}"
+            )
+            applied = self._exec_timed_on_nodes(
+                {
+                    name: [
+                        f"tc qdisc replace dev {iface} root netem {netem_command}"
+                        for iface in self.node_interfaces.get(name, [])
+                    ]
+                    for name in node_names
+                },
+                f"applying {description}",
+            )
+            covered_nodes.update(applied)
 
             log.info(f"[Iteration {i+1}] Holding fault for {self.duration}s")
             time.sleep(self.duration)
 
-            for node in selected_nodes:
-                interfaces = self.node_interfaces.get(node.name, [])
-                for iface in interfaces:
-                    log.info(
-                        f"[Iteration {i+1}] Removing fault from {node.name}/{iface}"
-                    )
-                    cmd = f"tc qdisc del dev {iface} root"
-                    try:
-                        self.ocp_obj.exec_oc_debug_cmd(node=node.name, cmd_list=[cmd])
-                    except (CommandFailed, subprocess.TimeoutExpired) as e:
-                        log.error(
-                            f"Failed to remove fault from {node.name}/{iface}: {e}"
-                        )
+            # The fault is removed from all the selected nodes, on the nodes
+            # where applying failed only some interfaces may have the netem
+            log.info(f"[Iteration {i+1}] Removing fault from {node_names}")
+            removed = self._exec_timed_on_nodes(
+                {
+                    name: [
+                        f"tc qdisc del dev {iface} root"
+                        + ("" if name in applied else " || true")
+                        for iface in self.node_interfaces.get(name, [])
+                    ]
+                    for name in node_names
+                },
+                f"removing {description}",
+            )
+            self._record_iteration(i + 1, description, applied, removed)
 
             if i < self.iterations - 1:
                 log.info(
@@ -174,45 +250,111 @@ class NetworkFaults(PlatformNodesFactory):
         log.info("All iterations completed. Clearing any residual faults.")
         self._remove_faults_all_nodes()
 
+    def _record_iteration(self, iteration, description, applied, removed):
+        """
+        Record the times the fault was applied and removed on the nodes
+
+        Args:
+            iteration (int): number of the iteration
+            description (str): description of the fault
+            applied (dict): node name: epoch time the fault was applied
+            removed (dict): node name: epoch time the fault was removed
+
+        """
+        for node, applied_time in applied.items():
+            removed_time = removed.get(node)
+            self.fault_timeline.append(
+                {
+                    "iteration": iteration,
+                    "fault": description,
+                    "node": node,
+                    "applied": applied_time,
+                    "removed": removed_time,
+                    "duration": removed_time - applied_time if removed_time else None,
+                }
+            )
+        if applied:
+            apply_skew = max(applied.values()) - min(applied.values())
+            durations = {
+                node: round(removed[node] - applied[node], 2)
+                for node in applied
+                if node in removed
+            }
+            log.info(
+                f"[Iteration {iteration}] Fault applied on {len(applied)} nodes "
+                f"within {apply_skew:.2f}s, fault duration per node: {durations}"
+            )
+
+    @staticmethod
+    def _parse_interface_outputs(output):
+        """
+        Split the output of the commands run per interface by the lines with
+        INTERFACE_MARKER
+
+        Args:
+            output (str): output of the commands of the node
+
+        Returns:
+            dict: interface name: output of its commands
+
+        """
+        iface = None
+        outputs = {}
+        for line in output.splitlines():
+            if line.startswith(INTERFACE_MARKER):
+                iface = line[len(INTERFACE_MARKER) :]
+                outputs[iface] = ""
+            elif iface:
+                outputs[iface] += line
+        return outputs
+
     def _remove_faults_all_nodes(self):
         """
         Removes all netem qdiscs from all interfaces on all nodes,
         and verifies that the faults have been successfully cleared.
+
+        Returns:
+            dict: node name: interfaces netem is still active on, for the
+                nodes where the removal couldn't be verified
+
         """
         log.info("Performing cleanup of all interfaces on all nodes")
 
+        node_cmds = {}
         for node in self.nodes:
-            interfaces = self.node_interfaces.get(node.name, [])
-            for iface in interfaces:
-                cmd_del = f"tc qdisc del dev {iface} root || true"
-                try:
-                    self.ocp_obj.exec_oc_debug_cmd(node=node.name, cmd_list=[cmd_del])
-                    log.debug(f"Deleted qdisc on {node.name}/{iface}")
-                except (CommandFailed, subprocess.TimeoutExpired) as e:
-                    log.warning(f"Could not delete qdisc on {node.name}/{iface}: {e}")
-                    continue
-
-                # Verify removal
-                cmd_verify = f"tc qdisc show dev {iface}"
-                try:
-                    output = self.ocp_obj.exec_oc_debug_cmd(
-                        node=node.name, cmd_list=[cmd_verify]
+            node_cmds[node.name] = []
+            for iface in self.node_interfaces.get(node.name, []):
+                node_cmds[node.name].extend(
+                    [
+                        f"tc qdisc del dev {iface} root || true",
+                        f"echo {INTERFACE_MARKER}{iface}",
+                        f"tc qdisc show dev {iface}",
+                    ]
+                )
+        results = self._exec_on_nodes(node_cmds, "deleting qdisc")
+
+        # Verify removal
+        active_faults = {}
+        for node, cmds in node_cmds.items():
+            if node not in results:
+                if cmds:
+                    active_faults[node] = list(self.node_interfaces.get(node, []))
+                continue
+            qdiscs = self._parse_interface_outputs(results[node])
+            for iface, qdisc in qdiscs.items():
+                if "netem" in qdisc:
+                    log.error(
+                        f"Verification failed: netem still active on {node}/{iface}"
                     )
-                    if "netem" in output:
-                        log.error(
-                            f"Verification failed: netem still active on {node.name}/{iface}"
-                        )
-                    else:
-                        log.info(
-                            f"Verified: netem successfully removed from {node.name}/{iface}"
-                        )
-                except (CommandFailed, subprocess.TimeoutExpired) as e:
-                    log.warning(
-                        f"Could not verify qdisc status on {node.name}/{iface}: {e}"
+                    active_faults.setdefault(node, []).append(iface)
+                else:
+                    log.info(
+                        f"Verified: netem successfully removed from {node}/{iface}"
                     )
 
         time.sleep(5)
         log.info("All fault configurations attempted and verified.")
+        return active_faults
 
     def network_packet_loss(self, percentage=25):
         """Simulates packet loss on all nodes.
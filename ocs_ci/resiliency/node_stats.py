@@ -1,7 +1,18 @@
 import logging
 import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from ocs_ci.framework import config
 from ocs_ci.ocs import ocp
 from ocs_ci.ocs.exceptions import CommandFailed
+from ocs_ci.utility.utils import ocsci_log_path
 
 log = logging.getLogger(__name__)
 
@@ -190,3 +201,527 @@ class NodeStats:
         except CommandFailed as e:
             log.error(f"Failed to fetch network stats for node {node_obj.name}: {e}")
             return []
+
+
+SAMPLE_MARKER = "@@SAMPLE"
+SECTION_MARKERS = ("@@CPU", "@@MEM", "@@DISK", "@@NET")
+END_MARKER = "@@END"
+SECTOR_SIZE = 512
+# whole disks only, partitions and device mapper devices on top of the
+# disks would count the same I/O again
+DISK_PATTERN = re.compile(r"^(sd[a-z]+|vd[a-z]+|xvd[a-z]+|hd[a-z]+|nvme\d+n\d+)$")
+# loopback, bridges and virtual interfaces of the pods and of OVN, which
+# carry the same traffic as the physical interfaces
+NET_EXCLUDE_PATTERN = re.compile(r"^(lo|veth|br-|ovs|genev|ovn|tun|vxlan|cali)")
+# metrics computed from two consecutive samples, *_bps are bytes per second
+TELEMETRY_METRICS = (
+    "cpu_percent",
+    "iowait_percent",
+    "memory_percent",
+    "disk_read_bps",
+    "disk_write_bps",
+    "disk_busy_percent",
+    "net_rx_bps",
+    "net_tx_bps",
+)
+
+
+def build_telemetry_script(interval):
+    """
+    Build the shell loop printing the kernel counters of the node at the
+    given cadence, each sample is enclosed by SAMPLE_MARKER and END_MARKER
+
+    Args:
+        interval (float): seconds between the samples
+
+    Returns:
+        str: the script to run by bash on the node
+
+    """
+    cpu, mem, disk, net = SECTION_MARKERS
+    return (
+        "while true; do "
+        f"echo {SAMPLE_MARKER} $(date +%s.%N); "
+        f"echo {cpu}; head -1 /proc/stat; "
+        f"echo {mem}; grep -E '^(MemTotal|MemAvailable):' /proc/meminfo; "
+        f"echo {disk}; cat /proc/diskstats; "
+        f"echo {net}; tail -n +3 /proc/net/dev; "
+        f"echo {END_MARKER}; sleep {interval}; "
+        "done"
+    )
+
+
+def parse_telemetry_sample(lines):
+    """
+    Parse the kernel counters of one sample printed by the telemetry script
+
+    Args:
+        lines (list): lines of the sample from SAMPLE_MARKER to END_MARKER
+
+    Returns:
+        dict: counters of the sample, "ts" is the node time in seconds since
+            the epoch, "disks" and "net" are per device counters
+
+    """
+    counters = {"disks": {}, "net": {}}
+    section = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith(SAMPLE_MARKER):
+            counters["ts"] = float(line.split()[1])
+        elif line in SECTION_MARKERS:
+            section = line
+        elif section == "@@CPU" and line.startswith("cpu "):
+            ticks = [int(value) for value in line.split()[1:9]]
+            counters["cpu_total"] = sum(ticks)
+            counters["cpu_idle"] = ticks[3] + ticks[4]
+            counters["cpu_iowait"] = ticks[4]
+        elif section == "@@MEM" and ":" in line:
+            key, value = line.split(":", 1)
+            counters[key] = int(value.split()[0]) * 1024
+        elif section == "@@DISK":
+            fields = line.split()
+            if len(fields) >= 13 and DISK_PATTERN.match(fields[2]):
+                counters["disks"][fields[2]] = (
+                    int(fields[5]) * SECTOR_SIZE,
+                    int(fields[9]) * SECTOR_SIZE,
+                    int(fields[12]),
+                )
+        elif section == "@@NET" and ":" in line:
+            iface, values = line.split(":", 1)
+            iface = iface.strip()
+            values = values.split()
+            if not NET_EXCLUDE_PATTERN.match(iface) and len(values) >= 9:
+                counters["net"][iface] = (int(values[0]), int(values[8]))
+    return counters
+
+
+def compute_telemetry_metrics(previous, current):
+    """
+    Compute the metrics of the interval between two samples of the node
+
+    Args:
+        previous (dict): counters of the previous sample
+        current (dict): counters of the current sample
+
+    Returns:
+        dict: metric name: value, None if the counters went backwards
+            (e.g. the node rebooted) or no time elapsed
+
+    """
+    elapsed = current["ts"] - previous["ts"]
+    cpu_ticks = current["cpu_total"] - previous["cpu_total"]
+    if elapsed <= 0 or cpu_ticks <= 0:
+        return None
+
+    def delta(device_counters, index):
+        deltas = [
+            values[index] - previous_counters[index]
+            for device, values in current[device_counters].items()
+            for previous_counters in [previous[device_counters].get(device)]
+            if previous_counters
+        ]
+        if any(value < 0 for value in deltas):
+            raise ValueError(f"{device_counters} counters went backwards")
+        return deltas
+
+    try:
+        disk_read = delta("disks", 0)
+        disk_write = delta("disks", 1)
+        disk_busy = delta("disks", 2)
+        net_rx = delta("net", 0)
+        net_tx = delta("net", 1)
+    except ValueError:
+        return None
+    mem_total = current.get("MemTotal") or 0
+    return {
+        "cpu_percent": 100.0
+        * (cpu_ticks - (current["cpu_idle"] - previous["cpu_idle"]))
+        / cpu_ticks,
+        "iowait_percent": 100.0
+        * (current["cpu_iowait"] - previous["cpu_iowait"])
+        / cpu_ticks,
+        "memory_percent": (
+            100.0 * (mem_total - current.get("MemAvailable", 0)) / mem_total
+            if mem_total
+            else np.nan
+        ),
+        "disk_read_bps": sum(disk_read) / elapsed,
+        "disk_write_bps": sum(disk_write) / elapsed,
+        # utilization of the busiest disk, io ticks are in milliseconds
+        "disk_busy_percent": min(100.0, max(disk_busy, default=0) / elapsed / 10),
+        "net_rx_bps": sum(net_rx) / elapsed,
+        "net_tx_bps": sum(net_tx) / elapsed,
+    }
+
+
+class NodeTelemetryBuffer(object):
+    """
+    Time series of the metrics of one node, kept in numpy arrays growing by
+    chunks: one array of the timestamps and one array per metric
+    """
+
+    def __init__(self, chunk_size=1024):
+        """
+        Args:
+            chunk_size (int): number of samples the arrays grow by
+
+        """
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.lock = threading.Lock()
+        self._ts = np.zeros(chunk_size, dtype=np.float64)
+        self._metrics = {
+            metric: np.zeros(chunk_size, dtype=np.float64)
+            for metric in TELEMETRY_METRICS
+        }
+
+    def __len__(self):
+        return self.size
+
+    def append(self, ts, metrics):
+        """
+        Append the metrics of one sample
+
+        Args:
+            ts (float): time of the sample in seconds since the epoch
+            metrics (dict): metric name: value
+
+        """
+        with self.lock:
+            if self.size == len(self._ts):
+                grow = np.zeros(self.chunk_size, dtype=np.float64)
+                self._ts = np.concatenate([self._ts, grow])
+                for metric, values in self._metrics.items():
+                    self._metrics[metric] = np.concatenate([values, grow])
+            self._ts[self.size] = ts
+            for metric, values in self._metrics.items():
+                values[self.size] = metrics.get(metric, np.nan)
+            self.size += 1
+
+    def columns(self):
+        """
+        Returns:
+            dict: "timestamp" and metric names: copy of their numpy arrays
+
+        """
+        with self.lock:
+            columns = {"timestamp": self._ts[: self.size].copy()}
+            for metric, values in self._metrics.items():
+                columns[metric] = values[: self.size].copy()
+        return columns
+
+
+class NodeTelemetrySampler(object):
+    """
+    Background sampler of CPU, memory, disk and network counters of the nodes
+
+    Instead of starting a debug pod per sample, one long-lived command per
+    node prints the counters from /proc at the given cadence and the output
+    is streamed to the per node buffers. The command runs in the node agent
+    pod when RUN["node_agent"] is enabled, otherwise in one 'oc debug' pod
+    per node. When the stream ends (e.g. the node rebooted), it's started
+    again until the sampler is stopped.
+
+    Usage:
+        with NodeTelemetrySampler(nodes, interval=5) as sampler:
+            run_stress()
+        log.info(sampler.summary())
+        sampler.to_csv(path)
+
+    """
+
+    def __init__(self, nodes, interval=5, chunk_size=1024, namespace="default"):
+        """
+        Args:
+            nodes (list): node objects or node names to sample
+            interval (float): seconds between the samples
+            chunk_size (int): number of samples the buffers grow by
+            namespace (str): namespace of the debug pods
+
+        """
+        self.nodes = [getattr(node, "name", node) for node in nodes]
+        self.interval = interval
+        self.namespace = namespace
+        self.script = build_telemetry_script(interval)
+        self.buffers = {node: NodeTelemetryBuffer(chunk_size) for node in self.nodes}
+        self.restarts = {node: 0 for node in self.nodes}
+        self.stop_event = threading.Event()
+        self.kubeconfig = None
+        self._threads = []
+        self._procs = {}
+        self._procs_lock = threading.Lock()
+
+    def _build_cmd(self, node):
+        """
+        Build the command streaming the counters of the node
+
+        Args:
+            node (str): node name
+
+        Returns:
+            list: command arguments
+
+        """
+        shell = ["chroot", "/host", "/bin/bash", "-c", self.script]
+        if config.RUN.get("node_agent"):
+            # Internal import in order to avoid circular import
+            from ocs_ci.ocs.node_agent import get_node_agent
+            from ocs_ci.ocs.exceptions import NodeAgentUnavailable
+
+            agent = get_node_agent()
+            if agent:
+                try:
+                    pod_name = agent.get_pod(node)
+                    return ["oc", "-n", agent.namespace, "exec", pod_name, "--"] + shell
+                except NodeAgentUnavailable as ex:
+                    log.info(f"{ex}, using oc debug")
+        return [
+            "oc",
+            "debug",
+            f"nodes/{node}",
+            f"--to-namespace={self.namespace}",
+            "--",
+        ] + shell
+
+    def add_sample(self, node, counters, previous):
+        """
+        Append the metrics of the interval ending by the sample to the buffer
+        of the node
+
+        Args:
+            node (str): node name
+            counters (dict): counters of the sample
+            previous (dict): counters of the previous sample, None for the
+                first sample of the stream
+
+        Returns:
+            bool: True if the sample was appended
+
+        """
+        if not previous:
+            return False
+        metrics = compute_telemetry_metrics(previous, counters)
+        if metrics is None:
+            log.debug(f"Skipping telemetry sample of node {node}, counters reset")
+            return False
+        self.buffers[node].append(counters["ts"], metrics)
+        return True
+
+    def _stream(self, node):
+        """
+        Read the samples of the node until the sampler is stopped
+
+        Args:
+            node (str): node name
+
+        """
+        env = os.environ.copy()
+        if self.kubeconfig:
+            env["KUBECONFIG"] = self.kubeconfig
+        while not self.stop_event.is_set():
+            previous = None
+            lines = []
+            try:
+                proc = subprocess.Popen(
+                    self._build_cmd(node),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    encoding="utf-8",
+                    env=env,
+                )
+            except OSError as ex:
+                log.warning(f"Failed to start telemetry of node {node}: {ex}")
+                self.stop_event.wait(self.interval)
+                continue
+            with self._procs_lock:
+                self._procs[node] = proc
+            if self.stop_event.is_set():
+                proc.terminate()
+            for line in proc.stdout:
+                if line.startswith(SAMPLE_MARKER):
+                    lines = []
+                lines.append(line)
+                if line.startswith(END_MARKER):
+                    try:
+                        counters = parse_telemetry_sample(lines)
+                    except (ValueError, IndexError) as ex:
+                        log.debug(f"Malformed telemetry sample of node {node}: {ex}")
+                        continue
+                    self.add_sample(node, counters, previous)
+                    previous = counters
+            proc.wait()
+            if not self.stop_event.is_set():
+                self.restarts[node] += 1
+                log.info(
+                    f"Telemetry stream of node {node} ended with rc "
+                    f"{proc.returncode}, restarting"
+                )
+                self.stop_event.wait(self.interval)
+
+    def start(self):
+        """
+        Start sampling of all the nodes in the background
+        """
+        if self._threads:
+            log.warning("Node telemetry sampler is already running")
+            return
+        log.info(
+            f"Starting node telemetry sampler on nodes {self.nodes} "
+            f"with interval {self.interval}s"
+        )
+        self.kubeconfig = config.RUN.get("kubeconfig")
+        self.stop_event.clear()
+        for node in self.nodes:
+            thread = threading.Thread(
+                target=self._stream,
+                args=(node,),
+                name=f"telemetry-{node}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=30):
+        """
+        Stop sampling and wait for the streams to end
+
+        Args:
+            timeout (int): seconds to wait for each stream
+
+        """
+        self.stop_event.set()
+        with self._procs_lock:
+            procs = list(self._procs.values())
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        deadline = time.time() + timeout
+        for thread in self._threads:
+            thread.join(max(0, deadline - time.time()))
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+        self._threads = []
+        samples = {node: len(buffer) for node, buffer in self.buffers.items()}
+        log.info(f"Stopped node telemetry sampler, samples per node: {samples}")
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def series(self, node, metric):
+        """
+        Args:
+            node (str): node name
+            metric (str): metric name, one of TELEMETRY_METRICS
+
+        Returns:
+            tuple: numpy arrays of the timestamps and of the metric values
+
+        """
+        columns = self.buffers[node].columns()
+        return columns["timestamp"], columns[metric]
+
+    def to_frame(self):
+        """
+        Get the samples of all the nodes as dataframe
+
+        Returns:
+            pd.DataFrame: dataframe with columns node, timestamp and the
+                metrics, one row per node and sample
+
+        """
+        frames = []
+        for node, buffer in self.buffers.items():
+            frame = pd.DataFrame(buffer.columns())
+            frame.insert(0, "node", node)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["node", "timestamp", *TELEMETRY_METRICS])
+        return pd.concat(frames, ignore_index=True)
+
+    def to_csv(self, path):
+        """
+        Write the samples of all the nodes to csv file
+
+        Args:
+            path (str): path to the csv file, compressed if it ends by .gz
+
+        """
+        self.to_frame().to_csv(path, index=False)
+        log.info(f"Node telemetry written to {path}")
+
+    def percentiles(self, percentiles=(50, 90, 99)):
+        """
+        Compute percentiles of the metrics per node
+
+        Args:
+            percentiles (tuple): percentiles to compute
+
+        Returns:
+            dict: node name: metric name: {"p<percentile>": value, "max": value},
+                nodes without samples are skipped
+
+        """
+        result = {}
+        for node, buffer in self.buffers.items():
+            if not len(buffer):
+                continue
+            result[node] = {}
+            columns = buffer.columns()
+            for metric in TELEMETRY_METRICS:
+                values = columns[metric]
+                values = values[~np.isnan(values)]
+                if not values.size:
+                    continue
+                stats = dict(
+                    zip(
+                        [f"p{p}" for p in percentiles],
+                        np.percentile(values, percentiles).tolist(),
+                    )
+                )
+                stats["max"] = float(values.max())
+                result[node][metric] = stats
+        return result
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Args:
+            percentiles (tuple): percentiles to show
+
+        Returns:
+            str: table of the metric percentiles per node
+
+        """
+        frame = pd.DataFrame(
+            [
+                {"node": node, "metric": metric, **stats}
+                for node, metrics in self.percentiles(percentiles).items()
+                for metric, stats in metrics.items()
+            ]
+        )
+        if frame.empty:
+            return "No node telemetry samples"
+        return frame.round(2).to_string(index=False)
+
+    def save_report(self, name):
+        """
+        Log the summary and write the samples to the log directory of the run
+
+        Args:
+            name (str): name of the sampled run, part of the file name
+
+        Returns:
+            str: path to the csv file
+
+        """
+        log.info(f"Node telemetry of {name}:\n{self.summary()}")
+        log_dir = ocsci_log_path()
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, f"node_telemetry_{name}_{int(time.time())}.csv.gz")
+        self.to_csv(path)
+        return path
@@ -21,6 +21,7 @@ import subprocess
 
 from ocs_ci.ocs.platform_nodes import PlatformNodesFactory
 from ocs_ci.resiliency.network_faults import NetworkFaults
+from ocs_ci.resiliency.node_stats import NodeTelemetrySampler
 from ocs_ci.ocs.node import get_nodes
 from ocs_ci.ocs import constants
 from ocs_ci.ocs.exceptions import CommandFailed
@@ -101,6 +102,10 @@ class PlatformFailures(PlatformNodesFactory):
         """
         Executes the selected failure scenario.
 
+        If NODE_TELEMETRY_INTERVAL is set in the failure case configuration,
+        CPU, memory, disk and network metrics of the nodes are sampled at this
+        interval in seconds during the failure and saved to the log directory.
+
         Args:
             failure_case (str): Key of the failure method to run.
 
@@ -110,7 +115,15 @@ class PlatformFailures(PlatformNodesFactory):
         method_name = self.FAILURE_METHODS.get(failure_case)
         if method_name and hasattr(self, method_name):
             log.info(f"Executing failure case: {failure_case}")
-            getattr(self, method_name)()
+            case_data = self.failure_data.get(failure_case) or {}
+            telemetry_interval = case_data.get("NODE_TELEMETRY_INTERVAL")
+            if not telemetry_interval:
+                getattr(self, method_name)()
+                return
+            telemetry = NodeTelemetrySampler(self.nodes, telemetry_interval)
+            with telemetry:
+                getattr(self, method_name)()
+            telemetry.save_report(failure_case.lower())
         else:
             raise NotImplementedError(
                 f"Failure method for '{failure_case}' is not implemented."
@@ -8,6 +8,7 @@ from ocs_ci.ocs.exceptions import (
     NoRunningCephToolBoxException,
 )
 from ocs_ci.ocs import ocp
+from ocs_ci.resiliency.node_stats import NodeTelemetrySampler
 from ocs_ci.utility.utils import ceph_health_check
 
 log = logging.getLogger(__name__)
@@ -16,13 +17,18 @@ log = logging.getLogger(__name__)
 class PlatformStress:
     """A class to perform stress testing on OpenShift cluster nodes using stress-ng."""
 
-    def __init__(self, nodes):
+    def __init__(self, nodes, telemetry_interval=None):
         """Initializes PlatformStress with the given nodes.
 
         Args:
             nodes (list): List of node objects to perform stress testing on.
+            telemetry_interval (int, optional): If set, CPU, memory, disk and
+                network metrics of the nodes are sampled at this interval in
+                seconds while the random stress runs. Defaults to None.
         """
         self.nodes = nodes
+        self.telemetry_interval = telemetry_interval
+        self.telemetry = None
         self.ocp_obj = ocp.OCP()
         self.run_status = False  # Flag to control stress test execution
         self.active_threads = []  # To keep track of active threads
@@ -264,6 +270,9 @@ class PlatformStress:
             daemon=True,
         )
         self.background_thread.start()
+        if self.telemetry_interval:
+            self.telemetry = NodeTelemetrySampler(self.nodes, self.telemetry_interval)
+            self.telemetry.start()
         log.info("Started random stress test in background")
         return True
 
@@ -290,6 +299,10 @@ class PlatformStress:
             if not thread.is_alive():
                 self.active_threads.remove(thread)
 
+        if self.telemetry:
+            self.telemetry.stop()
+            self.telemetry.save_report("platform_stress")
+
         log.info("All stress tests have been stopped")
         return True
 
@@ -6,6 +6,7 @@ Module for memory related util functions.
 import os
 import logging
 import tempfile
+import threading
 import numpy as np
 import pandas as pd
 from psutil import Process, ZombieProcess, NoSuchProcess
@@ -31,47 +32,263 @@ class MemoryMonitor(Timer):
 
 consumed_ram_log = []
 _columns_df = ["pid", "name", "ts", "rss", "vms", "status"]
-_df = pd.DataFrame(columns=_columns_df)
+_TS_FORMAT = "%Y-%m-%d %X"
 mon: MemoryMonitor
 _mem_csv: str
 
 
+class _ValueCodes(object):
+    """
+    Table of distinct string values stored in the sample columns as codes,
+    codes are given in the order the values are seen first
+    """
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, codes):
+        return np.array(self.values, dtype=object)[codes]
+
+
+class MemorySampleStore(object):
+    """
+    Append only store of the memory samples with structure:
+    "pid", "name", "ts", "rss", "vms", "status"
+
+    The samples are kept in numpy column buffers growing by chunks, strings
+    (name, ts, status) are stored as codes of their distinct values. If the
+    spill path is provided, full chunk is appended to the csv file instead of
+    growing the buffers, so the memory used by the store stays constant.
+    """
+
+    def __init__(self, chunk_size: int = 4096, spill_path: str = None):
+        """
+        Args:
+            chunk_size (int): number of samples the buffers grow by
+            spill_path (str): path to csv file the full chunks are written to
+        """
+        self.chunk_size = chunk_size
+        self.spill_path = spill_path
+        self.spilled_rows = 0
+        self.size = 0
+        self.names = _ValueCodes()
+        self.timestamps = _ValueCodes()
+        self.statuses = _ValueCodes()
+        self.lock = threading.Lock()
+        self._buffers = self._new_buffers(chunk_size)
+
+    @staticmethod
+    def _new_buffers(size):
+        return {
+            column: np.zeros(size, dtype=np.int64)
+            for column in ["pid", "name", "ts", constants.RAM, constants.VIRT, "status"]
+        }
+
+    def __len__(self):
+        return self.spilled_rows + self.size
+
+    def append(self, pid, name, ts, rss, vms, status):
+        """
+        Append memory sample of the process
+
+        Args:
+            pid (int): process id
+            name (str): process name
+            ts (str): timestamp of the sample in "%Y-%m-%d %X" format
+            rss (int): resident set size of the process
+            vms (int): virtual memory size of the process
+            status (str): process status
+        """
+        with self.lock:
+            capacity = len(self._buffers["pid"])
+            if self.size == capacity:
+                if self.spill_path:
+                    self._spill()
+                else:
+                    for column, buffer in self._buffers.items():
+                        self._buffers[column] = np.concatenate(
+                            [buffer, np.zeros(self.chunk_size, dtype=np.int64)]
+                        )
+            row = self.size
+            self._buffers["pid"][row] = pid
+            self._buffers["name"][row] = self.names.encode(name)
+            self._buffers["ts"][row] = self.timestamps.encode(ts)
+            self._buffers[constants.RAM][row] = rss
+            self._buffers[constants.VIRT][row] = vms
+            self._buffers["status"][row] = self.statuses.encode(status)
+            self.size += 1
+
+    def _buffered_frame(self):
+        columns = {
+            column: buffer[: self.size] for column, buffer in self._buffers.items()
+        }
+        columns["name"] = self.names.decode(columns["name"])
+        columns["ts"] = self.timestamps.decode(columns["ts"])
+        columns["status"] = self.statuses.decode(columns["status"])
+        return pd.DataFrame(columns, columns=_columns_df)
+
+    def _spill(self):
+        """
+        Append buffered samples to the spill file and empty the buffers
+        """
+        if not self.size:
+            return
+        self._buffered_frame().to_csv(
+            self.spill_path, mode="a", header=not self.spilled_rows, index=False
+        )
+        self.spilled_rows += self.size
+        self.size = 0
+
+    def columns(self) -> dict:
+        """
+        Get all the samples including the spilled ones as numpy columns,
+        name, ts and status columns contain codes of the values
+
+        Returns:
+            dict: column name: numpy array
+        """
+        with self.lock:
+            columns = {
+                column: buffer[: self.size].copy()
+                for column, buffer in self._buffers.items()
+            }
+            if self.spilled_rows:
+                spilled = pd.read_csv(self.spill_path)
+                for column, codes in [
+                    ("name", self.names.codes),
+                    ("ts", self.timestamps.codes),
+                    ("status", self.statuses.codes),
+                ]:
+                    spilled[column] = spilled[column].astype(str).map(codes)
+                for column in columns:
+                    columns[column] = np.concatenate(
+                        [spilled[column].to_numpy(dtype=np.int64), columns[column]]
+                    )
+        return columns
+
+    def to_csv(self, path: str):
+        """
+        Write all the samples to csv file
+
+        Args:
+            path (str): path to the csv file, if it is the spill path, only
+                the buffered samples are appended to it
+        """
+        with self.lock:
+            if path == self.spill_path:
+                self._spill()
+                return
+        self.to_frame().to_csv(path, index=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get all the samples as dataframe
+
+        Returns:
+            pd.DataFrame: dataframe with structure: pid,name,ts,rss,vms,status
+        """
+        columns = self.columns()
+        columns["name"] = self.names.decode(columns["name"])
+        columns["ts"] = self.timestamps.decode(columns["ts"])
+        columns["status"] = self.statuses.decode(columns["status"])
+        return pd.DataFrame(columns, columns=_columns_df)
+
+    def peak_stats(self, stat: constants) -> pd.DataFrame:
+        """
+        Get peak of the stat per process name, see read_peak_mem_stats
+
+        Args:
+            stat (constants): stat either 'rss' or 'vms' (constants.RAM | constants.VIRT)
+
+        Returns:
+            pd.DataFrame: dataframe with columns name, proc_start, proc_end, <stat>_peak
+        """
+        columns = self.columns()
+        values = columns[stat]
+        if len(np.unique(columns["name"])) > 10:
+            high_pids = np.unique(columns["pid"][values > values.mean()])
+            selected = np.isin(columns["pid"], high_pids)
+            columns = {column: array[selected] for column, array in columns.items()}
+        # the codes of timestamps are in chronological order
+        table = (
+            pd.DataFrame(
+                {"name": columns["name"], "ts": columns["ts"], stat: columns[stat]}
+            )
+            .groupby("name", as_index=False)
+            .agg(proc_start=("ts", "min"), proc_end=("ts", "max"), peak=(stat, "max"))
+        )
+        table = pd.DataFrame(
+            {
+                "name": self.names.decode(table["name"].to_numpy()),
+                "proc_start": self.timestamps.decode(table["proc_start"].to_numpy()),
+                "proc_end": self.timestamps.decode(table["proc_end"].to_numpy()),
+                f"{stat}_peak": table["peak"].to_numpy(),
+            }
+        )
+        return table.sort_values(by="name").reset_index(drop=True)
+
+    def sum_per_timestamp(self) -> pd.DataFrame:
+        """
+        Get the sum of rss and vms of all processes per timestamp, the last
+        sample of the process is taken if there are more with one timestamp
+
+        Returns:
+            pd.DataFrame: dataframe with columns ts, rss, vms
+        """
+        columns = self.columns()
+        df = (
+            pd.DataFrame(
+                {
+                    column: columns[column]
+                    for column in ["pid", "ts", constants.RAM, constants.VIRT]
+                }
+            )
+            .drop_duplicates(subset=["pid", "ts"], keep="last")
+            .drop(["pid"], axis=1)
+            .groupby(["ts"], as_index=False)
+            .sum()
+        )
+        df["ts"] = self.timestamps.decode(df["ts"].to_numpy())
+        return df
+
+
+_store = MemorySampleStore()
+
+
 def _get_memory_per_process():
     """
-    Function to add memory rss and vms of current process and all subprocesses to dataframe obj (_df)
+    Function to add memory rss and vms of current process and all subprocesses to the sample store (_store)
     """
+    ts = pd.Timestamp.now().strftime(_TS_FORMAT)
     proc = Process(os.getpid())
-    _rec_memory(proc)
+    _rec_memory(proc, ts)
     children = proc.children(recursive=True)
     for child in children:
-        _rec_memory(child)
+        _rec_memory(child, ts)
     del proc
 
 
-def _rec_memory(proc: Process):
+def _rec_memory(proc: Process, ts: str = None):
     """
-    Helper func to update _df DataFrame object with proc stats, accordingly
+    Helper func to append proc stats to the _store, accordingly
     to structure: "pid", "name", "ts", "rss", "vms", "status"
     """
     try:
-        global _df
-        _df = pd.concat(
-            [
-                _df,
-                pd.DataFrame(
-                    [
-                        [
-                            proc.pid,
-                            proc.name(),
-                            pd.Timestamp.now().strftime("%Y-%m-%d %X"),
-                            get_consumed_ram(proc),
-                            get_consumed_virt_mem(proc),
-                            proc.status(),
-                        ]
-                    ],
-                    columns=_columns_df,
-                ),
-            ]
+        _store.append(
+            proc.pid,
+            proc.name(),
+            ts or pd.Timestamp.now().strftime(_TS_FORMAT),
+            get_consumed_ram(proc),
+            get_consumed_virt_mem(proc),
+            proc.status(),
         )
     # ZombieProcess's, NoSuchProcess's come too often within a test run,
     # we're polling each process once per 3 sec. ZombieProcess and NoSuchProcess
@@ -114,17 +331,19 @@ def start_monitor_memory(interval: int = 3, create_csv: bool = False) -> MemoryM
     Args:
         interval (int): interval in sec to read measurements. Min interval is 2 sec
         create_csv (bool): create csv during test run. With this option it is possible
-            to upload file as artifact (to be done) or preserve csv file in the system
+            to upload file as artifact (to be done) or preserve csv file in the system,
+            the samples are spilled to the csv file by chunks
     Returns:
          MemoryMonitor: monitor object MemoryMonitor(Timer)
     """
     global _mem_csv
     global mon
-    global _df
-    _df = pd.DataFrame(columns=_columns_df)
+    global _store
     _mem_csv_path = f"mem-data-{get_testrun_name()}"
     if create_csv:
         _mem_csv = tempfile.mktemp(prefix=_mem_csv_path)
+    # with csv the samples are spilled to the file as the test runs
+    _store = MemorySampleStore(spill_path=_mem_csv if create_csv else None)
     # interval cannot be smaller than 2 sec, otherwise we get mistakes in calculation
     if interval < 2:
         interval = 2
@@ -150,12 +369,17 @@ def stop_monitor_memory(save_csv: bool = False) -> tuple:
     global mon
     mon.cancel()
     global _mem_csv
+    # peak stats read the spilled samples, compute them before the spill
+    # file is removed
+    table_rss = peak_mem_stats_human_readable(constants.RAM)
+    table_vms = peak_mem_stats_human_readable(constants.VIRT)
     if save_csv:
-        _df.to_csv(_mem_csv)
+        _store.to_csv(_mem_csv)
     else:
+        if _store.spill_path and os.path.exists(_store.spill_path):
+            os.remove(_store.spill_path)
+            _store.spilled_rows = 0
         _mem_csv = None
-    table_rss = peak_mem_stats_human_readable(constants.RAM)
-    table_vms = peak_mem_stats_human_readable(constants.VIRT)
     del mon
     return _mem_csv, table_rss, table_vms
 
@@ -173,6 +397,7 @@ def read_peak_mem_stats(
         df (pd.DataFrame): dataframe object with structure: index,pid,name,ts,rss,vms,status
         csv_path (str): path to csv file with structure: index,pid,name,ts,rss,vms,status;
                         will be ignored in case if df != None
+        If neither df nor csv_path is provided, samples of the running monitor are used
 
     Returns: pd.DataFrame similar to:
     name                                     proc_start             proc_end                rss_peak
@@ -181,7 +406,11 @@ def read_peak_mem_stats(
     2                           Python  2022-12-23 14:25:22      2022-12-23 14:27:32         228 MB
     """
 
-    if df is None:
+    if df is None and csv_path is None:
+        if len(_store):
+            return _store.peak_stats(stat)
+        df = pd.DataFrame(columns=_columns_df)
+    elif df is None:
         df = pd.read_csv(csv_path)
 
     df = catch_empty_mem_df(df)
@@ -219,8 +448,7 @@ def peak_mem_stats_human_readable(
     Returns:
         pd.DataFrame: peak memory stats dataframe
     """
-    global _df
-    df_peak = read_peak_mem_stats(stat, _df, csv_path)
+    df_peak = read_peak_mem_stats(stat, csv_path=csv_path)
     df_peak = df_peak.sort_values(by=f"{stat}_peak", ascending=False)
     df_peak[f"{stat}_peak"] = df_peak[f"{stat}_peak"].apply(bytes2human)
     return df_peak
@@ -231,14 +459,15 @@ def get_peak_sum_mem() -> tuple:
     get peak summarized memory stats for the test. Each test df file created anew.
     spikes defined per measurment (once in three seconds by default -> start_monitor_memory())
     """
-    global _df
-    _df = catch_empty_mem_df(_df)
-
-    _df = _df.drop_duplicates(subset=["pid", "ts"], keep="last").reset_index(drop=True)
-    df = _df.reset_index(drop=True)
-    df = (
-        df.drop(["status", "pid", "name"], axis=1).groupby(["ts"], as_index=False).sum()
-    )
+    if len(_store):
+        df = _store.sum_per_timestamp()
+    else:
+        df = catch_empty_mem_df(pd.DataFrame(columns=_columns_df))
+        df = (
+            df.drop(["status", "pid", "name"], axis=1)
+            .groupby(["ts"], as_index=False)
+            .sum()
+        )
 
     ram_max = df[df[constants.RAM] == df[constants.RAM].max()].drop(
         [constants.VIRT], axis=1
@@ -1,14 +1,20 @@
 import base64
+import gzip
+import json
 import logging
 import os
 import requests
 import tempfile
 import time
 import yaml
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, Timer
 from datetime import datetime
 
-from ocs_ci.framework import config
+import numpy as np
+from requests.adapters import HTTPAdapter
+
+from ocs_ci.framework import config, config_safe_thread_pool_task
 from ocs_ci.ocs import constants, defaults
 from ocs_ci.ocs.exceptions import AlertingError, AuthError, NoThreadingLockUsedError
 from ocs_ci.ocs.ocp import OCP
@@ -17,6 +23,333 @@ from ocs_ci.utility.utils import TimeoutIterator
 
 logger = logging.getLogger(__name__)
 
+# Number of keep-alive connections kept per Prometheus endpoint
+SESSION_POOL_MAXSIZE = 10
+
+# Maximal number of samples of one series returned by Prometheus range query
+MAX_RANGE_POINTS = 11000
+
+_sessions = {}
+_sessions_lock = Lock()
+_apis = {}
+_apis_lock = Lock()
+
+
+def get_prometheus_session(endpoint):
+    """
+    Get HTTP session with keep-alive connection pool for the Prometheus
+    endpoint, the session is shared by all PrometheusAPI objects using the
+    endpoint so TCP and TLS handshake is not done for every request.
+
+    Args:
+        endpoint (str): Prometheus endpoint, e.g. https://prometheus-k8s-...
+
+    Returns:
+        requests.Session: session of the endpoint
+
+    """
+    with _sessions_lock:
+        session = _sessions.get(endpoint)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SESSION_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[endpoint] = session
+    return session
+
+
+def close_prometheus_sessions():
+    """
+    Close HTTP sessions of all Prometheus endpoints
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+class RangeMatrix(object):
+    """
+    NumPy representation of the matrix returned by Prometheus range query
+
+    Attributes:
+        metrics (list): label sets (dicts) of the series
+        timestamps (numpy.ndarray): timestamps of the samples, one row per
+            series
+        values (numpy.ndarray): float values of the samples, one row per
+            series
+
+    """
+
+    def __init__(self, result):
+        """
+        Args:
+            result (list): Data from ``query_range()`` method, all series
+                have to have the same number of samples
+
+        Raises:
+            ValueError: when series have different size
+
+        """
+        sizes = sorted({len(metric["values"]) for metric in result})
+        if len(sizes) > 1:
+            raise ValueError(
+                f"Metric sample series doesn't have the same size (sizes: {sizes})"
+                ", they can't be represented as matrix"
+            )
+        self.metrics = [metric["metric"] for metric in result]
+        samples = np.array(
+            [metric["values"] for metric in result], dtype=float
+        ).reshape(len(result), -1, 2)
+        self.timestamps = samples[:, :, 0]
+        self.values = samples[:, :, 1]
+
+    def __len__(self):
+        return len(self.metrics)
+
+    def to_result(self):
+        """
+        Convert the matrix back to the format returned by ``query_range()``
+
+        Returns:
+            list: series with 'metric' and 'values' keys
+
+        """
+        return [
+            {
+                "metric": metric,
+                "values": [
+                    [timestamp, format_sample_value(value)]
+                    for timestamp, value in zip(timestamps.tolist(), values.tolist())
+                ],
+            }
+            for metric, timestamps, values in zip(
+                self.metrics, self.timestamps, self.values
+            )
+        ]
+
+
+def format_sample_value(value):
+    """
+    Format float value of the sample the same way as Prometheus does: the
+    shortest representation which reads back to the same float, without
+    exponent
+
+    Args:
+        value (float): value of the sample
+
+    Returns:
+        str: the value as returned by Prometheus API
+
+    """
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return np.format_float_positional(value, trim="-")
+
+
+def validate_range_result(result, start, end, step):
+    """
+    Check that all series of the range query result have the same number of
+    samples and that there are no holes in the data. The checks are done on
+    NumPy arrays of the sizes and timestamps of the series instead of a loop
+    over the samples.
+
+    Args:
+        result (list): Data from ``query_range()`` method.
+        start (float): start timestamp of the query
+        end (float): end timestamp of the query
+        step (float): Query resolution step width in seconds
+
+    Raises:
+        ValueError: when series have different size or there are holes in
+            the data
+
+    """
+    sizes = np.fromiter(
+        (len(metric["values"]) for metric in result), dtype=int, count=len(result)
+    )
+    if not (sizes == sizes[:1]).all():
+        msg = "Metric sample series doesn't have the same size."
+        logger.error(msg)
+        raise ValueError(msg)
+    # Check if the query result is empty (which is a valid answer from
+    # validation standpoint).
+    if not sizes.size:
+        logger.warning("prometheus query result is empty")
+        return
+    # Check that we don't have holes in the response. If this fails, our
+    # Prometheus instance is missing some part of the data we are asking it
+    # about. For positive test cases, this is most likely a test blocker
+    # product bug.
+    exp_samples = (float(end) - float(start)) / float(step)
+    if not exp_samples - 1 <= sizes[0] <= exp_samples + 1:
+        msg = "there are holes in prometheus data"
+        logger.error(
+            msg + ": result size is %d while expected sample size is %d +-1",
+            sizes[0],
+            exp_samples,
+        )
+        raise ValueError(msg)
+    # samples missing in the middle of the range are found by the gaps
+    # between the consecutive timestamps of the series
+    gaps = np.diff(RangeMatrix(result).timestamps, axis=1)
+    holes = ~np.isclose(gaps, float(step))
+    if holes.any():
+        msg = "there are holes in prometheus data"
+        logger.error(
+            msg + ": %d gaps between samples differ from the step %s",
+            holes.sum(),
+            step,
+        )
+        raise ValueError(msg)
+    logger.debug("there are no holes in the data")
+
+
+def split_time_range(start, end, step, max_points=MAX_RANGE_POINTS):
+    """
+    Split time range of range query to consecutive sub-ranges with at most
+    max_points samples, the sub-ranges don't share any sample
+
+    Args:
+        start (float): start timestamp of the range
+        end (float): end timestamp of the range
+        step (float): Query resolution step width in seconds
+        max_points (int): maximal number of samples in the sub-range
+
+    Returns:
+        list: tuples of start and end timestamps of the sub-ranges
+
+    """
+    start, end, step = float(start), float(end), float(step)
+    ranges = []
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + (max_points - 1) * step, end)
+        ranges.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + step
+    return ranges
+
+
+def dump_range_queries(
+    api,
+    queries,
+    start,
+    end,
+    step,
+    file_name,
+    max_workers=4,
+    max_points=MAX_RANGE_POINTS,
+):
+    """
+    Fetch range queries concurrently and save them to one gzip compressed
+    file with one JSON line per series. Long time ranges are split to
+    sub-ranges which are fetched in parallel as well.
+
+    Each line has keys: query, metric (labels of the series), timestamps
+    and values (floats), see ``read_range_dump()``.
+
+    Args:
+        api (PrometheusAPI): API used for the queries
+        queries (list): Prometheus expression query strings, e.g. metric names
+        start (float): start timestamp of required datapoints
+        end (float): end timestamp of required datapoints
+        step (float): step of required datapoints
+        file_name (str): path to the file, e.g. metrics.ndjson.gz
+        max_workers (int): maximal number of queries running at once
+        max_points (int): maximal number of samples of series in one query
+
+    Returns:
+        int: number of series saved
+
+    """
+    chunks = [
+        (query, chunk_start, chunk_end)
+        for query in queries
+        for chunk_start, chunk_end in split_time_range(start, end, step, max_points)
+    ]
+    config_index = config.cur_index
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda chunk: config_safe_thread_pool_task(
+                config_index,
+                api.query_range,
+                chunk[0],
+                chunk[1],
+                chunk[2],
+                step,
+                validate=False,
+            ),
+            chunks,
+        )
+        # series of the query merged over the sub-ranges in time order
+        series = {}
+        for (query, _, _), result in zip(chunks, results):
+            for metric in result:
+                key = (query, json.dumps(metric["metric"], sort_keys=True))
+                if key not in series:
+                    series[key] = {
+                        "query": query,
+                        "metric": metric["metric"],
+                        "timestamps": [],
+                        "values": [],
+                    }
+                for timestamp, value in metric["values"]:
+                    series[key]["timestamps"].append(timestamp)
+                    series[key]["values"].append(float(value))
+    with gzip.open(file_name, "wt") as dump_file:
+        for item in series.values():
+            dump_file.write(json.dumps(item) + "\n")
+    logger.info(f"Saved {len(series)} series of {len(queries)} queries to {file_name}")
+    return len(series)
+
+
+def read_range_dump(file_name, query=None):
+    """
+    Read series saved by ``dump_range_queries()``
+
+    Args:
+        file_name (str): path to the dump file
+        query (str): read only series of this query if provided
+
+    Yields:
+        dict: series with keys query, metric (labels of the series) and
+            timestamps and values as NumPy arrays
+
+    """
+    with gzip.open(file_name, "rt") as dump_file:
+        for line in dump_file:
+            item = json.loads(line)
+            if query is not None and item["query"] != query:
+                continue
+            item["timestamps"] = np.array(item["timestamps"], dtype=float)
+            item["values"] = np.array(item["values"], dtype=float)
+            yield item
+
+
+def get_prometheus_api(threading_lock):
+    """
+    Get PrometheusAPI of the current cluster, the instance is created (and
+    logged in) only once and reused by next calls
+
+    Args:
+        threading_lock (threading.RLock): Lock used for synchronization of the
+            threads in Prometheus calls
+
+    Returns:
+        PrometheusAPI: the API object
+
+    """
+    key = config.ENV_DATA["cluster_name"]
+    with _apis_lock:
+        api = _apis.get(key)
+        if api is None:
+            api = _apis[key] = PrometheusAPI(threading_lock=threading_lock)
+    return api
+
 
 # TODO(fbalak): if ignore_more_occurences is set to False then tests are flaky.
 # The root cause should be inspected.
@@ -378,6 +711,9 @@ class PrometheusAPI(object):
                         password = f.read().rstrip("\n")
                 self._password = password
             self._threading_lock = threading_lock
+            # the instance is shared by the threads of the session, only one
+            # of them can log in and swap the kubeconfig at a time
+            self._refresh_lock = Lock()
             self.refresh_connection()
             if (
                 not config.ENV_DATA["platform"].lower() == "ibm_cloud"
@@ -387,11 +723,19 @@ class PrometheusAPI(object):
             ):
                 self.generate_cert()
 
-    def refresh_connection(self):
+    def refresh_connection(self, stale_token=None):
         """
         Login into OCP, refresh endpoint and token.
+
+        Args:
+            stale_token (str): token rejected by the API, the refresh is
+                skipped if another thread already replaced it
+
         """
-        with self._cluster_context():
+        with self._refresh_lock, self._cluster_context():
+            if stale_token and self._token != stale_token:
+                logger.info("Connection was already refreshed by another thread")
+                return
             kubeconfig = config.RUN["kubeconfig"]
             ocp = OCP(
                 kind=constants.ROUTE,
@@ -441,6 +785,20 @@ class PrometheusAPI(object):
             self._cacert = cert_file.name
             logger.info(f"Generated CA certification file: {self._cacert}")
 
+    def _get_response(self, url, **kwargs):
+        """
+        GET request over the pooled session of the current endpoint
+
+        Args:
+            url (str): URL of the request
+            kwargs (dict): arguments of requests.Session.get
+
+        Returns:
+            requests.models.Response: Response of the request
+
+        """
+        return get_prometheus_session(self._endpoint).get(url, **kwargs)
+
     def get(self, resource, payload=None, timeout=300):
         """
         Get alerts from Prometheus API.
@@ -458,7 +816,8 @@ class PrometheusAPI(object):
             requests.models.Response: Response from Prometheus alerts api
         """
         pattern = f"/api/v1/{resource}"
-        headers = {"Authorization": f"Bearer {self._token}"}
+        token = self._token
+        headers = {"Authorization": f"Bearer {token}"}
 
         logger.debug(f"GET {self._endpoint + pattern}")
         logger.debug(f"headers={headers}")
@@ -470,7 +829,7 @@ class PrometheusAPI(object):
                 for sample_response in TimeoutIterator(
                     timeout=timeout,
                     sleep=15,
-                    func=requests.get,
+                    func=self._get_response,
                     func_kwargs={
                         "url": self._endpoint + pattern,
                         "headers": headers,
@@ -485,7 +844,7 @@ class PrometheusAPI(object):
                             f"There was an error in response: {response.text}"
                         )
                         logger.warning("Refreshing connection")
-                        self.refresh_connection()
+                        self.refresh_connection(stale_token=token)
                         if (
                             not config.ENV_DATA["platform"].lower() == "ibm_cloud"
                             and config.ENV_DATA["deployment_type"] == "managed"
@@ -493,12 +852,15 @@ class PrometheusAPI(object):
                             logger.warning("Generating new certificate")
                             self.generate_cert()
                         logger.warning("Connection refreshed")
+                        # the same headers are passed to the next request
+                        token = self._token
+                        headers["Authorization"] = f"Bearer {token}"
                     else:
                         break
             return response
         else:
             with self._cluster_context():
-                response = requests.get(
+                response = self._get_response(
                     self._endpoint + pattern,
                     headers=headers,
                     verify=self._cacert,
@@ -553,7 +915,7 @@ class PrometheusAPI(object):
                     logger.info(log_msg)
             resp = self.get("query", payload=query_payload)
             try:
-                content = yaml.safe_load(resp.content)
+                content = json.loads(resp.content)
             except Exception as ex:
                 log_parsing_error(query_payload, resp.content, ex)
                 raise
@@ -562,7 +924,9 @@ class PrometheusAPI(object):
         # return actual result of the query
         return content["data"]["result"]
 
-    def query_range(self, query, start, end, step, timeout=None, validate=True):
+    def query_range(
+        self, query, start, end, step, timeout=None, validate=True, as_matrix=False
+    ):
         """
         Perform Prometheus `range query`_. This is a simple wrapper over
         ``get()`` method with plumbing code for range queries, additional
@@ -578,9 +942,15 @@ class PrometheusAPI(object):
             validate (bool): Perform basic validation on the response.
                 Optional, ``True`` is the default. Use ``False`` when you
                 expect query to fail eg. during negative testing.
+            as_matrix (bool): Return the result as RangeMatrix with NumPy
+                arrays of timestamps and values instead of list of series
 
         Returns:
-            list: result of the query
+            list: result of the query (RangeMatrix if as_matrix is True)
+
+        Raises:
+            ValueError: when validation failed or as_matrix is True and the
+                series don't have the same number of samples
 
         .. _`range query`: https://prometheus.io/docs/prometheus/latest/querying/api/#range-queries
         """
@@ -598,7 +968,7 @@ class PrometheusAPI(object):
             )
             resp = self.get("query_range", payload=query_payload)
             try:
-                content = yaml.safe_load(resp.content)
+                content = json.loads(resp.content)
             except Exception as ex:
                 log_parsing_error(query_payload, resp.content, ex)
                 raise
@@ -613,38 +983,9 @@ class PrometheusAPI(object):
                 if result_type != "matrix":
                     logger.error("unexpected resultType: %s", result_type)
                     raise ValueError("resultType is not matrix but %s", result_type)
-                # All metric sample series has the same size.
-                sizes = []
-                for metric in content["data"]["result"]:
-                    sizes.append(len(metric["values"]))
-                if not all(size == sizes[0] for size in sizes):
-                    msg = "Metric sample series doesn't have the same size."
-                    logger.error(msg)
-                    raise ValueError(msg)
-                # Check if the query result is empty (which is a valid answer from
-                # validation standpoint).
-                if len(sizes) == 0:
-                    logger.warning("prometheus query result is empty")
-                else:
-                    # Check that we don't have holes in the response. If this
-                    # fails, our Prometheus instance is missing some part of the
-                    # data we are asking it about. For positive test cases, this is
-                    # most likely a test blocker product bug.
-                    start_dt = datetime.utcfromtimestamp(start)
-                    end_dt = datetime.utcfromtimestamp(end)
-                    duration = end_dt - start_dt
-                    exp_samples = duration.seconds / step
-                    if exp_samples - 1 <= sizes[0] <= exp_samples + 1:
-                        logger.debug("there are no holes in the data")
-                    else:
-                        msg = "there are holes in prometheus data"
-                        logger.error(
-                            msg
-                            + ": result size is %d while expected sample size is %d +-1",
-                            sizes[0],
-                            exp_samples,
-                        )
-                        raise ValueError(msg)
+                validate_range_result(content["data"]["result"], start, end, step)
+        if as_matrix:
+            return RangeMatrix(content["data"]["result"])
         # return actual result of the query
         return content["data"]["result"]
 
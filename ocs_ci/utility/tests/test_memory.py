@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import pandas as pd
+
+from ocs_ci.ocs import constants
+from ocs_ci.utility import memory
+
+
+def fill_store(store):
+    """
+    Append samples of 12 processes in 3 ticks, process 11 uses the most memory
+    """
+    for tick in range(3):
+        ts = f"2024-01-01 10:00:0{tick}"
+        for pid in range(12):
+            rss = 100 * pid + tick
+            store.append(pid, f"proc-{pid % 11}", ts, rss, 2 * rss, "running")
+
+
+def test_store_peak_stats_match_dataframe(tmp_path):
+    """
+    Check that the stats computed on the columns (with and without spilled
+    chunks) are the same as the stats computed on the dataframe.
+    """
+    store = memory.MemorySampleStore(chunk_size=5)
+    fill_store(store)
+    spilled_store = memory.MemorySampleStore(
+        chunk_size=5, spill_path=str(tmp_path / "mem.csv")
+    )
+    fill_store(spilled_store)
+    assert spilled_store.spilled_rows == 35
+    df = store.to_frame()
+    assert len(df) == 36
+    pd.testing.assert_frame_equal(spilled_store.to_frame(), df)
+
+    for stat in [constants.RAM, constants.VIRT]:
+        expected = memory.read_peak_mem_stats(stat, df=df.copy())
+        for sample_store in [store, spilled_store]:
+            table = sample_store.peak_stats(stat)
+            assert table.values.tolist() == expected.values.tolist()
+            assert list(table.columns) == list(expected.columns)
+
+
+def test_get_peak_sum_mem_from_store(monkeypatch):
+    """
+    Check that peak of summarized memory is found per timestamp.
+    """
+    store = memory.MemorySampleStore()
+    fill_store(store)
+    # the last sample of the process within timestamp is taken
+    store.append(0, "proc-0", "2024-01-01 10:00:02", 1000, 1000, "running")
+    monkeypatch.setattr(memory, "_store", store)
+    ram_max, virt_max = memory.get_peak_sum_mem()
+    assert ram_max.values.tolist() == [["2024-01-01 10:00:02", 6624 - 2 + 1000]]
+    assert virt_max.values.tolist() == [["2024-01-01 10:00:02", 13248 - 4 + 1000]]
+
+
+def test_stop_monitor_without_csv_keeps_spilled_stats(monkeypatch, tmp_path):
+    """
+    Check that the peak stats include the spilled samples when the spill
+    file isn't saved.
+    """
+    spill_path = tmp_path / "mem.csv"
+    store = memory.MemorySampleStore(chunk_size=5, spill_path=str(spill_path))
+    fill_store(store)
+    expected = store.peak_stats(constants.RAM)
+    monkeypatch.setattr(memory, "_store", store)
+    # the monitor is deleted by stop_monitor_memory
+    memory.mon = SimpleNamespace(cancel=lambda: None)
+    csv_path, table_rss, table_vms = memory.stop_monitor_memory(save_csv=False)
+    assert csv_path is None
+    assert not spill_path.exists()
+    assert len(table_rss) == len(expected) == len(table_vms)
+    assert table_rss["name"].iloc[0] == "proc-0"
@@ -1,9 +1,22 @@
 # -*- coding: utf8 -*-
 
+import contextlib
+import threading
+import time
+
 import pytest
 
 from ocs_ci.framework import config
-from ocs_ci.utility.prometheus import check_query_range_result_enum
+from ocs_ci.utility import prometheus
+from ocs_ci.utility.prometheus import (
+    PrometheusAPI,
+    RangeMatrix,
+    check_query_range_result_enum,
+    dump_range_queries,
+    read_range_dump,
+    split_time_range,
+    validate_range_result,
+)
 
 
 @pytest.fixture
@@ -205,3 +218,143 @@ def test_check_query_range_result_exp_good_time(query_range_result_bad_last_90s)
         exp_good_time=150,
     )
     assert result2, "taking exp_good_time into account, validation should pass"
+
+
+def test_validate_range_result(query_range_result_ok):
+    """
+    Check size and hole validation of the range query result.
+    """
+    start = query_range_result_ok[0]["values"][0][0]
+    end = query_range_result_ok[0]["values"][-1][0]
+    validate_range_result(query_range_result_ok, start, end, 15)
+    validate_range_result([], start, end, 15)
+    with pytest.raises(ValueError, match="holes"):
+        validate_range_result(query_range_result_ok, start, end + 600, 15)
+    query_range_result_ok[0]["values"].pop()
+    with pytest.raises(ValueError, match="same size"):
+        validate_range_result(query_range_result_ok, start, end, 15)
+    with pytest.raises(ValueError, match="same size"):
+        RangeMatrix(query_range_result_ok)
+    # sample missing in the middle of every series
+    for metric in query_range_result_ok[1:]:
+        metric["values"].pop()
+    for metric in query_range_result_ok:
+        del metric["values"][5]
+    with pytest.raises(ValueError, match="holes"):
+        validate_range_result(query_range_result_ok, start, end, 15)
+
+
+def test_range_matrix(query_range_result_ok):
+    """
+    Check that RangeMatrix holds the samples in NumPy arrays.
+    """
+    matrix = RangeMatrix(query_range_result_ok)
+    assert len(matrix) == len(query_range_result_ok)
+    assert matrix.values.shape == matrix.timestamps.shape
+    assert (matrix.values == 1).all()
+    assert matrix.to_result() == query_range_result_ok
+    # values formatted by Prometheus survive the round trip
+    values = ["1234567.123", "0.0000001", "12345678901234567000", "NaN", "-Inf"]
+    series = [{"metric": {}, "values": [[float(i), v] for i, v in enumerate(values)]}]
+    result = RangeMatrix(series).to_result()
+    assert [value for _, value in result[0]["values"]] == values
+
+
+class RangeResultAPI(object):
+    """
+    Object with query_range method of PrometheusAPI answering from the result
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.queries = []
+
+    def query_range(self, query, start, end, step, validate=True):
+        self.queries.append((query, start, end))
+        return [
+            {
+                "metric": metric["metric"],
+                "values": [
+                    value for value in metric["values"] if start <= value[0] <= end
+                ],
+            }
+            for metric in self.result
+        ]
+
+
+def test_dump_range_queries(query_range_result_ok, tmp_path):
+    """
+    Check that series fetched in sub-ranges are merged and read back from
+    the compressed dump.
+    """
+    start = query_range_result_ok[0]["values"][0][0]
+    end = query_range_result_ok[0]["values"][-1][0]
+    assert split_time_range(start, end, 15, max_points=6) == [
+        (start, start + 75),
+        (start + 90, start + 165),
+        (start + 180, end),
+    ]
+    api = RangeResultAPI(query_range_result_ok)
+    file_name = str(tmp_path / "metrics.ndjson.gz")
+    queries = ["ceph_mon_quorum_status", "up"]
+    assert dump_range_queries(
+        api, queries, start, end, 15, file_name, max_points=6
+    ) == 2 * len(query_range_result_ok)
+    assert len(api.queries) == 6
+    series = list(read_range_dump(file_name, query="up"))
+    assert [item["metric"] for item in series] == [
+        metric["metric"] for metric in query_range_result_ok
+    ]
+    matrix = RangeMatrix(query_range_result_ok)
+    for item, timestamps in zip(series, matrix.timestamps):
+        assert (item["timestamps"] == timestamps).all()
+        assert (item["values"] == 1).all()
+
+
+class LoginOCP(object):
+    """
+    OCP issuing new token on every login
+    """
+
+    logins = 0
+
+    def __init__(self, **kwargs):
+        pass
+
+    def login(self, user, password):
+        time.sleep(0.1)
+        LoginOCP.logins += 1
+        return True
+
+    def get_user_token(self):
+        return f"token-{LoginOCP.logins}"
+
+    def get(self, resource_name):
+        return {"spec": {"host": "prometheus.example.com"}}
+
+
+def test_concurrent_refresh_connection(monkeypatch, tmp_path):
+    """
+    Check that threads refreshing the same rejected token log in only once
+    and the kubeconfig is restored.
+    """
+    kubeconfig = tmp_path / "kubeconfig"
+    kubeconfig.write_text("kubeconfig data\n")
+    monkeypatch.setitem(config.RUN, "kubeconfig", str(kubeconfig))
+    monkeypatch.setattr(prometheus, "OCP", LoginOCP)
+    api = PrometheusAPI.__new__(PrometheusAPI)
+    api._cluster_context = contextlib.nullcontext
+    api._refresh_lock = threading.Lock()
+    api._token = "token-0"
+    threads = [
+        threading.Thread(target=api.refresh_connection, args=("token-0",))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert LoginOCP.logins == 1
+    assert api._token == "token-1"
+    assert api._endpoint == "https://prometheus.example.com"
+    assert kubeconfig.read_text() == "kubeconfig data\n"
@@ -1,6 +1,7 @@
 # -*- coding: utf8 -*-
 
 import logging
+import os
 from itertools import repeat
 from sys import platform
 
@@ -332,3 +333,57 @@ def test_is_base64_block_rejects_regular_text():
     regular_text = "This is a log message. It has punctuation!"
     regular_text = regular_text * 3  # Make it 100+ chars
     assert utils._is_base64_block(regular_text, min_length=100) is False
+
+
+@pytest.mark.skipif(platform == "win32", reason="uses shell script as oc binary")
+def test_get_oc_plugins_cached(tmp_path):
+    """
+    Check that 'oc plugin list' is executed only once for the same oc binary
+    and PATH and again after the binary is replaced.
+    """
+    oc_bin = tmp_path / "oc"
+    oc_bin.write_text("#!/bin/sh\necho /usr/local/bin/oc-mirror\n")
+    oc_bin.chmod(0o755)
+    env = {"PATH": str(tmp_path)}
+    stats_start = utils.get_oc_plugins_stats()
+
+    assert utils.get_oc_plugins(env) == ["/usr/local/bin/oc-mirror"]
+    assert utils.get_oc_plugins(env) == ["/usr/local/bin/oc-mirror"]
+    stats = utils.get_oc_plugins_stats()
+    assert stats["probes"] - stats_start["probes"] == 1
+    assert stats["forks_saved"] - stats_start["forks_saved"] == 1
+
+    oc_bin.write_text("#!/bin/sh\necho /usr/local/bin/oc-odf\n")
+    os.utime(oc_bin, (0, 0))
+    assert utils.get_oc_plugins(env) == ["/usr/local/bin/oc-odf"]
+    stats = utils.get_oc_plugins_stats()
+    assert stats["probes"] - stats_start["probes"] == 2
+
+
+def test_run_on_clusters(monkeypatch):
+    """
+    Check that the function runs with config of each cluster bound, results
+    are in cluster index order and the global context is not switched.
+    """
+    from ocs_ci.framework import Config, config
+
+    clusters = [Config() for _ in range(3)]
+    for index, cluster in enumerate(clusters):
+        cluster.ENV_DATA["cluster_name"] = f"cluster-{index}"
+    monkeypatch.setattr(config, "clusters", clusters)
+    monkeypatch.setattr(config, "_cur_index", 0)
+
+    def _cluster_name(suffix, cluster_config=None):
+        config.switch_ctx(config.cur_index)
+        assert cluster_config is config.cluster_ctx
+        return config.ENV_DATA["cluster_name"] + suffix
+
+    results = utils.run_on_clusters(_cluster_name, "-ok", skip_index=[1])
+    assert results == ["cluster-0-ok", None, "cluster-2-ok"]
+    assert config.cur_index == 0
+
+    def _fail(cluster_config=None):
+        raise CommandFailed(cluster_config.ENV_DATA["cluster_name"])
+
+    with pytest.raises(CommandFailed, match="cluster-1"):
+        utils.run_on_clusters(_fail, skip_index=0)
@@ -1,6 +1,7 @@
 import tempfile
 from datetime import datetime, timedelta
 from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
 import base64
 import io
 import json
@@ -14,6 +15,7 @@ import smtplib
 import socket
 import string
 import subprocess
+import threading
 import time
 import traceback
 from typing import Match, Iterator
@@ -41,7 +43,7 @@ from paramiko.auth_handler import AuthenticationException, SSHException
 from semantic_version import Version
 from tempfile import NamedTemporaryFile, mkdtemp, TemporaryDirectory
 from jinja2 import FileSystemLoader, Environment
-from ocs_ci.framework import config
+from ocs_ci.framework import config, config_safe_thread_pool_task
 from ocs_ci.framework import GlobalVariables as GV
 from ocs_ci.ocs import constants, defaults
 from ocs_ci.ocs.exceptions import (
@@ -672,12 +674,85 @@ def run_cmd_interactive(
             raise InteractivePromptException("Failed to provide answer to the prompt")
 
 
+def run_on_clusters(
+    func, *args, cluster_indexes=None, skip_index=None, max_workers=None, **kwargs
+):
+    """
+    Run the function on multiple clusters concurrently. Every call runs in a
+    thread with config index of its cluster bound (see
+    config_safe_thread_pool_task), so config in the call points to the
+    cluster and the global config.cur_index is never changed.
+
+    Args:
+        func (function): function to run, it gets cluster config of the
+            cluster as cluster_config keyword argument
+        args (tuple): positional arguments of the function
+        cluster_indexes (list): indexes of the clusters to run the function on,
+            all clusters if not provided
+        skip_index (int or list of int): indexes of clusters to skip
+        max_workers (int): maximal number of concurrent calls, all clusters
+            at once if not provided, 1 for sequential calls
+        kwargs (dict): keyword arguments of the function
+
+    Raises:
+        Exception: The first exception (in cluster index order) raised by the
+            function, it's raised after all the calls finished
+
+    Returns:
+        list: results of the function as per cluster's index in
+            config.clusters, None for the clusters the function didn't run on
+
+    """
+    if cluster_indexes is None:
+        cluster_indexes = range(len(config.clusters))
+    if not isinstance(skip_index, list):
+        skip_index = [skip_index]
+    cluster_indexes = [index for index in cluster_indexes if index not in skip_index]
+    results = [None] * len(config.clusters)
+    if not cluster_indexes:
+        return results
+    with ThreadPoolExecutor(
+        max_workers=max_workers or len(cluster_indexes)
+    ) as executor:
+        futures = {
+            index: executor.submit(
+                config_safe_thread_pool_task,
+                index,
+                func,
+                *args,
+                cluster_config=config.clusters[index],
+                **kwargs,
+            )
+            for index in cluster_indexes
+        }
+    errors = []
+    for index, future in futures.items():
+        try:
+            results[index] = future.result()
+        except Exception as ex:
+            log.error(
+                f"{getattr(func, '__name__', func)} failed on cluster "
+                f"{config.clusters[index].ENV_DATA.get('cluster_name')}: {ex}"
+            )
+            errors.append(ex)
+    if errors:
+        raise errors[0]
+    return results
+
+
 def run_cmd_multicluster(
-    cmd, secrets=None, timeout=600, ignore_error=False, skip_index=None, **kwargs
+    cmd,
+    secrets=None,
+    timeout=600,
+    ignore_error=False,
+    skip_index=None,
+    max_workers=None,
+    **kwargs,
 ):
     """
-    Run command on multiple clusters. Useful in multicluster scenarios
-    This is wrapper around exec_cmd
+    Run command on multiple clusters concurrently. Useful in multicluster
+    scenarios. This is wrapper around exec_cmd, kubeconfig of each cluster is
+    bound to its call without switching the config context.
 
     Args:
         cmd (str): command to be run
@@ -688,6 +763,8 @@ def run_cmd_multicluster(
         ignore_error (bool): True if ignore non zero return code and do not
             raise the exception.
         skip_index (list of int): List of indexes that needs to be skipped from executing the command
+        max_workers (int): maximal number of clusters the command runs on at
+            once, all clusters if not provided, 1 for sequential execution
 
     Raises:
         CommandFailed: In case the command execution fails
@@ -700,39 +777,86 @@ def run_cmd_multicluster(
     """
     # Skip indexed cluster while running commands
     # Useful to skip operations on ACM cluster
-    restore_ctx_index = config.cur_index
-    completed_process = [None] * len(config.clusters)
-    # this need's to be done to skip none value as skip_index accepts type none
-    if not isinstance(skip_index, list):
-        skip_index = [skip_index]
-    for cluster in config.clusters:
-        if cluster.MULTICLUSTER["multicluster_index"] in skip_index:
-            log.warning(f"skipping index = {skip_index}")
-            continue
-        else:
-            config.switch_ctx(cluster.MULTICLUSTER["multicluster_index"])
-            log.info(
-                f"Switched the context to cluster:{cluster.ENV_DATA['cluster_name']}"
-            )
-            try:
-                completed_process[cluster.MULTICLUSTER["multicluster_index"]] = (
-                    exec_cmd(
-                        cmd,
-                        secrets=secrets,
-                        timeout=timeout,
-                        ignore_error=ignore_error,
-                        **kwargs,
-                    )
-                )
-            except CommandFailed:
-                # In case of failure, restore the cluster context to where we started
-                config.switch_ctx(restore_ctx_index)
-                log.error(
-                    f"Command {cmd} execution failed on cluster {cluster.ENV_DATA['cluster_name']} "
-                )
-                raise
-    config.switch_ctx(restore_ctx_index)
-    return completed_process
+    if skip_index is not None:
+        log.warning(f"skipping index = {skip_index}")
+    return run_on_clusters(
+        exec_cmd,
+        cmd,
+        skip_index=skip_index,
+        max_workers=max_workers,
+        secrets=secrets,
+        timeout=timeout,
+        ignore_error=ignore_error,
+        **kwargs,
+    )
+
+
+# Cache of 'oc plugin list' output, keyed by the oc binary, its modification
+# time and PATH (plugins are discovered from PATH)
+_oc_plugins_cache = {}
+_oc_plugins_cache_lock = threading.Lock()
+_oc_plugins_stats = {"probes": 0, "forks_saved": 0}
+
+
+def get_oc_plugins(env=None):
+    """
+    Get the output lines of 'oc plugin list' for the oc binary resolved from
+    PATH. The probe is executed only once per process for the same oc binary
+    and PATH, it is executed again when the binary is replaced or PATH is
+    changed.
+
+    Args:
+        env (dict): environment the oc command will be executed with,
+            os.environ is used if not provided
+
+    Returns:
+        list: lines of 'oc plugin list' output
+
+    """
+    env = env if env is not None else os.environ
+    path_env = env.get("PATH", "")
+    oc_path = which("oc", path=path_env)
+    try:
+        oc_mtime = os.stat(oc_path).st_mtime if oc_path else None
+    except OSError:
+        oc_mtime = None
+    key = (oc_path, oc_mtime, path_env)
+    with _oc_plugins_cache_lock:
+        if key in _oc_plugins_cache:
+            _oc_plugins_stats["forks_saved"] += 1
+            return _oc_plugins_cache[key]
+        cp = subprocess.run(
+            shlex.split("oc plugin list"),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        _oc_plugins_stats["probes"] += 1
+        plugins = cp.stdout.decode().splitlines()
+        _oc_plugins_cache[key] = plugins
+        return plugins
+
+
+def get_oc_plugins_stats():
+    """
+    Get statistics of the 'oc plugin list' probe cache
+
+    Returns:
+        dict: 'probes' - number of executed 'oc plugin list' commands,
+            'forks_saved' - number of oc commands which used the cached probe
+
+    """
+    with _oc_plugins_cache_lock:
+        return dict(_oc_plugins_stats)
+
+
+def clear_oc_plugins_cache():
+    """
+    Drop the cached 'oc plugin list' output, e.g. after installing a plugin
+    to the same PATH
+    """
+    with _oc_plugins_cache_lock:
+        _oc_plugins_cache.clear()
 
 
 @retry(
@@ -806,19 +930,14 @@ def exec_cmd(
     ):
         kube_index = 1
         # check if we have an oc plugin in the command
-        plugin_list = "oc plugin list"
-        cp = subprocess.run(
-            shlex.split(plugin_list),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        plugins = get_oc_plugins(_env)
         subcmd = cmd[1].split("-")
         if len(subcmd) > 1:
             subcmd = "_".join(subcmd)
         if not isinstance(subcmd, str) and isinstance(subcmd, list):
             subcmd = str(subcmd[0])
 
-        for l in cp.stdout.decode().splitlines():
+        for l in plugins:
             if subcmd in l:
                 # If oc cmdline has plugin name then we need to push the
                 # --kubeconfig to next index
@@ -164,8 +164,9 @@ class TestMustGather(ManageTest):
         mustgather_obj = MustGather()
         mustgather_obj.collect_must_gather(ocs_flags=flags_cmd, mg_options=mg_options)
         mustgather_obj.get_all_paths()
-        folders_exist = mustgather_obj.verify_paths_in_dir(paths_exist)
-        folders_not_exist = mustgather_obj.verify_paths_not_in_dir(paths_not_exist)
+        folders_exist, folders_not_exist = mustgather_obj.verify_paths(
+            paths_exist, paths_not_exist
+        )
         assert len(folders_not_exist) + len(folders_exist) == 0, (
             f"\nMode: {flags_cmd}"
             f"\nThe folders don't exist [should exist]: {folders_exist} "